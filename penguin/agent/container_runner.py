@@ -0,0 +1,119 @@
+"""Sandbox worker entry point: ``python -m penguin.agent.container_runner``.
+
+Runs inside a sandbox (a Docker container or a plain subprocess) and serves
+newline-delimited JSON-RPC requests on stdin, one response line per request
+on stdout, until stdin closes or a ``shutdown`` request arrives. The worker
+stays up between requests so imports and agent setup are paid once per
+worker rather than once per job.
+
+Supported methods:
+
+- ``ping``: health check, returns the worker's pid and jobs served.
+- ``run_agent``: ``{"prompt", "context", "config"}`` -> the agent's result.
+- ``shutdown``: acknowledge and exit.
+
+Anything the agent prints goes to stderr so stdout carries only responses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+async def run_agent_request(
+    agent_config: Dict[str, Any],
+    prompt: str,
+    context: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Run a BasicPenguinAgent for one request without a full PenguinCore."""
+
+    # Import here to avoid circular dependencies
+    from penguin.agent.basic_agent import BasicPenguinAgent
+    from penguin.agent.schema import AgentConfig, SecurityConfig
+
+    config = AgentConfig(
+        name=agent_config.get("name", "sandbox_agent"),
+        type="penguin.agent.basic_agent.BasicPenguinAgent",
+        description="Sandboxed agent execution",
+        security=SecurityConfig(),
+    )
+
+    # Mock required components (in real usage these would come from Core)
+    from unittest.mock import AsyncMock
+    components = {
+        "conversation_manager": AsyncMock(),
+        "api_client": AsyncMock(),
+        "tool_manager": AsyncMock(),
+        "action_executor": AsyncMock(),
+    }
+    components["conversation_manager"].process_message = AsyncMock(return_value={
+        "assistant_response": f"Fallback response to: {prompt}",
+        "action_results": [],
+    })
+
+    agent = BasicPenguinAgent(config, **components)
+    return await agent.run(prompt, context)
+
+
+class _Worker:
+    def __init__(self) -> None:
+        self.jobs = 0
+        self.loop = asyncio.new_event_loop()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method")
+        params = request.get("params") or {}
+        if method == "ping":
+            return {"pid": os.getpid(), "jobs": self.jobs}
+        if method == "shutdown":
+            return {"pid": os.getpid()}
+        if method == "run_agent":
+            self.jobs += 1
+            return self.loop.run_until_complete(
+                run_agent_request(
+                    params.get("config") or {},
+                    params.get("prompt", ""),
+                    params.get("context"),
+                )
+            )
+        raise ValueError(f"Unknown method: {method}")
+
+
+def serve(stdin=None, stdout=None) -> int:
+    """Serve requests from ``stdin`` until EOF or ``shutdown``."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    # Keep stray prints from corrupting the response stream
+    sys.stdout = sys.stderr
+    worker = _Worker()
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        request: Dict[str, Any] = {}
+        try:
+            request = json.loads(line)
+            response = {"id": request.get("id"), "result": worker.handle(request)}
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception(f"Sandbox request failed: {e}")
+            response = {"id": request.get("id"), "error": {"message": str(e)}}
+        stdout.write(json.dumps(response, default=str) + "\n")
+        stdout.flush()
+        if request.get("method") == "shutdown":
+            break
+
+    worker.loop.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(stream=sys.stderr, level=os.environ.get("PENGUIN_SANDBOX_LOG_LEVEL", "WARNING"))
+    sys.exit(serve())
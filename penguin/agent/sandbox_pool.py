@@ -0,0 +1,391 @@
+"""Warm pool of sandbox workers for sandboxed agent runs.
+
+Each worker is a long-lived ``penguin.agent.container_runner`` process that
+speaks newline-delimited JSON-RPC over its stdin/stdout. Workers are started
+ahead of time, health-checked with ``ping`` before reuse when they have been
+idle for a while, and recycled after a fixed number of jobs or after any
+failure, so a job only pays for a round trip instead of a container start.
+
+How a worker is started is up to a ``SandboxBackend``: ``DockerBackend``
+attaches to ``docker run -i`` and ``SubprocessBackend`` runs the worker as a
+plain child process for hosts (and CI) without Docker.
+
+Tuning via environment:
+
+- ``PENGUIN_SANDBOX_POOL_SIZE`` workers kept warm (default 2)
+- ``PENGUIN_SANDBOX_MAX_JOBS`` jobs before a worker is recycled (default 20)
+- ``PENGUIN_SANDBOX_HEALTH_INTERVAL`` idle seconds before a re-check (default 30)
+- ``PENGUIN_SANDBOX_REQUEST_TIMEOUT`` seconds per request (default 600)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RUNNER_MODULE = "penguin.agent.container_runner"
+
+# Responses can carry whole agent transcripts
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class SandboxError(RuntimeError):
+    """A sandbox worker failed to start, answer, or stay healthy."""
+
+
+class SandboxWorker:
+    """One running sandbox process and its JSON-RPC channel."""
+
+    def __init__(self, process: asyncio.subprocess.Process, name: str):
+        self.process = process
+        self.name = name
+        self.jobs = 0
+        self.started_at = time.monotonic()
+        self.last_used = self.started_at
+        self._ids = itertools.count(1)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def call(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """Send one request and wait for its response."""
+        if not self.alive:
+            raise SandboxError(f"Sandbox worker {self.name} exited with {self.process.returncode}")
+        request_id = next(self._ids)
+        line = json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        try:
+            self.process.stdin.write(line.encode("utf-8") + b"\n")
+            await self.process.stdin.drain()
+            raw = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+        except asyncio.TimeoutError:
+            raise SandboxError(f"Sandbox worker {self.name} timed out on {method}") from None
+        except (BrokenPipeError, ConnectionResetError, ValueError) as e:
+            raise SandboxError(f"Sandbox worker {self.name} channel failed: {e}") from e
+        finally:
+            self.last_used = time.monotonic()
+
+        if not raw:
+            raise SandboxError(f"Sandbox worker {self.name} closed its output")
+        try:
+            response = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise SandboxError(f"Invalid JSON response from sandbox worker {self.name}: {e}") from e
+        if response.get("id") != request_id:
+            raise SandboxError(f"Sandbox worker {self.name} answered out of order")
+        if "error" in response:
+            raise SandboxError(response["error"].get("message", "sandbox request failed"))
+        return response.get("result")
+
+
+class SandboxBackend:
+    """Starts and stops sandbox worker processes."""
+
+    name = "base"
+
+    async def start(self) -> SandboxWorker:
+        raise NotImplementedError
+
+    async def stop(self, worker: SandboxWorker) -> None:
+        await _terminate(worker.process)
+
+    @staticmethod
+    async def _spawn(*cmd: str, name: str, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> SandboxWorker:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=cwd,
+            env=env,
+            limit=_STREAM_LIMIT,
+        )
+        return SandboxWorker(process, name)
+
+
+class SubprocessBackend(SandboxBackend):
+    """Runs workers as child processes of this interpreter (no isolation)."""
+
+    name = "subprocess"
+
+    def __init__(self, cwd: Optional[str] = None, python: Optional[str] = None, env: Optional[Dict[str, str]] = None):
+        self.cwd = cwd
+        self.python = python or sys.executable
+        self.env = env
+
+    async def start(self) -> SandboxWorker:
+        env = dict(os.environ)
+        env.update(self.env or {})
+        env.setdefault("PYTHONUNBUFFERED", "1")
+        return await self._spawn(
+            self.python, "-m", RUNNER_MODULE,
+            name=f"penguin-sandbox-{uuid.uuid4().hex[:8]}",
+            cwd=self.cwd,
+            env=env,
+        )
+
+
+class DockerBackend(SandboxBackend):
+    """Runs each worker in its own container, attached over ``docker run -i``."""
+
+    name = "docker"
+
+    def __init__(self, image_name: str = "penguin-agent:latest", workspace_mount: str = "/tmp/penguin_workspace"):
+        self.image_name = image_name
+        self.workspace_mount = workspace_mount
+
+    async def start(self) -> SandboxWorker:
+        container_name = f"penguin-agent-{uuid.uuid4().hex[:8]}"
+        return await self._spawn(
+            'docker', 'run', '--rm', '-i',
+            '--name', container_name,
+            '-v', f'{self.workspace_mount}:/workspace:ro',  # Read-only workspace mount
+            '-v', '/tmp:/tmp:rw',  # Writable temp directory
+            '--memory', '512m',  # Memory limit
+            '--cpus', '1.0',  # CPU limit
+            '--network', 'none',  # No network access by default
+            self.image_name,
+            'python', '-m', RUNNER_MODULE,
+            name=container_name,
+        )
+
+    async def stop(self, worker: SandboxWorker) -> None:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'docker', 'rm', '-f', worker.name,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await process.wait()
+        except (FileNotFoundError, OSError) as e:
+            logger.warning(f"Failed to remove container {worker.name}: {e}")
+        await _terminate(worker.process)
+
+
+async def _terminate(process: asyncio.subprocess.Process, grace: float = 2.0) -> None:
+    if process.returncode is not None:
+        return
+    try:
+        if process.stdin and not process.stdin.is_closing():
+            process.stdin.close()
+        await asyncio.wait_for(process.wait(), grace)
+    except asyncio.TimeoutError:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+
+class SandboxPool:
+    """Keeps ``size`` sandbox workers warm and hands them out one job at a time."""
+
+    def __init__(
+        self,
+        backend: SandboxBackend,
+        size: Optional[int] = None,
+        max_jobs_per_worker: Optional[int] = None,
+        health_check_interval: Optional[float] = None,
+        request_timeout: Optional[float] = None,
+        start_timeout: float = 120.0,
+    ):
+        self.backend = backend
+        self.size = max(1, size if size is not None else _env_int("PENGUIN_SANDBOX_POOL_SIZE", 2))
+        self.max_jobs_per_worker = max(
+            1, max_jobs_per_worker if max_jobs_per_worker is not None else _env_int("PENGUIN_SANDBOX_MAX_JOBS", 20)
+        )
+        self.health_check_interval = (
+            health_check_interval
+            if health_check_interval is not None
+            else _env_float("PENGUIN_SANDBOX_HEALTH_INTERVAL", 30.0)
+        )
+        self.request_timeout = (
+            request_timeout if request_timeout is not None else _env_float("PENGUIN_SANDBOX_REQUEST_TIMEOUT", 600.0)
+        )
+        self.start_timeout = start_timeout
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"started": 0, "recycled": 0, "failed_health_checks": 0, "jobs": 0}
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[SandboxWorker] = []
+        self._starting: set = set()
+        # Background retire-and-replace tasks, awaited by close()
+        self._retiring: set = set()
+        self._closed = False
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    async def start(self) -> None:
+        """Start the pool's workers; safe to call more than once."""
+        if self._idle is None:
+            self.loop = asyncio.get_running_loop()
+            self._idle = asyncio.Queue()
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            missing = self.size - len(self._workers) - len(self._starting)
+            if missing > 0:
+                await asyncio.gather(*(self._add_worker() for _ in range(missing)))
+
+    async def _add_worker(self) -> None:
+        marker = object()
+        self._starting.add(marker)
+        try:
+            worker = await self.backend.start()
+            try:
+                await worker.call("ping", timeout=self.start_timeout)
+            except Exception:
+                await self.backend.stop(worker)
+                raise
+        except Exception as e:
+            logger.warning(f"Failed to start {self.backend.name} sandbox worker: {e}")
+            self._starting.discard(marker)
+            if not self._workers and not self._starting:
+                # Wake anyone waiting on a worker that will never arrive
+                self._idle.put_nowait(None)
+            return
+        self._starting.discard(marker)
+        if self._closed:
+            await self.backend.stop(worker)
+            return
+        self.stats["started"] += 1
+        self._workers.append(worker)
+        self._idle.put_nowait(worker)
+
+    async def _retire(self, worker: SandboxWorker, replace: bool = True) -> None:
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self.stats["recycled"] += 1
+        await self.backend.stop(worker)
+        if replace and not self._closed:
+            await self._add_worker()
+
+    async def _healthy(self, worker: SandboxWorker) -> bool:
+        if not worker.alive:
+            return False
+        if time.monotonic() - worker.last_used < self.health_check_interval:
+            return True
+        try:
+            await worker.call("ping", timeout=min(self.start_timeout, 10.0))
+            return True
+        except SandboxError as e:
+            logger.warning(f"Sandbox worker {worker.name} failed its health check: {e}")
+            return False
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[SandboxWorker]:
+        """Check a healthy worker out for one job."""
+        if self._closed:
+            raise SandboxError("Sandbox pool is closed")
+        await self.start()
+        while True:
+            if not self._workers and not self._starting:
+                raise SandboxError(f"No {self.backend.name} sandbox workers could be started")
+            worker = await self._idle.get()
+            if worker is None:
+                continue
+            if await self._healthy(worker):
+                break
+            self.stats["failed_health_checks"] += 1
+            await self._retire(worker)
+
+        failed = False
+        try:
+            yield worker
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            worker.jobs += 1
+            self.stats["jobs"] += 1
+            if failed or not worker.alive or worker.jobs >= self.max_jobs_per_worker:
+                # Replace in the background so the caller gets its result now
+                task = asyncio.ensure_future(self._retire(worker))
+                self._retiring.add(task)
+                task.add_done_callback(self._retiring.discard)
+            else:
+                self._idle.put_nowait(worker)
+
+    async def call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Run one request on the next free worker."""
+        async with self.acquire() as worker:
+            return await worker.call(method, params, timeout=self.request_timeout)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "size": self.size,
+            "workers": len(self._workers),
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "starting": len(self._starting),
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+            **self.stats,
+        }
+
+    async def close(self) -> None:
+        """Stop every worker, waiting for ones being retired."""
+        self._closed = True
+        if self._retiring:
+            await asyncio.gather(*list(self._retiring), return_exceptions=True)
+        workers, self._workers = list(self._workers), []
+        await asyncio.gather(*(self.backend.stop(w) for w in workers), return_exceptions=True)
+
+    def kill(self) -> None:
+        """Best-effort synchronous teardown, for pools whose loop is gone."""
+        self._closed = True
+        for worker in self._workers:
+            try:
+                worker.process.kill()
+            except (ProcessLookupError, RuntimeError, AttributeError):
+                pass
+        self._workers = []
+
+
+# Pools are keyed by backend identity and bound to the loop that started them
+_pools: Dict[tuple, SandboxPool] = {}
+
+
+def get_sandbox_pool(key: tuple, factory) -> SandboxPool:
+    """Return the shared pool for ``key`` on the running loop, creating it with ``factory()``."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(key)
+    if pool is not None and pool.loop not in (None, loop):
+        pool.kill()
+        pool = None
+    if pool is None or pool._closed:
+        pool = factory()
+        _pools[key] = pool
+    return pool
+
+
+async def close_sandbox_pools() -> None:
+    """Stop every shared pool (call on shutdown)."""
+    pools = list(_pools.values())
+    _pools.clear()
+    loop = asyncio.get_running_loop()
+    for pool in pools:
+        if pool.loop in (None, loop):
+            await pool.close()
+        else:
+            pool.kill()
@@ -1464,34 +1464,49 @@ def main_entry(
         ctx.obj = ctx.obj or {}
         ctx.obj["project"] = project
 
-        # Check for priority flags in order of precedence:
-        # 1. Task execution (--run)
-        if run_task is not None:
-            await _handle_run_mode(run_task, continuous, time_limit, task_description)
-        # 2. Session management (--continue/--resume)
-        elif continue_last or resume_session:
-            # We'll always go into interactive mode for session management
-            if prompt is not None:
-                # Combine -p with -c/--resume
-                await _handle_session_management(
-                    continue_last, resume_session, prompt, output_format
-                )
-            else:
-                # Just go into interactive mode with loaded session
-                await _handle_session_management(continue_last, resume_session)
-        # 3. Direct prompt (-p/--prompt)
-        elif prompt is not None:
-            # Standard non-interactive mode if -p or --prompt was used
-            await _run_penguin_direct_prompt(prompt, output_format)
-        # 4. Continuous mode without task (just --247)
-        elif continuous:
-            await _handle_run_mode(None, continuous, time_limit, task_description)
-        # 5. Default: interactive chat session
-        elif ctx.invoked_subcommand is None:
-            # No subcommand invoked, default to interactive chat
-            await _run_interactive_chat()
-        # Else: a subcommand was invoked (e.g., `penguin chat`, `penguin profile`).
-        # Typer will handle calling the subcommand.
+        try:
+            # Check for priority flags in order of precedence:
+            # 1. Task execution (--run)
+            if run_task is not None:
+                await _handle_run_mode(run_task, continuous, time_limit, task_description)
+            # 2. Session management (--continue/--resume)
+            elif continue_last or resume_session:
+                # We'll always go into interactive mode for session management
+                if prompt is not None:
+                    # Combine -p with -c/--resume
+                    await _handle_session_management(
+                        continue_last, resume_session, prompt, output_format
+                    )
+                else:
+                    # Just go into interactive mode with loaded session
+                    await _handle_session_management(continue_last, resume_session)
+            # 3. Direct prompt (-p/--prompt)
+            elif prompt is not None:
+                # Standard non-interactive mode if -p or --prompt was used
+                await _run_penguin_direct_prompt(prompt, output_format)
+            # 4. Continuous mode without task (just --247)
+            elif continuous:
+                await _handle_run_mode(None, continuous, time_limit, task_description)
+            # 5. Default: interactive chat session
+            elif ctx.invoked_subcommand is None:
+                # No subcommand invoked, default to interactive chat
+                await _run_interactive_chat()
+            # Else: a subcommand was invoked (e.g., `penguin chat`, `penguin profile`).
+            # Typer will handle calling the subcommand.
+        finally:
+            # Write workflow state still waiting for a coalesced flush
+            try:
+                from penguin.orchestration import shutdown_backend
+
+                await shutdown_backend()
+            except Exception:
+                logger.debug("Unable to flush workflow state", exc_info=True)
+            try:
+                from penguin.agent.sandbox_pool import close_sandbox_pools
+
+                await close_sandbox_pools()
+            except Exception:
+                logger.debug("Unable to stop sandbox workers", exc_info=True)
 
     # Run the async function in the current thread
     # Run the async function in the current thread
@@ -48,6 +48,7 @@ class EventType(Enum):
 
     # Action/Tool events
     ACTION = "action"
+    ACTION_OUTPUT = "action_output"
     ACTION_RESULT = "action_result"
     TOOL = "tool"  # Tool events for chronological timeline display
     TOOL_CALL = "tool_call"
@@ -204,6 +205,7 @@ class EventBus:
             EventType.STREAM_CHUNK.value,
             EventType.TOKEN_UPDATE.value,
             "action",
+            "action_output",
             "action_result",
             "opencode_event",
         ]:
@@ -1028,6 +1028,13 @@ class AuditConfig:
     max_memory_entries: int = field(default=1000)
     # Include full context in logs (may contain sensitive data)
     include_context: bool = field(default=False)
+    # Optional SQLite database for querying decisions by session/tool/time
+    sqlite_file: Optional[str] = field(default=None)
+    # Rotate the log file at this size; keep this many rotated files
+    max_file_bytes: int = field(default=10 * 1024 * 1024)
+    backup_count: int = field(default=3)
+    # Seconds the background writer batches entries before writing
+    flush_interval: float = field(default=0.5)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AuditConfig":
@@ -1052,6 +1059,10 @@ class AuditConfig:
             categories=categories,
             max_memory_entries=data.get("max_memory_entries", 1000),
             include_context=data.get("include_context", False),
+            sqlite_file=data.get("sqlite_file"),
+            max_file_bytes=data.get("max_file_bytes", 10 * 1024 * 1024),
+            backup_count=data.get("backup_count", 3),
+            flush_interval=data.get("flush_interval", 0.5),
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -1062,6 +1073,10 @@ class AuditConfig:
             "categories": dict(self.categories),
             "max_memory_entries": self.max_memory_entries,
             "include_context": self.include_context,
+            "sqlite_file": self.sqlite_file,
+            "max_file_bytes": self.max_file_bytes,
+            "backup_count": self.backup_count,
+            "flush_interval": self.flush_interval,
         }
     
     def should_log(self, category: str, result: str) -> bool:
@@ -19,6 +19,7 @@ from . import (
 
 __all__ = [
     "handle_tui_action",
+    "handle_tui_action_output",
     "handle_tui_action_result",
     "handle_tui_lsp_diagnostics",
     "handle_tui_lsp_updated",
@@ -92,6 +93,29 @@ async def handle_tui_action(
     }
 
 
+async def handle_tui_action_output(
+    owner: Any,
+    event_type: str,
+    data: dict[str, Any],
+) -> None:
+    """Forward streamed output of a running action to its OpenCode tool part."""
+
+    if event_type != "action_output":
+        return
+
+    call_id = data.get("id") or data.get("call_id") or data.get("callID")
+    chunk = data.get("chunk")
+    if not call_id or not isinstance(chunk, str):
+        return
+
+    session_id = resolve_action_session_id(data)
+    part_id = _tool_parts(owner).get(tool_key_for(session_id, str(call_id)))
+    if not part_id:
+        return
+    adapter = owner._get_tui_adapter(session_id)
+    await adapter.on_tool_output(part_id, chunk)
+
+
 async def handle_tui_action_result(
     owner: Any,
     event_type: str,
@@ -132,6 +132,13 @@ class OpenCodeCoreFacade:
     async def _on_tui_action(self, event_type: str, data: dict[str, Any]) -> None:
         await core_action_events.handle_tui_action(self, event_type, data)
 
+    async def _on_tui_action_output(
+        self,
+        event_type: str,
+        data: dict[str, Any],
+    ) -> None:
+        await core_action_events.handle_tui_action_output(self, event_type, data)
+
     async def _on_tui_action_result(
         self,
         event_type: str,
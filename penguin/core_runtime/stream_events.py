@@ -92,8 +92,10 @@ def subscribe_to_stream_events(owner: Any) -> None:
     owner.event_bus.subscribe("stream_chunk", owner._tui_stream_handler)
 
     owner._tui_action_handler = owner._on_tui_action
+    owner._tui_action_output_handler = owner._on_tui_action_output
     owner._tui_action_result_handler = owner._on_tui_action_result
     owner.event_bus.subscribe("action", owner._tui_action_handler)
+    owner.event_bus.subscribe("action_output", owner._tui_action_output_handler)
     owner.event_bus.subscribe("action_result", owner._tui_action_result_handler)
 
     owner._tui_lsp_updated_handler = owner._on_tui_lsp_updated
@@ -6,7 +6,7 @@ import asyncio
 import logging
 from typing import Any
 
-from penguin.system.state import MessageCategory
+from penguin.system.state import MessageCategory, SessionUsage
 
 logger = logging.getLogger(__name__)
 
@@ -120,16 +120,20 @@ def get_session_token_usage(
         metadata_agent_id = None
 
     if agent_id:
-        messages = getattr(session, "messages", []) or []
-        message_agent_ids = {
-            message_agent_id.strip()
-            for message in messages
-            if isinstance(
-                message_agent_id := getattr(message, "agent_id", None),
-                str,
-            )
-            and message_agent_id.strip()
-        }
+        session_usage = _session_usage(session)
+        if session_usage is not None:
+            message_agent_ids = set(session_usage.agents)
+        else:
+            messages = getattr(session, "messages", []) or []
+            message_agent_ids = {
+                message_agent_id.strip()
+                for message in messages
+                if isinstance(
+                    message_agent_id := getattr(message, "agent_id", None),
+                    str,
+                )
+                and message_agent_id.strip()
+            }
         if agent_id in message_agent_ids:
             usage = usage_from_session_messages(
                 core,
@@ -184,8 +188,50 @@ def usage_from_session_messages(
     agent_id: str | None = None,
     manager: Any | None = None,
 ) -> dict[str, Any]:
-    """Build a conservative session-scoped usage payload from messages."""
+    """Build a conservative session-scoped usage payload from messages.
+
+    Sessions keep running totals (:class:`SessionUsage`), so this is O(1) for
+    them; other session-like objects are summed message by message.
+    """
+
+    session_usage = _session_usage(session)
+    if session_usage is not None:
+        totals = session_usage.totals(agent_id)
+        current_total_tokens = totals["current_total_tokens"]
+        categories = totals["categories"]
+    else:
+        current_total_tokens, categories = _sum_message_tokens(session, agent_id)
+
+    context_window = _session_context_window(core, manager)
+    max_tokens = int(getattr(context_window, "max_context_window_tokens", 0) or 0)
+    available_tokens = max(max_tokens - current_total_tokens, 0) if max_tokens else 0
+    percentage = (current_total_tokens / max_tokens) * 100 if max_tokens else 0
+
+    return {
+        "current_total_tokens": current_total_tokens,
+        "max_context_window_tokens": max_tokens,
+        "available_tokens": available_tokens,
+        "percentage": percentage,
+        "categories": categories,
+        "truncations": {
+            "total_truncations": 0,
+            "messages_removed": 0,
+            "tokens_freed": 0,
+            "by_category": {},
+            "recent_events": [],
+        },
+    }
+
 
+def _session_usage(session: Any) -> SessionUsage | None:
+    usage = getattr(session, "usage", None)
+    return usage if isinstance(usage, SessionUsage) else None
+
+
+def _sum_message_tokens(
+    session: Any,
+    agent_id: str | None,
+) -> tuple[int, dict[str, int]]:
     messages = getattr(session, "messages", []) or []
     if agent_id:
         messages = [
@@ -208,26 +254,7 @@ def usage_from_session_messages(
         else:
             category_name = "UNKNOWN"
         categories[category_name] = categories.get(category_name, 0) + token_count
-
-    context_window = _session_context_window(core, manager)
-    max_tokens = int(getattr(context_window, "max_context_window_tokens", 0) or 0)
-    available_tokens = max(max_tokens - current_total_tokens, 0) if max_tokens else 0
-    percentage = (current_total_tokens / max_tokens) * 100 if max_tokens else 0
-
-    return {
-        "current_total_tokens": current_total_tokens,
-        "max_context_window_tokens": max_tokens,
-        "available_tokens": available_tokens,
-        "percentage": percentage,
-        "categories": categories,
-        "truncations": {
-            "total_truncations": 0,
-            "messages_removed": 0,
-            "tokens_freed": 0,
-            "by_category": {},
-            "recent_events": [],
-        },
-    }
+    return current_total_tokens, categories
 
 
 def _usage_from_session_messages_with_snapshot(
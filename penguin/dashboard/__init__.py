@@ -1,13 +1,6 @@
 from __future__ import annotations
 
-from penguin.dashboard.components import (
-    cost_panel,
-    context_panel,
-    performance_panel,
-    reliability_panel,
-    session_explorer,
-    task_panel,
-)
+import importlib
 
 __all__ = [
     "cost_panel",
@@ -16,4 +9,12 @@ __all__ = [
     "reliability_panel",
     "session_explorer",
     "task_panel",
-]
\ No newline at end of file
+]
+
+
+# Lazy load the panels so submodules that do not need streamlit/plotly
+# (e.g. queries.log_index) import without the dashboard extras
+def __getattr__(name: str) -> object:
+    if name in __all__:
+        return importlib.import_module(f"penguin.dashboard.components.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
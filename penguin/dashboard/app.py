@@ -2,7 +2,7 @@
 
 This dashboard reads from:
   - runtime_events.db (structured event stream)
-  - server-logs/ (rotated text files, parsed and cached)
+  - server-logs/ (rotated text files, tailed into a persistent index)
   - projects.db (task/project execution)
   - conversations/ (session transcripts)
 
@@ -68,9 +68,9 @@ else:
 
 # Cache status
 cache_info = cache_status()
-st.sidebar.subheader("Log Cache")
+st.sidebar.subheader("Log Index")
 if cache_info["keys"]:
-    st.sidebar.text(f"{len(cache_info['keys'])} datasets cached")
+    st.sidebar.text(f"{cache_info['count']} files, {cache_info['entries']} entries")
 else:
     st.sidebar.text("Empty (parses on first load)")
 
@@ -25,9 +25,12 @@ def render():
     with col1:
         cache_info = cache_status()
         if cache_info["keys"]:
-            st.caption(f"Log cache: {len(cache_info['keys'])} cached datasets")
+            st.caption(
+                f"Log index: {cache_info['count']} files, "
+                f"{cache_info['entries']} entries"
+            )
         else:
-            st.caption("Log cache: empty (will parse on first load)")
+            st.caption("Log index: empty (will parse on first load)")
 
     # ── LLM Latency ────────────────────────────────────────────────────
     st.subheader("LLM Response Time")
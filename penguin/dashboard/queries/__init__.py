@@ -1,32 +1,34 @@
 from __future__ import annotations
 
-from penguin.dashboard.queries.runtime_events import (
-    query_cost_by_model,
-    query_cost_by_day,
-    query_cost_by_session,
-    query_cache_hit_ratio,
-    query_tool_executions,
-    query_llm_calls_all,
-    query_session_events,
-    query_events_by_session,
-    query_error_like_events,
-    get_event_db_path,
-)
-from penguin.dashboard.queries.server_logs import (
-    parse_llm_attempts,
-    parse_context_snapshots,
-    parse_tool_exec_done,
-    get_all_log_files,
-    parse_errors_from_logs,
-)
-from penguin.dashboard.queries.projects import (
-    query_task_summary,
-    query_task_timeline,
-    query_state_transitions,
-    query_execution_records,
-    query_project_summary,
-    get_projects_db_path,
-)
+import importlib
+
+# Exported name -> submodule; loaded on first access because most of them
+# need streamlit, which queries.log_index does not
+_EXPORTS = {
+    "query_cost_by_model": "runtime_events",
+    "query_cost_by_day": "runtime_events",
+    "query_cost_by_session": "runtime_events",
+    "query_cache_hit_ratio": "runtime_events",
+    "query_tool_executions": "runtime_events",
+    "query_llm_calls_all": "runtime_events",
+    "query_session_events": "runtime_events",
+    "query_events_by_session": "runtime_events",
+    "query_error_like_events": "runtime_events",
+    "get_event_db_path": "runtime_events",
+    "parse_llm_attempts": "server_logs",
+    "parse_context_snapshots": "server_logs",
+    "parse_tool_exec_done": "server_logs",
+    "get_all_log_files": "server_logs",
+    "parse_errors_from_logs": "server_logs",
+    "query_log_entries": "server_logs",
+    "refresh_index": "server_logs",
+    "query_task_summary": "projects",
+    "query_task_timeline": "projects",
+    "query_state_transitions": "projects",
+    "query_execution_records": "projects",
+    "query_project_summary": "projects",
+    "get_projects_db_path": "projects",
+}
 
 __all__ = [
     "query_cost_by_model",
@@ -44,10 +46,19 @@ __all__ = [
     "parse_tool_exec_done",
     "get_all_log_files",
     "parse_errors_from_logs",
+    "query_log_entries",
+    "refresh_index",
     "query_task_summary",
     "query_task_timeline",
     "query_state_transitions",
     "query_execution_records",
     "query_project_summary",
     "get_projects_db_path",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> object:
+    if name in _EXPORTS:
+        module = importlib.import_module(f"penguin.dashboard.queries.{_EXPORTS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,352 @@
+"""Persistent, incrementally-updated index of Penguin server log lines.
+
+Each log file is tracked by ``(st_dev, st_ino)`` plus a short fingerprint of its
+first bytes and the byte offset already consumed. A refresh only reads bytes
+appended since the last pass, so polling weeks of logs costs a ``stat`` per file
+plus whatever was written in between.
+
+Rotation is handled without re-parsing:
+  - ``RotatingFileHandler`` renames ``foo.txt`` to ``foo.txt.1``; the inode is
+    unchanged, so the index simply records the new path and keeps its offset.
+  - A truncated file or a reused inode (fingerprint mismatch) drops the
+    entries for that file and re-reads it from the start.
+  - A file deleted by rotation (the oldest backup) loses its entries on the
+    next refresh.
+
+A single line longer than the per-pass read limit is indexed truncated and
+the rest of it is skipped, so it cannot stall a file.
+
+Parsed records live in indexed columns (timestamp, level, logger, event,
+request id, session id) so dashboard queries are plain SQL lookups.
+
+This module deliberately has no Streamlit dependency.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+# Pattern: "2026-07-29 02:28:56,393 - penguin.engine - INFO - message"
+LOG_LINE_PATTERN = re.compile(
+    r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})\s*-\s+"
+    r"([\w.]+)\s*-\s+"
+    r"(\w+)\s*-\s+"
+    r"(.*)$"
+)
+
+_REQUEST_RE = re.compile(r"\brequest=(\S+)")
+_SESSION_RE = re.compile(r"\bsession=(\S+)")
+
+# Bytes from the head of a file used to detect truncation / inode reuse.
+_FINGERPRINT_BYTES = 256
+# Upper bound on bytes read per file per refresh pass.
+_READ_CHUNK_BYTES = 8 * 1024 * 1024
+# Bytes of an over-long line kept when it does not fit in one read.
+_MAX_LINE_BYTES = 64 * 1024
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_files (
+    file_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    head BLOB NOT NULL,
+    offset INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL DEFAULT 0,
+    entries INTEGER NOT NULL DEFAULT 0,
+    indexed_at INTEGER NOT NULL,
+    UNIQUE (dev, ino)
+);
+
+CREATE TABLE IF NOT EXISTS log_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_id INTEGER NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    ts TEXT NOT NULL,
+    level TEXT NOT NULL,
+    logger TEXT NOT NULL,
+    event TEXT,
+    request_id TEXT,
+    session_id TEXT,
+    message TEXT NOT NULL,
+    UNIQUE (file_id, byte_offset)
+);
+
+CREATE INDEX IF NOT EXISTS idx_log_entries_ts ON log_entries (ts);
+CREATE INDEX IF NOT EXISTS idx_log_entries_level_ts ON log_entries (level, ts);
+CREATE INDEX IF NOT EXISTS idx_log_entries_logger_ts ON log_entries (logger, ts);
+CREATE INDEX IF NOT EXISTS idx_log_entries_event_ts ON log_entries (event, ts);
+CREATE INDEX IF NOT EXISTS idx_log_entries_request ON log_entries (request_id);
+CREATE INDEX IF NOT EXISTS idx_log_entries_session ON log_entries (session_id, ts);
+"""
+
+
+def parse_log_line(line: str) -> dict[str, Any] | None:
+    """Split one formatted log record into its fields, or ``None``."""
+    match = LOG_LINE_PATTERN.match(line)
+    if not match:
+        return None
+    message = match.group(4)
+    event = message.split(" ", 1)[0] if message else ""
+    request = _REQUEST_RE.search(message)
+    session = _SESSION_RE.search(message)
+    return {
+        "timestamp": match.group(1),
+        "logger": match.group(2),
+        "level": match.group(3),
+        "message": message,
+        "event": event or None,
+        "request_id": request.group(1) if request else None,
+        "session_id": session.group(1) if session else None,
+    }
+
+
+def _format_bound(value: datetime | str | None) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime(_TIMESTAMP_FORMAT)[:-3]
+    return str(value)
+
+
+class ServerLogIndex:
+    """SQLite-backed index of server log lines, updated by tailing files."""
+
+    def __init__(self, db_path: str | os.PathLike[str]):
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._last_refresh = 0.0
+
+    # ── ingestion ──────────────────────────────────────────────────────
+
+    def refresh(self, paths: Iterable[str], min_interval: float = 0.0) -> int:
+        """Index bytes appended to ``paths`` since the last pass.
+
+        Returns the number of new entries. When ``min_interval`` is set and the
+        previous refresh was more recent than that, nothing is read.
+        """
+        now = time.monotonic()
+        if min_interval and now - self._last_refresh < min_interval:
+            return 0
+        added = 0
+        with self._lock:
+            seen: set[int] = set()
+            for path in paths:
+                try:
+                    added += self._refresh_file(path, seen)
+                except OSError:
+                    continue
+            self._prune_missing(seen)
+            self._last_refresh = time.monotonic()
+        return added
+
+    def _prune_missing(self, seen: set[int]) -> None:
+        """Drop files not refreshed this pass whose path no longer holds them."""
+        stale = []
+        for row in self._conn.execute("SELECT file_id, dev, ino, path FROM log_files"):
+            if row["file_id"] in seen:
+                continue
+            try:
+                st = os.stat(row["path"])
+            except OSError:
+                stale.append(row["file_id"])
+                continue
+            if (st.st_dev, st.st_ino) != (row["dev"], row["ino"]):
+                stale.append(row["file_id"])
+        if not stale:
+            return
+        placeholders = ", ".join("?" for _ in stale)
+        self._conn.execute(f"DELETE FROM log_entries WHERE file_id IN ({placeholders})", stale)
+        self._conn.execute(f"DELETE FROM log_files WHERE file_id IN ({placeholders})", stale)
+        self._conn.commit()
+
+    def _refresh_file(self, path: str, seen: set[int]) -> int:
+        st = os.stat(path)
+        row = self._conn.execute(
+            "SELECT file_id, path, head, offset FROM log_files WHERE dev = ? AND ino = ?",
+            (st.st_dev, st.st_ino),
+        ).fetchone()
+
+        with open(path, "rb") as handle:
+            head = handle.read(_FINGERPRINT_BYTES)
+            if row is None:
+                file_id = self._conn.execute(
+                    "INSERT INTO log_files (dev, ino, path, head, offset, size, indexed_at) "
+                    "VALUES (?, ?, ?, ?, 0, 0, ?)",
+                    (st.st_dev, st.st_ino, path, head, int(time.time())),
+                ).lastrowid
+                seen.add(file_id)
+                offset = 0
+            else:
+                file_id = row["file_id"]
+                seen.add(file_id)
+                offset = int(row["offset"])
+                stored_head = bytes(row["head"])
+                if st.st_size < offset or not head.startswith(stored_head):
+                    # Truncated in place or the inode was recycled for a new log.
+                    self._conn.execute(
+                        "DELETE FROM log_entries WHERE file_id = ?", (file_id,)
+                    )
+                    offset = 0
+                if st.st_size == offset and row["path"] == path:
+                    return 0
+
+            handle.seek(offset)
+            data = handle.read(_READ_CHUNK_BYTES)
+
+        # Only consume complete lines; a partial trailing line is picked up next pass.
+        end = data.rfind(b"\n") + 1
+        lines = data[:end].split(b"\n")[:-1]
+        if end == 0 and len(data) == _READ_CHUNK_BYTES:
+            # One line fills the whole read: keep its start and skip the rest,
+            # which no longer parses as a record when the next pass reaches it.
+            lines, end = [data], len(data)
+        batch = []
+        position = offset
+        for raw in lines:
+            parsed = parse_log_line(
+                raw[:_MAX_LINE_BYTES].decode("utf-8", errors="replace").rstrip("\r")
+            )
+            if parsed is not None:
+                batch.append(
+                    (
+                        file_id,
+                        position,
+                        parsed["timestamp"],
+                        parsed["level"],
+                        parsed["logger"],
+                        parsed["event"],
+                        parsed["request_id"],
+                        parsed["session_id"],
+                        parsed["message"],
+                    )
+                )
+            position += len(raw) + 1
+
+        if batch:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO log_entries (file_id, byte_offset, ts, level, logger, "
+                "event, request_id, session_id, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+        self._conn.execute(
+            "UPDATE log_files SET path = ?, head = ?, offset = ?, size = ?, "
+            "entries = (SELECT COUNT(*) FROM log_entries WHERE file_id = ?), indexed_at = ? "
+            "WHERE file_id = ?",
+            (path, head, offset + end, st.st_size, file_id, int(time.time()), file_id),
+        )
+        self._conn.commit()
+        return len(batch)
+
+    # ── queries ────────────────────────────────────────────────────────
+
+    def query(
+        self,
+        *,
+        level: str | Iterable[str] | None = None,
+        logger: str | None = None,
+        event: str | None = None,
+        request_id: str | None = None,
+        session_id: str | None = None,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        contains: str | None = None,
+        paths: Iterable[str] | None = None,
+        limit: int | None = 1000,
+        newest_first: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Return indexed entries matching every given filter.
+
+        ``logger`` matches the logger name or any of its children
+        (``penguin.llm`` matches ``penguin.llm.adapters.openai``); ``paths``
+        restricts results to entries read from those files.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if level is not None:
+            levels = [level] if isinstance(level, str) else list(level)
+            clauses.append(f"level IN ({', '.join('?' for _ in levels)})")
+            params.extend(levels)
+        if logger is not None:
+            clauses.append("(logger = ? OR logger LIKE ?)")
+            params.extend([logger, f"{logger}.%"])
+        if event is not None:
+            clauses.append("event = ?")
+            params.append(event)
+        if request_id is not None:
+            clauses.append("request_id = ?")
+            params.append(request_id)
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(_format_bound(since))
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(_format_bound(until))
+        if contains:
+            clauses.append("instr(message, ?) > 0")
+            params.append(contains)
+        if paths is not None:
+            paths = list(paths)
+            clauses.append(
+                "file_id IN (SELECT file_id FROM log_files WHERE path IN "
+                f"({', '.join('?' for _ in paths) or 'NULL'}))"
+            )
+            params.extend(paths)
+
+        sql = (
+            "SELECT ts AS timestamp, level, logger, event, request_id, session_id, message "
+            "FROM log_entries"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY ts {'DESC' if newest_first else 'ASC'}, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
+
+    def status(self) -> dict[str, Any]:
+        """Return per-file index state and totals."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, offset, size, entries, indexed_at FROM log_files ORDER BY path"
+            ).fetchall()
+        files = [dict(r) for r in rows]
+        return {
+            "files": files,
+            "file_count": len(files),
+            "entry_count": sum(f["entries"] for f in files),
+        }
+
+    def clear(self) -> None:
+        """Drop every indexed file and entry; the next refresh re-reads from scratch."""
+        with self._lock:
+            self._conn.execute("DELETE FROM log_entries")
+            self._conn.execute("DELETE FROM log_files")
+            self._conn.commit()
+            self._last_refresh = 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -3091,6 +3091,11 @@ class Engine:
                 if hasattr(cm, "core") and cm.core
                 else None
             ),
+            emit_action_output=(
+                (lambda payload: cm.core.emit_ui_event("action_output", payload))
+                if hasattr(cm, "core") and cm.core
+                else None
+            ),
             emit_tool_timeline=lambda action_result: self._emit_tool_event(
                 cm, action_result
             ),
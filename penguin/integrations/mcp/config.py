@@ -31,6 +31,8 @@ class MCPServerConfig:
     enabled_tools: set[str] | None = None
     disabled_tools: set[str] = field(default_factory=set)
     output_token_limit: int | None = None
+    circuit_failure_threshold: int = 3
+    circuit_reset_sec: float = 30.0
 
     @classmethod
     def from_mapping(cls, name: str, data: Mapping[str, Any]) -> MCPServerConfig:
@@ -100,6 +102,15 @@ class MCPServerConfig:
                 or data.get("max_output_chars")
                 or data.get("maxOutputChars")
             ),
+            circuit_failure_threshold=int(
+                data.get(
+                    "circuit_failure_threshold",
+                    data.get("circuitFailureThreshold", 3),
+                )
+            ),
+            circuit_reset_sec=float(
+                data.get("circuit_reset_sec", data.get("circuitResetSec", 30.0))
+            ),
         )
 
     @property
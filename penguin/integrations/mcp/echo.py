@@ -1,4 +1,7 @@
-from mcp import FastMCP # type: ignore
+try:
+    from mcp.server.fastmcp import FastMCP  # type: ignore
+except ImportError:  # older SDKs exported it at the top level
+    from mcp import FastMCP  # type: ignore
 
 # Create an MCP server instance for the Echo service
 echo_mcp = FastMCP("Echo")
@@ -40,10 +43,16 @@ def echo_prompt(message: str) -> str:
     return f"Please process this message: {message}"
 
 
-def start_server(host: str = "localhost", port: int = 8000):
+def start_server(host: str = "localhost", port: int = 8000, transport: str = "sse"):
     """Start the Echo MCP server"""
+    if transport == "stdio":
+        # stdout carries the protocol; nothing else may be printed
+        echo_mcp.run(transport="stdio")
+        return
     print(f"Starting Echo MCP server on {host}:{port}")
-    echo_mcp.run(host=host, port=port)
+    echo_mcp.settings.host = host
+    echo_mcp.settings.port = port
+    echo_mcp.run(transport=transport)
 
 
 if __name__ == "__main__":
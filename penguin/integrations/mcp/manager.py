@@ -1,4 +1,11 @@
-"""MCP client manager for consuming external MCP servers as Penguin tools."""
+"""MCP client manager for consuming external MCP servers as Penguin tools.
+
+Each configured server gets its own connection actor: a task on the manager's
+event loop that opens, uses and closes that server's transport, so a slow or
+hung server only delays work addressed to it. Servers are discovered
+concurrently, reconnect lazily on the next call after a failure, and are
+skipped by a per-server circuit breaker after repeated failures.
+"""
 
 from __future__ import annotations
 
@@ -11,7 +18,7 @@ from concurrent.futures import Future
 from contextlib import AsyncExitStack
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 if TYPE_CHECKING:
     from penguin.integrations.mcp.config import MCPServerConfig
@@ -68,6 +75,38 @@ class MCPToolDefinition:
         }
 
 
+@dataclass
+class MCPServerMetrics:
+    """Connection and call metrics for one MCP server."""
+
+    connect_attempts: int = 0
+    connect_failures: int = 0
+    last_connect_ms: float | None = None
+    calls: int = 0
+    call_errors: int = 0
+    call_timeouts: int = 0
+    total_call_ms: float = 0.0
+    last_call_ms: float | None = None
+    circuit_opens: int = 0
+    rejected_calls: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "connect_attempts": self.connect_attempts,
+            "connect_failures": self.connect_failures,
+            "last_connect_ms": self.last_connect_ms,
+            "calls": self.calls,
+            "call_errors": self.call_errors,
+            "call_timeouts": self.call_timeouts,
+            "avg_call_ms": (
+                round(self.total_call_ms / self.calls, 3) if self.calls else None
+            ),
+            "last_call_ms": self.last_call_ms,
+            "circuit_opens": self.circuit_opens,
+            "rejected_calls": self.rejected_calls,
+        }
+
+
 @dataclass
 class MCPServerState:
     """Runtime state for one MCP server connection."""
@@ -80,6 +119,75 @@ class MCPServerState:
     stack: AsyncExitStack | None = None
     list_changed: bool = False
     last_changed_at: float | None = None
+    consecutive_failures: int = 0
+    circuit_open_until: float | None = None
+    metrics: MCPServerMetrics = field(default_factory=MCPServerMetrics)
+
+    def circuit_state(self, now: float | None = None) -> str:
+        """Return ``closed``, ``open`` or ``half_open``."""
+        if self.circuit_open_until is None:
+            return "closed"
+        now = time.monotonic() if now is None else now
+        return "open" if now < self.circuit_open_until else "half_open"
+
+
+class _ServerActor:
+    """Run one server's session operations in order on a dedicated task.
+
+    The MCP SDK transports use AnyIO cancel scopes that must close in the
+    same task that opened them, so every open/close for a server goes through
+    its actor. Actors for different servers run independently.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._queue: asyncio.Queue[tuple[Any, asyncio.Future[Any]]] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(
+                self._serve(self._queue),
+                name=f"penguin-mcp-actor-{self.name}",
+            )
+        assert self._queue is not None
+        future: asyncio.Future[Any] = loop.create_future()
+        self._queue.put_nowait((operation, future))
+        return await future
+
+    async def stop(self) -> None:
+        if self._task is None or self._task.done() or self._queue is None:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            return
+        future: asyncio.Future[Any] = self._loop.create_future()
+        self._queue.put_nowait((None, future))
+        await future
+        self._task = None
+
+    @staticmethod
+    async def _serve(queue: asyncio.Queue[tuple[Any, asyncio.Future[Any]]]) -> None:
+        while True:
+            operation, future = await queue.get()
+            if operation is None:
+                future.set_result(None)
+                return
+            try:
+                result = await operation()
+            except asyncio.CancelledError as exc:
+                if not future.done():
+                    future.set_exception(exc)
+                raise
+            except BaseException as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
 
 
 class MCPClientManager:
@@ -89,11 +197,11 @@ class MCPClientManager:
         self._states = {
             server.name: MCPServerState(config=server) for server in servers
         }
+        self._actors = {name: _ServerActor(name) for name in self._states}
         self._tool_index: dict[str, MCPToolDefinition] = {}
         self._discovered = False
         self._loop: asyncio.AbstractEventLoop | None = None
         self._loop_thread: threading.Thread | None = None
-        self._actor_queue: asyncio.Queue[tuple[Any, Future[Any]]] | None = None
 
     @property
     def available(self) -> bool:
@@ -102,6 +210,7 @@ class MCPClientManager:
 
     def status(self) -> dict[str, Any]:
         """Return serializable MCP manager status."""
+        now = time.monotonic()
         return {
             "available": self.available,
             "discovered": self._discovered,
@@ -119,6 +228,16 @@ class MCPClientManager:
                     "list_changed": state.list_changed,
                     "last_changed_at": state.last_changed_at,
                     "output_token_limit": state.config.output_token_limit,
+                    "circuit": {
+                        "state": state.circuit_state(now),
+                        "consecutive_failures": state.consecutive_failures,
+                        "retry_in_sec": (
+                            round(max(0.0, state.circuit_open_until - now), 3)
+                            if state.circuit_open_until is not None
+                            else None
+                        ),
+                    },
+                    "metrics": state.metrics.to_dict(),
                 }
                 for name, state in self._states.items()
             },
@@ -147,11 +266,15 @@ class MCPClientManager:
         """Close all MCP sessions synchronously."""
         self._run_async(self.close())
         status = self.status()
-        self._stop_actor()
+        self._stop_loop()
         return status
 
     async def discover(self) -> list[MCPToolDefinition]:
-        """Connect to configured servers and discover tools."""
+        """Connect to configured servers concurrently and discover tools.
+
+        Tool names are assigned in configuration order once every server has
+        answered or timed out, so collisions resolve deterministically.
+        """
         if self._discovered:
             return list(self._tool_index.values())
         if not HAS_MCP_SDK:
@@ -164,9 +287,14 @@ class MCPClientManager:
             self._discovered = True
             return []
 
+        states = list(self._states.values())
+        listings = await asyncio.gather(
+            *(self._fetch_tools(state) for state in states)
+        )
         existing: set[str] = set()
-        for state in self._states.values():
-            await self._connect_and_list_tools(state, existing)
+        for state, raw_tools in zip(states, listings):
+            if raw_tools is not None:
+                self._register_tools(state, raw_tools, existing)
         self._discovered = True
         return list(self._tool_index.values())
 
@@ -188,59 +316,146 @@ class MCPClientManager:
         state = self._states.get(server_name)
         if state is None:
             raise ValueError(f"Unknown MCP server: {server_name}")
-        if state.stack is not None:
-            await state.stack.aclose()
+        await self._actors[server_name].run(lambda: self._drop_session(state))
         self._clear_server_tools(state)
-        state.stack = None
-        state.session = None
         state.error = None
         state.status = MCPServerStatus.DISCONNECTED
-        existing = set(self._tool_index)
-        await self._connect_and_list_tools(state, existing)
+        # An explicit reconnect bypasses the circuit breaker
+        state.consecutive_failures = 0
+        state.circuit_open_until = None
+        await self._connect_server(state)
         self._discovered = True
 
     async def call_tool(self, public_name: str, arguments: dict[str, Any]) -> Any:
         """Call a discovered MCP tool by Penguin public name."""
         if public_name not in self._tool_index:
             await self.discover()
+        if public_name not in self._tool_index:
+            # Tools of servers that were down at discovery appear once they
+            # reconnect
+            await self._reconnect_unavailable()
         tool = self._tool_index.get(public_name)
         if tool is None:
             raise ValueError(f"Unknown MCP tool: {public_name}")
 
         state = self._states[tool.server_name]
+        if not self._circuit_allows(state):
+            state.metrics.rejected_calls += 1
+            raise RuntimeError(
+                f"MCP server '{tool.server_name}' is unavailable after "
+                f"{state.consecutive_failures} consecutive failures: {state.error}"
+            )
         if state.session is None or state.status != MCPServerStatus.CONNECTED:
-            self._clear_server_tools(state)
-            await self._connect_and_list_tools(state, set(self._tool_index))
+            # Tool definitions stay until a reconnect replaces them, so later
+            # calls still reach the circuit breaker
+            if not await self._connect_server(state):
+                raise RuntimeError(
+                    f"MCP server '{tool.server_name}' could not reconnect: {state.error}"
+                )
             tool = self._tool_index.get(public_name)
             if tool is None:
                 raise ValueError(f"Unknown MCP tool after reconnect: {public_name}")
-        if state.session is None:
+        session = state.session
+        if session is None:
             raise RuntimeError(f"MCP server '{tool.server_name}' is not connected")
 
-        timeout = state.config.tool_timeout_sec
-        result = await asyncio.wait_for(
-            state.session.call_tool(tool.raw_name, arguments or {}),
-            timeout=timeout,
-        )
+        metrics = state.metrics
+        metrics.calls += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                session.call_tool(tool.raw_name, arguments or {}),
+                timeout=state.config.tool_timeout_sec,
+            )
+        except Exception as exc:
+            metrics.call_errors += 1
+            if isinstance(exc, asyncio.TimeoutError):
+                metrics.call_timeouts += 1
+                exc = TimeoutError(
+                    f"MCP tool '{tool.raw_name}' on '{tool.server_name}' timed out "
+                    f"after {state.config.tool_timeout_sec}s"
+                )
+            self._record_failure(state, exc)
+            # Drop the session so the next call reconnects lazily
+            await self._actors[state.config.name].run(lambda: self._drop_session(state))
+            state.status = MCPServerStatus.FAILED
+            raise exc
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            metrics.total_call_ms += elapsed_ms
+            metrics.last_call_ms = round(elapsed_ms, 3)
+        self._record_success(state)
         return self._serialize_call_result(result, state.config.output_token_limit)
 
     async def close(self) -> None:
-        """Close cached MCP session handles from the actor task that opened them."""
-        for state in self._states.values():
-            if state.stack is not None:
-                try:
-                    await state.stack.aclose()
-                except Exception as exc:  # pragma: no cover - defensive cleanup
-                    logger.warning(
-                        "Failed closing MCP server '%s': %s",
-                        state.config.name,
-                        exc,
-                    )
-            state.stack = None
-            state.session = None
+        """Close cached MCP session handles from the actor tasks that opened them."""
+
+        async def close_one(state: MCPServerState) -> None:
+            await self._actors[state.config.name].run(lambda: self._drop_session(state))
             state.status = MCPServerStatus.DISCONNECTED
             state.list_changed = False
 
+        await asyncio.gather(*(close_one(state) for state in self._states.values()))
+        await self._stop_actors()
+
+    async def _drop_session(self, state: MCPServerState) -> None:
+        """Close one server's transport; runs on that server's actor."""
+        if state.stack is not None:
+            try:
+                await state.stack.aclose()
+            except Exception as exc:  # pragma: no cover - defensive cleanup
+                logger.warning(
+                    "Failed closing MCP server '%s': %s",
+                    state.config.name,
+                    exc,
+                )
+        state.stack = None
+        state.session = None
+
+    def _circuit_allows(self, state: MCPServerState) -> bool:
+        """Return whether a connection or call may be attempted now."""
+        return state.circuit_state() != "open"
+
+    def _record_success(self, state: MCPServerState) -> None:
+        state.consecutive_failures = 0
+        state.circuit_open_until = None
+
+    def _record_failure(self, state: MCPServerState, exc: BaseException) -> None:
+        state.error = str(exc) or type(exc).__name__
+        state.consecutive_failures += 1
+        threshold = state.config.circuit_failure_threshold
+        if threshold and state.consecutive_failures >= threshold:
+            # Half-open trials that fail re-open the circuit right away
+            state.circuit_open_until = (
+                time.monotonic() + state.config.circuit_reset_sec
+            )
+            state.metrics.circuit_opens += 1
+            logger.warning(
+                "MCP server '%s' circuit opened for %ss after %d failures",
+                state.config.name,
+                state.config.circuit_reset_sec,
+                state.consecutive_failures,
+            )
+
+    async def _reconnect_unavailable(self) -> None:
+        """Lazily retry servers that are down and not circuit-broken."""
+        pending = [
+            state
+            for state in self._states.values()
+            if state.status != MCPServerStatus.CONNECTED and self._circuit_allows(state)
+        ]
+        if pending:
+            await asyncio.gather(*(self._connect_server(state) for state in pending))
+
+    async def _connect_server(self, state: MCPServerState) -> bool:
+        """Connect one server and register its tools after the current index."""
+        raw_tools = await self._fetch_tools(state)
+        if raw_tools is None:
+            return False
+        self._clear_server_tools(state)
+        self._register_tools(state, raw_tools, set(self._tool_index))
+        return True
+
     def _clear_server_tools(self, state: MCPServerState) -> None:
         """Remove cached tool definitions for one server."""
         for public_name in list(state.tools):
@@ -250,54 +465,89 @@ class MCPClientManager:
                 self._tool_index.pop(public_name, None)
         state.tools.clear()
 
-    async def _connect_and_list_tools(
-        self,
-        state: MCPServerState,
-        existing: set[str],
-    ) -> None:
+    async def _fetch_tools(self, state: MCPServerState) -> list[Any] | None:
+        """Connect one server on its actor and return its raw tool list.
+
+        Failures are recorded on the server's state rather than raised so
+        one broken server never fails discovery for the others.
+        """
+        if not self._circuit_allows(state):
+            state.status = MCPServerStatus.FAILED
+            return None
         state.status = MCPServerStatus.CONNECTING
         state.error = None
+        metrics = state.metrics
+        metrics.connect_attempts += 1
+        started = time.perf_counter()
         try:
-            session = await self._ensure_session(state)
-            self._install_list_changed_handlers(state, session)
-            response = await asyncio.wait_for(
-                session.list_tools(),
-                timeout=state.config.startup_timeout_sec,
+            raw_tools = await self._actors[state.config.name].run(
+                lambda: self._open_and_list(state)
             )
-            for raw_tool in getattr(response, "tools", []) or []:
-                raw_name = str(getattr(raw_tool, "name", ""))
-                if not raw_name or not state.config.allows_tool(raw_name):
-                    continue
-                public_name = make_tool_name(state.config.name, raw_name, existing)
-                existing.add(public_name)
-                input_schema = getattr(raw_tool, "inputSchema", None) or getattr(
-                    raw_tool,
-                    "input_schema",
-                    None,
-                )
-                if not isinstance(input_schema, dict):
-                    input_schema = {"type": "object", "properties": {}}
-                description = str(getattr(raw_tool, "description", "") or "")
-                definition = MCPToolDefinition(
-                    public_name=public_name,
-                    server_name=state.config.name,
-                    raw_name=raw_name,
-                    description=(
-                        description or f"MCP tool {raw_name} from {state.config.name}"
-                    ),
-                    input_schema=input_schema,
-                )
-                state.tools[public_name] = definition
-                self._tool_index[public_name] = definition
-            state.status = MCPServerStatus.CONNECTED
         except Exception as exc:
+            metrics.connect_failures += 1
+            if isinstance(exc, asyncio.TimeoutError):
+                exc = TimeoutError(
+                    f"timed out after {state.config.startup_timeout_sec}s"
+                )
+            self._record_failure(state, exc)
             state.status = MCPServerStatus.FAILED
-            state.error = str(exc)
             logger.warning(
                 "MCP server '%s' discovery failed: %s",
                 state.config.name,
-                exc,
+                state.error,
             )
+            return None
+        finally:
+            metrics.last_connect_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._record_success(state)
+        state.status = MCPServerStatus.CONNECTED
+        return raw_tools
+
+    async def _open_and_list(self, state: MCPServerState) -> list[Any]:
+        """Open the session if needed and list tools; runs on the actor."""
+        try:
+            session = await self._ensure_session(state)
+            self._install_list_changed_handlers(state, session)
+            response = await asyncio.wait_for(
+                session.list_tools(),
+                timeout=state.config.startup_timeout_sec,
+            )
+        except BaseException:
+            await self._drop_session(state)
+            raise
+        return list(getattr(response, "tools", []) or [])
+
+    def _register_tools(
+        self,
+        state: MCPServerState,
+        raw_tools: list[Any],
+        existing: set[str],
+    ) -> None:
+        for raw_tool in raw_tools:
+            raw_name = str(getattr(raw_tool, "name", ""))
+            if not raw_name or not state.config.allows_tool(raw_name):
+                continue
+            public_name = make_tool_name(state.config.name, raw_name, existing)
+            existing.add(public_name)
+            input_schema = getattr(raw_tool, "inputSchema", None) or getattr(
+                raw_tool,
+                "input_schema",
+                None,
+            )
+            if not isinstance(input_schema, dict):
+                input_schema = {"type": "object", "properties": {}}
+            description = str(getattr(raw_tool, "description", "") or "")
+            definition = MCPToolDefinition(
+                public_name=public_name,
+                server_name=state.config.name,
+                raw_name=raw_name,
+                description=(
+                    description or f"MCP tool {raw_name} from {state.config.name}"
+                ),
+                input_schema=input_schema,
+            )
+            state.tools[public_name] = definition
+            self._tool_index[public_name] = definition
 
     def _install_list_changed_handlers(self, state: MCPServerState, session: Any) -> None:
         """Install best-effort MCP list-change notification handlers."""
@@ -322,9 +572,16 @@ class MCPClientManager:
                     )
 
     async def _ensure_session(self, state: MCPServerState) -> Any:
-        """Open or return a persistent MCP stdio session."""
+        """Open or return a persistent MCP session."""
         if state.session is not None:
             return state.session
+        stack, session = await self._open_session(state)
+        state.stack = stack
+        state.session = session
+        return session
+
+    async def _open_session(self, state: MCPServerState) -> tuple[AsyncExitStack, Any]:
+        """Open a transport and initialized client session for one server."""
         if not HAS_MCP_SDK:
             raise RuntimeError(
                 "MCP SDK is not installed. Install with `penguin-ai[mcp]`."
@@ -373,12 +630,10 @@ class MCPClientManager:
                 session.initialize(),
                 timeout=state.config.startup_timeout_sec,
             )
-        except Exception:
+        except BaseException:
             await stack.aclose()
             raise
-        state.stack = stack
-        state.session = session
-        return session
+        return stack, session
 
     @staticmethod
     def _cap_output(value: Any, output_limit: int | None) -> Any:
@@ -429,35 +684,26 @@ class MCPClientManager:
         return MCPClientManager._cap_output(serialized, output_limit)
 
     def _run_async(self, coro: Any) -> Any:
-        """Run manager coroutines on one actor task.
+        """Run a manager coroutine on the manager's event loop thread.
 
-        The MCP SDK stdio transport uses AnyIO cancel scopes that must close in
-        the same task that opened them. A single actor task preserves session
-        state and closes transports cleanly.
+        Session work inside the coroutine is routed to per-server actors on
+        that loop, so sync callers on any thread share the same sessions.
         """
-        loop, queue = self._ensure_actor()
-        future: Future[Any] = Future()
-        loop.call_soon_threadsafe(queue.put_nowait, (coro, future))
+        loop = self._ensure_loop()
+        future: Future[Any] = asyncio.run_coroutine_threadsafe(coro, loop)
         return future.result()
 
-    def _ensure_actor(
-        self,
-    ) -> tuple[asyncio.AbstractEventLoop, asyncio.Queue[tuple[Any, Future[Any]]]]:
-        if (
-            self._loop is not None
-            and self._loop.is_running()
-            and self._actor_queue is not None
-        ):
-            return self._loop, self._actor_queue
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None and self._loop.is_running():
+            return self._loop
 
         ready = threading.Event()
         loop = asyncio.new_event_loop()
 
         def run_loop() -> None:
             asyncio.set_event_loop(loop)
-            self._actor_queue = asyncio.Queue()
-            ready.set()
-            loop.run_until_complete(self._actor_worker())
+            loop.call_soon(ready.set)
+            loop.run_forever()
             loop.close()
 
         thread = threading.Thread(
@@ -466,46 +712,32 @@ class MCPClientManager:
             daemon=True,
         )
         thread.start()
-        ready.wait(timeout=5)
-        if self._actor_queue is None:
-            raise RuntimeError("MCP actor failed to start")
+        if not ready.wait(timeout=5):
+            raise RuntimeError("MCP client loop failed to start")
         self._loop = loop
         self._loop_thread = thread
-        return loop, self._actor_queue
+        return loop
 
-    async def _actor_worker(self) -> None:
-        assert self._actor_queue is not None
-        while True:
-            coro, future = await self._actor_queue.get()
-            if coro is None:
-                future.set_result(None)
-                return
-            try:
-                result = await coro
-            except BaseException as exc:  # pragma: no cover - re-raised by caller
-                future.set_exception(exc)
-            else:
-                future.set_result(result)
+    async def _stop_actors(self) -> None:
+        await asyncio.gather(*(actor.stop() for actor in self._actors.values()))
 
-    def _stop_actor(self) -> None:
-        if self._loop is None or self._actor_queue is None:
+    def _stop_loop(self) -> None:
+        if self._loop is None:
             return
-        future: Future[Any] = Future()
-        self._loop.call_soon_threadsafe(
-            self._actor_queue.put_nowait,
-            (None, future),
+        asyncio.run_coroutine_threadsafe(self._stop_actors(), self._loop).result(
+            timeout=5
         )
-        future.result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
         if self._loop_thread is not None:
             self._loop_thread.join(timeout=5)
         self._loop = None
         self._loop_thread = None
-        self._actor_queue = None
 
 
 __all__ = [
     "HAS_MCP_SDK",
     "MCPClientManager",
+    "MCPServerMetrics",
     "MCPServerStatus",
     "MCPToolDefinition",
 ]
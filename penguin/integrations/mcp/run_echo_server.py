@@ -1,15 +1,15 @@
 import argparse
-from penguin.penguin.integrations.mcp.echo import start_server
+from penguin.integrations.mcp.echo import start_server
 
 def main():
     parser = argparse.ArgumentParser(description='Run the Echo MCP server')
     parser.add_argument('--host', default='localhost', help='Host to bind to')
     parser.add_argument('--port', type=int, default=8000, help='Port to run on')
+    parser.add_argument('--transport', default='sse', choices=['sse', 'streamable-http', 'stdio'], help='Transport to serve')
     
     args = parser.parse_args()
     
-    print(f"Starting Echo MCP server on {args.host}:{args.port}")
-    start_server(host=args.host, port=args.port)
+    start_server(host=args.host, port=args.port, transport=args.transport)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import inspect
 import json
 import logging
@@ -22,6 +21,7 @@ from ..contracts import (
     LLMUsage,
     ProviderRequestStatus,
 )
+from ..image_cache import get_image_cache, image_part_path
 from ..model_config import ModelConfig
 from ..provider_transform import build_llm_error, normalize_finish_reason
 from ..reasoning_variants import anthropic_reasoning_efforts
@@ -280,6 +280,7 @@ class AnthropicAdapter(BaseAdapter):
         if max_output_tokens is None and legacy_max_tokens is not None:
             max_output_tokens = legacy_max_tokens
 
+        await self._prewarm_image_cache(messages)
         formatted_messages = self.format_messages(messages)
         system_message = None
         for msg in messages:
@@ -443,6 +444,7 @@ class AnthropicAdapter(BaseAdapter):
         """Create a message using Anthropic's API directly"""
         try:
             # Format messages for Anthropic
+            await self._prewarm_image_cache(messages)
             formatted_messages = self.format_messages(messages)
 
             # Prepare request parameters
@@ -540,6 +542,7 @@ class AnthropicAdapter(BaseAdapter):
                 max_output_tokens = legacy_max_tokens
 
             # Format messages for Anthropic
+            await self._prewarm_image_cache(messages)
             formatted_messages = self.format_messages(messages)
 
             # Extract system message if present
@@ -1272,6 +1275,39 @@ class AnthropicAdapter(BaseAdapter):
             if isinstance(part, dict) and part.get("type") == "tool_use"
         }
 
+    def _local_image_block(self, image_path: str) -> Dict[str, Any]:
+        """Build an Anthropic base64 image block from the shared image cache."""
+        encoded = get_image_cache().encode_path(image_path, output_format=None)
+        if encoded is None:
+            raise FileNotFoundError(image_path)
+        return {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": encoded.media_type,
+                "data": encoded.data,
+            },
+        }
+
+    async def _prewarm_image_cache(self, messages: List[Dict[str, Any]]) -> None:
+        """Encode local images in the worker pool so format_messages only hits cache."""
+        cache = get_image_cache()
+        paths = set()
+        for message in messages:
+            content = message.get("content")
+            if not isinstance(content, list):
+                continue
+            for part in content:
+                if isinstance(part, dict) and part.get("type") in ["image_url", "image"]:
+                    path = image_part_path(part)
+                    if path and os.path.exists(path):
+                        paths.add(path)
+        for path in paths:
+            try:
+                await cache.aencode_path(path, output_format=None)
+            except Exception as e:
+                self.logger.debug(f"Image prewarm failed for {path}: {e}")
+
     def format_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Format messages for Anthropic API, properly handling images"""
         formatted_messages = []
@@ -1393,133 +1429,22 @@ class AnthropicAdapter(BaseAdapter):
                                         }
                                     )
                                 elif image_path and os.path.exists(image_path):
-                                    # For local files, read and encode as base64
-                                    from PIL import Image  # type: ignore
-                                    import io
-
-                                    # Open and process the image
-                                    with Image.open(image_path) as img:
-                                        # Resize if needed
-                                        max_size = (1024, 1024)
-                                        resampling_namespace = getattr(
-                                            Image, "Resampling", Image
-                                        )
-                                        img.thumbnail(
-                                            max_size,
-                                            getattr(
-                                                Image,
-                                                "LANCZOS",
-                                                getattr(
-                                                    resampling_namespace, "LANCZOS"
-                                                ),
-                                            ),
-                                        )
-
-                                        # Convert to RGB if necessary
-                                        if img.mode != "RGB":
-                                            img = img.convert("RGB")
-
-                                        # Determine media type based on file extension
-                                        ext = os.path.splitext(image_path)[1].lower()
-                                        media_type = {
-                                            ".jpg": "image/jpeg",
-                                            ".jpeg": "image/jpeg",
-                                            ".png": "image/png",
-                                            ".gif": "image/gif",
-                                            ".webp": "image/webp",
-                                        }.get(ext, "image/jpeg")
-
-                                        # Encode to base64
-                                        buffer = io.BytesIO()
-                                        img.save(
-                                            buffer,
-                                            format=media_type.split("/")[1].upper(),
-                                        )
-                                        base64_data = base64.b64encode(
-                                            buffer.getvalue()
-                                        ).decode("utf-8")
-
-                                        # Format for Anthropic API using base64
-                                        formatted_content.append(
-                                            {
-                                                "type": "image",
-                                                "source": {
-                                                    "type": "base64",
-                                                    "media_type": media_type,
-                                                    "data": base64_data,
-                                                },
-                                            }
-                                        )
+                                    # For local files, use the cached base64 encoding
+                                    formatted_content.append(
+                                        self._local_image_block(image_path)
+                                    )
                                 elif image_url:
                                     # For other URLs (like file:// or unsupported), try to load and convert to base64
                                     try:
-                                        from PIL import Image  # type: ignore
-                                        import io
-
-                                        # Import base64 again in this scope to avoid the variable shadowing issue
-                                        import base64 as image_base64
-
                                         # Try to open as local file by removing file:// prefix if present
                                         local_path = image_url
                                         if image_url.startswith("file://"):
                                             local_path = image_url[7:]
 
                                         if os.path.exists(local_path):
-                                            with Image.open(local_path) as img:
-                                                # Same processing as above
-                                                max_size = (1024, 1024)
-                                                resampling_namespace = getattr(
-                                                    Image, "Resampling", Image
-                                                )
-                                                img.thumbnail(
-                                                    max_size,
-                                                    getattr(
-                                                        Image,
-                                                        "LANCZOS",
-                                                        getattr(
-                                                            resampling_namespace,
-                                                            "LANCZOS",
-                                                        ),
-                                                    ),
-                                                )
-                                                if img.mode != "RGB":
-                                                    img = img.convert("RGB")
-
-                                                # Determine media type
-                                                ext = os.path.splitext(local_path)[
-                                                    1
-                                                ].lower()
-                                                media_type = {
-                                                    ".jpg": "image/jpeg",
-                                                    ".jpeg": "image/jpeg",
-                                                    ".png": "image/png",
-                                                    ".gif": "image/gif",
-                                                    ".webp": "image/webp",
-                                                }.get(ext, "image/jpeg")
-
-                                                # Encode to base64 using the renamed import
-                                                buffer = io.BytesIO()
-                                                img.save(
-                                                    buffer,
-                                                    format=media_type.split("/")[
-                                                        1
-                                                    ].upper(),
-                                                )
-                                                base64_data = image_base64.b64encode(
-                                                    buffer.getvalue()
-                                                ).decode("utf-8")
-
-                                                # Format for Anthropic API using base64
-                                                formatted_content.append(
-                                                    {
-                                                        "type": "image",
-                                                        "source": {
-                                                            "type": "base64",
-                                                            "media_type": media_type,
-                                                            "data": base64_data,
-                                                        },
-                                                    }
-                                                )
+                                            formatted_content.append(
+                                                self._local_image_block(local_path)
+                                            )
                                         else:
                                             self.logger.error(
                                                 f"Image not found at path: {local_path}"
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import base64
-import io
 import json
 import logging
 import os
@@ -36,6 +34,7 @@ from ..contracts import (
     ProviderRequestStatus,
     stable_payload_hash,
 )
+from ..image_cache import get_image_cache
 from ..model_config import ModelConfig, normalize_openai_service_tier
 from ..provider_transform import (
     build_llm_error,
@@ -67,7 +66,8 @@ def _log_error(message: str, *args: Any, exc_info: bool = False) -> None:
         uvicorn_logger.error(message, *args, exc_info=exc_info)
 
 
-_OPENAI_CODEX_RESPONSES_URL = "https://chatgpt.com/backend-api/codex/responses"
+_OPENAI_CODEX_BASE_URL = "https://chatgpt.com/backend-api"
+_OPENAI_CODEX_RESPONSES_URL = f"{_OPENAI_CODEX_BASE_URL}/codex/responses"
 _OPENAI_OAUTH_REFRESH_BUFFER_MS = 5 * 60 * 1000
 _OPENAI_CODEX_TRACE_HEADER_KEYS = (
     "x-request-id",
@@ -1149,6 +1149,15 @@ class OpenAIAdapter(BaseAdapter):
 
         return httpx.Timeout(connect=30.0, read=None, write=60.0, pool=30.0)
 
+    def _codex_http_client(self):
+        """Shared keep-alive client for the Codex backend (see ConnectionPoolManager)."""
+
+        return ConnectionPoolManager.get_instance().client_context(
+            _OPENAI_CODEX_BASE_URL,
+            auth_mode="codex_oauth",
+            timeout=self._codex_http_timeout(),
+        )
+
     def _codex_payload_hash(self, payload: Dict[str, Any]) -> str:
         return stable_payload_hash(payload)
 
@@ -1677,7 +1686,7 @@ class OpenAIAdapter(BaseAdapter):
             )
         self._update_request_lifecycle(status=ProviderRequestStatus.RUNNING)
         try:
-            async with httpx.AsyncClient(timeout=self._codex_http_timeout()) as client:
+            async with self._codex_http_client() as client:
                 response = await client.post(
                     _OPENAI_CODEX_RESPONSES_URL,
                     headers=headers,
@@ -1834,7 +1843,7 @@ class OpenAIAdapter(BaseAdapter):
         )
         self._update_request_lifecycle(status=ProviderRequestStatus.RUNNING)
         try:
-            async with httpx.AsyncClient(timeout=self._codex_http_timeout()) as client:
+            async with self._codex_http_client() as client:
                 async with client.stream(
                     "POST",
                     _OPENAI_CODEX_RESPONSES_URL,
@@ -2549,24 +2558,8 @@ class OpenAIAdapter(BaseAdapter):
     async def _encode_image(self, image_path: str) -> Optional[str]:
         """Encode an image file to a base64 data URI suitable for OpenAI."""
         try:
-            from PIL import Image as PILImage  # type: ignore
-
-            with PILImage.open(image_path) as img:
-                max_size = (1024, 1024)
-                resampling_namespace = getattr(PILImage, "Resampling", PILImage)
-                resample_filter = getattr(
-                    PILImage,
-                    "LANCZOS",
-                    getattr(resampling_namespace, "LANCZOS"),
-                )
-                img.thumbnail(max_size, resample_filter)
-                if img.mode != "RGB":
-                    img = img.convert("RGB")
-                buffer = io.BytesIO()
-                img.save(buffer, format="JPEG")
-                image_bytes = buffer.getvalue()
-            b64 = base64.b64encode(image_bytes).decode("utf-8")
-            return f"data:image/jpeg;base64,{b64}"
+            encoded = await get_image_cache().aencode_path(image_path)
+            return encoded.data_uri if encoded else None
         except Exception as e:
             logger.error(f"Failed to encode image '{image_path}': {e}")
             return None
@@ -6,12 +6,6 @@ import math
 import time
 from typing import List, Dict, Optional, Any, Union, Callable, AsyncIterator, NoReturn
 
-# --- Added Imports for Vision Handling ---
-import base64
-import io
-from PIL import Image as PILImage  # Use alias for PIL Image # type: ignore
-# --- End Added Imports ---
-
 import httpx  # type: ignore
 import tiktoken  # type: ignore
 from openai import AsyncOpenAI, APIError  # type: ignore
@@ -34,6 +28,7 @@ from penguin.llm.provider_transform import (
     normalize_finish_reason,
 )
 
+from ..image_cache import get_image_cache
 from ..model_config import ModelConfig
 
 logger = logging.getLogger(__name__)
@@ -1082,23 +1077,11 @@ class OpenRouterGateway:
             return None
         try:
             logger.debug(f"Encoding image from path: {image_path}")
-            with PILImage.open(image_path) as img:
-                max_size = (1024, 1024)  # Configurable?
-                resampling_namespace = getattr(PILImage, "Resampling", PILImage)
-                img.thumbnail(
-                    max_size,
-                    getattr(
-                        PILImage, "LANCZOS", getattr(resampling_namespace, "LANCZOS")
-                    ),
-                )
-                if img.mode != "RGB":
-                    img = img.convert("RGB")
-                buffer = io.BytesIO()
-                img.save(buffer, format="JPEG")  # Use JPEG for efficiency
-                image_bytes = buffer.getvalue()
-
-            base64_image = base64.b64encode(image_bytes).decode("utf-8")
-            data_uri = f"data:image/jpeg;base64,{base64_image}"
+            encoded = await get_image_cache().aencode_path(image_path)
+            if encoded is None:
+                self.logger.error(f"Image file not found during encoding: {image_path}")
+                return None
+            data_uri = encoded.data_uri
             self.logger.debug(f"Encoded image to data URI (length: {len(data_uri)})")
             return data_uri
         except FileNotFoundError:
@@ -1160,17 +1143,9 @@ class OpenRouterGateway:
         """
         try:
             # Import here to avoid circular imports
-            from penguin.utils.parser import ActionType
-            import re
+            from penguin.utils.parser import contains_action_tags
 
-            # Generate pattern from ActionType enum (exactly like parser.py does)
-            action_tag_pattern = "|".join(
-                [action_type.value for action_type in ActionType]
-            )
-            # Use same regex pattern as parser: full tag pairs only, case-insensitive but strict
-            action_tag_regex = f"<({action_tag_pattern})>.*?</\\1>"
-
-            return bool(re.search(action_tag_regex, content, re.DOTALL | re.IGNORECASE))
+            return contains_action_tags(content)
         except ImportError:
             # Fallback to basic check if import fails
             return any(
@@ -1178,6 +1153,17 @@ class OpenRouterGateway:
                 for tag in ["execute", "search", "memory_search"]
             )
 
+    def _new_action_stream_parser(self) -> Optional[Any]:
+        """Return an incremental ActionXML parser when interrupt_on_action is on."""
+        if not getattr(self.model_config, "interrupt_on_action", False):
+            return None
+        try:
+            from penguin.utils.parser import ActionStreamParser
+
+            return ActionStreamParser()
+        except ImportError:
+            return None
+
     def _clean_conversation_format(
         self, messages: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
@@ -1535,6 +1521,7 @@ class OpenRouterGateway:
                 # Separate accumulators for reasoning and content
                 _gateway_accumulated_reasoning = ""
                 _gateway_accumulated_content = ""
+                action_stream = self._new_action_stream_parser()
                 reasoning_phase_complete = False
                 # Track finish_reason for error and truncation detection
                 sdk_last_finish_reason: Optional[str] = None
@@ -1778,10 +1765,11 @@ class OpenRouterGateway:
 
                         # Interrupt streaming when a complete Penguin action tag is detected
                         try:
-                            if getattr(self.model_config, "interrupt_on_action", False):
-                                if self._contains_penguin_action_tags(
-                                    full_response_content
-                                ):
+                            if action_stream is not None and new_content_segment:
+                                _, completed_actions = action_stream.feed(
+                                    new_content_segment
+                                )
+                                if completed_actions:
                                     self.logger.info(
                                         "[OpenRouterGateway] Interrupting stream on detected Penguin action tag (SDK path)"
                                     )
@@ -2210,6 +2198,7 @@ class OpenRouterGateway:
 
         full_content = ""
         full_reasoning = ""
+        action_stream = self._new_action_stream_parser()
         reasoning_phase_complete = False
         last_finish_reason: Optional[str] = None
         stream_error: Optional[Dict[str, Any]] = None
@@ -2386,10 +2375,11 @@ class OpenRouterGateway:
                                     )
                             # Interrupt streaming when a complete Penguin action tag is detected
                             try:
-                                if getattr(
-                                    self.model_config, "interrupt_on_action", False
-                                ):
-                                    if self._contains_penguin_action_tags(full_content):
+                                if action_stream is not None:
+                                    _, completed_actions = action_stream.feed(
+                                        content_delta
+                                    )
+                                    if completed_actions:
                                         self.logger.info(
                                             "[OpenRouterGateway] Interrupting stream on detected Penguin action tag (Direct API path)"
                                         )
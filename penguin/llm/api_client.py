@@ -3,7 +3,9 @@ import base64
 import io
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar
 from typing import Any, Dict, List, Optional, Callable, Union
 
 import httpx
@@ -57,7 +59,7 @@ def _log_error(message: str, *args: Any, exc_info: bool = False) -> None:
 
 # TODO: review max_keepalive_connections and max_connections defaults based on expected concurrency and provider limits.
 # These seem like magic numbers and might need tuning based on real-world usage patterns and provider guidelines.
-# Much less configurable than the old connection pool, but also much simpler. We can always add more config options later if needed.
+# Keepalive/limit knobs can be overridden per process via ConnectionPoolConfig.from_env().
 class ConnectionPoolConfig:
     """Configuration for HTTP connection pools."""
 
@@ -69,6 +71,7 @@ class ConnectionPoolConfig:
         connect_timeout: float = 10.0,
         read_timeout: Optional[float] = None,
         write_timeout: float = 10.0,
+        http2: Optional[bool] = None,
     ):
         self.max_keepalive_connections = max_keepalive_connections
         self.max_connections = max_connections
@@ -76,6 +79,39 @@ class ConnectionPoolConfig:
         self.connect_timeout = connect_timeout
         self.read_timeout = read_timeout
         self.write_timeout = write_timeout
+        # None means "use HTTP/2 when the optional h2 package is installed".
+        self.http2 = http2
+
+    @classmethod
+    def from_env(cls) -> "ConnectionPoolConfig":
+        """Build a config from ``PENGUIN_HTTP_*`` environment overrides."""
+
+        def _number(name: str, default: float, cast: Callable[[str], Any]) -> Any:
+            raw = os.getenv(name)
+            if raw is None or not raw.strip():
+                return default
+            try:
+                return cast(raw)
+            except ValueError:
+                logger.warning("Ignoring invalid %s=%r", name, raw)
+                return default
+
+        http2_raw = os.getenv("PENGUIN_HTTP2")
+        http2: Optional[bool] = None
+        if http2_raw is not None and http2_raw.strip():
+            http2 = http2_raw.strip().lower() in {"1", "true", "yes", "on"}
+        return cls(
+            max_keepalive_connections=_number("PENGUIN_HTTP_MAX_KEEPALIVE", 20, int),
+            max_connections=_number("PENGUIN_HTTP_MAX_CONNECTIONS", 100, int),
+            keepalive_expiry=_number("PENGUIN_HTTP_KEEPALIVE_EXPIRY", 30.0, float),
+            http2=http2,
+        )
+
+    @property
+    def use_http2(self) -> bool:
+        if self.http2 is not None:
+            return self.http2 and _h2_available()
+        return _h2_available()
 
     def to_limits(self) -> httpx.Limits:
         return httpx.Limits(
@@ -93,11 +129,65 @@ class ConnectionPoolConfig:
         )
 
 
+def _h2_available() -> bool:
+    try:
+        import h2  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _NoCookieJar(CookieJar):
+    """Cookie jar that never keeps cookies from responses.
+
+    Pooled clients are shared by every user, session and OAuth flow in the
+    process, so a persisted cookie would leak between them. Cookies passed
+    explicitly on a request are still sent.
+    """
+
+    def extract_cookies(self, response: Any, request: Any) -> None:
+        return None
+
+
+class _PooledClientInfo:
+    """Bookkeeping for one pooled client, surfaced through ``get_stats``."""
+
+    def __init__(
+        self,
+        base_url: str,
+        auth_mode: Optional[str],
+        http2: bool,
+        loop: Optional[asyncio.AbstractEventLoop],
+    ):
+        self.base_url = base_url
+        self.auth_mode = auth_mode
+        self.http2 = http2
+        self.loop = loop
+        self.created_at = time.time()
+        self.last_used_at: Optional[float] = None
+        self.requests = 0
+        self.responses = 0
+        self.errors = 0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        self.last_used_at = time.time()
+
+    async def on_response(self, response: httpx.Response) -> None:
+        self.responses += 1
+        if response.status_code >= 400:
+            self.errors += 1
+
+
 class ConnectionPoolManager:
-    """Manages shared HTTP connection pools per provider/base_url.
+    """Process-wide registry of shared HTTP clients.
 
-    Singleton pattern ensures connection reuse across all LLM clients.
-    This enables efficient parallel LLM calls by reusing connections.
+    One ``httpx.AsyncClient`` is kept per (base URL, auth mode) so adapters,
+    OAuth flows and discovery routes reuse warm TLS connections instead of
+    opening a fresh client per request. Clients are bound to the event loop
+    that created them and are transparently rebuilt if that loop has closed.
+    Pooled clients do not persist response cookies, since they are shared
+    across callers.
 
     Usage:
         # Get the global pool instance
@@ -110,6 +200,12 @@ class ConnectionPoolManager:
         async with pool.client_context("https://openrouter.ai/api/v1") as client:
             response = await client.post(url, json=payload)
 
+        # Separate pools for different credentials/timeouts on the same host
+        async with pool.client_context(
+            "https://chatgpt.com/backend-api", auth_mode="codex_oauth", timeout=t
+        ) as client:
+            ...
+
         # On shutdown, close all pools
         await pool.close_all()
     """
@@ -130,7 +226,7 @@ class ConnectionPoolManager:
             The global ConnectionPoolManager instance
         """
         if cls._instance is None:
-            cls._instance = cls(config or ConnectionPoolConfig())
+            cls._instance = cls(config or ConnectionPoolConfig.from_env())
         return cls._instance
 
     @classmethod
@@ -148,7 +244,7 @@ class ConnectionPoolManager:
         if cls._instance is None:
             async with cls._lock:
                 if cls._instance is None:
-                    cls._instance = cls(config or ConnectionPoolConfig())
+                    cls._instance = cls(config or ConnectionPoolConfig.from_env())
         return cls._instance
 
     def __init__(self, config: Optional[ConnectionPoolConfig] = None):
@@ -160,34 +256,79 @@ class ConnectionPoolManager:
         self._config = config or ConnectionPoolConfig()
         self._clients: Dict[str, httpx.AsyncClient] = {}
         self._client_locks: Dict[str, asyncio.Lock] = {}
+        self._client_info: Dict[str, _PooledClientInfo] = {}
+
+    @staticmethod
+    def pool_key(base_url: str, auth_mode: Optional[str] = None) -> str:
+        """Registry key for a base URL and optional auth mode."""
+        return f"{base_url}#{auth_mode}" if auth_mode else base_url
+
+    def _is_stale(self, key: str) -> bool:
+        info = self._client_info.get(key)
+        return bool(info and info.loop is not None and info.loop.is_closed())
 
-    async def get_client(self, base_url: str) -> httpx.AsyncClient:
+    async def get_client(
+        self,
+        base_url: str,
+        *,
+        auth_mode: Optional[str] = None,
+        timeout: Optional[Union[httpx.Timeout, float]] = None,
+    ) -> httpx.AsyncClient:
         """Get or create a pooled client for the given base URL.
 
         Args:
             base_url: The base URL for the API (e.g., "https://openrouter.ai/api/v1")
+            auth_mode: Optional discriminator (e.g. "codex_oauth") so callers with
+                different credentials or timeouts don't share a client
+            timeout: Default timeout for a newly created client; defaults to the
+                pool config timeouts
 
         Returns:
             Shared AsyncClient with connection pooling
         """
-        if base_url not in self._clients:
-            # Create lock for this base_url if needed
-            if base_url not in self._client_locks:
-                self._client_locks[base_url] = asyncio.Lock()
-
-            async with self._client_locks[base_url]:
+        key = self.pool_key(base_url, auth_mode)
+        if key in self._clients and self._is_stale(key):
+            # The loop that owned these sockets is gone; they cannot be reused.
+            logger.info(f"Discarding connection pool for {key}: event loop closed")
+            self._clients.pop(key, None)
+            self._client_info.pop(key, None)
+            self._client_locks.pop(key, None)
+
+        if key not in self._clients:
+            # Create lock for this key if needed
+            if key not in self._client_locks:
+                self._client_locks[key] = asyncio.Lock()
+
+            async with self._client_locks[key]:
                 # Double-check after acquiring lock
-                if base_url not in self._clients:
-                    self._clients[base_url] = httpx.AsyncClient(
+                if key not in self._clients:
+                    http2 = self._config.use_http2
+                    info = _PooledClientInfo(
+                        base_url, auth_mode, http2, asyncio.get_running_loop()
+                    )
+                    self._clients[key] = httpx.AsyncClient(
                         limits=self._config.to_limits(),
-                        timeout=self._config.to_timeout(),
+                        timeout=timeout if timeout is not None else self._config.to_timeout(),
+                        http2=http2,
+                        cookies=_NoCookieJar(),
+                        event_hooks={
+                            "request": [info.on_request],
+                            "response": [info.on_response],
+                        },
                     )
-                    logger.info(f"Created connection pool for {base_url}")
+                    self._client_info[key] = info
+                    logger.info(f"Created connection pool for {key} (http2={http2})")
 
-        return self._clients[base_url]
+        return self._clients[key]
 
     @asynccontextmanager
-    async def client_context(self, base_url: str):
+    async def client_context(
+        self,
+        base_url: str,
+        *,
+        auth_mode: Optional[str] = None,
+        timeout: Optional[Union[httpx.Timeout, float]] = None,
+    ):
         """Context manager for using a pooled client.
 
         Unlike the per-request pattern, this reuses connections:
@@ -201,13 +342,17 @@ class ConnectionPoolManager:
             async with pool.client_context(base_url) as client:
                 response = await client.post(...)
 
+        Leaving the context does not close the client; see ``close_all``.
+
         Args:
             base_url: The base URL for the API
+            auth_mode: Optional pool discriminator, see ``get_client``
+            timeout: Default timeout used if the client is created here
 
         Yields:
             Shared AsyncClient instance
         """
-        client = await self.get_client(base_url)
+        client = await self.get_client(base_url, auth_mode=auth_mode, timeout=timeout)
         try:
             yield client
         except httpx.PoolTimeout:
@@ -216,32 +361,79 @@ class ConnectionPoolManager:
             )
             raise
 
+    async def close_client(self, base_url: str, auth_mode: Optional[str] = None) -> None:
+        """Close and forget a single pooled client, if present."""
+        key = self.pool_key(base_url, auth_mode)
+        client = self._clients.pop(key, None)
+        self._client_locks.pop(key, None)
+        self._client_info.pop(key, None)
+        if client is not None:
+            await client.aclose()
+
     async def close_all(self) -> None:
         """Close all pooled clients. Call during shutdown."""
-        for base_url, client in list(self._clients.items()):
+        for key, client in list(self._clients.items()):
+            if self._is_stale(key):
+                # Sockets died with their loop; awaiting aclose() would fail.
+                continue
             try:
                 await client.aclose()
-                logger.info(f"Closed connection pool for {base_url}")
+                logger.info(f"Closed connection pool for {key}")
             except Exception as e:
-                logger.warning(f"Error closing client for {base_url}: {e}")
+                logger.warning(f"Error closing client for {key}: {e}")
         self._clients.clear()
         self._client_locks.clear()
+        self._client_info.clear()
+
+    @staticmethod
+    def _connection_counts(client: httpx.AsyncClient) -> Dict[str, int]:
+        """Best-effort view of the underlying httpcore pool."""
+        try:
+            connections = list(client._transport._pool.connections)  # type: ignore[attr-defined]
+        except Exception:
+            return {}
+        idle = 0
+        for connection in connections:
+            try:
+                idle += 1 if connection.is_idle() else 0
+            except Exception:
+                pass
+        return {"open": len(connections), "idle": idle}
 
     def get_stats(self) -> Dict[str, Dict]:
         """Get connection pool statistics for monitoring.
 
         Returns:
-            Dict mapping base_url to pool stats
+            Dict mapping pool key (base_url, or ``base_url#auth_mode``) to stats
         """
         stats = {}
-        for base_url in self._clients:
-            stats[base_url] = {
-                "active": True,
+        for key, client in self._clients.items():
+            info = self._client_info.get(key)
+            entry: Dict[str, Any] = {
+                "active": not self._is_stale(key),
                 "limits": {
                     "max_keepalive": self._config.max_keepalive_connections,
                     "max_connections": self._config.max_connections,
+                    "keepalive_expiry": self._config.keepalive_expiry,
                 },
             }
+            if info is not None:
+                entry.update(
+                    {
+                        "base_url": info.base_url,
+                        "auth_mode": info.auth_mode,
+                        "http2": info.http2,
+                        "created_at": info.created_at,
+                        "last_used_at": info.last_used_at,
+                        "requests": info.requests,
+                        "responses": info.responses,
+                        "errors": info.errors,
+                    }
+                )
+            connections = self._connection_counts(client)
+            if connections:
+                entry["connections"] = connections
+            stats[key] = entry
         return stats
 
 
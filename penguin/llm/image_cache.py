@@ -0,0 +1,363 @@
+"""Content-addressed cache of provider-ready encoded images.
+
+Adapters used to reopen, resize and base64-encode every local image on every
+request, on the event loop thread. This module does that work once per unique
+image content (and output format), in a worker pool, and keeps the result in a
+small in-memory LRU backed by an on-disk store under the Penguin cache dir.
+
+Each entry also records the encoded dimensions so the context window manager
+can budget image tokens from real sizes instead of a fixed guess.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Longest edge adapters send to providers (matches the historical thumbnail).
+DEFAULT_MAX_IMAGE_SIZE: Tuple[int, int] = (1024, 1024)
+# Used when an image's dimensions cannot be determined (remote URLs, bad data).
+DEFAULT_IMAGE_TOKEN_ESTIMATE = 4000
+
+_CACHE_VERSION = 1
+_MEDIA_TYPES_BY_EXT = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+
+@dataclass(frozen=True)
+class EncodedImage:
+    """A resized, base64-encoded image plus the metadata needed to budget it."""
+
+    key: str
+    data: str
+    media_type: str
+    width: int
+    height: int
+    source_width: int
+    source_height: int
+
+    @property
+    def data_uri(self) -> str:
+        return f"data:{self.media_type};base64,{self.data}"
+
+    @property
+    def estimated_tokens(self) -> int:
+        """Conservative token estimate across supported providers."""
+        return estimate_image_tokens(self.width, self.height)
+
+
+def media_type_for_path(path: str) -> str:
+    """Return the MIME type adapters use for a local image path."""
+    return _MEDIA_TYPES_BY_EXT.get(os.path.splitext(path)[1].lower(), "image/jpeg")
+
+
+def _fit_within(width: int, height: int, max_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Mirror ``PIL.Image.thumbnail`` sizing without touching pixels."""
+    max_w, max_h = max_size
+    if width <= max_w and height <= max_h:
+        return width, height
+    scale = min(max_w / width, max_h / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Estimate prompt tokens for an image of the given encoded size.
+
+    Takes the larger of Anthropic's ``w*h/750`` rule and OpenAI's high-detail
+    tile formula (85 + 170 per 512px tile after fitting into 2048/768).
+    """
+    if width <= 0 or height <= 0:
+        return DEFAULT_IMAGE_TOKEN_ESTIMATE
+    anthropic = math.ceil(width * height / 750)
+
+    w, h = float(width), float(height)
+    if max(w, h) > 2048:
+        scale = 2048 / max(w, h)
+        w, h = w * scale, h * scale
+    if min(w, h) > 768:
+        scale = 768 / min(w, h)
+        w, h = w * scale, h * scale
+    openai = 85 + 170 * math.ceil(w / 512) * math.ceil(h / 512)
+
+    return max(anthropic, openai)
+
+
+def _default_cache_dir() -> Path:
+    root = os.getenv("PENGUIN_CACHE_DIR", "~/.cache/penguin")
+    return Path(root).expanduser() / "images"
+
+
+class ImagePreprocessCache:
+    """Memory LRU + on-disk cache of encoded images keyed by content hash."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_memory_entries: int = 64,
+        max_workers: int = 2,
+        max_size: Tuple[int, int] = DEFAULT_MAX_IMAGE_SIZE,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else _default_cache_dir()
+        self.max_memory_entries = max_memory_entries
+        self.max_size = tuple(max_size)
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._memory: "OrderedDict[str, EncodedImage]" = OrderedDict()
+        # (path, mtime_ns, size) -> content digest, so unchanged files are not re-hashed.
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        # content digest -> encoded (width, height), for token estimates.
+        self._dimensions: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    # ── public API ─────────────────────────────────────────────────────
+
+    def encode_path(
+        self, image_path: str, output_format: Optional[str] = "JPEG"
+    ) -> Optional[EncodedImage]:
+        """Return the encoded image for ``image_path``, processing it at most once.
+
+        ``output_format`` is a PIL format name; ``None`` keeps the format implied
+        by the file extension (what the Anthropic adapter sends).
+        """
+        digest = self._file_digest(image_path)
+        if digest is None:
+            return None
+        media_type = (
+            media_type_for_path(image_path)
+            if output_format is None
+            else f"image/{output_format.lower()}"
+        )
+        key = self._entry_key(digest, media_type)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        with open(image_path, "rb") as handle:
+            raw = handle.read()
+        return self._store(self._encode_bytes(key, raw, media_type))
+
+    async def aencode_path(
+        self, image_path: str, output_format: Optional[str] = "JPEG"
+    ) -> Optional[EncodedImage]:
+        """Async ``encode_path`` that keeps hashing/decoding off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), self.encode_path, image_path, output_format
+        )
+
+    def estimate_path_tokens(self, image_path: str) -> int:
+        """Token estimate for a local image without encoding it.
+
+        Uses a cached entry when present, otherwise reads only the image header.
+        """
+        digest = self._file_digest(image_path)
+        if digest is None:
+            return DEFAULT_IMAGE_TOKEN_ESTIMATE
+        with self._lock:
+            dims = self._dimensions.get(digest)
+        if dims is None:
+            try:
+                from PIL import Image as PILImage  # type: ignore
+
+                with PILImage.open(image_path) as img:
+                    dims = _fit_within(*img.size, self.max_size)
+            except Exception:
+                return DEFAULT_IMAGE_TOKEN_ESTIMATE
+            with self._lock:
+                self._dimensions[digest] = dims
+        return estimate_image_tokens(*dims)
+
+    def estimate_data_uri_tokens(self, data_uri: str) -> int:
+        """Token estimate for an inline ``data:`` image URI."""
+        try:
+            _, payload = data_uri.split(",", 1)
+            raw = base64.b64decode(payload, validate=False)
+            from PIL import Image as PILImage  # type: ignore
+
+            with PILImage.open(io.BytesIO(raw)) as img:
+                width, height = _fit_within(*img.size, self.max_size)
+            return estimate_image_tokens(width, height)
+        except (ValueError, binascii.Error, OSError, ImportError):
+            return DEFAULT_IMAGE_TOKEN_ESTIMATE
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._digests.clear()
+            self._dimensions.clear()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # ── internals ──────────────────────────────────────────────────────
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="penguin-image"
+            )
+        return self._executor
+
+    def _file_digest(self, image_path: str) -> Optional[str]:
+        try:
+            st = os.stat(image_path)
+        except OSError:
+            return None
+        stat_key = (os.path.abspath(image_path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._digests.get(stat_key)
+        if digest is not None:
+            return digest
+        hasher = hashlib.sha256()
+        try:
+            with open(image_path, "rb") as handle:
+                for block in iter(lambda: handle.read(1 << 20), b""):
+                    hasher.update(block)
+        except OSError:
+            return None
+        digest = hasher.hexdigest()
+        with self._lock:
+            self._digests[stat_key] = digest
+        return digest
+
+    def _entry_key(self, digest: str, media_type: str) -> str:
+        width, height = self.max_size
+        suffix = media_type.split("/")[-1]
+        return f"{digest}-{width}x{height}-{suffix}-v{_CACHE_VERSION}"
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _lookup(self, key: str) -> Optional[EncodedImage]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry
+        path = self._disk_path(key)
+        try:
+            entry = EncodedImage(**json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable image cache entry {path}: {e}")
+            self.stats["misses"] += 1
+            return None
+        self.stats["disk_hits"] += 1
+        self._remember(entry)
+        return entry
+
+    def _remember(self, entry: EncodedImage) -> None:
+        with self._lock:
+            self._dimensions[entry.key.split("-", 1)[0]] = (entry.width, entry.height)
+            self._memory[entry.key] = entry
+            self._memory.move_to_end(entry.key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _store(self, entry: EncodedImage) -> EncodedImage:
+        self._remember(entry)
+        path = self._disk_path(entry.key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not persist image cache entry {path}: {e}")
+        return entry
+
+    def _encode_bytes(self, key: str, raw: bytes, media_type: str) -> EncodedImage:
+        from PIL import Image as PILImage  # type: ignore
+
+        with PILImage.open(io.BytesIO(raw)) as img:
+            source_width, source_height = img.size
+            resampling_namespace = getattr(PILImage, "Resampling", PILImage)
+            img.thumbnail(
+                self.max_size,
+                getattr(PILImage, "LANCZOS", getattr(resampling_namespace, "LANCZOS")),
+            )
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            buffer = io.BytesIO()
+            img.save(buffer, format=media_type.split("/")[1].upper())
+            width, height = img.size
+        return EncodedImage(
+            key=key,
+            data=base64.b64encode(buffer.getvalue()).decode("utf-8"),
+            media_type=media_type,
+            width=width,
+            height=height,
+            source_width=source_width,
+            source_height=source_height,
+        )
+
+
+_image_cache: Optional[ImagePreprocessCache] = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImagePreprocessCache:
+    """Return the process-wide image cache."""
+    global _image_cache
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = ImagePreprocessCache()
+    return _image_cache
+
+
+def image_part_path(part: Dict[str, Any]) -> Optional[str]:
+    """Extract a local file path from the image part shapes Penguin stores."""
+    if part.get("image_path"):
+        return str(part["image_path"])
+    url_obj = part.get("image_url")
+    if isinstance(url_obj, dict):
+        if url_obj.get("image_path"):
+            return str(url_obj["image_path"])
+        url = str(url_obj.get("url") or "")
+    else:
+        url = str(url_obj or "")
+    if url.startswith("file://"):
+        return url[7:]
+    return None
+
+
+def estimate_image_part_tokens(part: Dict[str, Any]) -> int:
+    """Estimate tokens for one multimodal content part holding an image."""
+    cache = get_image_cache()
+    path = image_part_path(part)
+    if path and os.path.exists(path):
+        return cache.estimate_path_tokens(path)
+    url_obj = part.get("image_url")
+    url = url_obj.get("url") if isinstance(url_obj, dict) else url_obj
+    if isinstance(url, str) and url.startswith("data:"):
+        return cache.estimate_data_uri_tokens(url)
+    source = part.get("source")
+    if isinstance(source, dict) and source.get("type") == "base64":
+        return cache.estimate_data_uri_tokens(f"data:;base64,{source.get('data', '')}")
+    return DEFAULT_IMAGE_TOKEN_ESTIMATE
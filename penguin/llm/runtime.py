@@ -22,6 +22,7 @@ from penguin.tools.runtime import (
     tool_call_with_schedule_metadata,
 )
 from penguin.utils.errors import LLMEmptyResponseError
+from penguin.utils.shell_runner import OutputEventStream, stream_output_to
 
 from .contracts import (
     ErrorCategory,
@@ -117,6 +118,50 @@ async def _execute_tool_with_manager(
     return result
 
 
+async def _execute_tool_streaming_output(
+    tool_manager: Any,
+    tool_call: ToolCall,
+    tool_arguments: Dict[str, Any],
+    emit_action_output: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
+    event_metadata: Dict[str, Any],
+) -> Any:
+    """Execute a tool, emitting shell output it produces as it arrives.
+
+    Args:
+        tool_manager: Tool manager exposed by the active Penguin runtime.
+        tool_call: Provider tool call being executed.
+        tool_arguments: Parsed provider tool arguments.
+        emit_action_output: Optional hook receiving ``action_output`` payloads.
+        event_metadata: Metadata attached to every emitted payload.
+
+    Returns:
+        The completed tool result.
+    """
+
+    if emit_action_output is None:
+        return await _execute_tool_with_manager(
+            tool_manager, tool_call.name, tool_arguments
+        )
+    output_stream = OutputEventStream(
+        lambda stream, text: emit_action_output(
+            {
+                "id": tool_call.id,
+                "action": tool_call.name,
+                "stream": stream,
+                "chunk": text,
+                "metadata": event_metadata,
+            }
+        )
+    )
+    try:
+        with stream_output_to(output_stream.write):
+            return await _execute_tool_with_manager(
+                tool_manager, tool_call.name, tool_arguments
+            )
+    finally:
+        await output_stream.close()
+
+
 def _tool_arguments_chars(arguments: Any) -> int:
     """Return a bounded-diagnostic argument size in characters."""
 
@@ -756,6 +801,7 @@ async def execute_pending_tool_call(
     execution_policy: Optional[ToolExecutionPolicy] = None,
     emit_action_start: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
     emit_action_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    emit_action_output: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
     emit_tool_timeline: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
 ) -> Optional[Dict[str, Any]]:
     """Execute a pending provider-captured tool call using generic hooks."""
@@ -769,6 +815,7 @@ async def execute_pending_tool_call(
         execution_policy=execution_policy,
         emit_action_start=emit_action_start,
         emit_action_result=emit_action_result,
+        emit_action_output=emit_action_output,
         emit_tool_timeline=emit_tool_timeline,
     )
     return results[0] if results else None
@@ -832,6 +879,7 @@ async def _execute_ordered_batch_parent(
     persist_tool_result_record: Optional[Callable[[ToolCall, ToolResult], None]],
     emit_action_start: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
     emit_action_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
+    emit_action_output: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
     emit_tool_timeline: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
     event_metadata: Dict[str, Any],
 ) -> ToolResult:
@@ -887,10 +935,16 @@ async def _execute_ordered_batch_parent(
         child_args = (
             child_call.arguments if isinstance(child_call.arguments, dict) else {}
         )
-        return await _execute_tool_with_manager(
+        return await _execute_tool_streaming_output(
             tool_manager,
-            child_call.name,
+            child_call,
             child_args,
+            emit_action_output,
+            {
+                **event_metadata,
+                "source": "ordered_tool_batch_child",
+                "parent_tool_call_id": parent_call.id,
+            },
         )
 
     child_results = await execute_tool_calls_ordered(
@@ -951,6 +1005,7 @@ async def execute_pending_tool_calls(
     execution_policy: Optional[ToolExecutionPolicy] = None,
     emit_action_start: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
     emit_action_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    emit_action_output: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
     emit_tool_timeline: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
     persist_image_artifacts: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> List[Dict[str, Any]]:
@@ -1051,13 +1106,16 @@ async def execute_pending_tool_calls(
                     persist_tool_result_record=persist_tool_result_record,
                     emit_action_start=emit_action_start,
                     emit_action_result=emit_action_result,
+                    emit_action_output=emit_action_output,
                     emit_tool_timeline=emit_tool_timeline,
                     event_metadata=event_metadata,
                 )
-            return await _execute_tool_with_manager(
+            return await _execute_tool_streaming_output(
                 tool_manager,
-                current_tool_call.name,
+                current_tool_call,
                 parsed_args_by_id.get(current_tool_call.id, {}),
+                emit_action_output,
+                event_metadata,
             )
 
         scheduler_results = await execute_tool_calls_ordered(
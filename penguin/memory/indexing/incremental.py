@@ -7,10 +7,12 @@ and adding them to the memory provider.
 
 import asyncio
 import logging
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from penguin.memory.providers.base import MemoryProvider
+from penguin.utils.discovery_cache import WORKSPACE_IGNORED_DIRS
 from .metadata import IndexMetadata
 from .processors import (
     ContentProcessor,
@@ -21,22 +23,30 @@ from .processors import (
 
 logger = logging.getLogger(__name__)
 
+# Re-indexing the same path twice at once would leave a duplicate memory
+# behind, so work on a path is serialised through one of these locks.
+_PATH_LOCK_STRIPES = 16
+
 
 class IncrementalIndexer:
     """
     Efficiently indexes files in a workspace by processing only new or
     changed files.
+
+    Every indexed file's provider memory IDs are kept in the index metadata,
+    so re-indexing a file replaces its memories and deleting a file deletes
+    them from the provider.
     """
 
     def __init__(self, provider: MemoryProvider, config: Dict[str, Any]):
         self.provider = provider
         self.config = config
         self.workspace_path = Path(config.get("workspace_path", ".")).resolve()
-        
-        # Initialize metadata manager
+
+        # Initialize metadata manager; workers save it when the queue drains
         metadata_file = self.workspace_path / ".penguin_index.json"
-        self.metadata = IndexMetadata(metadata_file)
-        
+        self.metadata = IndexMetadata(metadata_file, autosave=False)
+
         # Initialize content processors (with priority)
         self.processors: List[ContentProcessor] = [
             PythonCodeProcessor(),
@@ -44,8 +54,12 @@ class IncrementalIndexer:
             GenericTextProcessor(),  # Fallback
         ]
 
-        self._queue = asyncio.Queue()
+        # Jobs are ("index", path, force) or ("forget", path, memory_ids)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued: Set[str] = set()
+        self._path_locks = [asyncio.Lock() for _ in range(_PATH_LOCK_STRIPES)]
         self._workers: List[asyncio.Task] = []
+        self.stats = {"indexed": 0, "unchanged": 0, "deleted": 0, "renamed": 0}
 
     async def start_workers(self, num_workers: int = 4):
         """Start the worker tasks that process files from the queue."""
@@ -60,75 +74,171 @@ class IncrementalIndexer:
         for worker in self._workers:
             worker.cancel()
         await asyncio.gather(*self._workers, return_exceptions=True)
+        self.metadata.save()
         logger.info("Indexing workers stopped.")
 
     async def _worker(self):
         """The worker task that processes files from the queue."""
         while True:
-            file_path = await self._queue.get()
+            action, file_path, payload = await self._queue.get()
             try:
-                await self._process_file(file_path)
+                async with self._lock_for(file_path):
+                    if action == "forget":
+                        await self._delete_memories(file_path, payload)
+                    else:
+                        self._queued.discard(file_path)
+                        await self._process_file(file_path, force=payload)
             except Exception as e:
                 logger.error(f"Error processing file {file_path} in worker: {e}")
             finally:
                 self._queue.task_done()
+                if self._queue.empty():
+                    self.metadata.save()
 
-    def add_to_queue(self, file_path: str):
-        """Add a file to the processing queue."""
-        self._queue.put_nowait(file_path)
+    def _lock_for(self, file_path: str) -> asyncio.Lock:
+        return self._path_locks[hash(file_path) % _PATH_LOCK_STRIPES]
+
+    def add_to_queue(self, file_path: str, force: bool = False):
+        """Add a file to the processing queue (once, until a worker takes it)."""
+        if file_path in self._queued and not force:
+            return
+        self._queued.add(file_path)
+        self._queue.put_nowait(("index", file_path, force))
 
     def remove_from_index(self, file_path: str):
-        """Remove a file from the memory provider and metadata."""
-        # This needs to be implemented based on how memory IDs are stored/retrieved
-        # For now, we'll just remove metadata.
-        # A lookup from file_path to memory_id would be needed.
-        logger.info(f"File {file_path} deleted. Removing from metadata.")
-        self.metadata.remove_file_metadata(file_path)
-        # To fully remove from the provider, we'd need to:
-        # memory_id = self.metadata.get_memory_id_for_file(file_path)
-        # await self.provider.delete_memory(memory_id)
-
-
-    async def sync_directory(self, directory: str, force_full: bool = False):
+        """Remove a file from the metadata and queue deletion of its memories."""
+        entry = self.metadata.remove_file_metadata(file_path)
+        memory_ids = (entry or {}).get("memory_ids", [])
+        if memory_ids:
+            logger.info(f"File {file_path} deleted. Removing {len(memory_ids)} memories.")
+            self._queue.put_nowait(("forget", file_path, memory_ids))
+
+    async def _delete_memories(self, file_path: str, memory_ids: Iterable[str]) -> int:
+        deleted = 0
+        for memory_id in memory_ids:
+            try:
+                if await self.provider.delete_memory(memory_id):
+                    deleted += 1
+            except Exception as e:
+                logger.error(f"Failed to delete memory {memory_id} for {file_path}: {e}")
+        self.stats["deleted"] += deleted
+        return deleted
+
+    async def rename_in_index(self, src_path: str, dest_path: str) -> bool:
+        """
+        Follow a rename without re-embedding when the content is unchanged.
+
+        Falls back to deleting the old entry and queueing the new path, and
+        returns False in that case.
+        """
+        async with self._lock_for(dest_path):
+            entry = self.metadata.data.get(str(src_path))
+            unchanged = (
+                entry is not None
+                and entry.get("memory_ids")
+                and entry.get("embedding_model") == self.provider.embedding_model
+                and entry.get("content_hash") == self.metadata._calculate_hash(dest_path)
+            )
+            if unchanged:
+                try:
+                    for memory_id in entry["memory_ids"]:
+                        record = await self.provider.get_memory(memory_id)
+                        if record is None:
+                            raise LookupError(f"memory {memory_id} not found")
+                        metadata = dict(record.get("metadata") or {})
+                        metadata["path"] = str(dest_path)
+                        await self.provider.update_memory(memory_id, metadata=metadata)
+                except Exception as e:
+                    logger.debug(f"Re-indexing renamed file {dest_path}: {e}")
+                else:
+                    self.metadata.move_file_metadata(src_path, dest_path)
+                    self.stats["renamed"] += 1
+                    return True
+        self.remove_from_index(src_path)
+        self.add_to_queue(dest_path)
+        return False
+
+    def _iter_files(self, directory: Path):
+        """Files under ``directory``, skipping VCS, cache and build directories."""
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = sorted(d for d in dirnames if d not in WORKSPACE_IGNORED_DIRS)
+            for name in sorted(filenames):
+                file_path = Path(dirpath) / name
+                if file_path != self.metadata.metadata_path:
+                    yield file_path
+
+    async def sync_directory(self, directory: str, force_full: bool = False) -> int:
         """
         Scan a directory and add any new or modified files to the indexing queue.
+
+        Returns the number of files queued.
         """
         logger.info(f"Syncing directory: {directory} (force_full={force_full})")
         directory_path = Path(directory).resolve()
-        
-        for file_path in directory_path.rglob("*"):
-            if file_path.is_file():
-                if force_full or self.metadata.needs_indexing(str(file_path), self.provider.embedding_model):
-                    self.add_to_queue(str(file_path))
-        
-        logger.info(f"Sync for {directory} complete. Check queue for pending files.")
-
-    async def _process_file(self, file_path: str):
+
+        queued = 0
+        for file_path in self._iter_files(directory_path):
+            if force_full or self.metadata.needs_indexing(str(file_path), self.provider.embedding_model):
+                self.add_to_queue(str(file_path), force=force_full)
+                queued += 1
+
+        logger.info(f"Sync for {directory} complete. Queued {queued} files.")
+        return queued
+
+    async def reconcile(self, directories: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+        """
+        Bring the index in line with the tree after changes too large to
+        follow file by file (a branch checkout, a bulk rewrite).
+
+        Drops entries for files that no longer exist and queues new or
+        changed ones. Returns ``(removed, queued)``.
+        """
+        roots = [Path(d).resolve() for d in (directories or [self.workspace_path])]
+        removed = 0
+        for file_path in list(self.metadata.data):
+            path = Path(file_path)
+            if any(path.is_relative_to(root) for root in roots) and not path.exists():
+                self.remove_from_index(file_path)
+                removed += 1
+        queued = 0
+        for root in roots:
+            queued += await self.sync_directory(str(root))
+        logger.info(f"Reconciled index: {removed} removed, {queued} queued.")
+        return removed, queued
+
+    async def _process_file(self, file_path: str, force: bool = False):
         """
         Process a single file: select a processor, extract content, and add to memory.
         """
         logger.debug(f"Processing file: {file_path}")
-        
+
+        # Watch events only say a file may have changed; saves that rewrite
+        # identical content are skipped here.
+        if not force and not self.metadata.needs_indexing(file_path, self.provider.embedding_model):
+            self.stats["unchanged"] += 1
+            return
+
         # 1. Select the right processor
         selected_processor = None
         for processor in self.processors:
             if processor.can_process(file_path):
                 selected_processor = processor
                 break
-        
+
         if not selected_processor:
             logger.debug(f"No suitable processor found for {file_path}. Skipping.")
             return
 
         # 2. Process the file to get content and metadata
+        content_hash = self.metadata._calculate_hash(file_path)
         processed_data = await selected_processor.process(file_path)
         if not processed_data:
             logger.debug(f"Processor failed for {file_path}. Skipping.")
             return
-            
+
         # 3. Add to the memory provider
         try:
-            await self.provider.add_memory(
+            memory_id = await self.provider.add_memory(
                 content=processed_data["content"],
                 metadata=processed_data["metadata"],
                 categories=[processed_data["metadata"].get("file_type", "general")]
@@ -137,7 +247,16 @@ class IncrementalIndexer:
             logger.error(f"Failed to add memory for file {file_path}: {e}")
             return
 
-        # 4. Update the index metadata
-        content_hash = self.metadata._calculate_hash(file_path)
-        self.metadata.update_file_metadata(file_path, content_hash, self.provider.embedding_model)
-        logger.info(f"Successfully indexed file: {file_path}") 
\ No newline at end of file
+        # The file may have been deleted while it was being embedded
+        if not os.path.exists(file_path):
+            await self._delete_memories(file_path, [memory_id])
+            return
+
+        # 4. Update the index metadata and drop the memories this replaces
+        previous_ids = self.metadata.get_memory_ids(file_path)
+        self.metadata.update_file_metadata(
+            file_path, content_hash, self.provider.embedding_model, memory_ids=[memory_id]
+        )
+        await self._delete_memories(file_path, [i for i in previous_ids if i != memory_id])
+        self.stats["indexed"] += 1
+        logger.info(f"Successfully indexed file: {file_path}")
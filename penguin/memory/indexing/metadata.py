@@ -11,7 +11,7 @@ import logging
 import os
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -21,18 +21,23 @@ class IndexMetadata:
     Tracks the indexing state of files in a workspace.
 
     Manages a metadata file (e.g., .penguin_index.json) that stores the
-    last indexed timestamp and content hash for each processed file.
+    last indexed timestamp, content hash and provider memory IDs for each
+    processed file.
     """
 
-    def __init__(self, metadata_path: Path):
+    def __init__(self, metadata_path: Path, autosave: bool = True):
         """
         Initialize the metadata manager.
 
         Args:
             metadata_path: Path to the metadata file.
+            autosave: Write the file after every change. When False, callers
+                batch changes and call ``save()`` themselves.
         """
         self.metadata_path = metadata_path
+        self.autosave = autosave
         self.data: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
         self._load_metadata()
 
     def _load_metadata(self) -> None:
@@ -55,6 +60,17 @@ class IndexMetadata:
         except IOError as e:
             logger.error(f"Error saving index metadata to {self.metadata_path}: {e}")
 
+    def _changed(self) -> None:
+        self._dirty = True
+        if self.autosave:
+            self.save()
+
+    def save(self) -> None:
+        """Write pending changes to disk."""
+        if self._dirty:
+            self._dirty = False
+            self._save_metadata()
+
     def needs_indexing(self, file_path: str, embedding_model: str) -> bool:
         """
         Check if a file needs to be re-indexed.
@@ -88,6 +104,9 @@ class IndexMetadata:
                 current_hash = self._calculate_hash(file_path)
                 if current_hash != stored_data.get("content_hash"):
                     return True
+                # Same content: remember the new mtime so it is not hashed again
+                stored_data["last_modified"] = current_stat.st_mtime
+                self._changed()
 
             if embedding_model != stored_data.get("embedding_model"):
                 return True # Re-index if embedding model changed
@@ -96,7 +115,13 @@ class IndexMetadata:
         except FileNotFoundError:
             return False
 
-    def update_file_metadata(self, file_path: str, content_hash: str, embedding_model: str) -> None:
+    def update_file_metadata(
+        self,
+        file_path: str,
+        content_hash: str,
+        embedding_model: str,
+        memory_ids: Optional[List[str]] = None,
+    ) -> None:
         """
         Update the metadata for a file after it has been indexed.
         """
@@ -106,15 +131,33 @@ class IndexMetadata:
             "last_modified": os.path.getmtime(file_path),
             "content_hash": content_hash,
             "embedding_model": embedding_model,
+            "memory_ids": list(memory_ids or []),
         }
-        self._save_metadata()
-
-    def remove_file_metadata(self, file_path: str) -> None:
-        """Remove metadata for a deleted file."""
-        file_path_str = str(file_path)
-        if file_path_str in self.data:
-            del self.data[file_path_str]
-            self._save_metadata()
+        self._changed()
+
+    def get_memory_ids(self, file_path: str) -> List[str]:
+        """Provider memory IDs currently stored for a file."""
+        return list(self.data.get(str(file_path), {}).get("memory_ids", []))
+
+    def remove_file_metadata(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Remove metadata for a deleted file and return what was stored."""
+        entry = self.data.pop(str(file_path), None)
+        if entry is not None:
+            self._changed()
+        return entry
+
+    def move_file_metadata(self, src_path: str, dest_path: str) -> bool:
+        """Re-key a file's metadata after a rename that kept its content."""
+        entry = self.data.pop(str(src_path), None)
+        if entry is None:
+            return False
+        try:
+            entry["last_modified"] = os.path.getmtime(dest_path)
+        except OSError:
+            pass
+        self.data[str(dest_path)] = entry
+        self._changed()
+        return True
 
     @staticmethod
     def _calculate_hash(file_path: str, block_size: int = 65536) -> str:
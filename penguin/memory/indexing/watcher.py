@@ -3,48 +3,251 @@ File System Watcher
 
 Monitors directories for file changes and triggers re-indexing events.
 Uses the `watchdog` library for efficient, OS-native file system event handling.
+
+Raw events are not forwarded one by one: an editor save or a ``git checkout``
+produces bursts of events for the same paths. ``ChangeCoalescer`` collects
+them on the indexer's event loop, waits until each path has been quiet for a
+debounce window, and then looks at the file itself to decide whether to
+re-index, delete or follow a rename. A burst that touches too many paths, or
+a change of the checked-out git ref, switches to a single reconcile scan.
 """
 
+import asyncio
 import logging
+import os
 import time
 from pathlib import Path
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Callable, Collection, Dict, List, Optional, Tuple
 
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from penguin.utils.discovery_cache import WORKSPACE_IGNORED_DIRS
+
 if TYPE_CHECKING:
     from .incremental import IncrementalIndexer
 
 logger = logging.getLogger(__name__)
 
+# Files under .git whose change means the working tree was switched wholesale
+# (FETCH_HEAD is left out: a fetch, including IDE auto-fetch, touches no files)
+_GIT_REF_FILES = frozenset({"HEAD", "ORIG_HEAD", "MERGE_HEAD"})
 
-class IndexingEventHandler(FileSystemEventHandler):
-    """Handles file system events and triggers the indexer."""
 
-    def __init__(self, indexer: "IncrementalIndexer"):
+class ChangeCoalescer:
+    """
+    Debounces file events per path and hands settled changes to the indexer.
+
+    All methods except ``record_threadsafe`` must run on the event loop that
+    owns the indexer.
+    """
+
+    def __init__(
+        self,
+        indexer: "IncrementalIndexer",
+        roots: List[Path],
+        *,
+        debounce_sec: float = 0.5,
+        max_delay_sec: float = 5.0,
+        bulk_threshold: int = 200,
+        ignored_dirs: Collection[str] = WORKSPACE_IGNORED_DIRS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.indexer = indexer
+        self.roots = [Path(root) for root in roots]
+        self.debounce_sec = debounce_sec
+        # A path that keeps changing (a log file) is still flushed this often
+        self.max_delay_sec = max_delay_sec
+        self.bulk_threshold = bulk_threshold
+        self.ignored_dirs = frozenset(ignored_dirs)
+        self._clock = clock
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup = asyncio.Event()
+        # path -> (first event time, last event time)
+        self._pending: Dict[str, Tuple[float, float]] = {}
+        # rename destination -> original source
+        self._renames: Dict[str, str] = {}
+        # Time of the last event while a bulk change is in progress
+        self._bulk_last: Optional[float] = None
+        self.stats = {
+            "events": 0,
+            "ignored": 0,
+            "indexed": 0,
+            "deleted": 0,
+            "renamed": 0,
+            "reconciles": 0,
+        }
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def record_threadsafe(self, event_type: str, src_path: str, dest_path: Optional[str] = None, is_directory: bool = False) -> None:
+        """Forward an event from the watchdog thread to the event loop."""
+        if self._loop is None:
+            raise RuntimeError("ChangeCoalescer.run() has not been started")
+        self._loop.call_soon_threadsafe(self.record, event_type, src_path, dest_path, is_directory)
+
+    def record(self, event_type: str, src_path: str, dest_path: Optional[str] = None, is_directory: bool = False) -> None:
+        """Note a file system event; nothing is indexed until it settles."""
+        now = self._clock()
+        self.stats["events"] += 1
+
+        if self._is_ref_change(src_path) or (dest_path and self._is_ref_change(dest_path)):
+            self._start_bulk(now)
+            return
+        if self._bulk_last is not None:
+            self._bulk_last = now
+            return
+        if is_directory:
+            # Moving or removing a directory does not report its files
+            if event_type in ("moved", "deleted"):
+                self._start_bulk(now)
+            return
+
+        src_ignored = self._is_ignored(src_path)
+        if event_type == "moved" and dest_path:
+            if self._is_ignored(dest_path):
+                if not src_ignored:
+                    self._touch(src_path, now)
+                return
+            if not src_ignored:
+                self._renames[dest_path] = self._renames.pop(src_path, src_path)
+                self._touch(src_path, now)
+            self._touch(dest_path, now)
+        elif src_ignored:
+            self.stats["ignored"] += 1
+            return
+        else:
+            self._touch(src_path, now)
+
+        if len(self._pending) >= self.bulk_threshold:
+            self._start_bulk(now)
+
+    def _touch(self, path: str, now: float) -> None:
+        first, _ = self._pending.get(path, (now, now))
+        self._pending[path] = (first, now)
+        self._wakeup.set()
 
-    def on_modified(self, event):
-        if not event.is_directory:
-            logger.debug(f"File modified: {event.src_path}")
-            self.indexer.add_to_queue(event.src_path)
+    def _start_bulk(self, now: float) -> None:
+        if self._bulk_last is None:
+            logger.info("Bulk file change detected; will reconcile the index once it settles.")
+        self._pending.clear()
+        self._renames.clear()
+        self._bulk_last = now
+        self._wakeup.set()
 
-    def on_created(self, event):
-        if not event.is_directory:
-            logger.debug(f"File created: {event.src_path}")
-            self.indexer.add_to_queue(event.src_path)
+    def _is_ref_change(self, path: str) -> bool:
+        parts = Path(path).parts
+        return len(parts) >= 2 and parts[-2] == ".git" and parts[-1] in _GIT_REF_FILES
 
-    def on_deleted(self, event):
-        if not event.is_directory:
-            logger.debug(f"File deleted: {event.src_path}")
-            self.indexer.remove_from_index(event.src_path)
+    def _is_ignored(self, path: str) -> bool:
+        file_path = Path(path)
+        if file_path == self.indexer.metadata.metadata_path:
+            return True
+        for root in self.roots:
+            if file_path.is_relative_to(root):
+                relative = file_path.relative_to(root).parts[:-1]
+                return any(part in self.ignored_dirs for part in relative)
+        return any(part in self.ignored_dirs for part in file_path.parts[:-1])
 
-    def on_moved(self, event):
-        if not event.is_directory:
-            logger.debug(f"File moved: {event.src_path} to {event.dest_path}")
-            self.indexer.remove_from_index(event.src_path)
-            self.indexer.add_to_queue(event.dest_path)
+    def _next_deadline(self) -> Optional[float]:
+        if self._bulk_last is not None:
+            return self._bulk_last + self.debounce_sec
+        if not self._pending:
+            return None
+        return min(
+            min(last + self.debounce_sec, first + self.max_delay_sec)
+            for first, last in self._pending.values()
+        )
+
+    async def flush(self, force: bool = False) -> int:
+        """
+        Apply every change that has settled (all of them with ``force``).
+
+        Returns the number of paths handed to the indexer.
+        """
+        now = self._clock()
+        if self._bulk_last is not None:
+            if not force and now - self._bulk_last < self.debounce_sec:
+                return 0
+            self._bulk_last = None
+            self.stats["reconciles"] += 1
+            await self.indexer.reconcile([str(root) for root in self.roots])
+            return 1
+
+        ready = [
+            path
+            for path, (first, last) in self._pending.items()
+            if force or now - last >= self.debounce_sec or now - first >= self.max_delay_sec
+        ]
+        for path in ready:
+            del self._pending[path]
+
+        handled = set()
+        for path in ready:
+            src_path = self._renames.pop(path, None)
+            if src_path is None or src_path == path:
+                continue
+            if src_path in self._pending or os.path.exists(src_path) or not os.path.exists(path):
+                continue
+            # Following the rename also takes care of the source path
+            handled.update((src_path, path))
+            if await self.indexer.rename_in_index(src_path, path):
+                self.stats["renamed"] += 1
+            else:
+                self.stats["deleted"] += 1
+                self.stats["indexed"] += 1
+
+        for path in ready:
+            if path in handled:
+                continue
+            if os.path.isfile(path):
+                self.indexer.add_to_queue(path)
+                self.stats["indexed"] += 1
+            else:
+                self.indexer.remove_from_index(path)
+                self.stats["deleted"] += 1
+        return len(ready)
+
+    async def run(self) -> None:
+        """Flush settled changes until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        while True:
+            deadline = self._next_deadline()
+            if deadline is None:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            delay = deadline - self._clock()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error applying file changes to the index: {e}")
+
+
+class IndexingEventHandler(FileSystemEventHandler):
+    """Passes file system events to a ``ChangeCoalescer``."""
+
+    def __init__(self, coalescer: ChangeCoalescer):
+        self.coalescer = coalescer
+
+    def on_any_event(self, event):
+        if event.event_type not in ("created", "modified", "deleted", "moved"):
+            return
+        dest_path = getattr(event, "dest_path", None) or None
+        logger.debug(f"File {event.event_type}: {event.src_path}" + (f" to {dest_path}" if dest_path else ""))
+        self.coalescer.record_threadsafe(
+            event.event_type, os.fsdecode(event.src_path),
+            os.fsdecode(dest_path) if dest_path else None, event.is_directory,
+        )
 
 
 class FileSystemWatcher:
@@ -52,23 +255,39 @@ class FileSystemWatcher:
     Watches specified directories for file changes and notifies an indexer.
     """
 
-    def __init__(self, directories: List[str], indexer: "IncrementalIndexer"):
+    def __init__(
+        self,
+        directories: List[str],
+        indexer: "IncrementalIndexer",
+        *,
+        debounce_sec: float = 0.5,
+        max_delay_sec: float = 5.0,
+        bulk_threshold: int = 200,
+    ):
         self.directories = [Path(d).resolve() for d in directories]
         self.indexer = indexer
         self.observer = Observer()
+        self.coalescer = ChangeCoalescer(
+            indexer,
+            self.directories,
+            debounce_sec=debounce_sec,
+            max_delay_sec=max_delay_sec,
+            bulk_threshold=bulk_threshold,
+        )
+        self._flusher: Optional[asyncio.Task] = None
 
-    def start(self):
+    async def start(self):
         """Start watching the configured directories."""
         if not self.directories:
             logger.warning("No directories to watch.")
             return
 
-        event_handler = IndexingEventHandler(self.indexer)
+        event_handler = IndexingEventHandler(self.coalescer)
         for directory in self.directories:
             if not directory.exists() or not directory.is_dir():
                 logger.warning(f"Watch directory not found or not a directory: {directory}")
                 continue
-            
+
             self.observer.schedule(event_handler, str(directory), recursive=True)
             logger.info(f"Watching for file changes in: {directory}")
 
@@ -76,11 +295,18 @@ class FileSystemWatcher:
             logger.error("Could not start watcher, no valid directories found.")
             return
 
+        self._flusher = asyncio.create_task(self.coalescer.run())
+        await asyncio.sleep(0)  # let run() bind the loop before events arrive
         self.observer.start()
 
-    def stop(self):
-        """Stop watching for file changes."""
+    async def stop(self):
+        """Stop watching for file changes and apply what is still pending."""
         if self.observer.is_alive():
             self.observer.stop()
-            self.observer.join()
-            logger.info("File system watcher stopped.") 
\ No newline at end of file
+            await asyncio.to_thread(self.observer.join)
+            logger.info("File system watcher stopped.")
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+            await self.coalescer.flush(force=True)
@@ -2,6 +2,7 @@
 
 This package provides components for running multiple agents in parallel:
 - AgentExecutor: Background agent execution with concurrency control
+- AgentWorkerPool: Optional worker processes the executor can run agents in
 - AgentCoordinator: Multi-agent orchestration and coordination
 """
 
@@ -15,12 +16,16 @@ from penguin.multi.executor import (
     get_executor,
     set_executor,
 )
+from penguin.multi.worker_pool import AgentWorkerPool, WorkerError, WorkerJob
 
 __all__ = [
     "AgentExecutionOutcome",
     "AgentExecutor",
     "AgentState",
     "AgentTask",
+    "AgentWorkerPool",
+    "WorkerError",
+    "WorkerJob",
     "classify_agent_result",
     "get_executor",
     "set_executor",
@@ -1,7 +1,10 @@
 """Background agent execution for parallel multi-agent workflows.
 
 This module provides the AgentExecutor class for running multiple agents
-concurrently on one owning event loop.
+concurrently on one owning event loop. With ``PENGUIN_AGENT_WORKERS`` > 0 (or
+an explicit ``worker_pool``) agent runs are delegated to worker processes so
+CPU-heavy agents do not stall the loop; tool calls still execute here and
+sessions the workers save are written here.
 """
 
 import asyncio
@@ -9,7 +12,10 @@ import logging
 import os
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Mapping, Optional, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from penguin.multi.worker_pool import DEFAULT_RUNNER, AgentWorkerPool
 
 __all__ = [
     "AgentExecutionOutcome",
@@ -86,7 +92,8 @@ class AgentExecutor:
     """Executes multiple agents in parallel with concurrency control.
 
     This class owns background tasks and bounds concurrent child execution
-    with an asyncio semaphore.
+    with an asyncio semaphore. State counts are maintained on every
+    transition so status queries do not scan the task table.
 
     Usage:
         executor = AgentExecutor(core, max_concurrent=5)
@@ -111,12 +118,19 @@ class AgentExecutor:
         self,
         core: Any,
         max_concurrent: Optional[int] = None,
+        worker_pool: Optional[AgentWorkerPool] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
     ):
         """Initialize the executor.
 
         Args:
             core: PenguinCore instance for agent execution
             max_concurrent: Maximum concurrent agents (default from env or 10)
+            worker_pool: Run agents in this worker-process pool instead of
+                in-process (default: a pool of ``PENGUIN_AGENT_WORKERS``
+                workers, or none when that is 0)
+            on_event: Callback receiving ``(agent_id, event)`` for events
+                streamed by pooled agents
         """
         self._core = core
         self._max_concurrent = max_concurrent or int(
@@ -124,22 +138,56 @@ class AgentExecutor:
         )
         self._semaphore = asyncio.Semaphore(self._max_concurrent)
         self._tasks: Dict[str, AgentTask] = {}
+        self._state_counts: Dict[AgentState, int] = {state: 0 for state in AgentState}
         self._lock = asyncio.Lock()
+        self._on_event = on_event
+
+        if worker_pool is None:
+            workers = int(os.getenv("PENGUIN_AGENT_WORKERS", "0"))
+            if workers > 0:
+                worker_pool = AgentWorkerPool(
+                    workers,
+                    runner=os.getenv("PENGUIN_AGENT_WORKER_RUNNER", DEFAULT_RUNNER),
+                )
+        if worker_pool is not None:
+            if worker_pool.tool_handler is None:
+                worker_pool.tool_handler = self._execute_tool
+            if worker_pool.event_handler is None:
+                worker_pool.event_handler = self._forward_event
+            if worker_pool.session_handler is None:
+                worker_pool.session_handler = self._persist_session
+        self._worker_pool = worker_pool
+        # Session managers opened for worker sessions the core does not manage
+        self._session_managers: Dict[Path, Any] = {}
 
     @property
     def max_concurrent(self) -> int:
         """Maximum concurrent agent count."""
         return self._max_concurrent
 
+    @property
+    def worker_pool(self) -> Optional[AgentWorkerPool]:
+        """Worker-process pool agents run in, if any."""
+        return self._worker_pool
+
     @property
     def running_count(self) -> int:
         """Number of currently running agents."""
-        return sum(1 for t in self._tasks.values() if t.state == AgentState.RUNNING)
+        return self._state_counts[AgentState.RUNNING]
 
     @property
     def pending_count(self) -> int:
         """Number of pending agents."""
-        return sum(1 for t in self._tasks.values() if t.state == AgentState.PENDING)
+        return self._state_counts[AgentState.PENDING]
+
+    def _set_state(self, agent_task: AgentTask, state: AgentState) -> None:
+        """Transition an agent, keeping the state counters in step."""
+        if agent_task.state is state:
+            return
+        if self._tasks.get(agent_task.agent_id) is agent_task:
+            self._state_counts[agent_task.state] -= 1
+            self._state_counts[state] += 1
+        agent_task.state = state
 
     async def spawn_agent(
         self,
@@ -171,6 +219,7 @@ class AgentExecutor:
                 metadata=metadata or {},
             )
             self._tasks[agent_id] = agent_task
+            self._state_counts[AgentState.PENDING] += 1
 
         # Start the background task
         task = asyncio.create_task(self._run_agent(agent_task))
@@ -209,12 +258,18 @@ class AgentExecutor:
         """
         try:
             async with self._semaphore:
-                agent_task.state = AgentState.RUNNING
+                self._set_state(agent_task, AgentState.RUNNING)
                 logger.info(f"Agent '{agent_task.agent_id}' started execution")
 
-                # Execute via core.process
+                # Execute in a worker process, or in-process via core.process
                 run_scoped = getattr(self._core, "run_agent_prompt_in_session", None)
-                if callable(run_scoped) and asyncio.iscoroutinefunction(run_scoped):
+                if self._worker_pool is not None:
+                    result = await self._worker_pool.run(
+                        agent_task.agent_id,
+                        agent_task.prompt,
+                        agent_task.metadata,
+                    )
+                elif callable(run_scoped) and asyncio.iscoroutinefunction(run_scoped):
                     result = await run_scoped(
                         agent_task.agent_id,
                         agent_task.prompt,
@@ -238,8 +293,8 @@ class AgentExecutor:
 
                 outcome = classify_agent_result(result)
                 agent_task.result = str(result) if result else ""
-                agent_task.state = outcome.state
                 agent_task.error = outcome.error
+                self._set_state(agent_task, outcome.state)
                 logger.info(
                     "Agent '%s' finished with state %s",
                     agent_task.agent_id,
@@ -247,15 +302,61 @@ class AgentExecutor:
                 )
 
         except asyncio.CancelledError:
-            agent_task.state = AgentState.CANCELLED
+            self._set_state(agent_task, AgentState.CANCELLED)
             logger.info(f"Agent '{agent_task.agent_id}' was cancelled")
             raise
 
         except Exception as e:
             agent_task.error = str(e)
-            agent_task.state = AgentState.FAILED
+            self._set_state(agent_task, AgentState.FAILED)
             logger.error(f"Agent '{agent_task.agent_id}' failed: {e}")
 
+    async def _execute_tool(
+        self, agent_id: str, tool_name: str, arguments: Dict[str, Any]
+    ) -> Any:
+        """Execute a tool call forwarded by a worker process."""
+        tool_manager = getattr(self._core, "tool_manager", None)
+        if tool_manager is None:
+            raise RuntimeError("Core has no tool manager for worker tool calls")
+        return await tool_manager.execute_tool_async(
+            tool_name, arguments, context={"agent_id": agent_id}
+        )
+
+    def _persist_session(
+        self, agent_id: str, base_path: str, data: Dict[str, Any]
+    ) -> None:
+        """Write a session saved by a worker process with this process's managers."""
+        from penguin.system.session_manager import SessionManager
+        from penguin.system.state import Session
+
+        path = Path(base_path).resolve()
+        manager = self._session_managers.get(path)
+        if manager is None:
+            conversation_manager = getattr(self._core, "conversation_manager", None)
+            candidates = [getattr(conversation_manager, "session_manager", None)]
+            candidates.extend(
+                (getattr(conversation_manager, "agent_session_managers", None) or {}).values()
+            )
+            manager = next(
+                (
+                    m for m in candidates
+                    if m is not None and Path(m.base_path).resolve() == path
+                ),
+                None,
+            )
+            if manager is None:
+                manager = SessionManager(base_path=str(path), auto_save_interval=0)
+            self._session_managers[path] = manager
+        # Also replaces any stale cached copy of the session
+        if not manager.save_session(Session.from_dict(data)):
+            logger.error(f"Failed to save session for worker agent '{agent_id}'")
+
+    def _forward_event(self, agent_id: str, event: Dict[str, Any]) -> Any:
+        """Pass an event streamed by a worker to the configured callback."""
+        if self._on_event is not None:
+            return self._on_event(agent_id, event)
+        return None
+
     async def wait_for(
         self,
         agent_id: str,
@@ -376,7 +477,7 @@ class AgentExecutor:
             await agent_task.task
         except asyncio.CancelledError:
             pass
-        agent_task.state = AgentState.CANCELLED
+        self._set_state(agent_task, AgentState.CANCELLED)
         return True
 
     async def cancel_all(self) -> int:
@@ -394,6 +495,8 @@ class AgentExecutor:
     async def shutdown(self) -> int:
         """Cancel and await every unfinished background agent.
 
+        Also shuts down the worker-process pool, if any.
+
         Returns:
             Number of tasks cancelled during shutdown.
         """
@@ -406,6 +509,8 @@ class AgentExecutor:
         ]
         if unfinished:
             await asyncio.gather(*unfinished, return_exceptions=True)
+        if self._worker_pool is not None:
+            await self._worker_pool.close()
         return cancelled
 
     def pause(self, agent_id: str) -> bool:
@@ -424,7 +529,7 @@ class AgentExecutor:
         if not agent_task or agent_task.state != AgentState.RUNNING:
             return False
 
-        agent_task.state = AgentState.PAUSED
+        self._set_state(agent_task, AgentState.PAUSED)
         return True
 
     def resume(self, agent_id: str) -> bool:
@@ -440,7 +545,7 @@ class AgentExecutor:
         if not agent_task or agent_task.state != AgentState.PAUSED:
             return False
 
-        agent_task.state = AgentState.RUNNING
+        self._set_state(agent_task, AgentState.RUNNING)
         return True
 
     def cleanup(self, agent_id: str) -> bool:
@@ -460,6 +565,7 @@ class AgentExecutor:
                 AgentState.CANCELLED,
             ):
                 del self._tasks[agent_id]
+                self._state_counts[agent_task.state] -= 1
                 return True
         return False
 
@@ -481,16 +587,17 @@ class AgentExecutor:
         Returns:
             Dict with counts and settings
         """
-        state_counts = {state.value: 0 for state in AgentState}
-        for agent_task in self._tasks.values():
-            state_counts[agent_task.state.value] += 1
-
-        return {
+        stats = {
             "max_concurrent": self._max_concurrent,
             "total_agents": len(self._tasks),
-            "state_counts": state_counts,
+            "state_counts": {
+                state.value: count for state, count in self._state_counts.items()
+            },
             "semaphore_value": self._semaphore._value,
         }
+        if self._worker_pool is not None:
+            stats["workers"] = self._worker_pool.status()
+        return stats
 
 
 # Singleton instance for global access
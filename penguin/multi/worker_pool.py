@@ -0,0 +1,616 @@
+"""Worker-process pool for running sub-agents outside the owning event loop.
+
+CPU-heavy agent work (parsing, tokenization, AST analysis) in one coroutine
+stalls every other agent and the web server sharing the loop. The pool runs
+agents in separate processes and talks to them over a pipe with small
+pickled messages. Workers only think: tools run on the parent's ToolManager
+and session files are written by the parent, so workers never touch shared
+state directly.
+
+Parent -> worker:
+- ``run``: ``{job_id, agent_id, prompt, metadata}``
+- ``cancel``: ``{job_id}``
+- ``tool_result``: ``{call_id, result}`` or ``{call_id, error}``
+- ``shutdown``
+
+Worker -> parent:
+- ``ready``: ``{pid}``
+- ``event``: ``{job_id, event}`` streamed progress (chunks, tool activity)
+- ``tool_call``: ``{job_id, call_id, name, arguments}`` executed by the parent
+- ``save_session``: ``{job_id, base_path, session}`` persisted by the parent
+- ``result`` / ``error`` / ``cancelled``: ``{job_id, ...}`` terminal replies
+
+Agents are assigned to workers stickily: an agent's later runs go to the same
+worker (while it is alive) so per-agent state and warm caches in that process
+are reused. New agents go to the least-loaded worker.
+
+A runner is an ``async def runner(job: WorkerJob) -> Any`` importable as
+``"module:function"`` in the worker process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import importlib
+import inspect
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUNNER = "penguin.multi.worker_pool:run_core_agent"
+
+ToolHandler = Callable[[str, str, Dict[str, Any]], Awaitable[Any]]
+EventHandler = Callable[[str, Dict[str, Any]], Any]
+SessionHandler = Callable[[str, str, Dict[str, Any]], Any]
+
+
+class WorkerError(RuntimeError):
+    """An agent job failed inside a worker process or the worker died."""
+
+
+def _import_runner(path: str) -> Callable[["WorkerJob"], Awaitable[Any]]:
+    module_name, _, attr = path.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Runner must be 'module:function', got {path!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _portable(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Metadata values that can safely cross the process boundary."""
+    simple = (str, int, float, bool, type(None), list, tuple, dict)
+    return {k: v for k, v in (metadata or {}).items() if isinstance(v, simple)}
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+# The job whose runner is executing; tool calls and session saves made by
+# code it calls (in tasks or threads it starts) are attributed to it.
+_current_job: contextvars.ContextVar[Optional["WorkerJob"]] = contextvars.ContextVar(
+    "penguin_worker_job", default=None
+)
+
+
+class WorkerJob:
+    """One agent run inside a worker process, as seen by the runner."""
+
+    def __init__(self, runtime: "_WorkerRuntime", message: Dict[str, Any]):
+        self._runtime = runtime
+        self.job_id: str = message["job_id"]
+        self.agent_id: str = message["agent_id"]
+        self.prompt: str = message.get("prompt", "")
+        self.metadata: Dict[str, Any] = message.get("metadata") or {}
+        # Survives across runs of the same agent on this worker
+        self.state: Dict[str, Any] = runtime.agent_state.setdefault(self.agent_id, {})
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """Stream an event to the parent."""
+        self._runtime.send({"type": "event", "job_id": self.job_id, "event": event})
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """Ask the parent process to execute a tool and wait for its result."""
+        call_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._runtime.tool_calls[call_id] = future
+        self._runtime.send({
+            "type": "tool_call",
+            "job_id": self.job_id,
+            "call_id": call_id,
+            "name": name,
+            "arguments": arguments or {},
+        })
+        try:
+            return await future
+        finally:
+            self._runtime.tool_calls.pop(call_id, None)
+
+    def call_tool_sync(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """Blocking ``call_tool`` for synchronous callers.
+
+        The reply is picked up by the inbox thread, so this may block the
+        worker's event loop (as a local synchronous tool would).
+        """
+        call_id = uuid.uuid4().hex
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._runtime.sync_tool_calls[call_id] = future
+        self._runtime.send({
+            "type": "tool_call",
+            "job_id": self.job_id,
+            "call_id": call_id,
+            "name": name,
+            "arguments": arguments or {},
+        })
+        try:
+            return future.result()
+        finally:
+            self._runtime.sync_tool_calls.pop(call_id, None)
+
+    def save_session(self, base_path: str, session: Dict[str, Any]) -> None:
+        """Have the parent write a serialized session under ``base_path``."""
+        self._runtime.send({
+            "type": "save_session",
+            "job_id": self.job_id,
+            "base_path": base_path,
+            "session": session,
+        })
+
+
+class _WorkerRuntime:
+    def __init__(self, conn, runner_path: str):
+        self.conn = conn
+        self.runner = _import_runner(runner_path)
+        self.jobs: Dict[str, asyncio.Task] = {}
+        self.tool_calls: Dict[str, asyncio.Future] = {}
+        self.sync_tool_calls: Dict[str, concurrent.futures.Future] = {}
+        self.agent_state: Dict[str, Dict[str, Any]] = {}
+        self._send_lock = threading.Lock()
+
+    def send(self, message: Dict[str, Any]) -> None:
+        with self._send_lock:
+            try:
+                self.conn.send(message)
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+
+    async def serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        inbox: asyncio.Queue = asyncio.Queue()
+
+        def pump() -> None:
+            while True:
+                try:
+                    message = self.conn.recv()
+                except (EOFError, OSError):
+                    message = {"type": "shutdown"}
+                if self._resolve_sync_call(message):
+                    continue
+                loop.call_soon_threadsafe(inbox.put_nowait, message)
+                if message.get("type") == "shutdown":
+                    for future in list(self.sync_tool_calls.values()):
+                        if not future.done():
+                            future.set_exception(WorkerError("Worker is shutting down"))
+                    return
+
+        threading.Thread(target=pump, name="agent-worker-inbox", daemon=True).start()
+        self.send({"type": "ready", "pid": os.getpid()})
+
+        while True:
+            message = await inbox.get()
+            kind = message.get("type")
+            if kind == "run":
+                job = WorkerJob(self, message)
+                self.jobs[job.job_id] = asyncio.create_task(self._run(job))
+            elif kind == "cancel":
+                task = self.jobs.get(message.get("job_id"))
+                if task:
+                    task.cancel()
+            elif kind == "tool_result":
+                future = self.tool_calls.get(message.get("call_id"))
+                if future and not future.done():
+                    if "error" in message:
+                        future.set_exception(WorkerError(message["error"]))
+                    else:
+                        future.set_result(message.get("result"))
+            elif kind == "shutdown":
+                for task in self.jobs.values():
+                    task.cancel()
+                await asyncio.gather(*self.jobs.values(), return_exceptions=True)
+                return
+
+    def _resolve_sync_call(self, message: Dict[str, Any]) -> bool:
+        if message.get("type") != "tool_result":
+            return False
+        future = self.sync_tool_calls.get(message.get("call_id"))
+        if future is None:
+            return False
+        if "error" in message:
+            future.set_exception(WorkerError(message["error"]))
+        else:
+            future.set_result(message.get("result"))
+        return True
+
+    async def _run(self, job: WorkerJob) -> None:
+        _current_job.set(job)  # This task has its own context
+        try:
+            result = await self.runner(job)
+        except asyncio.CancelledError:
+            self.send({"type": "cancelled", "job_id": job.job_id})
+            return
+        except Exception as e:
+            logger.exception(f"Agent '{job.agent_id}' failed in worker")
+            self.send({"type": "error", "job_id": job.job_id, "error": str(e) or type(e).__name__})
+            return
+        finally:
+            self.jobs.pop(job.job_id, None)
+
+        reply = {"type": "result", "job_id": job.job_id, "result": result}
+        try:
+            self.send(reply)
+        except Exception:
+            # Unpicklable result; the executor stringifies results anyway
+            self.send({"type": "result", "job_id": job.job_id, "result": str(result)})
+
+
+def _worker_main(conn, runner_path: str) -> None:
+    logging.basicConfig(level=os.environ.get("PENGUIN_AGENT_WORKER_LOG_LEVEL", "WARNING"))
+    asyncio.run(_WorkerRuntime(conn, runner_path).serve())
+
+
+def _job_for(what: str) -> WorkerJob:
+    job = _current_job.get()
+    if job is None:
+        raise WorkerError(f"{what} outside of an agent job cannot reach the parent process")
+    return job
+
+
+def route_tools_to_parent(tool_manager: Any) -> None:
+    """Make a worker-side ToolManager execute every tool in the parent.
+
+    Replaces ``execute_tool`` and ``execute_tool_async`` on this instance with
+    calls over the pipe for the job that is running.
+    """
+
+    def execute_tool(tool_name: str, tool_input: Dict[str, Any], context: Any = None) -> Any:
+        return _job_for(f"Tool {tool_name!r}").call_tool_sync(tool_name, tool_input)
+
+    async def execute_tool_async(tool_name: str, tool_input: Dict[str, Any], context: Any = None) -> Any:
+        return await _job_for(f"Tool {tool_name!r}").call_tool(tool_name, tool_input)
+
+    tool_manager.execute_tool = execute_tool
+    tool_manager.execute_tool_async = execute_tool_async
+
+
+def save_session_in_parent(manager: Any, session: Any) -> bool:
+    """Session writer for worker processes (see ``set_session_writer``)."""
+    job = _current_job.get()
+    if job is None:
+        logger.debug(f"Not saving session {session.id} outside of an agent job")
+        return False
+    job.save_session(str(manager.base_path), session.to_dict())
+    return True
+
+
+_worker_core = None
+
+
+async def run_core_agent(job: WorkerJob) -> Any:
+    """Default runner: a PenguinCore per worker process, shared by its agents.
+
+    The worker's core only runs the model loop. Its tool calls are executed
+    by the parent's ToolManager and its sessions are saved by the parent.
+    """
+    global _worker_core
+    if _worker_core is None:
+        from penguin.core import PenguinCore
+        from penguin.system.session_manager import set_session_writer
+
+        set_session_writer(save_session_in_parent)
+        _worker_core = await PenguinCore.create(enable_cli=False, show_progress=False)
+        route_tools_to_parent(_worker_core.tool_manager)
+
+    def on_chunk(chunk: Any, *args: Any) -> None:
+        job.emit({"type": "stream_chunk", "chunk": str(chunk)})
+
+    kwargs: Dict[str, Any] = {
+        "input_data": {"text": job.prompt},
+        "agent_id": job.agent_id,
+        "streaming": True,
+        "stream_callback": on_chunk,
+    }
+    session_id = job.metadata.get("session_id")
+    if isinstance(session_id, str) and session_id.strip():
+        kwargs["conversation_id"] = session_id.strip()
+    return await _worker_core.process(**kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Job:
+    job_id: str
+    agent_id: str
+    worker: "_WorkerHandle"
+    future: asyncio.Future
+
+
+@dataclass
+class _WorkerHandle:
+    index: int
+    process: Any
+    conn: Any
+    ready: asyncio.Future
+    pid: Optional[int] = None
+    alive: bool = True
+    jobs: Set[str] = field(default_factory=set)
+    agents: Set[str] = field(default_factory=set)
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        with self.send_lock:
+            self.conn.send(message)
+
+
+class AgentWorkerPool:
+    """A fixed number of agent worker processes with sticky assignment."""
+
+    def __init__(
+        self,
+        size: int,
+        runner: str = DEFAULT_RUNNER,
+        tool_handler: Optional[ToolHandler] = None,
+        event_handler: Optional[EventHandler] = None,
+        session_handler: Optional[SessionHandler] = None,
+        start_method: str = "spawn",
+        startup_timeout: float = 60.0,
+    ):
+        """Initialize the pool; workers start on first use.
+
+        Args:
+            size: Number of worker processes
+            runner: ``"module:function"`` run for each job in the worker
+            tool_handler: ``async (agent_id, name, arguments)`` executing
+                tool calls forwarded by workers
+            event_handler: ``(agent_id, event)`` receiving streamed events
+            session_handler: ``(agent_id, base_path, session)`` writing
+                sessions saved by workers
+            start_method: multiprocessing start method
+            startup_timeout: Seconds to wait for a worker to report ready
+        """
+        self.size = max(1, size)
+        self.runner = runner
+        self.tool_handler = tool_handler
+        self.event_handler = event_handler
+        self.session_handler = session_handler
+        self.startup_timeout = startup_timeout
+        self._mp = multiprocessing.get_context(start_method)
+        self._workers: List[Optional[_WorkerHandle]] = [None] * self.size
+        self._assignments: Dict[str, int] = {}
+        self._jobs: Dict[str, _Job] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        """Start every worker and wait until they are ready."""
+        await asyncio.gather(*(self._worker(i) for i in range(self.size)))
+
+    async def _worker(self, index: int) -> _WorkerHandle:
+        if self._closed:
+            raise WorkerError("Worker pool is closed")
+        handle = self._workers[index]
+        if handle is None or not handle.alive:
+            handle = self._spawn(index)
+        await asyncio.wait_for(asyncio.shield(handle.ready), self.startup_timeout)
+        return handle
+
+    def _spawn(self, index: int) -> _WorkerHandle:
+        self._loop = asyncio.get_running_loop()
+        parent_conn, child_conn = self._mp.Pipe()
+        process = self._mp.Process(
+            target=_worker_main,
+            args=(child_conn, self.runner),
+            name=f"penguin-agent-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        handle = _WorkerHandle(
+            index=index,
+            process=process,
+            conn=parent_conn,
+            ready=self._loop.create_future(),
+        )
+        self._workers[index] = handle
+        threading.Thread(
+            target=self._read_loop,
+            args=(handle, self._loop),
+            name=f"agent-worker-reader-{index}",
+            daemon=True,
+        ).start()
+        logger.info(f"Started agent worker {index} (pid {process.pid})")
+        return handle
+
+    def _read_loop(self, handle: _WorkerHandle, loop: asyncio.AbstractEventLoop) -> None:
+        while True:
+            try:
+                message = handle.conn.recv()
+            except (EOFError, OSError):
+                message = {"type": "exited"}
+            try:
+                loop.call_soon_threadsafe(self._dispatch, handle, message)
+            except RuntimeError:
+                return  # loop closed
+            if message.get("type") == "exited":
+                return
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Shut every worker down, terminating any that do not exit."""
+        self._closed = True
+        handles = [h for h in self._workers if h is not None]
+        for handle in handles:
+            if handle.alive:
+                try:
+                    handle.send({"type": "shutdown"})
+                except (BrokenPipeError, OSError):
+                    pass
+
+        def join_all() -> None:
+            for handle in handles:
+                handle.process.join(timeout)
+                if handle.process.is_alive():
+                    handle.process.terminate()
+                    handle.process.join(1)
+
+        await asyncio.get_running_loop().run_in_executor(None, join_all)
+        for handle in handles:
+            self._fail_worker_jobs(handle, "Worker pool closed")
+            handle.conn.close()
+
+    # Scheduling
+
+    def _pick_worker(self, agent_id: str) -> int:
+        index = self._assignments.get(agent_id)
+        if index is not None:
+            handle = self._workers[index]
+            if handle is None or handle.alive:
+                return index
+
+        def load(i: int):
+            handle = self._workers[i]
+            if handle is None or not handle.alive:
+                return (0, 0)
+            return (len(handle.jobs), len(handle.agents))
+
+        index = min(range(self.size), key=load)
+        self._assignments[agent_id] = index
+        return index
+
+    async def run(
+        self,
+        agent_id: str,
+        prompt: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Run one agent job on its worker and return the runner's result.
+
+        Cancelling the awaiting task sends ``cancel`` to the worker.
+        """
+        handle = await self._worker(self._pick_worker(agent_id))
+        job = _Job(
+            job_id=uuid.uuid4().hex,
+            agent_id=agent_id,
+            worker=handle,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._jobs[job.job_id] = job
+        handle.jobs.add(job.job_id)
+        handle.agents.add(agent_id)
+        try:
+            handle.send({
+                "type": "run",
+                "job_id": job.job_id,
+                "agent_id": agent_id,
+                "prompt": prompt,
+                "metadata": _portable(metadata),
+            })
+            return await job.future
+        except asyncio.CancelledError:
+            if handle.alive:
+                try:
+                    handle.send({"type": "cancel", "job_id": job.job_id})
+                except (BrokenPipeError, OSError):
+                    pass
+            raise
+        finally:
+            self._jobs.pop(job.job_id, None)
+            handle.jobs.discard(job.job_id)
+
+    # Message handling (on the owning loop)
+
+    def _dispatch(self, handle: _WorkerHandle, message: Dict[str, Any]) -> None:
+        kind = message.get("type")
+        if kind == "ready":
+            handle.pid = message.get("pid")
+            if not handle.ready.done():
+                handle.ready.set_result(None)
+            return
+        if kind == "exited":
+            handle.alive = False
+            if not handle.ready.done():
+                handle.ready.set_exception(WorkerError("Agent worker exited during startup"))
+            self._fail_worker_jobs(handle, "Agent worker exited")
+            return
+
+        job = self._jobs.get(message.get("job_id"))
+        if job is None:
+            return
+        if kind == "event":
+            self._emit(job.agent_id, message.get("event") or {})
+        elif kind == "tool_call":
+            asyncio.ensure_future(self._handle_tool_call(handle, job, message))
+        elif kind == "save_session":
+            self._save_session(job, message)
+        elif job.future.done():
+            return
+        elif kind == "result":
+            job.future.set_result(message.get("result"))
+        elif kind == "error":
+            job.future.set_exception(WorkerError(message.get("error") or "Agent failed"))
+        elif kind == "cancelled":
+            job.future.set_exception(WorkerError("Agent was cancelled in its worker"))
+
+    def _emit(self, agent_id: str, event: Dict[str, Any]) -> None:
+        if self.event_handler is None:
+            return
+        try:
+            outcome = self.event_handler(agent_id, event)
+            if inspect.isawaitable(outcome):
+                asyncio.ensure_future(outcome)
+        except Exception as e:
+            logger.warning(f"Agent event handler failed: {e}")
+
+    def _save_session(self, job: _Job, message: Dict[str, Any]) -> None:
+        # Handled before the job's result, which arrives later on the same pipe
+        if self.session_handler is None:
+            logger.warning(f"Dropping session saved by agent '{job.agent_id}': no session handler")
+            return
+        try:
+            self.session_handler(job.agent_id, message.get("base_path", ""), message.get("session") or {})
+        except Exception as e:
+            logger.error(f"Could not save session for agent '{job.agent_id}': {e}")
+
+    async def _handle_tool_call(self, handle: _WorkerHandle, job: _Job, message: Dict[str, Any]) -> None:
+        reply: Dict[str, Any] = {"type": "tool_result", "call_id": message.get("call_id")}
+        try:
+            if self.tool_handler is None:
+                raise WorkerError("No tool handler configured for worker pool")
+            reply["result"] = await self.tool_handler(
+                job.agent_id, message.get("name", ""), message.get("arguments") or {}
+            )
+        except Exception as e:
+            reply.pop("result", None)
+            reply["error"] = str(e) or type(e).__name__
+        if handle.alive:
+            try:
+                handle.send(reply)
+            except Exception as e:
+                logger.warning(f"Could not return tool result to worker: {e}")
+
+    def _fail_worker_jobs(self, handle: _WorkerHandle, reason: str) -> None:
+        for job_id in list(handle.jobs):
+            job = self._jobs.get(job_id)
+            if job and not job.future.done():
+                job.future.set_exception(WorkerError(reason))
+        handle.agents.clear()
+
+    # Introspection
+
+    def worker_for(self, agent_id: str) -> Optional[int]:
+        """Index of the worker an agent is assigned to, if any."""
+        return self._assignments.get(agent_id)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Per-worker pid, liveness and load."""
+        return [
+            {
+                "index": i,
+                "pid": handle.pid if handle else None,
+                "alive": bool(handle and handle.alive),
+                "active_jobs": len(handle.jobs) if handle else 0,
+                "agents": len(handle.agents) if handle else 0,
+            }
+            for i, handle in enumerate(self._workers)
+        ]
@@ -20,7 +20,7 @@ from .backend import (
     WorkflowResult,
 )
 from .state import WorkflowState, WorkflowStateStorage
-from .config import OrchestrationConfig, get_backend
+from .config import OrchestrationConfig, get_backend, shutdown_backend
 
 __all__ = [
     # Backend interface
@@ -35,5 +35,6 @@ __all__ = [
     # Config and factory
     "OrchestrationConfig",
     "get_backend",
+    "shutdown_backend",
 ]
 
@@ -295,3 +295,6 @@ class OrchestrationBackend(ABC):
         """Get workflow artifacts."""
         result = await self.query_workflow(workflow_id, "artifacts")
         return result if isinstance(result, dict) else None
+    
+    async def shutdown(self) -> None:
+        """Persist pending state and release resources before exit."""
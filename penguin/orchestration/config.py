@@ -64,6 +64,11 @@ class OrchestrationConfig:
     # Cleanup settings
     cleanup_completed_after_days: int = 30
     
+    # Native backend: seconds non-critical state writes are coalesced for
+    # before being flushed in one transaction (phase completions and
+    # terminal states are always flushed immediately)
+    state_flush_interval_sec: float = 0.5
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "OrchestrationConfig":
         """Create config from dictionary (e.g., from config.yml)."""
@@ -99,6 +104,7 @@ class OrchestrationConfig:
             default_max_retries=data.get("default_max_retries", 3),
             default_retry_delay_sec=data.get("default_retry_delay_sec", 5),
             cleanup_completed_after_days=data.get("cleanup_completed_after_days", 30),
+            state_flush_interval_sec=data.get("state_flush_interval_sec", 0.5),
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -123,6 +129,7 @@ class OrchestrationConfig:
             "default_max_retries": self.default_max_retries,
             "default_retry_delay_sec": self.default_retry_delay_sec,
             "cleanup_completed_after_days": self.cleanup_completed_after_days,
+            "state_flush_interval_sec": self.state_flush_interval_sec,
         }
 
 
@@ -196,6 +203,14 @@ def get_backend(
     return _backend
 
 
+async def shutdown_backend() -> None:
+    """Shut down the active backend, writing any pending workflow state."""
+    global _backend
+    backend, _backend = _backend, None
+    if backend is not None:
+        await backend.shutdown()
+
+
 def reset_backend() -> None:
     """Reset the backend instance (for testing)."""
     global _backend
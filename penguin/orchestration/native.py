@@ -25,14 +25,45 @@ from .state import WorkflowState, WorkflowStateStorage
 logger = logging.getLogger(__name__)
 
 
+class _WorkflowControl:
+    """Pause/cancel flags for one workflow, awaitable through a condition."""
+
+    def __init__(self) -> None:
+        self.paused = False
+        self.cancelled = False
+        self._condition = asyncio.Condition()
+
+    async def set(self, paused: Optional[bool] = None, cancelled: Optional[bool] = None) -> None:
+        async with self._condition:
+            if paused is not None:
+                self.paused = paused
+            if cancelled is not None:
+                self.cancelled = cancelled
+            self._condition.notify_all()
+
+    async def wait_runnable(self) -> bool:
+        """Block while paused; False once the workflow is cancelled."""
+        if self.paused and not self.cancelled:
+            async with self._condition:
+                await self._condition.wait_for(lambda: not self.paused or self.cancelled)
+        return not self.cancelled
+
+
 class NativeBackend(OrchestrationBackend):
     """Native orchestration backend using in-memory execution with SQLite persistence.
     
     This backend:
     - Executes ITUV phases sequentially in-process
     - Persists workflow state to SQLite for recovery
-    - Supports pause/resume via in-memory flags
+    - Supports pause/resume/cancel via awaitable per-workflow signals
     - Does NOT survive process restarts mid-execution (use Temporal for that)
+
+    State writes are coalesced: routine updates (phase start, snapshot ids)
+    are batched across workflows and flushed every
+    ``config.state_flush_interval_sec`` in one transaction. Completed phases
+    are group-committed before the next phase starts, and signals and
+    terminal states are written immediately, so recovery never loses a
+    finished phase or a final status.
     """
     
     def __init__(
@@ -51,9 +82,16 @@ class NativeBackend(OrchestrationBackend):
         
         # In-memory tracking of active workflows
         self._active_workflows: Dict[str, asyncio.Task] = {}
-        self._paused_workflows: set = set()
-        self._cancelled_workflows: set = set()
+        self._controls: Dict[str, _WorkflowControl] = {}
+        self._live_states: Dict[str, WorkflowState] = {}
         self._feedback_queues: Dict[str, asyncio.Queue] = {}
+
+        # Coalesced state writes
+        self._pending_states: Dict[str, WorkflowState] = {}
+        self._flush_waiters: List[asyncio.Future] = []
+        self._flush_now: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self.persist_stats = {"flushes": 0, "states_written": 0}
         
         # Reference to core/engine (set by ProjectManager)
         self._core = None
@@ -101,7 +139,9 @@ class NativeBackend(OrchestrationBackend):
         )
         
         # Persist state
-        self.storage.save_state(state)
+        self._save_now(state)
+        self._live_states[workflow_id] = state
+        self._controls[workflow_id] = _WorkflowControl()
         
         # Create feedback queue for this workflow
         self._feedback_queues[workflow_id] = asyncio.Queue()
@@ -115,14 +155,14 @@ class NativeBackend(OrchestrationBackend):
     
     async def get_workflow_status(self, workflow_id: str) -> Optional[WorkflowInfo]:
         """Get current status of a workflow."""
-        state = self.storage.get_state(workflow_id)
+        state = self._load_state(workflow_id)
         if not state:
             return None
         return state.to_info()
     
     async def get_workflow_result(self, workflow_id: str) -> Optional[WorkflowResult]:
         """Get the final result of a completed workflow."""
-        state = self.storage.get_state(workflow_id)
+        state = self._load_state(workflow_id)
         if not state:
             return None
         
@@ -151,36 +191,40 @@ class NativeBackend(OrchestrationBackend):
         payload: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Send a signal to a running workflow."""
-        state = self.storage.get_state(workflow_id)
+        state = self._load_state(workflow_id)
         if not state:
             return False
+        control = self._controls.get(workflow_id)
         
         if signal == "pause":
-            self._paused_workflows.add(workflow_id)
+            if control:
+                await control.set(paused=True)
             state.status = WorkflowStatus.PAUSED
             state.updated_at = datetime.utcnow()
-            self.storage.save_state(state)
+            self._save_now(state)
             logger.info(f"Paused workflow {workflow_id}")
             return True
         
         elif signal == "resume":
-            self._paused_workflows.discard(workflow_id)
             if state.status == WorkflowStatus.PAUSED:
                 state.status = WorkflowStatus.RUNNING
                 state.updated_at = datetime.utcnow()
-                self.storage.save_state(state)
+                self._save_now(state)
+            if control:
+                await control.set(paused=False)
             logger.info(f"Resumed workflow {workflow_id}")
             return True
         
         elif signal == "cancel":
-            self._cancelled_workflows.add(workflow_id)
-            # Cancel the asyncio task if running
-            if workflow_id in self._active_workflows:
-                self._active_workflows[workflow_id].cancel()
             state.status = WorkflowStatus.CANCELLED
             state.completed_at = datetime.utcnow()
             state.updated_at = datetime.utcnow()
-            self.storage.save_state(state)
+            self._save_now(state)
+            if control:
+                await control.set(cancelled=True)
+            # Cancel the asyncio task if running
+            if workflow_id in self._active_workflows:
+                self._active_workflows[workflow_id].cancel()
             logger.info(f"Cancelled workflow {workflow_id}")
             return True
         
@@ -199,7 +243,7 @@ class NativeBackend(OrchestrationBackend):
         query: str,
     ) -> Optional[Any]:
         """Query a running workflow for information."""
-        state = self.storage.get_state(workflow_id)
+        state = self._load_state(workflow_id)
         if not state:
             return None
         
@@ -232,6 +276,7 @@ class NativeBackend(OrchestrationBackend):
         limit: int = 100,
     ) -> List[WorkflowInfo]:
         """List workflows with optional filtering."""
+        self.flush_states()
         states = self.storage.list_states(project_id, status_filter, limit)
         return [s.to_info() for s in states]
     
@@ -240,14 +285,98 @@ class NativeBackend(OrchestrationBackend):
         older_than_days: int = 30,
     ) -> int:
         """Clean up old completed workflows."""
+        self.flush_states()
         return self.storage.cleanup_old(older_than_days)
+
+    async def shutdown(self) -> None:
+        """Stop the background flusher and write any pending state."""
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        self.flush_states()
+
+    # State persistence
+
+    def _load_state(self, workflow_id: str) -> Optional[WorkflowState]:
+        """The live in-memory state for running workflows, else storage."""
+        state = self._live_states.get(workflow_id) or self._pending_states.get(workflow_id)
+        return state or self.storage.get_state(workflow_id)
+
+    def _save_now(self, state: WorkflowState) -> None:
+        """Write a state immediately (signals, terminal states)."""
+        self._pending_states.pop(state.workflow_id, None)
+        self.storage.save_state(state)
+
+    def _mark_dirty(self, state: WorkflowState) -> None:
+        """Queue a routine state update for the next coalesced flush."""
+        self._pending_states[state.workflow_id] = state
+        self._ensure_flusher()
+
+    async def _persist_durable(self, state: WorkflowState) -> None:
+        """Queue a state and wait until the batch containing it is written.
+
+        Concurrent callers in the same tick share one transaction.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._flush_waiters.append(future)
+        self._mark_dirty(state)
+        self._flush_now.set()
+        await future
+
+    def flush_states(self) -> None:
+        """Write every pending state in one transaction."""
+        pending, self._pending_states = self._pending_states, {}
+        waiters, self._flush_waiters = self._flush_waiters, []
+        try:
+            self.storage.save_states(list(pending.values()))
+        except Exception as e:
+            logger.error(f"Failed to persist {len(pending)} workflow states: {e}")
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        if pending:
+            self.persist_stats["flushes"] += 1
+            self.persist_stats["states_written"] += len(pending)
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+    def _ensure_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._flusher is not None and self._flusher.get_loop() is not loop:
+            # The backend outlived the loop its flusher ran on
+            self._flusher = None
+            self._flush_now = None
+        if self._flush_now is None:
+            self._flush_now = asyncio.Event()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while self._pending_states or self._flush_waiters:
+            try:
+                await asyncio.wait_for(
+                    self._flush_now.wait(),
+                    timeout=self.config.state_flush_interval_sec,
+                )
+            except asyncio.TimeoutError:
+                pass
+            # Let other workflows finishing in this tick join the batch
+            await asyncio.sleep(0)
+            self._flush_now.clear()
+            self.flush_states()
     
     # Internal workflow execution
     
     async def _run_workflow(self, workflow_id: str) -> None:
         """Execute the ITUV workflow phases."""
+        control = self._controls.get(workflow_id) or _WorkflowControl()
         try:
-            state = self.storage.get_state(workflow_id)
+            state = self._load_state(workflow_id)
             if not state:
                 return
             
@@ -262,23 +391,14 @@ class NativeBackend(OrchestrationBackend):
             progress_per_phase = 100 // len(phases)
             
             for i, phase in enumerate(phases):
-                # Check for cancellation
-                if workflow_id in self._cancelled_workflows:
-                    break
-                
-                # Wait while paused
-                while workflow_id in self._paused_workflows:
-                    await asyncio.sleep(0.5)
-                    if workflow_id in self._cancelled_workflows:
-                        break
-                
-                if workflow_id in self._cancelled_workflows:
+                # Wait while paused; wakes as soon as resumed or cancelled
+                if not await control.wait_runnable():
                     break
                 
                 # Update state to current phase
                 state.phase = phase
                 state.updated_at = datetime.utcnow()
-                self.storage.save_state(state)
+                self._mark_dirty(state)
                 
                 # Execute phase
                 phase_result = await self._execute_phase(workflow_id, phase, state)
@@ -287,49 +407,53 @@ class NativeBackend(OrchestrationBackend):
                 # Update progress
                 state.progress = (i + 1) * progress_per_phase
                 state.updated_at = datetime.utcnow()
-                self.storage.save_state(state)
                 
                 # Check phase result
                 if not phase_result.success:
                     state.status = WorkflowStatus.FAILED
                     state.error_message = phase_result.error_message
                     state.completed_at = datetime.utcnow()
-                    self.storage.save_state(state)
+                    self._save_now(state)
                     logger.warning(f"Workflow {workflow_id} failed at phase {phase.value}")
                     return
+                
+                # A finished phase must survive a crash; the last one is
+                # covered by the terminal write below
+                if i < len(phases) - 1:
+                    await self._persist_durable(state)
             
             # All phases completed successfully
-            if workflow_id not in self._cancelled_workflows:
+            if not control.cancelled:
                 state.status = WorkflowStatus.COMPLETED
                 state.phase = WorkflowPhase.COMPLETED
                 state.progress = 100
                 state.completed_at = datetime.utcnow()
-                self.storage.save_state(state)
+                self._save_now(state)
                 logger.info(f"Workflow {workflow_id} completed successfully")
         
         except asyncio.CancelledError:
             logger.info(f"Workflow {workflow_id} was cancelled")
-            state = self.storage.get_state(workflow_id)
+            state = self._load_state(workflow_id)
             if state:
                 state.status = WorkflowStatus.CANCELLED
                 state.completed_at = datetime.utcnow()
-                self.storage.save_state(state)
+                self._save_now(state)
         
         except Exception as e:
             logger.error(f"Workflow {workflow_id} failed with error: {e}")
-            state = self.storage.get_state(workflow_id)
+            state = self._load_state(workflow_id)
             if state:
                 state.status = WorkflowStatus.FAILED
                 state.error_message = str(e)
                 state.completed_at = datetime.utcnow()
-                self.storage.save_state(state)
+                self._save_now(state)
         
         finally:
             # Cleanup
             self._active_workflows.pop(workflow_id, None)
             self._feedback_queues.pop(workflow_id, None)
-            self._paused_workflows.discard(workflow_id)
-            self._cancelled_workflows.discard(workflow_id)
+            self._controls.pop(workflow_id, None)
+            self._live_states.pop(workflow_id, None)
     
     async def _execute_phase(
         self,
@@ -436,7 +560,7 @@ class NativeBackend(OrchestrationBackend):
                     conversation_history=result.get("conversation_history", []),
                 )
                 state.context_snapshot_id = snapshot.snapshot_id
-                self.storage.save_state(state)
+                self._mark_dirty(state)
             
             return True, artifacts
         
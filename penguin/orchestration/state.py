@@ -256,8 +256,14 @@ class WorkflowStateStorage:
     
     def save_state(self, state: WorkflowState) -> None:
         """Save or update workflow state."""
+        self.save_states([state])
+
+    def save_states(self, states: List[WorkflowState]) -> None:
+        """Save or update several workflow states in one transaction."""
+        if not states:
+            return
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+            conn.executemany("""
                 INSERT OR REPLACE INTO workflow_states (
                     workflow_id, task_id, blueprint_id, project_id,
                     status, phase, progress,
@@ -265,7 +271,7 @@ class WorkflowStateStorage:
                     context_snapshot_id, phase_results, artifacts,
                     error_message, retry_count, config
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            """, [(
                 state.workflow_id,
                 state.task_id,
                 state.blueprint_id,
@@ -282,7 +288,7 @@ class WorkflowStateStorage:
                 state.error_message,
                 state.retry_count,
                 json.dumps(state.config),
-            ))
+            ) for state in states])
             conn.commit()
     
     def get_state(self, workflow_id: str) -> Optional[WorkflowState]:
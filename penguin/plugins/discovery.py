@@ -3,6 +3,12 @@ Plugin discovery system for Penguin.
 
 Handles automatic discovery of plugins from directories, Python packages,
 and entry points.
+
+Results are cached per plugin directory and file, keyed by file signatures:
+unchanged manifests are not re-parsed, Python files already known not to be
+plugins are not re-imported, and entry points are resolved once per
+discovery instance. Pass ``refresh=True`` to ``discover_all`` to bypass the
+caches.
 """
 
 import os
@@ -13,14 +19,23 @@ import importlib
 import importlib.util
 from importlib.metadata import entry_points
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Union, Any
+from typing import Dict, List, Optional, Set, Tuple, Union, Any
 import logging
 
 from .base_plugin import BasePlugin, PluginMetadata, ToolDefinition, ActionDefinition
 from .decorators import get_tools_from_module, get_actions_from_module
+from penguin.utils.discovery_cache import (
+    DEFAULT_IGNORED_DIRS,
+    DiscoveryCache,
+    default_cache_path,
+    file_signature,
+)
 
 logger = logging.getLogger(__name__)
 
+_MANIFEST_NAMES = ("plugin.yml", "plugin.yaml", "plugin.json", "pyproject.toml")
+_MAX_CACHED_ENTRIES = 4096
+
 
 class PluginDiscovery:
     """
@@ -31,6 +46,9 @@ class PluginDiscovery:
         self,
         plugin_dirs: Optional[List[Union[str, Path]]] = None,
         entry_point_group: str = "penguin.plugins",
+        cache_path: Optional[Union[str, Path]] = None,
+        use_cache: bool = True,
+        ignored_dirs: Optional[Set[str]] = None,
     ):
         """
         Initialize plugin discovery.
@@ -38,19 +56,43 @@ class PluginDiscovery:
         Args:
             plugin_dirs: List of directories to search for plugins
             entry_point_group: Entry point group name for setuptools plugins
+            cache_path: Persistent discovery cache file (default under
+                ``PENGUIN_CACHE_DIR``)
+            use_cache: Persist discovery results between runs
+            ignored_dirs: Directory names never treated as plugins
         """
         self.plugin_dirs = plugin_dirs or []
         self.entry_point_group = entry_point_group
+        self.ignored_dirs = (
+            set(ignored_dirs) if ignored_dirs is not None else set(DEFAULT_IGNORED_DIRS)
+        )
         self.discovered_plugins: Dict[str, Dict[str, Any]] = {}
+        self._cache = DiscoveryCache(
+            (cache_path or default_cache_path("plugins")) if use_cache else None
+        )
+        # plugin file -> (signature, plugin info) for files imported this process
+        self._file_results: Dict[str, Tuple[Optional[List[int]], Dict[str, Any]]] = {}
+        self._entry_point_results: Optional[Dict[str, Dict[str, Any]]] = None
+        self._seen: Set[str] = set()
 
-    def discover_all(self) -> Dict[str, Dict[str, Any]]:
+    def discover_all(self, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
         """
         Discover plugins from all configured sources.
 
+        Args:
+            refresh: Ignore cached results and rescan everything
+
         Returns:
             Dictionary mapping plugin names to plugin information
         """
         self.discovered_plugins.clear()
+        self._seen.clear()
+        if refresh:
+            self._file_results.clear()
+            self._entry_point_results = None
+            self._cache.section("directories").clear()
+            self._cache.section("files").clear()
+            self._cache.mark_dirty()
 
         # Discover from directories
         for plugin_dir in self.plugin_dirs:
@@ -62,9 +104,20 @@ class PluginDiscovery:
         # Discover from current Python path
         self._discover_from_python_path()
 
+        self._prune_cache()
+        self._cache.save()
         logger.info(f"Discovered {len(self.discovered_plugins)} plugins")
         return self.discovered_plugins.copy()
 
+    def _prune_cache(self) -> None:
+        """Keep the persistent cache bounded by dropping entries unseen this run."""
+        for name in ("directories", "files"):
+            section = self._cache.section(name)
+            if len(section) > _MAX_CACHED_ENTRIES:
+                for key in [key for key in section if key not in self._seen]:
+                    del section[key]
+                self._cache.mark_dirty()
+
     def _discover_from_directory(self, plugin_dir: Union[str, Path]) -> None:
         """Discover plugins from a directory"""
         plugin_path = Path(plugin_dir)
@@ -75,32 +128,65 @@ class PluginDiscovery:
 
         logger.debug(f"Scanning plugin directory: {plugin_path}")
 
-        for item in plugin_path.iterdir():
+        for item in sorted(plugin_path.iterdir()):
             if item.is_dir():
-                self._scan_plugin_directory(item)
+                if item.name not in self.ignored_dirs:
+                    self._scan_plugin_directory(item)
             elif item.suffix in [".py"]:
                 self._scan_plugin_file(item)
 
     def _scan_plugin_directory(self, plugin_dir: Path) -> None:
         """Scan a single plugin directory"""
         # Look for plugin manifest files
-        manifest_files = [
-            plugin_dir / "plugin.yml",
-            plugin_dir / "plugin.yaml",
-            plugin_dir / "plugin.json",
-            plugin_dir / "pyproject.toml",
-        ]
-
         manifest_file = None
-        for manifest in manifest_files:
-            if manifest.exists():
-                manifest_file = manifest
+        manifest_signature = None
+        for manifest_name in _MANIFEST_NAMES:
+            manifest_signature = file_signature(plugin_dir / manifest_name)
+            if manifest_signature is not None:
+                manifest_file = plugin_dir / manifest_name
                 break
 
         if not manifest_file:
             logger.debug(f"No manifest found in {plugin_dir}, skipping")
             return
 
+        key = str(plugin_dir)
+        self._seen.add(key)
+        directories = self._cache.section("directories")
+        cached = directories.get(key)
+        if (
+            isinstance(cached, dict)
+            and cached.get("manifest") == str(manifest_file)
+            and cached.get("manifest_sig") == manifest_signature
+            and file_signature(cached.get("module_file", "")) == cached.get("module_sig")
+        ):
+            plugin_info = cached.get("info") or {}
+            if plugin_info.get("name"):
+                self.discovered_plugins[plugin_info["name"]] = dict(plugin_info)
+                return
+
+        plugin_info = self._read_plugin_directory(plugin_dir, manifest_file)
+        module_file = plugin_info.get("module_file") if plugin_info else None
+        if not module_file or not plugin_info.get("name"):
+            return
+        entry = {
+            "manifest": str(manifest_file),
+            "manifest_sig": manifest_signature,
+            "module_file": module_file,
+            "module_sig": file_signature(module_file),
+            "info": dict(plugin_info),
+        }
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError):
+            return
+        directories[key] = entry
+        self._cache.mark_dirty()
+
+    def _read_plugin_directory(
+        self, plugin_dir: Path, manifest_file: Path
+    ) -> Optional[Dict[str, Any]]:
+        """Parse a plugin directory's manifest and locate its entry module"""
         try:
             plugin_info = self._parse_manifest(manifest_file)
             plugin_info["source_type"] = "directory"
@@ -127,12 +213,26 @@ class PluginDiscovery:
                     logger.debug(f"Discovered directory plugin: {plugin_name}")
             else:
                 logger.warning(f"Entry point module not found: {module_file}")
+            return plugin_info
 
         except Exception as e:
             logger.error(f"Error scanning plugin directory {plugin_dir}: {e}")
+            return None
 
     def _scan_plugin_file(self, plugin_file: Path) -> None:
         """Scan a single Python plugin file"""
+        key = str(plugin_file)
+        self._seen.add(key)
+        signature = file_signature(plugin_file)
+        remembered = self._file_results.get(key)
+        if remembered is not None and remembered[0] == signature:
+            self.discovered_plugins[plugin_file.stem] = remembered[1]
+            return
+        files = self._cache.section("files")
+        if signature is not None and files.get(key) == signature:
+            logger.debug(f"Skipping unchanged non-plugin file: {plugin_file}")
+            return
+
         try:
             # Import the module to check for plugin classes or decorators
             spec = importlib.util.spec_from_file_location(plugin_file.stem, plugin_file)
@@ -170,13 +270,31 @@ class PluginDiscovery:
                 }
 
                 self.discovered_plugins[plugin_file.stem] = plugin_info
+                self._file_results[key] = (signature, plugin_info)
                 logger.debug(f"Discovered file plugin: {plugin_file.stem}")
+            elif signature is not None:
+                # Imported cleanly but declares nothing: don't import it again
+                files[key] = signature
+                self._cache.mark_dirty()
 
         except Exception as e:
             logger.error(f"Error scanning plugin file {plugin_file}: {e}")
 
     def _discover_from_entry_points(self) -> None:
         """Discover plugins from setuptools entry points"""
+        if self._entry_point_results is not None:
+            self.discovered_plugins.update(self._entry_point_results)
+            return
+        before = set(self.discovered_plugins)
+        self._read_entry_points()
+        self._entry_point_results = {
+            name: info
+            for name, info in self.discovered_plugins.items()
+            if info.get("source_type") == "entry_point" and name not in before
+        }
+
+    def _read_entry_points(self) -> None:
+        """Resolve plugin entry points from installed package metadata"""
         try:
             discovered_entry_points = entry_points()
             if hasattr(discovered_entry_points, "select"):
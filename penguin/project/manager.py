@@ -6,8 +6,10 @@ like dependency tracking, DAG-based scheduling, and resource management.
 """
 
 import asyncio
+import copy
 import hashlib
 import logging
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -27,6 +29,7 @@ from .models import (
     TaskPhase,
     TaskStatus,
 )
+from .ready_queue import ReadyQueue, dependency_specs
 from .storage import ProjectStorage
 from .runtime_jobs import RuntimeJobRecord
 from .exceptions import (
@@ -74,6 +77,11 @@ class ProjectManager:
         # DAG scheduler state
         self._dag: Optional[nx.DiGraph] = None
         self._dag_project_id: Optional[str] = None
+
+        # Per-project ready queues, kept current from storage write events
+        self._ready_queues: Dict[str, ReadyQueue] = {}
+        self._scheduler_lock = threading.RLock()
+        self.storage.add_listener(self._on_task_change)
         
         # Default tie-breaker order for DAG frontier selection
         self._tie_breakers: List[str] = [
@@ -889,13 +897,8 @@ class ProjectManager:
         if not task.dependencies:
             return []
 
-        dependency_specs = task.dependency_specs or [
-            TaskDependency(task_id=dep_id)
-            for dep_id in task.dependencies
-        ]
-
         blockers: List[Dict[str, Any]] = []
-        for dependency in dependency_specs:
+        for dependency in dependency_specs(task):
             dep_task = (
                 task_map.get(dependency.task_id)
                 if task_map is not None
@@ -997,32 +1000,10 @@ class ProjectManager:
         Returns:
             List of ready tasks, sorted by tie-breakers.
         """
-        self.build_dag(project_id)
-        tasks = self.list_tasks(project_id)
-        task_map = {t.id: t for t in tasks}
-        
-        ready = []
-        for task in tasks:
-            if task.status != TaskStatus.ACTIVE:
-                continue
-
-            dependency_specs = task.dependency_specs or [
-                TaskDependency(task_id=dep_id)
-                for dep_id in task.dependencies
-            ]
-
-            all_deps_done = True
-            for dependency in dependency_specs:
-                dep_task = task_map.get(dependency.task_id)
-                if not self._is_dependency_satisfied(dependency, dep_task):
-                    all_deps_done = False
-                    break
-
-            if all_deps_done:
-                ready.append(task)
-        
-        # Sort by tie-breakers
-        return self._sort_by_tie_breakers(ready)
+        with self._scheduler_lock:
+            self.build_dag(project_id)
+            ready = self._get_ready_queue(project_id).ready_tasks()
+            return [copy.copy(task) for task in ready]
     
     async def get_ready_tasks_async(self, project_id: str) -> List[Task]:
         """Async version of get_ready_tasks."""
@@ -1069,8 +1050,10 @@ class ProjectManager:
         Returns:
             The highest-priority ready task, or None if no tasks are ready.
         """
-        ready = self.get_ready_tasks(project_id)
-        return ready[0] if ready else None
+        with self._scheduler_lock:
+            self.build_dag(project_id)
+            task = self._get_ready_queue(project_id).peek()
+            return copy.copy(task) if task else None
     
     async def get_next_task_dag_async(self, project_id: str) -> Optional[Task]:
         """Async version of get_next_task_dag."""
@@ -1078,41 +1061,42 @@ class ProjectManager:
             None, self.get_next_task_dag, project_id
         )
     
-    def _sort_by_tie_breakers(self, tasks: List[Task]) -> List[Task]:
-        """Sort tasks by configured tie-breakers.
+    def _tie_breaker_key(self, task: Task) -> Tuple:
+        """Sort key for a task under the configured tie-breakers.
         
         Tie-breaker format: "field_direction" where direction is asc or desc.
         Special cases:
         - priority_desc: higher priority score first
         - sequence: alpha < beta < rc < ga
         """
-        def sort_key(task: Task) -> Tuple:
-            keys = []
-            for tb in self._tie_breakers:
-                if tb == "priority_desc":
-                    # Higher priority score = more urgent
-                    keys.append(-task.priority_score())
-                elif tb == "due_date_asc":
-                    # Earlier due date first, None last
-                    keys.append(task.due_date or "9999-99-99")
-                elif tb == "sequence":
-                    # Sequence order: alpha=1, beta=2, rc=3, ga=4, None=0
-                    seq_order = {"alpha": 1, "beta": 2, "rc": 3, "ga": 4}
-                    keys.append(seq_order.get(task.sequence, 0) if task.sequence else 0)
-                elif tb == "effort_asc":
-                    # Lower effort first, None last
-                    keys.append(task.effort if task.effort is not None else 999)
-                elif tb == "value_desc":
-                    # Higher value first, None last
-                    keys.append(-(task.value if task.value is not None else 0))
-                elif tb == "risk_asc":
-                    # Lower risk first, None last
-                    keys.append(task.risk if task.risk is not None else 999)
-                elif tb == "created_at_asc":
-                    keys.append(task.created_at)
-            return tuple(keys)
-        
-        return sorted(tasks, key=sort_key)
+        keys = []
+        for tb in self._tie_breakers:
+            if tb == "priority_desc":
+                # Higher priority score = more urgent
+                keys.append(-task.priority_score())
+            elif tb == "due_date_asc":
+                # Earlier due date first, None last
+                keys.append(task.due_date or "9999-99-99")
+            elif tb == "sequence":
+                # Sequence order: alpha=1, beta=2, rc=3, ga=4, None=0
+                seq_order = {"alpha": 1, "beta": 2, "rc": 3, "ga": 4}
+                keys.append(seq_order.get(task.sequence, 0) if task.sequence else 0)
+            elif tb == "effort_asc":
+                # Lower effort first, None last
+                keys.append(task.effort if task.effort is not None else 999)
+            elif tb == "value_desc":
+                # Higher value first, None last
+                keys.append(-(task.value if task.value is not None else 0))
+            elif tb == "risk_asc":
+                # Lower risk first, None last
+                keys.append(task.risk if task.risk is not None else 999)
+            elif tb == "created_at_asc":
+                keys.append(task.created_at)
+        return tuple(keys)
+
+    def _sort_by_tie_breakers(self, tasks: List[Task]) -> List[Task]:
+        """Sort tasks by configured tie-breakers."""
+        return sorted(tasks, key=self._tie_breaker_key)
     
     def get_dag_stats(self, project_id: str) -> Dict[str, Any]:
         """Get statistics about the project's task DAG.
@@ -1199,13 +1183,92 @@ class ProjectManager:
                 Valid values: priority_desc, due_date_asc, sequence,
                 effort_asc, value_desc, risk_asc, created_at_asc
         """
-        self._tie_breakers = tie_breakers
+        with self._scheduler_lock:
+            self._tie_breakers = tie_breakers
+            self._ready_queues.clear()
         logger.info(f"Set tie-breakers: {tie_breakers}")
     
     def invalidate_dag(self) -> None:
-        """Invalidate the cached DAG, forcing rebuild on next access."""
-        self._dag = None
-        self._dag_project_id = None
+        """Invalidate the cached DAG and ready queues, forcing rebuild on next access."""
+        with self._scheduler_lock:
+            self._dag = None
+            self._dag_project_id = None
+            self._ready_queues.clear()
+
+    def _get_ready_queue(self, project_id: str) -> ReadyQueue:
+        """The project's ready queue, built from storage on first use."""
+        if self.storage.changed_elsewhere():
+            # Another ProjectStorage wrote to the database; reload everything
+            self.invalidate_dag()
+            self.storage.mark_synced()
+        queue = self._ready_queues.get(project_id)
+        if queue is None:
+            queue = ReadyQueue(
+                self.list_tasks(project_id),
+                is_satisfied=self._is_dependency_satisfied,
+                sort_key=self._tie_breaker_key,
+            )
+            self._ready_queues[project_id] = queue
+        return queue
+
+    def _on_task_change(self, event: str, payload: Any) -> None:
+        """Apply a storage write to the ready queues and the cached DAG.
+
+        Status and phase changes update the task in place; only changes to
+        the graph's shape touch the DAG, and only for the affected project.
+        """
+        with self._scheduler_lock:
+            if event == "reset":
+                self.invalidate_dag()
+                self.storage.mark_synced()
+            elif event == "upsert":
+                task = copy.copy(payload)
+                # A task moved to another project leaves its old project's queue
+                for project_id, queue in self._ready_queues.items():
+                    if project_id != task.project_id and task.id in queue:
+                        queue.remove(task.id)
+                queue = self._ready_queues.get(task.project_id)
+                if queue is not None:
+                    queue.upsert(task)
+                if self._dag is not None:
+                    if self._dag_project_id == task.project_id:
+                        self._update_dag_task(task)
+                    elif self._dag.has_node(task.id):
+                        self._dag.remove_node(task.id)
+            elif event == "delete":
+                for queue in self._ready_queues.values():
+                    queue.remove(payload)
+                if self._dag is not None and self._dag.has_node(payload):
+                    self._dag.remove_node(payload)
+            elif event == "delete_project":
+                self._ready_queues.pop(payload, None)
+                if self._dag_project_id == payload:
+                    self._dag = None
+                    self._dag_project_id = None
+
+    def _update_dag_task(self, task: Task) -> None:
+        """Reflect one task's latest state in the cached DAG."""
+        dag = self._dag
+        is_new = not dag.has_node(task.id)
+        dag.add_node(task.id, task=task)
+
+        wanted = {dep_id for dep_id in task.dependencies if dag.has_node(dep_id)}
+        current = set(dag.predecessors(task.id))
+        if is_new:
+            # Tasks created earlier may already name this one as a dependency
+            for dependent_id in self.storage.get_dependent_task_ids(task.id):
+                if dag.has_node(dependent_id):
+                    dag.add_edge(task.id, dependent_id)
+        if wanted == current:
+            return
+        dag.remove_edges_from((dep_id, task.id) for dep_id in current - wanted)
+        added = wanted - current
+        if any(nx.has_path(dag, task.id, dep_id) for dep_id in added):
+            # New edge closes a cycle; let the next build_dag report it
+            self._dag = None
+            self._dag_project_id = None
+            return
+        dag.add_edges_from((dep_id, task.id) for dep_id in added)
     
     # ==================== Blueprint Integration ====================
     
@@ -0,0 +1,130 @@
+"""Incrementally maintained frontier of runnable tasks.
+
+``ReadyQueue`` holds one project's tasks and the reverse dependency index
+(dependency -> dependents). When a task changes, only that task and the
+tasks depending on it are re-evaluated, so a status change costs
+O(dependents) instead of a rescan of the project. Ready tasks are kept in a
+heap ordered by the manager's tie-breakers, making the next task a peek.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Task, TaskDependency, TaskStatus
+
+DependencyCheck = Callable[[TaskDependency, Optional[Task]], bool]
+SortKey = Callable[[Task], Tuple]
+
+
+def dependency_specs(task: Task) -> List[TaskDependency]:
+    """A task's dependency edges, defaulting to completion-required."""
+    return task.dependency_specs or [
+        TaskDependency(task_id=dep_id)
+        for dep_id in task.dependencies
+    ]
+
+
+class ReadyQueue:
+    """Ready tasks for one project, updated as tasks change."""
+
+    def __init__(
+        self,
+        tasks: Iterable[Task],
+        is_satisfied: DependencyCheck,
+        sort_key: SortKey,
+    ):
+        self._is_satisfied = is_satisfied
+        self._sort_key = sort_key
+        self.tasks: Dict[str, Task] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self.ready: Set[str] = set()
+        self._heap: List[Tuple[Tuple, int, str]] = []
+        # task id -> sequence of its live heap entry; older entries are stale
+        self._heap_seq: Dict[str, int] = {}
+        self._counter = itertools.count()
+
+        for task in tasks:
+            self.tasks[task.id] = task
+            self._link(task)
+        for task_id in self.tasks:
+            self._evaluate(task_id)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.tasks
+
+    def _link(self, task: Task) -> None:
+        for dependency in dependency_specs(task):
+            self.dependents.setdefault(dependency.task_id, set()).add(task.id)
+
+    def _unlink(self, task: Task) -> None:
+        for dependency in dependency_specs(task):
+            dependents = self.dependents.get(dependency.task_id)
+            if dependents is not None:
+                dependents.discard(task.id)
+                if not dependents:
+                    del self.dependents[dependency.task_id]
+
+    def _evaluate(self, task_id: str) -> None:
+        task = self.tasks.get(task_id)
+        runnable = task is not None and task.status == TaskStatus.ACTIVE and all(
+            self._is_satisfied(dependency, self.tasks.get(dependency.task_id))
+            for dependency in dependency_specs(task)
+        )
+        if not runnable:
+            self.ready.discard(task_id)
+            self._heap_seq.pop(task_id, None)
+            return
+        self.ready.add(task_id)
+        seq = next(self._counter)
+        self._heap_seq[task_id] = seq
+        heapq.heappush(self._heap, (self._sort_key(task), seq, task_id))
+        # Compact once stale entries outnumber live ones so the heap stays
+        # O(ready) even when it is only ever peeked
+        if len(self._heap) > 2 * len(self._heap_seq) + 64:
+            self._heap = [
+                entry for entry in self._heap
+                if self._heap_seq.get(entry[2]) == entry[1]
+            ]
+            heapq.heapify(self._heap)
+
+    def upsert(self, task: Task) -> None:
+        """Add or replace a task and re-evaluate it and its dependents."""
+        previous = self.tasks.get(task.id)
+        if previous is not None:
+            self._unlink(previous)
+        self.tasks[task.id] = task
+        self._link(task)
+        self._evaluate(task.id)
+        for dependent_id in self.dependents.get(task.id, ()):
+            self._evaluate(dependent_id)
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task; its dependents become blocked on a missing task."""
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return
+        self._unlink(task)
+        self._evaluate(task_id)
+        for dependent_id in self.dependents.get(task_id, ()):
+            self._evaluate(dependent_id)
+
+    def peek(self) -> Optional[Task]:
+        """The first ready task in tie-breaker order."""
+        heap = self._heap
+        while heap:
+            _, seq, task_id = heap[0]
+            if self._heap_seq.get(task_id) == seq:
+                return self.tasks[task_id]
+            heapq.heappop(heap)
+        return None
+
+    def ready_tasks(self) -> List[Task]:
+        """All ready tasks in tie-breaker order."""
+        return [
+            self.tasks[task_id]
+            for _, _, task_id in sorted(
+                entry for entry in self._heap
+                if self._heap_seq.get(entry[2]) == entry[1]
+            )
+        ]
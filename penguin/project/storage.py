@@ -2,13 +2,19 @@
 
 This module provides persistent storage for the project management system using
 SQLite with ACID transactions, supporting both sync and async operations.
+
+Connections are kept open per thread (WAL mode) rather than opened for every
+operation. Task writes notify registered listeners so in-memory schedulers can
+update incrementally instead of rescanning the project.
 """
 
+import os
 import sqlite3
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Any, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from contextlib import contextmanager
 
 from .models import Project, Task, TaskPhase, TaskStatus, ExecutionRecord, StateTransition
@@ -22,6 +28,17 @@ def _json_dumps_safe(value: Any) -> str:
     return json.dumps(value, default=str)
 
 
+# Task change listener: (event, task_or_id). Events are "upsert" (Task),
+# "delete" (task id), "delete_project" (project id) and "reset" (None, the
+# database was written through another ProjectStorage instance).
+TaskListener = Callable[[str, Any], None]
+
+# Write counts per database file, shared by every ProjectStorage in the
+# process so an instance can tell when another one wrote behind its back.
+_write_generations: Dict[str, int] = {}
+_write_generations_lock = threading.Lock()
+
+
 class ProjectStorage:
     """SQLite-backed storage for projects and tasks."""
     
@@ -33,6 +50,17 @@ class ProjectStorage:
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One long-lived connection per thread; all of them for close()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._pid = os.getpid()
+
+        self._listeners: List[TaskListener] = []
+        self._generation_key = str(self.db_path.resolve())
+        with _write_generations_lock:
+            self._generation = _write_generations.setdefault(self._generation_key, 0)
         
         # Initialize database schema
         self._init_schema()
@@ -161,10 +189,33 @@ class ProjectStorage:
                 )
             """)
             
+            # Dependency edges, mirrored from tasks.dependencies for indexed lookups
+            has_dependency_table = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_dependencies'"
+            ).fetchone()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_dependencies (
+                    task_id TEXT NOT NULL,
+                    depends_on_id TEXT NOT NULL,
+                    project_id TEXT,
+                    PRIMARY KEY (task_id, depends_on_id)
+                ) WITHOUT ROWID
+            """)
+            if not has_dependency_table:
+                for row in conn.execute(
+                    "SELECT id, project_id, dependencies FROM tasks WHERE dependencies IS NOT NULL"
+                ).fetchall():
+                    self._write_dependencies(
+                        conn, row["id"], row["project_id"], json.loads(row["dependencies"])
+                    )
+            
             # Indexes for better query performance
             conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks (project_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_parent_id ON tasks (parent_task_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_title ON tasks (title, project_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_dependencies_depends_on ON task_dependencies (depends_on_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_dependencies_project ON task_dependencies (project_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_execution_records_task_id ON execution_records (task_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_state_transitions_task_id ON state_transitions (task_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_runtime_jobs_project_id ON runtime_jobs (project_id)")
@@ -173,21 +224,105 @@ class ProjectStorage:
             
             conn.commit()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        if self._pid != os.getpid():
+            # Connections must not be shared with a forked child
+            self._local = threading.local()
+            with self._connections_lock:
+                self._connections = []
+            self._pid = os.getpid()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
     @contextmanager
     def _get_connection(self):
-        """Get database connection with proper error handling."""
+        """Get this thread's pooled connection with proper error handling.
+
+        Work left uncommitted when the outermost block exits is rolled back,
+        matching the old behaviour of closing a fresh connection per call.
+        """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row  # Enable column access by name
+            conn = self._connect()
+            self._local.depth += 1
             yield conn
         except sqlite3.Error as e:
-            if conn:
+            if conn and conn.in_transaction:
                 conn.rollback()
             raise StorageError(f"Database error: {e}")
         finally:
             if conn:
+                self._local.depth -= 1
+                if self._local.depth == 0 and conn.in_transaction:
+                    conn.rollback()
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
                 conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    # Change notification
+
+    def add_listener(self, listener: TaskListener) -> None:
+        """Register a callback for task writes made through this storage."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: TaskListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, payload: Any) -> None:
+        with _write_generations_lock:
+            current = _write_generations.get(self._generation_key, 0)
+            stale = current != self._generation
+            self._generation = _write_generations[self._generation_key] = current + 1
+        if stale:
+            event, payload = "reset", None
+        for listener in list(self._listeners):
+            try:
+                listener(event, payload)
+            except Exception as e:
+                logger.warning(f"Task listener failed for {event}: {e}")
+
+    def changed_elsewhere(self) -> bool:
+        """Whether another ProjectStorage wrote to this database since our last write."""
+        return _write_generations.get(self._generation_key, 0) != self._generation
+
+    def mark_synced(self) -> None:
+        """Acknowledge writes from other instances after reloading from disk."""
+        with _write_generations_lock:
+            self._generation = _write_generations.get(self._generation_key, 0)
+
+    def _write_dependencies(
+        self,
+        conn: sqlite3.Connection,
+        task_id: str,
+        project_id: Optional[str],
+        dependencies: List[str],
+    ) -> None:
+        conn.execute("DELETE FROM task_dependencies WHERE task_id = ?", (task_id,))
+        if dependencies:
+            conn.executemany(
+                "INSERT OR IGNORE INTO task_dependencies (task_id, depends_on_id, project_id) VALUES (?, ?, ?)",
+                [(task_id, dep_id, project_id) for dep_id in dependencies],
+            )
     
     def _ensure_column(self, conn: sqlite3.Connection, table: str, column: str, definition: str) -> None:
         """Ensure a table column exists for lightweight schema evolution."""
@@ -272,8 +407,14 @@ class ProjectStorage:
     def delete_project(self, project_id: str) -> None:
         """Delete a project and all its tasks."""
         with self._get_connection() as conn:
+            conn.execute(
+                """DELETE FROM task_dependencies WHERE project_id = ?
+                   OR task_id IN (SELECT id FROM tasks WHERE project_id = ?)""",
+                (project_id, project_id),
+            )
             conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
             conn.commit()
+        self._notify("delete_project", project_id)
     
     def list_projects(self, status: Optional[str] = None) -> List[Project]:
         """List all projects, optionally filtered by status."""
@@ -329,7 +470,9 @@ class ProjectStorage:
             for transition in task.transition_history:
                 self._insert_state_transition(conn, task.id, transition)
 
+            self._write_dependencies(conn, task.id, task.project_id, task.dependencies)
             conn.commit()
+        self._notify("upsert", task)
 
     def get_task(self, task_id: str) -> Optional[Task]:
         """Get a task by ID with full execution history."""
@@ -422,13 +565,17 @@ class ProjectStorage:
             for transition in task.transition_history:
                 self._insert_state_transition(conn, task.id, transition)
 
+            self._write_dependencies(conn, task.id, task.project_id, task.dependencies)
             conn.commit()
+        self._notify("upsert", task)
 
     def delete_task(self, task_id: str) -> None:
         """Delete a task and all its execution records."""
         with self._get_connection() as conn:
             conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            conn.execute("DELETE FROM task_dependencies WHERE task_id = ?", (task_id,))
             conn.commit()
+        self._notify("delete", task_id)
 
     def list_tasks(
         self,
@@ -464,16 +611,26 @@ class ProjectStorage:
 
     def get_task_dependencies(self, task_id: str) -> List[Task]:
         """Get all tasks that this task depends on."""
-        task = self.get_task(task_id)
-        if not task or not task.dependencies:
-            return []
-
         with self._get_connection() as conn:
-            placeholders = ", ".join(["?"] * len(task.dependencies))
-            query = f"SELECT * FROM tasks WHERE id IN ({placeholders})"
-            rows = conn.execute(query, task.dependencies).fetchall()
+            rows = conn.execute(
+                """
+                SELECT t.* FROM task_dependencies d
+                JOIN tasks t ON t.id = d.depends_on_id
+                WHERE d.task_id = ?
+                """,
+                (task_id,),
+            ).fetchall()
             return [self._row_to_task(row) for row in rows]
 
+    def get_dependent_task_ids(self, task_id: str) -> List[str]:
+        """Get the IDs of tasks that depend on this task."""
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT task_id FROM task_dependencies WHERE depends_on_id = ?",
+                (task_id,),
+            ).fetchall()
+            return [row["task_id"] for row in rows]
+
     # Runtime job operations
 
     def upsert_runtime_job(self, record: RuntimeJobRecord) -> None:
@@ -59,6 +59,9 @@ from penguin.security.agent_permissions import (
 from penguin.security.audit import (
     AuditEntry,
     PermissionAuditLogger,
+    BufferedAuditWriter,
+    JsonlAuditSink,
+    SQLiteAuditSink,
     get_audit_logger,
     configure_audit_logger,
     configure_from_config,
@@ -115,6 +118,9 @@ __all__ = [
     # Audit logging
     "AuditEntry",
     "PermissionAuditLogger",
+    "BufferedAuditWriter",
+    "JsonlAuditSink",
+    "SQLiteAuditSink",
     "get_audit_logger",
     "configure_audit_logger",
     "configure_from_config",
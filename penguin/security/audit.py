@@ -3,22 +3,32 @@ Permission Audit Logging for Penguin Security.
 
 Provides structured logging of permission checks with:
 - Per-category verbosity control
-- File-based persistence
+- File-based persistence, written in batches by a background thread
+- Optional SQLite store for querying by session, tool and time range
 - In-memory buffer for API queries
 - JSON structured format for machine parsing
+
+Permission checks only enqueue entries; a ``BufferedAuditWriter`` drains
+the bounded queue in batches. DENY decisions and shutdown wait for a
+durable (fsynced) flush so the entries that matter most are never lost.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
+import queue
+import sqlite3
 import threading
+import time
+import weakref
 from collections import deque
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Deque, Dict, List, Optional, Union
+from typing import Any, Deque, Dict, List, Optional, Sequence, Union
 
 logger = logging.getLogger(__name__)
 
@@ -76,12 +86,359 @@ class AuditEntry:
         )
 
 
+class AuditSink:
+    """Destination for batches of audit entries."""
+
+    def write(self, entries: Sequence[AuditEntry]) -> None:
+        raise NotImplementedError
+
+    def flush(self, durable: bool = False) -> None:
+        """Push buffered data to the OS, and to disk when ``durable``."""
+
+    def close(self) -> None:
+        """Release file handles or connections."""
+
+
+class JsonlAuditSink(AuditSink):
+    """JSON lines file kept open between batches, rotated by size.
+
+    When the file reaches ``max_bytes`` it is renamed to ``<path>.1``
+    (shifting older backups up to ``backup_count``) and a new file started.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            log_dir = os.path.dirname(self.path)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def write(self, entries: Sequence[AuditEntry]) -> None:
+        f = self._open()
+        f.write("".join(entry.to_json() + "\n" for entry in entries))
+        if self.max_bytes and f.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def flush(self, durable: bool = False) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if durable:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            self._file.close()
+            self._file = None
+
+
+class SQLiteAuditSink(AuditSink):
+    """SQLite store for audit entries, indexed for per-session/tool queries."""
+
+    _COLUMNS = (
+        "timestamp", "operation", "resource", "result", "reason", "policy",
+        "agent_id", "tool_name", "session_id", "context",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        db_dir = os.path.dirname(path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS audit_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                resource TEXT,
+                result TEXT NOT NULL,
+                reason TEXT,
+                policy TEXT,
+                agent_id TEXT,
+                tool_name TEXT,
+                session_id TEXT,
+                context TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_entries(timestamp);
+            CREATE INDEX IF NOT EXISTS idx_audit_session ON audit_entries(session_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_audit_tool ON audit_entries(tool_name, timestamp);
+            """
+        )
+        self._conn.commit()
+
+    def write(self, entries: Sequence[AuditEntry]) -> None:
+        rows = [
+            (
+                e.timestamp, e.operation, e.resource, e.result, e.reason, e.policy,
+                e.agent_id, e.tool_name, e.session_id,
+                json.dumps(e.context) if e.context is not None else None,
+            )
+            for e in entries
+        ]
+        placeholders = ", ".join("?" for _ in self._COLUMNS)
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO audit_entries ({', '.join(self._COLUMNS)}) VALUES ({placeholders})",
+                    rows,
+                )
+
+    def query(
+        self,
+        session_id: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        since: Optional[Union[datetime, str]] = None,
+        until: Optional[Union[datetime, str]] = None,
+        result: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[AuditEntry]:
+        """Entries matching every given filter, newest first."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (
+            ("session_id", session_id),
+            ("tool_name", tool_name),
+            ("agent_id", agent_id),
+            ("result", result.lower() if result else None),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_timestamp_bound(since))
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(_timestamp_bound(until))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM audit_entries {where} "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                params,
+            ).fetchall()
+        entries = []
+        for row in rows:
+            data = dict(zip(self._COLUMNS, row))
+            if data["context"] is not None:
+                data["context"] = json.loads(data["context"])
+            entries.append(AuditEntry.from_dict(data))
+        return entries
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _timestamp_bound(value: Union[datetime, str]) -> str:
+    """Normalize a query bound to the UTC ISO format entries are stored in."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+class _FlushRequest:
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()
+_live_writers: "weakref.WeakSet[BufferedAuditWriter]" = weakref.WeakSet()
+
+
+class BufferedAuditWriter:
+    """Writes audit entries to sinks in batches from a background thread.
+
+    ``submit`` only enqueues. The writer thread collects entries for up to
+    ``flush_interval`` seconds (or ``batch_size`` entries), writes them to
+    every sink in one go and flushes. ``flush`` (used for DENY decisions and
+    shutdown) blocks until everything queued before it is fsynced. When the
+    bounded queue is full, ``submit`` waits briefly and then drops the entry
+    and counts it rather than stalling permission checks indefinitely.
+    Entries submitted after ``close`` are dropped and counted the same way.
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[AuditSink],
+        max_queue: int = 10000,
+        flush_interval: float = 0.5,
+        batch_size: int = 500,
+        put_timeout: float = 1.0,
+    ):
+        self.sinks = list(sinks)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_queue))
+        self._thread: Optional[threading.Thread] = None
+        # Guards thread start-up and ``_stats`` (updated by callers and the writer)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {"written": 0, "batches": 0, "dropped": 0, "errors": 0}
+        _live_writers.add(self)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="penguin-audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, entry: AuditEntry, durable: bool = False) -> None:
+        """Queue ``entry``; with ``durable`` wait until it is on disk."""
+        if self._closed:
+            # The sinks are closed; nothing can be written any more
+            self._count("dropped")
+            logger.debug("Audit writer closed; dropped entry for %s", entry.operation)
+            return
+        self._ensure_started()
+        try:
+            self._queue.put(entry, timeout=self.put_timeout)
+        except queue.Full:
+            self._count("dropped")
+            logger.warning("Audit queue full; dropped entry for %s", entry.operation)
+            return
+        if durable:
+            self.flush()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until entries queued so far are durably written."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush everything queued, stop the thread and close the sinks."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+                self._thread.join(timeout)
+            except queue.Full:
+                logger.warning("Audit writer did not drain before shutdown")
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.warning(f"Failed to close audit sink: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, queued=self._queue.qsize())
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _run(self) -> None:
+        while True:
+            batch: List[AuditEntry] = []
+            waiters: List[_FlushRequest] = []
+            stop = False
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            # Anything already queued behind a flush/stop marker still goes out now
+            if waiters or stop:
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, _FlushRequest):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+            self._write_batch(batch, durable=bool(waiters or stop))
+            for request in waiters:
+                request.done.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[AuditEntry], durable: bool) -> None:
+        for sink in self.sinks:
+            try:
+                if batch:
+                    sink.write(batch)
+                sink.flush(durable=durable)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"Failed to write audit log: {e}")
+        if batch:
+            with self._lock:
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+
+
+@atexit.register
+def _close_audit_writers() -> None:
+    for writer in list(_live_writers):
+        writer.close()
+
+
 class PermissionAuditLogger:
     """Handles permission audit logging with file persistence and memory buffer.
     
     Features:
     - Per-category verbosity filtering
-    - Rotating file output with JSON lines format
+    - Size-rotated JSON lines output, written in background batches
+    - Optional SQLite store queryable by session, tool and time range
     - In-memory circular buffer for recent entries
     - Thread-safe operations
     
@@ -109,6 +466,11 @@ class PermissionAuditLogger:
         include_context: bool = False,
         workspace_root: Optional[str] = None,
         enabled: bool = True,
+        sqlite_file: Optional[str] = None,
+        max_file_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
     ):
         """Initialize the audit logger.
         
@@ -119,6 +481,11 @@ class PermissionAuditLogger:
             include_context: Whether to include full context in logs
             workspace_root: Workspace root for relative paths
             enabled: Whether audit logging is enabled
+            sqlite_file: Optional SQLite database to also record entries in
+            max_file_bytes: Rotate the log file at this size (0 disables)
+            backup_count: Number of rotated log files to keep
+            flush_interval: Seconds the writer batches entries before writing
+            max_queue: Maximum entries waiting to be written
         """
         self._enabled = enabled
         self._log_file = log_file or ".penguin/permission_audit.log"
@@ -144,11 +511,31 @@ class PermissionAuditLogger:
             "ask": 0,
             "deny": 0,
             "by_category": {},
+            "decision_cache": {"hits": 0, "misses": 0},
         }
         
         # Ensure log directory exists
         if self._enabled and self._log_file:
             self._ensure_log_directory()
+
+        # Background writer; sinks are opened lazily on the first batch
+        self._sqlite_sink: Optional[SQLiteAuditSink] = None
+        sinks: List[AuditSink] = []
+        if self._log_file:
+            sinks.append(JsonlAuditSink(
+                self._get_absolute_log_path(),
+                max_bytes=max_file_bytes,
+                backup_count=backup_count,
+            ))
+        if self._enabled and sqlite_file:
+            try:
+                self._sqlite_sink = SQLiteAuditSink(self._resolve_path(sqlite_file))
+                sinks.append(self._sqlite_sink)
+            except Exception as e:
+                logger.warning(f"Failed to open audit database: {e}")
+        self._writer = BufferedAuditWriter(
+            sinks, max_queue=max_queue, flush_interval=flush_interval
+        )
     
     def _ensure_log_directory(self) -> None:
         """Create log directory if it doesn't exist."""
@@ -162,9 +549,12 @@ class PermissionAuditLogger:
     
     def _get_absolute_log_path(self) -> str:
         """Get absolute path to log file."""
-        if os.path.isabs(self._log_file):
-            return self._log_file
-        return os.path.join(self._workspace_root, self._log_file)
+        return self._resolve_path(self._log_file)
+
+    def _resolve_path(self, path: str) -> str:
+        if os.path.isabs(path):
+            return path
+        return os.path.join(self._workspace_root, path)
     
     def _get_category(self, operation: str) -> str:
         """Extract category from operation string."""
@@ -210,6 +600,7 @@ class PermissionAuditLogger:
         tool_name: Optional[str] = None,
         session_id: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None,
+        cached: Optional[bool] = None,
     ) -> Optional[AuditEntry]:
         """Log a permission check.
         
@@ -223,12 +614,14 @@ class PermissionAuditLogger:
             tool_name: Tool that triggered the check
             session_id: Session ID if available
             context: Additional context
+            cached: Whether the decision came from the enforcer's decision
+                cache (None when the check was not cacheable)
             
         Returns:
             AuditEntry if logged, None if filtered out
         """
         # Update statistics regardless of filtering
-        self._update_stats(operation, result)
+        self._update_stats(operation, result, cached)
         
         # Check if we should log this entry
         if not self.should_log(operation, result):
@@ -248,10 +641,10 @@ class PermissionAuditLogger:
             context=context if self._include_context else None,
         )
         
-        # Add to memory buffer and write to file
+        # Add to memory buffer and hand off to the background writer
         with self._lock:
             self._memory_buffer.append(entry)
-            self._write_to_file(entry)
+        self._write_to_file(entry)
         
         # Log to standard logger as well
         log_level = logging.WARNING if result.lower() == "deny" else logging.DEBUG
@@ -262,13 +655,15 @@ class PermissionAuditLogger:
         
         return entry
     
-    def _update_stats(self, operation: str, result: str) -> None:
+    def _update_stats(self, operation: str, result: str, cached: Optional[bool] = None) -> None:
         """Update statistics counters."""
         result_lower = result.lower()
         category = self._get_category(operation)
         
         with self._lock:
             self._stats["total"] += 1
+            if cached is not None:
+                self._stats["decision_cache"]["hits" if cached else "misses"] += 1
             if result_lower in self._stats:
                 self._stats[result_lower] += 1
             
@@ -279,16 +674,18 @@ class PermissionAuditLogger:
                 self._stats["by_category"][category][result_lower] += 1
     
     def _write_to_file(self, entry: AuditEntry) -> None:
-        """Write entry to audit log file."""
-        if not self._log_file:
+        """Queue entry for the audit sinks; DENY waits for a durable write."""
+        if not self._writer.sinks:
             return
-        
-        try:
-            log_path = self._get_absolute_log_path()
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(entry.to_json() + "\n")
-        except Exception as e:
-            logger.warning(f"Failed to write audit log: {e}")
+        self._writer.submit(entry, durable=entry.result == "deny")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until queued entries are durably written."""
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Flush pending entries and close the log file and database."""
+        self._writer.close()
     
     def get_recent_entries(
         self,
@@ -323,6 +720,51 @@ class PermissionAuditLogger:
         
         # Return newest first, limited
         return list(reversed(entries))[:limit]
+
+    def query_entries(
+        self,
+        session_id: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        since: Optional[Union[datetime, str]] = None,
+        until: Optional[Union[datetime, str]] = None,
+        result: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[AuditEntry]:
+        """Query logged decisions by session, tool and time range.
+
+        Uses the SQLite store when configured (covering everything ever
+        logged), otherwise filters the in-memory buffer.
+
+        Returns:
+            List of matching AuditEntry objects (newest first)
+        """
+        if self._sqlite_sink is not None:
+            self.flush()
+            return self._sqlite_sink.query(
+                session_id=session_id,
+                tool_name=tool_name,
+                since=since,
+                until=until,
+                result=result,
+                agent_id=agent_id,
+                limit=limit,
+            )
+
+        lower = _timestamp_bound(since) if since is not None else None
+        upper = _timestamp_bound(until) if until is not None else None
+        with self._lock:
+            entries = list(self._memory_buffer)
+        matches = [
+            e for e in reversed(entries)
+            if (session_id is None or e.session_id == session_id)
+            and (tool_name is None or e.tool_name == tool_name)
+            and (agent_id is None or e.agent_id == agent_id)
+            and (result is None or e.result == result.lower())
+            and (lower is None or e.timestamp >= lower)
+            and (upper is None or e.timestamp <= upper)
+        ]
+        return matches[:limit]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get audit statistics.
@@ -331,7 +773,13 @@ class PermissionAuditLogger:
             Dictionary with statistics about permission checks
         """
         with self._lock:
-            return dict(self._stats)
+            stats = dict(self._stats)
+            cache = dict(self._stats["decision_cache"])
+        lookups = cache["hits"] + cache["misses"]
+        cache["hit_rate"] = cache["hits"] / lookups if lookups else 0.0
+        stats["decision_cache"] = cache
+        stats["writer"] = self._writer.stats()
+        return stats
     
     def get_summary(self) -> str:
         """Get a human-readable summary of recent activity.
@@ -375,6 +823,7 @@ class PermissionAuditLogger:
                 "ask": 0,
                 "deny": 0,
                 "by_category": {},
+                "decision_cache": {"hits": 0, "misses": 0},
             }
     
     def set_enabled(self, enabled: bool) -> None:
@@ -416,6 +865,10 @@ def configure_audit_logger(
     include_context: bool = False,
     workspace_root: Optional[str] = None,
     enabled: bool = True,
+    sqlite_file: Optional[str] = None,
+    max_file_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 3,
+    flush_interval: float = 0.5,
 ) -> PermissionAuditLogger:
     """Configure the global audit logger.
     
@@ -424,6 +877,7 @@ def configure_audit_logger(
     global _audit_logger
     
     with _audit_logger_lock:
+        previous = _audit_logger
         _audit_logger = PermissionAuditLogger(
             log_file=log_file,
             categories=categories,
@@ -431,7 +885,13 @@ def configure_audit_logger(
             include_context=include_context,
             workspace_root=workspace_root,
             enabled=enabled,
+            sqlite_file=sqlite_file,
+            max_file_bytes=max_file_bytes,
+            backup_count=backup_count,
+            flush_interval=flush_interval,
         )
+        if previous is not None:
+            previous.close()
         logger.info(f"Permission audit logger configured: enabled={enabled}, log_file={log_file}")
     
     return _audit_logger
@@ -451,5 +911,9 @@ def configure_from_config(audit_config: "AuditConfig", workspace_root: Optional[
         include_context=audit_config.include_context,
         workspace_root=workspace_root,
         enabled=audit_config.enabled,
+        sqlite_file=audit_config.sqlite_file,
+        max_file_bytes=audit_config.max_file_bytes,
+        backup_count=audit_config.backup_count,
+        flush_interval=audit_config.flush_interval,
     )
 
@@ -7,16 +7,22 @@ This module provides the foundational permission checking infrastructure:
 - Operation: Standardized operation taxonomy
 - PolicyEngine: Base class for implementing permission policies
 - PermissionEnforcer: Wrapper that enforces policies on tool execution
+- DecisionCache: Memoized decisions for repeated checks
 """
 
 from __future__ import annotations
 
+import fnmatch
 import logging
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -189,22 +195,38 @@ class PolicyEngine:
     
     name: str = "base"
     priority: int = 0  # Higher priority policies are checked first
+    # Policies whose decision depends only on (operation, resource, the
+    # context keys below, own state) may set this so PermissionEnforcer can
+    # memoize them; they must call _bump_version() whenever that state changes.
+    cacheable: bool = False
+    cache_context_keys: Tuple[str, ...] = ()
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """Initialize policy with optional configuration."""
         self.config = config or {}
         self._enabled = True
+        self._version = 0
     
     @property
     def enabled(self) -> bool:
         return self._enabled
     
+    @property
+    def version(self) -> int:
+        """Bumped whenever the policy's configuration changes."""
+        return getattr(self, "_version", 0)
+    
+    def _bump_version(self) -> None:
+        self._version = self.version + 1
+    
     def enable(self) -> None:
         self._enabled = True
+        self._bump_version()
         logger.info(f"Policy '{self.name}' enabled")
     
     def disable(self) -> None:
         self._enabled = False
+        self._bump_version()
         logger.info(f"Policy '{self.name}' disabled")
     
     def check_operation(
@@ -238,6 +260,91 @@ class PolicyEngine:
         }
 
 
+class PatternMatcher:
+    """A set of glob patterns compiled into one regex.
+    
+    Matches the full string or, with ``match_basename``, its last path
+    component, the same as calling ``fnmatch.fnmatch`` pattern by pattern.
+    """
+    
+    def __init__(self, patterns: Iterable[str] = (), match_basename: bool = False):
+        self.patterns = tuple(sorted(set(patterns)))
+        self.match_basename = match_basename
+        if self.patterns:
+            self._regex = re.compile(
+                "|".join(fnmatch.translate(os.path.normcase(p)) for p in self.patterns)
+            )
+        else:
+            self._regex = None
+    
+    def matches(self, value: str) -> bool:
+        if self._regex is None:
+            return False
+        value = os.path.normcase(value)
+        if self._regex.match(value):
+            return True
+        if self.match_basename:
+            basename = value.rstrip("/\\").rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
+            return bool(self._regex.match(basename))
+        return False
+
+
+class DecisionCache:
+    """Bounded LRU of permission decisions with a time-to-live.
+    
+    Entries expire after ``ttl`` seconds so decisions that depend on the
+    filesystem (symlinks, path resolution) are re-evaluated periodically.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = (
+            max_entries
+            if max_entries is not None
+            else int(os.environ.get("PENGUIN_PERMISSION_CACHE_SIZE", "4096"))
+        )
+        self.ttl = ttl if ttl is not None else float(os.environ.get("PENGUIN_PERMISSION_CACHE_TTL", "30"))
+        self._entries: "OrderedDict[Any, Tuple[float, Tuple[PermissionResult, str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+    
+    def get(self, key: Any) -> Optional[Tuple[PermissionResult, str, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key: Any, decision: Tuple[PermissionResult, str, str]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, decision)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
 class PermissionEnforcer:
     """Enforces permission policies on tool execution.
     
@@ -246,6 +353,9 @@ class PermissionEnforcer:
     - Audit logging of all permission checks
     - YOLO mode to bypass all checks
     - Integration with RuntimeConfig for dynamic policy updates
+    - A decision cache keyed by operation, resource, policy-set version and
+      the context keys the policies declare, used only while every enabled
+      policy is ``cacheable``
     
     Example:
         enforcer = PermissionEnforcer(mode=PermissionMode.WORKSPACE)
@@ -275,6 +385,8 @@ class PermissionEnforcer:
         self._policies: List[PolicyEngine] = []
         self._audit_log: List[PermissionCheck] = []
         self._session_allowlist: Set[str] = set()  # "operation:resource" patterns allowed for session
+        self._version = 0  # Bumped on any change that can alter a decision
+        self._decision_cache = DecisionCache()
         
         # Check for YOLO mode via environment
         if os.environ.get("PENGUIN_YOLO", "").lower() in ("1", "true", "yes"):
@@ -289,6 +401,7 @@ class PermissionEnforcer:
     def mode(self, value: PermissionMode) -> None:
         logger.info(f"Permission mode changed from {self._mode.value} to {value.value}")
         self._mode = value
+        self._invalidate()
     
     @property
     def yolo(self) -> bool:
@@ -297,6 +410,7 @@ class PermissionEnforcer:
     def set_yolo(self, enabled: bool) -> None:
         """Enable or disable YOLO mode."""
         self._yolo = enabled
+        self._invalidate()
         if enabled:
             logger.warning("YOLO mode enabled - all permission checks bypassed!")
         else:
@@ -307,6 +421,7 @@ class PermissionEnforcer:
         self._policies.append(policy)
         # Sort by priority (highest first)
         self._policies.sort(key=lambda p: p.priority, reverse=True)
+        self._invalidate()
         logger.debug(f"Added policy '{policy.name}' with priority {policy.priority}")
     
     def remove_policy(self, policy_name: str) -> bool:
@@ -314,6 +429,7 @@ class PermissionEnforcer:
         for i, p in enumerate(self._policies):
             if p.name == policy_name:
                 self._policies.pop(i)
+                self._invalidate()
                 logger.debug(f"Removed policy '{policy_name}'")
                 return True
         return False
@@ -325,17 +441,57 @@ class PermissionEnforcer:
         Example: "filesystem.write:*.py" allows writing to Python files
         """
         self._session_allowlist.add(pattern)
+        self._invalidate()
         logger.info(f"Added session allowlist pattern: {pattern}")
     
     def clear_session_allowlist(self) -> None:
         """Clear all session allowlist patterns."""
         self._session_allowlist.clear()
+        self._invalidate()
         logger.info("Cleared session allowlist")
     
+    def _invalidate(self) -> None:
+        """Forget memoized decisions after a policy, allowlist or mode change."""
+        self._version += 1
+        self._decision_cache.clear()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Decision cache size and hit rate."""
+        return self._decision_cache.stats()
+    
+    def _cache_key(
+        self,
+        operation: Operation,
+        resource: str,
+        context: Dict[str, Any],
+    ) -> Optional[Tuple[Any, ...]]:
+        """Key for memoizing this check, or None when it must be evaluated."""
+        if not self._decision_cache.enabled:
+            return None
+        versions = []
+        context_keys: Set[str] = set()
+        for policy in self._policies:
+            if not policy.enabled:
+                continue
+            if not policy.cacheable:
+                return None
+            versions.append(policy.version)
+            context_keys.update(policy.cache_context_keys)
+        key = (
+            operation,
+            resource,
+            self._version,
+            tuple(versions),
+            tuple((name, context.get(name)) for name in sorted(context_keys)),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
     def _check_session_allowlist(self, operation: Operation, resource: str) -> bool:
         """Check if operation+resource matches session allowlist."""
-        import fnmatch
-        
         for pattern in self._session_allowlist:
             if ":" in pattern:
                 op_pattern, res_pattern = pattern.split(":", 1)
@@ -376,10 +532,38 @@ class PermissionEnforcer:
             self._log_check(operation, resource, PermissionResult.ALLOW, "YOLO mode", "yolo", context)
             return PermissionResult.ALLOW
         
+        cache_key = self._cache_key(operation, resource, context)
+        if cache_key is not None:
+            cached = self._decision_cache.get(cache_key)
+            if cached is not None:
+                result, reason, policy_name = cached
+                self._log_check(operation, resource, result, reason, policy_name, context, cached=True)
+                return result
+        
+        result, reason, policy_name = self._evaluate(operation, resource, context)
+        if cache_key is not None:
+            self._decision_cache.put(cache_key, (result, reason, policy_name))
+        self._log_check(
+            operation,
+            resource,
+            result,
+            reason,
+            policy_name,
+            context,
+            cached=False if cache_key is not None else None,
+        )
+        return result
+    
+    def _evaluate(
+        self,
+        operation: Operation,
+        resource: str,
+        context: Dict[str, Any],
+    ) -> Tuple[PermissionResult, str, str]:
+        """Run the allowlist and policy chain; returns (result, reason, policy)."""
         # Check session allowlist
         if self._check_session_allowlist(operation, resource):
-            self._log_check(operation, resource, PermissionResult.ALLOW, "Session allowlist", "session", context)
-            return PermissionResult.ALLOW
+            return PermissionResult.ALLOW, "Session allowlist", "session"
         
         # Evaluate policies
         ask_reasons: List[str] = []
@@ -395,21 +579,17 @@ class PermissionEnforcer:
                 continue
             
             if result == PermissionResult.DENY:
-                self._log_check(operation, resource, result, reason, policy.name, context)
-                return PermissionResult.DENY
+                return PermissionResult.DENY, reason, policy.name
             
             if result == PermissionResult.ASK:
                 ask_reasons.append(f"{policy.name}: {reason}")
         
         # If any policy said ASK, return ASK
         if ask_reasons:
-            combined_reason = "; ".join(ask_reasons)
-            self._log_check(operation, resource, PermissionResult.ASK, combined_reason, "combined", context)
-            return PermissionResult.ASK
+            return PermissionResult.ASK, "; ".join(ask_reasons), "combined"
         
         # Default: ALLOW
-        self._log_check(operation, resource, PermissionResult.ALLOW, "No policy denied", "default", context)
-        return PermissionResult.ALLOW
+        return PermissionResult.ALLOW, "No policy denied", "default"
     
     def check_and_raise(
         self,
@@ -439,8 +619,13 @@ class PermissionEnforcer:
         reason: str,
         policy: str,
         context: Dict[str, Any],
+        cached: Optional[bool] = None,
     ) -> None:
-        """Log a permission check to the audit log and audit logger."""
+        """Log a permission check to the audit log and audit logger.
+        
+        ``cached`` is True for decisions served from the decision cache,
+        False for cacheable misses and None when caching did not apply.
+        """
         # Always send to audit logger first - it has its own category-based filtering
         # that respects user configuration (e.g., "filesystem": "all" logs all operations)
         try:
@@ -456,6 +641,7 @@ class PermissionEnforcer:
                 tool_name=context.get("tool_name"),
                 session_id=context.get("session_id"),
                 context=context if audit_logger._include_context else None,
+                cached=cached,
             )
         except ImportError:
             pass  # Audit module not available
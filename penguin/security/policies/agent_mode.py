@@ -24,6 +24,8 @@ class AgentModePolicy(PolicyEngine):
 
     name = "agent_mode"
     priority = 200
+    cacheable = True
+    cache_context_keys = ("agent_mode",)
 
     def check_operation(
         self,
@@ -22,6 +22,7 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 from penguin.security.command_filter import is_command_safe, CommandFilterResult
 from penguin.security.permission_engine import (
     Operation,
+    PatternMatcher,
     PermissionMode,
     PermissionResult,
     PolicyEngine,
@@ -92,6 +93,8 @@ class WorkspaceBoundaryPolicy(PolicyEngine):
 
     name = "workspace_boundary"
     priority = 100  # High priority - checked early
+    cacheable = True
+    cache_context_keys = ("permission_mode", "workspace_root", "project_root", "directory")
 
     def __init__(
         self,
@@ -149,12 +152,19 @@ class WorkspaceBoundaryPolicy(PolicyEngine):
 
         # Add default denied patterns
         self._denied_paths.update(SENSITIVE_PATTERNS)
+        self._compile_patterns()
 
         logger.info(
             f"WorkspaceBoundaryPolicy initialized: "
             f"workspace={self._workspace_root}, project={self._project_root}, mode={mode.value}"
         )
 
+    def _compile_patterns(self) -> None:
+        """Precompile the allow/deny globs and invalidate cached decisions."""
+        self._allowed_matcher = PatternMatcher(self._allowed_paths, match_basename=True)
+        self._denied_matcher = PatternMatcher(self._denied_paths, match_basename=True)
+        self._bump_version()
+
     def _detect_project_root(self) -> Path:
         """Detect project root by looking for .git directory."""
         try:
@@ -181,10 +191,12 @@ class WorkspaceBoundaryPolicy(PolicyEngine):
             f"WorkspaceBoundaryPolicy mode changed from {self._mode.value} to {value.value}"
         )
         self._mode = value
+        self._bump_version()
 
     def set_project_root(self, path: str) -> None:
         """Update the project root at runtime."""
         self._project_root = Path(path).resolve()
+        self._bump_version()
         logger.info(
             f"WorkspaceBoundaryPolicy project_root updated to {self._project_root}"
         )
@@ -192,6 +204,7 @@ class WorkspaceBoundaryPolicy(PolicyEngine):
     def set_workspace_root(self, path: str) -> None:
         """Update the workspace root at runtime."""
         self._workspace_root = Path(path).resolve()
+        self._bump_version()
         logger.info(
             f"WorkspaceBoundaryPolicy workspace_root updated to {self._workspace_root}"
         )
@@ -199,10 +212,12 @@ class WorkspaceBoundaryPolicy(PolicyEngine):
     def add_allowed_path(self, pattern: str) -> None:
         """Add a path pattern to the allowlist."""
         self._allowed_paths.add(pattern)
+        self._compile_patterns()
 
     def add_denied_path(self, pattern: str) -> None:
         """Add a path pattern to the denylist."""
         self._denied_paths.add(pattern)
+        self._compile_patterns()
 
     def check_operation(
         self,
@@ -285,13 +300,13 @@ class WorkspaceBoundaryPolicy(PolicyEngine):
             return PermissionResult.DENY, f"System path '{path}' - writes not allowed"
 
         # Check explicit denylist
-        if self._matches_pattern(str(path), self._denied_paths):
+        if self._denied_matcher.matches(str(path)):
             if Operation.is_read_only(operation):
                 return PermissionResult.ALLOW, "Sensitive path - read allowed"
             return PermissionResult.DENY, f"Path matches denied pattern"
 
         # Check explicit allowlist
-        if self._matches_pattern(str(path), self._allowed_paths):
+        if self._allowed_matcher.matches(str(path)):
             return PermissionResult.ALLOW, "Path matches allowed pattern"
 
         # Check if within workspace or project boundaries
@@ -381,15 +396,12 @@ class WorkspaceBoundaryPolicy(PolicyEngine):
 
     def _matches_pattern(self, path_str: str, patterns: Set[str]) -> bool:
         """Check if path matches any glob pattern."""
-        import fnmatch
-
-        for pattern in patterns:
-            # Handle both full paths and basename matching
-            if fnmatch.fnmatch(path_str, pattern):
-                return True
-            if fnmatch.fnmatch(Path(path_str).name, pattern):
-                return True
-        return False
+        # Handle both full paths and basename matching
+        if patterns is self._denied_paths:
+            return self._denied_matcher.matches(path_str)
+        if patterns is self._allowed_paths:
+            return self._allowed_matcher.matches(path_str)
+        return PatternMatcher(patterns, match_basename=True).matches(path_str)
 
     def get_capabilities_summary(self) -> Dict[str, List[str]]:
         """Return a summary of what this policy allows/denies."""
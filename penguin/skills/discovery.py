@@ -1,13 +1,29 @@
-"""Skill discovery across configured user and project paths."""
+"""Skill discovery across configured user and project paths.
+
+Roots are walked with a pruned scan that stops at ``max_scan_depth`` and
+skips ignored directories. Scans and parsed ``SKILL.md`` files are cached on
+disk (keyed by directory mtimes and file signatures), so discovery at startup
+only re-reads what changed.
+"""
 
 from __future__ import annotations
 
+import json
 import os
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from penguin.skills.models import Skill, SkillDiagnostic
 from penguin.skills.parser import SkillParseError, parse_skill_file
+from penguin.utils.discovery_cache import (
+    DEFAULT_IGNORED_DIRS,
+    DiscoveryCache,
+    default_cache_path,
+    file_signature,
+    scan_tree,
+)
+
+_MAX_CACHED_SKILL_FILES = 4096
 
 DEFAULT_USER_SCAN_PATHS = [
     "~/.penguin/skills",
@@ -41,6 +57,7 @@ def get_skills_config(config: Any) -> Dict[str, Any]:
     if not isinstance(raw, dict):
         raw = {}
     scan_paths = raw.get("scan_paths", {})
+    ignore_dirs = raw.get("ignore_dirs")
     return {
         "enabled": raw.get("enabled", True),
         "trust_project_skills": raw.get("trust_project_skills", False),
@@ -48,6 +65,13 @@ def get_skills_config(config: Any) -> Dict[str, Any]:
         "include_bundled": raw.get("include_bundled", True),
         "max_scan_depth": int(raw.get("max_scan_depth", 6)),
         "max_skill_dirs": int(raw.get("max_skill_dirs", 2000)),
+        "ignore_dirs": (
+            frozenset(str(name) for name in ignore_dirs)
+            if isinstance(ignore_dirs, (list, tuple, set))
+            else DEFAULT_IGNORED_DIRS
+        ),
+        "cache": raw.get("cache", True),
+        "cache_path": raw.get("cache_path") or default_cache_path("skills"),
     }
 
 
@@ -83,11 +107,63 @@ def configured_scan_roots(
     return roots
 
 
-def _depth_from_root(path: Path, root: Path) -> int:
+def _skill_to_cache(skill: Skill) -> Optional[Dict[str, Any]]:
+    payload = {
+        "name": skill.name,
+        "description": skill.description,
+        "path": str(skill.path),
+        "skill_file": str(skill.skill_file),
+        "body": skill.body,
+        "frontmatter": skill.frontmatter,
+        "allowed_tools": skill.allowed_tools,
+    }
     try:
-        return len(path.relative_to(root).parts)
-    except ValueError:
-        return 999999
+        # Frontmatter with YAML-only types (dates, ...) is not cached
+        json.dumps(payload)
+    except (TypeError, ValueError):
+        return None
+    return payload
+
+
+def _skill_from_cache(payload: Dict[str, Any], source: str) -> Skill:
+    return Skill(
+        name=payload["name"],
+        description=payload["description"],
+        path=Path(payload["path"]),
+        skill_file=Path(payload["skill_file"]),
+        body=payload["body"],
+        frontmatter=payload["frontmatter"],
+        allowed_tools=list(payload["allowed_tools"]),
+        source=source,
+    )
+
+
+def _parse_with_cache(skill_file: Path, source: str, cache: DiscoveryCache) -> Skill:
+    """Parse a SKILL.md, reusing the cached result while the file is unchanged."""
+    entries = cache.section("skills")
+    key = str(skill_file)
+    signature = file_signature(skill_file)
+    entry = entries.get(key)
+    if signature is not None and isinstance(entry, dict) and entry.get("sig") == signature:
+        if "error" in entry:
+            raise SkillParseError(entry["error"])
+        try:
+            return _skill_from_cache(entry["skill"], source)
+        except (KeyError, TypeError):
+            pass
+
+    try:
+        skill = parse_skill_file(skill_file, source=source)
+    except SkillParseError as exc:
+        if signature is not None:
+            entries[key] = {"sig": signature, "error": str(exc)}
+            cache.mark_dirty()
+        raise
+    payload = _skill_to_cache(skill)
+    if signature is not None and payload is not None:
+        entries[key] = {"sig": signature, "skill": payload}
+        cache.mark_dirty()
+    return skill
 
 
 def discover_skills(
@@ -103,6 +179,8 @@ def discover_skills(
 
     max_depth = max(0, skills_config["max_scan_depth"])
     max_skill_dirs = max(1, skills_config["max_skill_dirs"])
+    ignored = skills_config["ignore_dirs"]
+    cache = DiscoveryCache(skills_config["cache_path"] if skills_config["cache"] else None)
     candidates: List[Tuple[Path, str]] = []
 
     for root, source in configured_scan_roots(config, project_root=project_root):
@@ -120,19 +198,30 @@ def discover_skills(
             )
             continue
 
-        for skill_file in root.rglob("SKILL.md"):
-            if _depth_from_root(skill_file.parent, root) > max_depth:
-                diagnostics.append(
-                    SkillDiagnostic(
-                        path=str(skill_file),
-                        severity="warning",
-                        code="max_depth_exceeded",
-                        message=f"Skill exceeds max_scan_depth={max_depth}",
-                        source=source,
-                    )
+        scan_key = f"{root}|{max_depth}|{max_skill_dirs}|{','.join(sorted(ignored))}"
+        scan = cache.get_scan(scan_key)
+        if scan is None:
+            scan = scan_tree(
+                root,
+                "SKILL.md",
+                max_depth=max_depth,
+                ignored=ignored,
+                limit=max_skill_dirs,
+            )
+            cache.put_scan(scan_key, scan)
+
+        for rel in scan.too_deep:
+            diagnostics.append(
+                SkillDiagnostic(
+                    path=str(root / rel / "SKILL.md"),
+                    severity="warning",
+                    code="max_depth_exceeded",
+                    message=f"Skill exceeds max_scan_depth={max_depth}",
+                    source=source,
                 )
-                continue
-            candidates.append((skill_file, source))
+            )
+        for rel in scan.matches:
+            candidates.append((root / rel / "SKILL.md", source))
             if len(candidates) >= max_skill_dirs:
                 diagnostics.append(
                     SkillDiagnostic(
@@ -149,7 +238,7 @@ def discover_skills(
     seen: Dict[str, Skill] = {}
     for skill_file, source in candidates:
         try:
-            skill = parse_skill_file(skill_file, source=source)
+            skill = _parse_with_cache(skill_file, source, cache)
         except SkillParseError as exc:
             diagnostics.append(
                 SkillDiagnostic(
@@ -178,5 +267,12 @@ def discover_skills(
         seen[skill.name] = skill
         valid.append(skill)
 
+    parsed = cache.section("skills")
+    if len(parsed) > _MAX_CACHED_SKILL_FILES:
+        current = {str(skill_file) for skill_file, _ in candidates}
+        for key in [key for key in parsed if key not in current]:
+            del parsed[key]
+        cache.mark_dirty()
+    cache.save()
     valid.sort(key=lambda item: item.name)
     return valid, diagnostics
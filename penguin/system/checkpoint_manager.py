@@ -6,24 +6,43 @@ This module implements the conversation plane auto-checkpointing from V2.1 plan:
 - Async worker pattern to prevent UI blocking
 - Retention policies for storage management
 - Rollback and branching functionality
+
+Checkpoints are delta-encoded: each manifest references message blobs in a
+content-addressed chunk store (see ``checkpoint_store``) and only lists the
+messages added since its parent checkpoint.
 """
 
 import asyncio
-import gzip
+import copy
 import json
 import logging
 import os
 import uuid
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Callable
+from typing import Any, Dict, List, Optional, Set, Callable, Tuple
 from enum import Enum
 
+from penguin.system.checkpoint_store import (
+    CheckpointChunkStore,
+    read_gzip_json,
+    write_gzip_json_atomic,
+)
 from penguin.system.state import Message, MessageCategory, Session
 
 logger = logging.getLogger(__name__)
 
+# Manifest format written by this module; files without it are legacy full snapshots.
+CHECKPOINT_FORMAT = 2
+# Write a full hash list every N checkpoints so restores walk bounded delta chains.
+KEYFRAME_INTERVAL = 64
+# Compact the index journal into checkpoint_index.json after this many appends.
+JOURNAL_COMPACT_MIN = 256
+# Message fields a memoized blob hash is checked against before reuse.
+_MESSAGE_FIELDS = tuple(f.name for f in fields(Message))
+
 
 class CheckpointType(Enum):
     """Types of checkpoints that can be created."""
@@ -69,7 +88,7 @@ class CheckpointMetadata:
     message_count: int
     name: Optional[str] = None
     description: Optional[str] = None
-    parent_checkpoint: Optional[str] = None
+    parent_checkpoint: Optional[str] = None  # Delta base in the chunk store
     branch_point: Optional[str] = None
     auto: bool = True
 
@@ -107,11 +126,23 @@ class CheckpointManager:
         self.checkpoints_path = self.workspace_path / "checkpoints"
         self.checkpoints_path.mkdir(exist_ok=True)
 
-        # Checkpoint index for fast lookups
+        # Content-addressed message blobs shared by all checkpoints
+        self.chunk_store = CheckpointChunkStore(self.checkpoints_path / "objects")
+
+        # Checkpoint index for fast lookups; updates are appended to a journal
+        # and periodically compacted into the JSON snapshot.
         self.index_path = self.checkpoints_path / "checkpoint_index.json"
+        self.journal_path = self.checkpoints_path / "checkpoint_index.log"
         self.checkpoint_index: Dict[str, CheckpointMetadata] = {}
+        self._journal_entries = 0
         self._load_checkpoint_index()
 
+        # Delta bookkeeping: latest checkpoint per session, memoized message
+        # hashes per session, and recently resolved hash lists.
+        self._session_heads: Dict[str, Tuple[str, List[str], int]] = {}
+        self._message_digests: Dict[str, Dict[str, Tuple[Tuple[Any, ...], str]]] = {}
+        self._resolved: "OrderedDict[str, Tuple[List[str], int]]" = OrderedDict()
+
         # Async worker setup (queues created lazily in the owning event loop)
         self.checkpoint_queue: Optional[asyncio.Queue] = None
         self.cleanup_queue: Optional[asyncio.Queue] = None
@@ -449,13 +480,18 @@ class CheckpointManager:
             List of session IDs from root to the given session
         """
         chain = []
+        seen: Set[str] = set()
         current = session_id
 
-        while current:
+        while current and current not in seen:
+            seen.add(current)
             chain.insert(0, current)
             # Get the continued_from link from session index
-            session_info = self.session_manager.session_index.get(current, {})
-            current = session_info.get("continued_from")
+            session_info = self.session_manager.session_index.get(current)
+            if session_info is None:
+                # Session no longer indexed; fall back to its checkpointed metadata
+                session_info = self._checkpointed_session_metadata(current)
+            current = (session_info or {}).get("continued_from")
 
         return chain
 
@@ -490,8 +526,12 @@ class CheckpointManager:
                 # Use the tail session directly
                 source_session = tail_session
             else:
-                # Load the session
+                # Load the session, falling back to its latest checkpoint
                 source_session = self.session_manager.load_session(session_id)
+                if source_session is None:
+                    source_session = await self._load_latest_session_checkpoint(
+                        session_id
+                    )
 
             if source_session:
                 for message in source_session.messages:
@@ -588,25 +628,36 @@ class CheckpointManager:
                 # For auto checkpoints, just use the current session
                 checkpoint_session = session
 
-            # Create checkpoint data with proper enum serialization
-            metadata_dict = metadata.__dict__.copy()
-            metadata_dict["type"] = metadata.type.value  # Convert enum to string
+            # Store new message blobs; unchanged history is already present
+            messages = checkpoint_session.messages
+            memo = self._message_digests.setdefault(checkpoint_session.id, {})
+            hashes = [self._store_message(m, memo) for m in messages]
+            for stale_id in memo.keys() - {m.id for m in messages}:
+                del memo[stale_id]
+            parent_id, base, depth = self._delta_base(checkpoint_session.id, hashes)
+            metadata.parent_checkpoint = parent_id
+
+            # Session fields other than messages are small and stored inline
+            envelope = copy.copy(checkpoint_session)
+            envelope.messages = []
 
             checkpoint_data = {
-                "metadata": metadata_dict,
-                "session": checkpoint_session.to_dict(),
+                "format": CHECKPOINT_FORMAT,
+                "metadata": self._metadata_to_dict(metadata),
+                "session": envelope.to_dict(),
+                "parent": parent_id,
+                "base": base,
+                "depth": depth,
+                "messages": hashes[base:],
             }
+            write_gzip_json_atomic(self._checkpoint_file(metadata.id), checkpoint_data)
 
-            # Compress and save
-            checkpoint_file = self.checkpoints_path / f"{metadata.id}.json.gz"
-            compressed_data = gzip.compress(json.dumps(checkpoint_data).encode("utf-8"))
-
-            with open(checkpoint_file, "wb") as f:
-                f.write(compressed_data)
+            self._session_heads[checkpoint_session.id] = (metadata.id, hashes, depth)
+            self._remember_resolved(metadata.id, hashes, depth)
 
             # Update index
             self.checkpoint_index[metadata.id] = metadata
-            self._save_checkpoint_index()
+            self._journal_append({"op": "put", "metadata": self._metadata_to_dict(metadata)})
 
             logger.debug(f"Created checkpoint file: {metadata.id}")
 
@@ -624,20 +675,19 @@ class CheckpointManager:
             Session object if successful, None otherwise
         """
         try:
-            checkpoint_file = self.checkpoints_path / f"{checkpoint_id}.json.gz"
+            checkpoint_file = self._checkpoint_file(checkpoint_id)
 
             if not checkpoint_file.exists():
                 logger.error(f"Checkpoint file not found: {checkpoint_file}")
                 return None
 
-            # Load and decompress
-            with open(checkpoint_file, "rb") as f:
-                compressed_data = f.read()
-
-            data = json.loads(gzip.decompress(compressed_data).decode("utf-8"))
+            data = read_gzip_json(checkpoint_file)
 
             # Extract session data
-            session_data = data.get("session", {})
+            session_data = dict(data.get("session", {}))
+            if data.get("format") == CHECKPOINT_FORMAT:
+                hashes, _ = self._resolve_hashes(checkpoint_id)
+                session_data["messages"] = [self.chunk_store.get(h) for h in hashes]
             return Session.from_dict(session_data)
 
         except Exception as e:
@@ -700,8 +750,11 @@ class CheckpointManager:
 
             # Delete the checkpoints
             for cp_id in checkpoints_to_delete:
-                await self._delete_checkpoint(cp_id)
-                cleaned_count += 1
+                if await self._delete_checkpoint(cp_id):
+                    cleaned_count += 1
+
+            if cleaned_count:
+                self._collect_garbage()
 
             return cleaned_count
 
@@ -709,28 +762,54 @@ class CheckpointManager:
             logger.error(f"Error during checkpoint cleanup: {e}")
             return 0
 
-    async def _delete_checkpoint(self, checkpoint_id: str) -> None:
+    async def _delete_checkpoint(self, checkpoint_id: str) -> bool:
         """
         Delete a checkpoint file and remove from index.
 
+        Delta children are first rebased onto this checkpoint's parent. If a
+        rebase fails the checkpoint is kept, since a child still depends on
+        it; children already rebased stay valid against the parent.
+
         Args:
             checkpoint_id: ID of the checkpoint to delete
+
+        Returns:
+            True if the checkpoint was deleted
         """
         try:
+            # Re-point delta children at this checkpoint's parent before removal
+            metadata = self.checkpoint_index.get(checkpoint_id)
+            new_parent = metadata.parent_checkpoint if metadata else None
+            for child_id, child in list(self.checkpoint_index.items()):
+                if child.parent_checkpoint == checkpoint_id:
+                    if not self._rebase_checkpoint(child_id, new_parent):
+                        logger.error(
+                            f"Keeping checkpoint {checkpoint_id}: "
+                            f"dependent checkpoint {child_id} could not be rebased"
+                        )
+                        return False
+
             # Remove file
-            checkpoint_file = self.checkpoints_path / f"{checkpoint_id}.json.gz"
+            checkpoint_file = self._checkpoint_file(checkpoint_id)
             if checkpoint_file.exists():
                 checkpoint_file.unlink()
 
+            self._resolved.pop(checkpoint_id, None)
+            for session_id, head in list(self._session_heads.items()):
+                if head[0] == checkpoint_id:
+                    del self._session_heads[session_id]
+
             # Remove from index
             if checkpoint_id in self.checkpoint_index:
                 del self.checkpoint_index[checkpoint_id]
-                self._save_checkpoint_index()
+                self._journal_append({"op": "delete", "id": checkpoint_id})
 
             logger.debug(f"Deleted checkpoint: {checkpoint_id}")
+            return True
 
         except Exception as e:
             logger.error(f"Error deleting checkpoint {checkpoint_id}: {e}")
+            return False
 
     def _load_checkpoint_index(self) -> None:
         """Load the checkpoint index from disk."""
@@ -741,23 +820,41 @@ class CheckpointManager:
 
                 # Convert dict data back to CheckpointMetadata objects
                 for cp_id, metadata_dict in data.items():
-                    # Convert type string back to enum
-                    metadata_dict["type"] = CheckpointType(metadata_dict["type"])
-                    self.checkpoint_index[cp_id] = CheckpointMetadata(**metadata_dict)
+                    self.checkpoint_index[cp_id] = self._metadata_from_dict(
+                        metadata_dict
+                    )
 
         except Exception as e:
             logger.error(f"Error loading checkpoint index: {e}")
             self.checkpoint_index = {}
 
+        # Replay updates appended since the last compaction
+        if not self.journal_path.exists():
+            return
+        try:
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn trailing write
+                    if record.get("op") == "put":
+                        metadata = self._metadata_from_dict(record["metadata"])
+                        self.checkpoint_index[metadata.id] = metadata
+                    elif record.get("op") == "delete":
+                        self.checkpoint_index.pop(record.get("id"), None)
+                    self._journal_entries += 1
+        except Exception as e:
+            logger.error(f"Error replaying checkpoint index journal: {e}")
+
     def _save_checkpoint_index(self) -> None:
         """Save the checkpoint index to disk."""
         try:
             # Convert CheckpointMetadata objects to dicts for serialization
-            index_data = {}
-            for cp_id, metadata in self.checkpoint_index.items():
-                metadata_dict = metadata.__dict__.copy()
-                metadata_dict["type"] = metadata.type.value  # Convert enum to string
-                index_data[cp_id] = metadata_dict
+            index_data = {
+                cp_id: self._metadata_to_dict(metadata)
+                for cp_id, metadata in self.checkpoint_index.items()
+            }
 
             # Write to temp file first for atomic operation
             temp_path = self.index_path.with_suffix(".tmp")
@@ -767,5 +864,206 @@ class CheckpointManager:
             # Atomic rename
             temp_path.replace(self.index_path)
 
+            # The snapshot now covers everything in the journal
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journal_entries = 0
+
         except Exception as e:
             logger.error(f"Error saving checkpoint index: {e}")
+
+    def _journal_append(self, record: Dict[str, Any]) -> None:
+        """Append an index update, compacting once the journal grows large."""
+        try:
+            with open(self.journal_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            self._journal_entries += 1
+        except Exception as e:
+            logger.error(f"Error appending to checkpoint index journal: {e}")
+            self._save_checkpoint_index()
+            return
+        if not self.index_path.exists() or self._journal_entries >= max(
+            JOURNAL_COMPACT_MIN, len(self.checkpoint_index)
+        ):
+            self._save_checkpoint_index()
+
+    @staticmethod
+    def _metadata_to_dict(metadata: CheckpointMetadata) -> Dict[str, Any]:
+        metadata_dict = metadata.__dict__.copy()
+        metadata_dict["type"] = metadata.type.value  # Convert enum to string
+        return metadata_dict
+
+    @staticmethod
+    def _metadata_from_dict(metadata_dict: Dict[str, Any]) -> CheckpointMetadata:
+        metadata_dict = dict(metadata_dict)
+        # Convert type string back to enum
+        metadata_dict["type"] = CheckpointType(metadata_dict["type"])
+        return CheckpointMetadata(**metadata_dict)
+
+    def _checkpoint_file(self, checkpoint_id: str) -> Path:
+        return self.checkpoints_path / f"{checkpoint_id}.json.gz"
+
+    # ------------------------------------------------------------------
+    # Chunk store helpers
+    # ------------------------------------------------------------------
+
+    def _store_message(
+        self,
+        message: Message,
+        memo: Optional[Dict[str, Tuple[Tuple[Any, ...], str]]] = None,
+    ) -> str:
+        """Return the blob hash for ``message``, storing it if new.
+
+        Messages are edited in place (tool calls appended to metadata, content
+        streamed in), so a hash memoized in ``memo`` is reused only while the
+        message still equals the copy taken when it was hashed. Comparing is
+        much cheaper than serializing, so unchanged history is not rewritten.
+        """
+        current = tuple(getattr(message, name) for name in _MESSAGE_FIELDS)
+        if memo is not None:
+            cached = memo.get(message.id)
+            if cached is not None and cached[0] == current:
+                return cached[1]
+        digest = self.chunk_store.put(message.to_dict())
+        if memo is not None:
+            memo[message.id] = (copy.deepcopy(current), digest)
+        return digest
+
+    def _delta_base(
+        self, session_id: str, hashes: List[str]
+    ) -> Tuple[Optional[str], int, int]:
+        """Pick the parent checkpoint and shared-prefix length for a new one."""
+        head = self._session_head(session_id)
+        if head is None:
+            return None, 0, 0
+        head_id, head_hashes, head_depth = head
+        if head_id not in self.checkpoint_index or head_depth + 1 >= KEYFRAME_INTERVAL:
+            return None, 0, 0
+        base = 0
+        for ours, theirs in zip(hashes, head_hashes):
+            if ours != theirs:
+                break
+            base += 1
+        return head_id, base, head_depth + 1
+
+    def _session_head(self, session_id: str) -> Optional[Tuple[str, List[str], int]]:
+        head = self._session_heads.get(session_id)
+        if head is not None:
+            return head
+        # After a restart, resume the chain from the newest stored checkpoint
+        candidates = self._session_checkpoints(session_id)
+        if not candidates:
+            return None
+        try:
+            hashes, depth = self._resolve_hashes(candidates[0].id)
+        except Exception:
+            return None
+        head = (candidates[0].id, hashes, depth)
+        self._session_heads[session_id] = head
+        return head
+
+    def _session_checkpoints(self, session_id: str) -> List[CheckpointMetadata]:
+        """Checkpoints of ``session_id``, newest first."""
+        return sorted(
+            (m for m in self.checkpoint_index.values() if m.session_id == session_id),
+            key=lambda m: m.created_at,
+            reverse=True,
+        )
+
+
+    def _read_manifest(self, checkpoint_id: str) -> Dict[str, Any]:
+        data = read_gzip_json(self._checkpoint_file(checkpoint_id))
+        if data.get("format") != CHECKPOINT_FORMAT:
+            raise ValueError(f"Checkpoint {checkpoint_id} is a legacy full snapshot")
+        return data
+
+    def _resolve_hashes(self, checkpoint_id: str) -> Tuple[List[str], int]:
+        """Expand a checkpoint's delta chain into its full message hash list."""
+        chain: List[Dict[str, Any]] = []
+        hashes: List[str] = []
+        depth = 0
+        current: Optional[str] = checkpoint_id
+        while current:
+            cached = self._resolved.get(current)
+            if cached is not None:
+                hashes, depth = list(cached[0]), cached[1]
+                break
+            manifest = self._read_manifest(current)
+            chain.append(manifest)
+            current = manifest.get("parent")
+        for manifest in reversed(chain):
+            hashes = hashes[: manifest["base"]] + list(manifest["messages"])
+            depth = manifest.get("depth", 0)
+        self._remember_resolved(checkpoint_id, hashes, depth)
+        return hashes, depth
+
+    def _remember_resolved(self, checkpoint_id: str, hashes: List[str], depth: int) -> None:
+        self._resolved[checkpoint_id] = (list(hashes), depth)
+        self._resolved.move_to_end(checkpoint_id)
+        while len(self._resolved) > 32:
+            self._resolved.popitem(last=False)
+
+    def _rebase_checkpoint(self, checkpoint_id: str, new_parent: Optional[str]) -> bool:
+        """Rewrite a manifest as a delta against ``new_parent`` (or a keyframe).
+
+        Returns False, leaving the manifest untouched, if it cannot be rewritten.
+        """
+        try:
+            manifest = self._read_manifest(checkpoint_id)
+            hashes, _ = self._resolve_hashes(checkpoint_id)
+            base, depth = 0, 0
+            if new_parent is not None:
+                parent_hashes, parent_depth = self._resolve_hashes(new_parent)
+                for ours, theirs in zip(hashes, parent_hashes):
+                    if ours != theirs:
+                        break
+                    base += 1
+                depth = parent_depth + 1
+            manifest.update(
+                parent=new_parent, base=base, depth=depth, messages=hashes[base:]
+            )
+            manifest["metadata"]["parent_checkpoint"] = new_parent
+            write_gzip_json_atomic(self._checkpoint_file(checkpoint_id), manifest)
+        except Exception as e:
+            logger.error(f"Error rebasing checkpoint {checkpoint_id}: {e}")
+            return False
+
+        metadata = self.checkpoint_index[checkpoint_id]
+        metadata.parent_checkpoint = new_parent
+        self._remember_resolved(checkpoint_id, hashes, depth)
+        self._journal_append({"op": "put", "metadata": self._metadata_to_dict(metadata)})
+        return True
+
+    def _collect_garbage(self) -> int:
+        """Remove blobs no longer referenced by any checkpoint manifest."""
+        referenced: Set[str] = set()
+        for checkpoint_id in self.checkpoint_index:
+            try:
+                referenced.update(self._read_manifest(checkpoint_id)["messages"])
+            except ValueError:
+                continue  # Legacy snapshot, no blobs
+            except Exception as e:
+                # Unreadable manifest: keep everything rather than risk data loss
+                logger.error(f"Skipping blob sweep, cannot read {checkpoint_id}: {e}")
+                return 0
+        removed = self.chunk_store.sweep(referenced)
+        if removed:
+            logger.debug(f"Removed {removed} unreferenced checkpoint blobs")
+        return removed
+
+    def _checkpointed_session_metadata(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Session metadata from the newest checkpoint of ``session_id``, if any."""
+        for metadata in self._session_checkpoints(session_id):
+            try:
+                data = read_gzip_json(self._checkpoint_file(metadata.id))
+            except Exception:
+                continue
+            session_metadata = data.get("session", {}).get("metadata")
+            return session_metadata if isinstance(session_metadata, dict) else {}
+        return None
+
+    async def _load_latest_session_checkpoint(self, session_id: str) -> Optional[Session]:
+        candidates = self._session_checkpoints(session_id)
+        if not candidates:
+            return None
+        return await self._load_checkpoint_session(candidates[0].id)
@@ -0,0 +1,125 @@
+"""
+Content-addressed storage for conversation checkpoints.
+
+Messages are stored once as gzip-compressed JSON blobs named by the SHA-256 of
+their canonical serialization. A checkpoint manifest then only lists the
+hashes of messages added since its parent checkpoint, so checkpoint cost is
+proportional to new messages and disk usage to unique content.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_json(payload: Any) -> bytes:
+    """Serialize ``payload`` deterministically for hashing."""
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def write_gzip_json_atomic(path: Path, payload: Any) -> None:
+    """Write ``payload`` as gzip-compressed JSON via a temp file + rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(gzip.compress(json.dumps(payload).encode("utf-8")))
+    temp_path.replace(path)
+
+
+def read_gzip_json(path: Path) -> Any:
+    with open(path, "rb") as f:
+        return json.loads(gzip.decompress(f.read()).decode("utf-8"))
+
+
+class CheckpointChunkStore:
+    """Blob store keyed by content hash, laid out as ``objects/ab/<hash>``."""
+
+    def __init__(self, root: Path, cache_size: int = 4096):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_size = cache_size
+        self.stats = {"writes": 0, "dedup_hits": 0, "reads": 0, "cache_hits": 0}
+
+    @staticmethod
+    def digest(payload: Any) -> str:
+        return hashlib.sha256(canonical_json(payload)).hexdigest()
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest[2:]}.json.gz"
+
+    def contains(self, digest: str) -> bool:
+        return digest in self._cache or self._path(digest).exists()
+
+    def put(self, payload: Any, digest: Optional[str] = None) -> str:
+        """Store ``payload`` unless an identical blob exists; return its hash."""
+        raw = canonical_json(payload)
+        digest = digest or hashlib.sha256(raw).hexdigest()
+        if self.contains(digest):
+            self.stats["dedup_hits"] += 1
+            return digest
+        path = self._path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(gzip.compress(raw))
+        temp_path.replace(path)
+        self.stats["writes"] += 1
+        self._remember(digest, raw)
+        return digest
+
+    def get(self, digest: str) -> Any:
+        """Return a fresh decoded copy of the blob (callers may mutate it)."""
+        raw = self._cache.get(digest)
+        if raw is not None:
+            self._cache.move_to_end(digest)
+            self.stats["cache_hits"] += 1
+        else:
+            with open(self._path(digest), "rb") as f:
+                raw = gzip.decompress(f.read())
+            self.stats["reads"] += 1
+            self._remember(digest, raw)
+        return json.loads(raw.decode("utf-8"))
+
+    def _remember(self, digest: str, raw: bytes) -> None:
+        self._cache[digest] = raw
+        self._cache.move_to_end(digest)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def sweep(self, referenced: Iterable[str]) -> int:
+        """Delete every blob whose hash is not in ``referenced``."""
+        keep = set(referenced)
+        removed = 0
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for blob in shard.glob("*.json.gz"):
+                digest = shard.name + blob.name[: -len(".json.gz")]
+                if digest in keep:
+                    continue
+                try:
+                    blob.unlink()
+                    removed += 1
+                except OSError as e:
+                    logger.debug(f"Could not remove checkpoint blob {blob}: {e}")
+                self._cache.pop(digest, None)
+            try:
+                if not any(os.scandir(shard)):
+                    shard.rmdir()
+            except OSError:
+                pass
+        return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
@@ -285,9 +285,10 @@ class ContextWindowManager:
                     item.get("type") in ["image", "image_url"]
                     or "image_path" in item
                 ):
-                    # Much more realistic image token estimates - Claude models use ~4000 tokens per image
-                    total += 4000  # Higher default for safety
-                    # TODO: Make this dynamic based on the model used
+                    # Sized from the image's real dimensions when it can be read
+                    from penguin.llm.image_cache import estimate_image_part_tokens
+
+                    total += estimate_image_part_tokens(item)
                 elif isinstance(item, dict) and "text" in item:
                     total += len(item["text"]) // 4
                 else:
@@ -432,7 +433,7 @@ class ContextWindowManager:
             # Use existing token count or calculate new one
             token_count = msg.tokens
             if token_count == 0:
-                token_count = self.token_counter(content)
+                token_count = self._count_content_tokens(content)
                 # Update message token count for future reference
                 msg.tokens = token_count
 
@@ -566,7 +567,7 @@ class ContextWindowManager:
                 # First pass: Remove oldest messages until we reach our token target
                 msgs_to_keep = []
                 for msg in category_msgs:
-                    msg_tokens = msg.tokens or self.token_counter(msg.content)
+                    msg_tokens = msg.tokens or self._count_content_tokens(msg.content)
 
                     if tokens_removed < category_excess:
                         # Remove this message (oldest first)
@@ -641,6 +642,27 @@ class ContextWindowManager:
 
         return result_session
 
+    def _count_content_tokens(self, content: Any) -> int:
+        """Count tokens for message content, sizing image parts by their dimensions.
+
+        Non-image parts go through the configured token counter; image parts use
+        the image cache's per-image estimate instead of a counter's fixed guess.
+        """
+        if not self._contains_image(content):
+            return self.token_counter(content)
+        from penguin.llm.image_cache import estimate_image_part_tokens
+
+        total = 0
+        other_parts = []
+        for part in content:
+            if self._contains_image([part]):
+                total += estimate_image_part_tokens(part)
+            else:
+                other_parts.append(part)
+        if other_parts:
+            total += self.token_counter(other_parts)
+        return total
+
     def _contains_image(self, content: Any) -> bool:
         """Check if content contains an image."""
         if not isinstance(content, list):
@@ -686,7 +708,7 @@ class ContextWindowManager:
             id=msg.id,
             timestamp=msg.timestamp,
             metadata={**msg.metadata, "image_replaced": True},
-            tokens=self.token_counter(new_content),
+            tokens=self._count_content_tokens(new_content),
         )
 
     def _handle_image_trimming(self, session: Session) -> Session:
@@ -0,0 +1,315 @@
+"""SQLite sidecar index over the daily Markdown journals.
+
+The ``YYYY-MM-DD.md`` files stay the source of truth; this index only makes
+them fast to query. Each day file is tracked by its size, mtime, a fingerprint
+of its first bytes and the byte offset already parsed, so a sync after an
+append reads just the new entry. A file that shrank or whose head changed
+(edited by hand) is re-parsed from the start, a deleted file drops its rows,
+and deleting the database simply rebuilds it on the next sync. The journal
+directory is usually committed, so the index and its WAL files are listed in
+the directory's ``.gitignore``.
+
+Entries are searchable through an FTS5 table ranked by bm25. When SQLite is
+built without FTS5, search falls back to ``LIKE`` matching.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = ".journal_index.sqlite3"
+# Matches the database and its -wal/-shm files
+_GITIGNORE_PATTERN = f"{INDEX_FILENAME}*"
+
+ENTRY_PATTERN = re.compile(r"---\s*\n(.*?)\n---\s*\n(.*?)\n(?=---|$)", re.DOTALL)
+
+# Bytes from the head of a file used to detect rewrites
+_FINGERPRINT_BYTES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal_files (
+    date TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    head BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS journal_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    entry_type TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    content TEXT NOT NULL,
+    UNIQUE (date, byte_offset)
+);
+
+CREATE INDEX IF NOT EXISTS idx_journal_entries_agent ON journal_entries (agent_id, date);
+CREATE INDEX IF NOT EXISTS idx_journal_entries_session ON journal_entries (session_id, date);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS journal_fts USING fts5(
+    content,
+    content='journal_entries',
+    content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS journal_fts_insert AFTER INSERT ON journal_entries
+BEGIN
+    INSERT INTO journal_fts(rowid, content) VALUES (new.id, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS journal_fts_delete AFTER DELETE ON journal_entries
+BEGIN
+    INSERT INTO journal_fts(journal_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+"""
+
+
+def _ensure_gitignored(directory: Path) -> None:
+    """Add the index files to ``directory/.gitignore`` if not already there."""
+    gitignore = directory / ".gitignore"
+    try:
+        existing = gitignore.read_text(encoding="utf-8") if gitignore.exists() else ""
+        if _GITIGNORE_PATTERN in existing.splitlines():
+            return
+        with open(gitignore, "a", encoding="utf-8") as f:
+            if existing and not existing.endswith("\n"):
+                f.write("\n")
+            f.write(f"{_GITIGNORE_PATTERN}\n")
+    except OSError as e:
+        logger.debug(f"Could not update {gitignore}: {e}")
+
+
+def parse_entries(text: str, base_offset: int = 0) -> Iterator[Tuple[int, int, Dict[str, Any], str]]:
+    """Yield ``(byte_offset, end_byte_offset, metadata, content)`` per entry in ``text``."""
+    char_pos, byte_pos = 0, base_offset
+    for match in ENTRY_PATTERN.finditer(text):
+        byte_pos += len(text[char_pos : match.start()].encode("utf-8"))
+        start = byte_pos
+        byte_pos += len(match.group(0).encode("utf-8"))
+        char_pos = match.end()
+        try:
+            metadata = yaml.safe_load(match.group(1))
+        except yaml.YAMLError:
+            continue
+        if isinstance(metadata, dict):
+            yield start, byte_pos, metadata, match.group(2).strip()
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word, as a quoted prefix."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"*' for term in terms if term)
+
+
+class JournalIndex:
+    """SQLite (FTS5) index of journal entries, kept in sync with the day files."""
+
+    def __init__(self, journal_dir: Path, db_path: Optional[Path] = None):
+        self.journal_dir = Path(journal_dir)
+        self.db_path = Path(db_path) if db_path else self.journal_dir / INDEX_FILENAME
+        if self.db_path.parent == self.journal_dir:
+            _ensure_gitignored(self.journal_dir)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.info(f"FTS5 unavailable, journal search will use LIKE: {e}")
+            self.has_fts = False
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── syncing ────────────────────────────────────────────────────────
+
+    def sync(self) -> int:
+        """Bring the index up to date with every day file; returns new entries."""
+        added = 0
+        with self._lock:
+            present = set()
+            for path in self.journal_dir.glob("*.md"):
+                present.add(path.stem)
+                try:
+                    added += self._sync_file(path)
+                except OSError as e:
+                    logger.debug(f"Skipping journal {path}: {e}")
+            for row in self._conn.execute("SELECT date FROM journal_files").fetchall():
+                if row["date"] not in present:
+                    self._forget(row["date"])
+            self._conn.commit()
+        return added
+
+    def sync_file(self, path: Path) -> int:
+        """Index whatever was appended to one day file since the last sync."""
+        with self._lock:
+            try:
+                added = self._sync_file(Path(path))
+            except OSError as e:
+                logger.debug(f"Skipping journal {path}: {e}")
+                return 0
+            self._conn.commit()
+            return added
+
+    def rebuild(self) -> int:
+        """Drop everything and re-index all day files."""
+        with self._lock:
+            self._conn.execute("DELETE FROM journal_entries")
+            self._conn.execute("DELETE FROM journal_files")
+            self._conn.commit()
+        return self.sync()
+
+    def _forget(self, date: str) -> None:
+        self._conn.execute("DELETE FROM journal_entries WHERE date = ?", (date,))
+        self._conn.execute("DELETE FROM journal_files WHERE date = ?", (date,))
+
+    def _sync_file(self, path: Path) -> int:
+        date = path.stem
+        st = path.stat()
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, offset, head FROM journal_files WHERE date = ?", (date,)
+        ).fetchone()
+        if row is not None and row["size"] == st.st_size and row["mtime_ns"] == st.st_mtime_ns:
+            return 0
+
+        with open(path, "rb") as handle:
+            head = handle.read(_FINGERPRINT_BYTES)
+            offset = 0
+            if row is not None:
+                offset = int(row["offset"])
+                if st.st_size < offset or not head.startswith(bytes(row["head"])):
+                    # Rewritten rather than appended to: start over
+                    self._conn.execute("DELETE FROM journal_entries WHERE date = ?", (date,))
+                    offset = 0
+            handle.seek(offset)
+            data = handle.read()
+
+        batch = []
+        consumed = offset
+        for start, end, metadata, content in parse_entries(
+            data.decode("utf-8", errors="replace"), offset
+        ):
+            batch.append(
+                (
+                    date,
+                    start,
+                    str(metadata.get("timestamp", "")),
+                    str(metadata.get("entry_type", "unknown")),
+                    str(metadata.get("session_id", "")),
+                    str(metadata.get("agent_id", "main")),
+                    int(metadata.get("tokens", 0) or 0),
+                    content,
+                )
+            )
+            consumed = end
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO journal_entries "
+            "(date, byte_offset, timestamp, entry_type, session_id, agent_id, tokens, content) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            batch,
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO journal_files (date, size, mtime_ns, offset, head) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (date, st.st_size, st.st_mtime_ns, consumed, head),
+        )
+        return len(batch)
+
+    # ── queries ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _filters(
+        date_from: Optional[str],
+        date_to: Optional[str],
+        agent_id: Optional[str],
+        session_id: Optional[str],
+        entry_type: Optional[str],
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for clause, value in (
+            ("e.date >= ?", date_from),
+            ("e.date <= ?", date_to),
+            ("e.agent_id = ?", agent_id),
+            ("e.session_id = ?", session_id),
+            ("e.entry_type = ?", entry_type),
+        ):
+            if value:
+                clauses.append(clause)
+                params.append(value)
+        return clauses, params
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        entry_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Entries matching ``query``, best match first."""
+        clauses, params = self._filters(date_from, date_to, agent_id, session_id, entry_type)
+        match = _fts_query(query)
+        if self.has_fts and match:
+            sql = (
+                "SELECT e.*, bm25(journal_fts) AS score FROM journal_fts "
+                "JOIN journal_entries e ON e.id = journal_fts.rowid "
+                "WHERE journal_fts MATCH ?"
+            )
+            params.insert(0, match)
+            order = "score, e.date DESC, e.byte_offset DESC"
+        else:
+            sql = "SELECT e.*, 0.0 AS score FROM journal_entries e WHERE e.content LIKE ?"
+            params.insert(0, f"%{query}%")
+            order = "e.date DESC, e.byte_offset DESC"
+        for clause in clauses:
+            sql += f" AND {clause}"
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def tail(
+        self,
+        count: int = 50,
+        date: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """The last ``count`` entries in file order, optionally for one day."""
+        clauses, params = self._filters(date, date, agent_id, session_id, None)
+        sql = "SELECT e.* FROM journal_entries e"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY e.date DESC, e.byte_offset DESC LIMIT ?"
+        params.append(int(count))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def entry_count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM journal_entries").fetchone()[0])
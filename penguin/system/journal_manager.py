@@ -2,10 +2,13 @@
 """
 Journal 247 System - Phase 1 (Manual)
 Manages daily session logs with YAML frontmatter.
+
+The Markdown files are the source of truth. Search and tail reads go through
+a sidecar SQLite index (see ``journal_index``) that is updated on append and
+can be rebuilt from the files at any time.
 """
 
 import os
-import re
 import yaml
 import logging
 from pathlib import Path
@@ -13,6 +16,8 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 
+from penguin.system.journal_index import ENTRY_PATTERN, JournalIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,14 +47,45 @@ class JournalEntry:
 class JournalManager:
     """Manages daily journal files in context/journal/."""
 
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, fsync: bool = False):
         self.project_root = Path(project_root)
         self.journal_dir = self.project_root / "context" / "journal"
         self.journal_dir.mkdir(parents=True, exist_ok=True)
+        # fsync per entry is opt-in; a flushed append survives a process crash
+        self.fsync = fsync
+        self._index: Optional[JournalIndex] = None
+        self._index_failed = False
 
         today = datetime.now().strftime("%Y-%m-%d")
         self.today_file = self.journal_dir / f"{today}.md"
 
+    @property
+    def index(self) -> Optional[JournalIndex]:
+        """Sidecar search index, or None if it cannot be opened."""
+        if self._index is None and not self._index_failed:
+            try:
+                self._index = JournalIndex(self.journal_dir)
+            except Exception as e:
+                logger.warning(f"Journal index unavailable, scanning files instead: {e}")
+                self._index_failed = True
+        return self._index
+
+    def rebuild_index(self) -> int:
+        """Re-index every journal file from scratch; returns the entry count."""
+        index = self.index
+        return index.rebuild() if index else 0
+
+    @staticmethod
+    def _entry_from_row(row: Dict[str, Any]) -> JournalEntry:
+        return JournalEntry(
+            timestamp=row['timestamp'],
+            entry_type=row['entry_type'],
+            session_id=row['session_id'],
+            agent_id=row['agent_id'],
+            tokens=row['tokens'],
+            content=row['content'],
+        )
+
     def write_entry(
         self,
         content: str,
@@ -72,8 +108,15 @@ class JournalManager:
             with open(self.today_file, 'a', encoding='utf-8') as f:
                 f.write(entry.to_yaml_frontmatter())
                 f.flush()
-                os.fsync(f.fileno())
+                if self.fsync:
+                    os.fsync(f.fileno())
 
+            index = self.index
+            if index:
+                try:
+                    index.sync_file(self.today_file)  # Reads only the appended bytes
+                except Exception as e:
+                    logger.debug(f"Journal index update failed: {e}")
             return True
         except Exception as e:
             logger.error(f"Failed to write journal: {e}")
@@ -84,14 +127,21 @@ class JournalManager:
         if not self.today_file.exists():
             return []
 
+        index = self.index
+        if index:
+            try:
+                index.sync_file(self.today_file)
+                rows = index.tail(count, date=self.today_file.stem)
+                return [self._entry_from_row(row) for row in rows]
+            except Exception as e:
+                logger.debug(f"Journal index tail failed, reading file: {e}")
+
         try:
             with open(self.today_file, 'r', encoding='utf-8') as f:
                 content = f.read()
 
             entries = []
-            pattern = r'---\s*\n(.*?)\n---\s*\n(.*?)\n(?=---|$)'
-
-            for match in re.finditer(pattern, content, re.DOTALL):
+            for match in ENTRY_PATTERN.finditer(content):
                 try:
                     metadata = yaml.safe_load(match.group(1))
                     entries.append(JournalEntry(
@@ -121,9 +171,7 @@ class JournalManager:
                 content = f.read()
 
             entries = []
-            pattern = r'---\s*\n(.*?)\n---\s*\n(.*?)\n(?=---|$)'
-
-            for match in re.finditer(pattern, content, re.DOTALL):
+            for match in ENTRY_PATTERN.finditer(content):
                 try:
                     metadata = yaml.safe_load(match.group(1))
                     entries.append(JournalEntry(
@@ -150,17 +198,67 @@ class JournalManager:
             logger.error(f"Failed to list journals: {e}")
             return []
 
-    def search(self, query: str) -> List[Dict[str, Any]]:
-        """Search across all journals."""
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        entry_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search across all journals, best match first.
+
+        Dates are ``YYYY-MM-DD`` bounds (inclusive). Uses the sidecar index;
+        falls back to scanning the files when it is unavailable.
+        """
+        index = self.index
+        if index:
+            try:
+                index.sync()
+                rows = index.search(
+                    query,
+                    limit=limit,
+                    date_from=date_from,
+                    date_to=date_to,
+                    agent_id=agent_id,
+                    session_id=session_id,
+                    entry_type=entry_type,
+                )
+                return [
+                    {
+                        'date': row['date'],
+                        'timestamp': row['timestamp'],
+                        'entry_type': row['entry_type'],
+                        'agent_id': row['agent_id'],
+                        'session_id': row['session_id'],
+                        'score': row['score'],
+                        'content': row['content'][:200] + "..." if len(row['content']) > 200 else row['content'],
+                    }
+                    for row in rows
+                ]
+            except Exception as e:
+                logger.debug(f"Journal index search failed, scanning files: {e}")
+
         results = []
         for journal_file in sorted(self.journal_dir.glob("*.md")):
-            entries = self.read_date(journal_file.stem)
+            date = journal_file.stem
+            if (date_from and date < date_from) or (date_to and date > date_to):
+                continue
+            entries = self.read_date(date)
             for entry in entries:
+                if (
+                    (agent_id and entry.agent_id != agent_id)
+                    or (session_id and entry.session_id != session_id)
+                    or (entry_type and entry.entry_type != entry_type)
+                ):
+                    continue
                 if query.lower() in entry.content.lower():
                     results.append({
-                        'date': journal_file.stem,
+                        'date': date,
                         'timestamp': entry.timestamp,
                         'entry_type': entry.entry_type,
                         'content': entry.content[:200] + "..." if len(entry.content) > 200 else entry.content
                     })
-        return results
+        return results[:limit]
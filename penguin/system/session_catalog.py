@@ -0,0 +1,178 @@
+"""Ordered session catalog over the session index.
+
+``SessionManager.session_index`` maps session IDs to lightweight metadata and
+is persisted as ``session_index.json``. ``SessionCatalog`` is that same dict,
+but it also keeps the IDs sorted by ``last_active`` as entries are written,
+so a page of the newest sessions is read without sorting the whole index.
+Filters by directory, agent and parent walk the order from newest and stop
+as soon as the page is full.
+
+Entries are kept in order whenever one is assigned or removed. Code that
+edits ``last_active`` inside an existing entry must assign the entry again
+(``index[sid] = entry``) for the new position to be picked up.
+"""
+
+import bisect
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Characters of the first user message kept as the cached title fallback
+FIRST_PROMPT_MAX_CHARS = 40
+
+
+def first_prompt_from_messages(messages: Iterable[Any]) -> str:
+    """First line of the first user message, shortened for list views.
+
+    Accepts ``Message`` objects or their serialized dicts.
+    """
+    for message in messages:
+        if isinstance(message, dict):
+            role, content = message.get("role"), message.get("content", "")
+        else:
+            role, content = getattr(message, "role", None), getattr(message, "content", "")
+        if role != "user":
+            continue
+        text = ""
+        if isinstance(content, str):
+            text = content
+        elif isinstance(content, list):
+            for item in content:
+                if isinstance(item, dict) and item.get("type") == "text":
+                    text = item.get("text", "") or ""
+                    break
+        first_line = text.split("\n", 1)[0]
+        if len(first_line) > FIRST_PROMPT_MAX_CHARS:
+            return first_line[: FIRST_PROMPT_MAX_CHARS - 3] + "..."
+        return first_line
+    return ""
+
+
+def _order_key(session_id: str, entry: Any) -> Tuple[str, str]:
+    last_active = entry.get("last_active") if isinstance(entry, dict) else None
+    return (last_active if isinstance(last_active, str) else "", session_id)
+
+
+def _normalize_directory(directory: str) -> str:
+    return os.path.normcase(os.path.normpath(os.path.expanduser(directory)))
+
+
+class SessionCatalog(dict):
+    """Session index dict that keeps its IDs ordered by ``last_active``."""
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        super().__init__(entries or {})
+        self._keys: Dict[str, Tuple[str, str]] = {}
+        self._order: List[Tuple[str, str]] = []
+        self.reorder()
+
+    def reorder(self) -> None:
+        """Rebuild the ordering from scratch (after in-place edits)."""
+        self._keys = {sid: _order_key(sid, entry) for sid, entry in dict.items(self)}
+        self._order = sorted(self._keys.values())
+
+    def _place(self, session_id: str) -> None:
+        key = _order_key(session_id, dict.get(self, session_id))
+        old = self._keys.get(session_id)
+        if old == key:
+            return
+        if old is not None:
+            self._discard(old)
+        self._keys[session_id] = key
+        bisect.insort(self._order, key)
+
+    def _discard(self, key: Tuple[str, str]) -> None:
+        position = bisect.bisect_left(self._order, key)
+        if position < len(self._order) and self._order[position] == key:
+            del self._order[position]
+
+    def _forget(self, session_id: str) -> None:
+        key = self._keys.pop(session_id, None)
+        if key is not None:
+            self._discard(key)
+
+    def __setitem__(self, session_id: str, entry: Dict[str, Any]) -> None:
+        super().__setitem__(session_id, entry)
+        self._place(session_id)
+
+    def __delitem__(self, session_id: str) -> None:
+        super().__delitem__(session_id)
+        self._forget(session_id)
+
+    def pop(self, session_id, *default):
+        value = super().pop(session_id, *default)
+        self._forget(session_id)
+        return value
+
+    def popitem(self):
+        session_id, entry = super().popitem()
+        self._forget(session_id)
+        return session_id, entry
+
+    def setdefault(self, session_id, default=None):
+        if session_id not in self:
+            self[session_id] = default
+        return dict.__getitem__(self, session_id)
+
+    def update(self, *args, **kwargs) -> None:
+        for session_id, entry in dict(*args, **kwargs).items():
+            self[session_id] = entry
+
+    def clear(self) -> None:
+        super().clear()
+        self._keys.clear()
+        self._order.clear()
+
+    def touch(self, session_id: str) -> None:
+        """Re-position one session after its entry was edited in place."""
+        if session_id in self:
+            self._place(session_id)
+
+    def newest(self) -> Iterator[str]:
+        """Session IDs from the most to the least recently active."""
+        for position in range(len(self._order) - 1, -1, -1):
+            yield self._order[position][1]
+
+    def page(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        *,
+        directory: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Newest-first ``(session_id, entry)`` pairs matching the filters."""
+        if limit <= 0:
+            return []
+        offset = max(offset, 0)
+        if directory is None and agent_id is None and parent_id is None:
+            end = len(self._order) - offset
+            start = max(end - limit, 0)
+            return [
+                (sid, dict.__getitem__(self, sid))
+                for _, sid in reversed(self._order[start:max(end, 0)])
+            ]
+
+        wanted_directory = _normalize_directory(directory) if directory else None
+        results: List[Tuple[str, Dict[str, Any]]] = []
+        skipped = 0
+        for session_id in self.newest():
+            entry = dict.__getitem__(self, session_id)
+            if wanted_directory is not None:
+                entry_directory = entry.get("directory")
+                if not isinstance(entry_directory, str) or _normalize_directory(entry_directory) != wanted_directory:
+                    continue
+            if agent_id is not None and entry.get("agent_id") != agent_id:
+                continue
+            if parent_id is not None and parent_id not in (
+                entry.get("parentID"),
+                entry.get("parent_id"),
+            ):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            results.append((session_id, entry))
+            if len(results) >= limit:
+                break
+        return results
@@ -18,7 +18,7 @@ from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 
 # ------------------------------------------------------------------
 # Ensure builtins.open is always available (some libraries may delete
@@ -39,12 +39,23 @@ _safe_open = builtins.open  # type: ignore[assignment]
 builtins.open = _safe_open  # type: ignore[attr-defined]
 
 from penguin.config import CONVERSATIONS_PATH
+from penguin.system.session_catalog import SessionCatalog, first_prompt_from_messages
 from penguin.system.state import Message, MessageCategory, Session, create_message
 from penguin.constants import DEFAULT_MAX_MESSAGES_PER_SESSION
 
 
 logger = logging.getLogger(__name__)
 
+# When set, sessions are handed to this writer instead of being written here.
+# Agent worker processes use it so that only the parent writes session files.
+_session_writer: Optional[Callable[["SessionManager", Session], bool]] = None
+
+
+def set_session_writer(writer: Optional[Callable[["SessionManager", Session], bool]]) -> None:
+    """Route every ``save_session`` in this process to ``writer`` (None restores file writes)."""
+    global _session_writer
+    _session_writer = writer
+
 
 class SessionManager:
     """
@@ -55,7 +66,7 @@ class SessionManager:
     - Saving sessions with transaction safety
     - Detecting when to create a new session
     - Creating continuation sessions for long-running conversations
-    - Maintaining a lightweight index of all sessions
+    - Maintaining a lightweight index of all sessions, ordered by activity
     """
 
     def __init__(
@@ -88,9 +99,9 @@ class SessionManager:
         # Create directory if it doesn't exist
         os.makedirs(self.base_path, exist_ok=True)
         
-        # Initialize the session index
+        # Initialize the session index (kept ordered by last_active)
         self.index_path = self.base_path / "session_index.json"
-        self.session_index = self._load_or_create_index()
+        self.session_index = SessionCatalog(self._load_or_create_index())
         
         # Setup auto-save thread if interval > 0
         self.auto_save_interval = auto_save_interval
@@ -167,7 +178,8 @@ class SessionManager:
                     "created_at": created_at,
                     "last_active": last_active,
                     "message_count": metadata.get("message_count", 0),
-                    "title": metadata.get("title", f"Session {session_id[-8:]}")
+                    "title": metadata.get("title", f"Session {session_id[-8:]}"),
+                    "first_prompt": first_prompt_from_messages(data.get("messages", [])),
                 }
                 self._copy_metadata_to_index_entry(metadata, index[session_id])
             except Exception as e:
@@ -179,6 +191,8 @@ class SessionManager:
     
     def _save_index(self, index: Dict[str, Dict[str, Any]]) -> None:
         """Save the session index to disk."""
+        if _session_writer is not None:
+            return  # The writer's process owns the index
         try:
             # Write to temp file first - fix the suffix
             temp_path = Path(f"{self.index_path}.temp")  # Fix: Use explicit Path constructor
@@ -303,7 +317,8 @@ class SessionManager:
             "created_at": session.created_at,
             "last_active": session.last_active,
             "message_count": 0,
-            "title": f"Session {session.id[-8:]}"
+            "title": f"Session {session.id[-8:]}",
+            "first_prompt": "",
         }
         self._copy_metadata_to_index_entry(
             session.metadata,
@@ -496,6 +511,12 @@ class SessionManager:
         if not session:
             logger.error("No session to save")
             return False
+
+        if _session_writer is not None:
+            saved = _session_writer(self, session)
+            if saved and session.id in self.sessions:
+                self.sessions[session.id] = (session, False)
+            return saved
             
         try:
             temp_path = self.base_path / f"{session.id}.{self.format}.temp"
@@ -527,7 +548,8 @@ class SessionManager:
                 "last_active": session.last_active,
                 "message_count": session.metadata.get("message_count", 0),
                 "token_count": token_count,  # Always include token count
-                "title": session.metadata.get("title", f"Session {session.id[-8:]}")
+                "title": session.metadata.get("title", f"Session {session.id[-8:]}"),
+                "first_prompt": first_prompt_from_messages(session.messages),
             }
             self._copy_metadata_to_index_entry(
                 session.metadata,
@@ -651,6 +673,7 @@ class SessionManager:
             "last_active": continuation.last_active,
             "message_count": len(continuation.messages),
             "title": f"Continuation of {source_session.id[-8:]}",
+            "first_prompt": first_prompt_from_messages(continuation.messages),
             "continued_from": source_session.id,
             "token_count": continuation_token_count,
             "source_session_tokens": source_token_count,
@@ -700,101 +723,76 @@ class SessionManager:
                 
         return continuation_count + 1
     
-    def list_sessions(self, limit: int = 100, offset: int = 0) -> List[Dict]:
+    def list_sessions(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        *,
+        directory: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> List[Dict]:
         """
         List available sessions with metadata using the index.
         
         Args:
             limit: Maximum number of sessions to return
             offset: Offset for pagination
+            directory: Only sessions whose working directory matches
+            agent_id: Only sessions owned by this agent
+            parent_id: Only child sessions of this session
             
         Returns:
-            List of session metadata dictionaries
+            List of session metadata dictionaries, most recently active first
         """
-        # Use the index for efficient listing
-        sorted_sessions = sorted(
-            self.session_index.items(),
-            key=lambda x: x[1].get("last_active", ""),
-            reverse=True
+        # The catalog is already ordered, so only the page itself is visited
+        paginated = self.session_index.page(
+            limit,
+            offset,
+            directory=directory,
+            agent_id=agent_id,
+            parent_id=parent_id,
         )
         
-        # Apply pagination
-        paginated = sorted_sessions[offset:offset+limit]
-        
-        # Format the results with titles from first user messages
         result = []
+        index_dirty = False
         for session_id, metadata in paginated:
             session_data = {
                 "id": session_id,
                 **metadata
             }
             
-            # Try to extract a title from the first user message if not already set
+            # Fall back to the first user message, cached in the index at save time
             if not session_data.get("title"):
-                try:
-                    # Check if session is in memory cache first
-                    if session_id in self.sessions:
-                        session = self.sessions[session_id][0]
-                        # Find first user message
-                        for msg in session.messages:
-                            if msg.role == "user":
-                                # Use content as title
-                                content = msg.content
-                                if isinstance(content, str):
-                                    first_line = content.split('\n', 1)[0]
-                                    session_data["title"] = (first_line[:37] + '...') if len(first_line) > 40 else first_line
-                                    break
-                                elif isinstance(content, list) and len(content) > 0:
-                                    # Try to extract text from structured content
-                                    for item in content:
-                                        if isinstance(item, dict) and item.get("type") == "text":
-                                            text = item.get("text", "")
-                                            first_line = text.split('\n', 1)[0]
-                                            session_data["title"] = (first_line[:37] + '...') if len(first_line) > 40 else first_line
-                                            break
-                                    break
-                    else:
-                        # If not in memory, check the file (but don't load fully)
-                        session_path = self.base_path / f"{session_id}.{self.format}"
-                        if not session_path.exists():
-                            session_data["title"] = f"Session {session_id[-8:]}"
-                            result.append(session_data)
-                            continue
-                            
-                        with _safe_open(session_path, 'r', encoding='utf-8') as f:
-                            try:
-                                # Load only part of the file to find first user message
-                                data = json.load(f)
-                                # Look for first user message
-                                if "messages" in data:
-                                    for msg in data["messages"]:
-                                        if msg.get("role") == "user":
-                                            content = msg.get("content", "")
-                                            if isinstance(content, str):
-                                                first_line = content.split('\n', 1)[0]
-                                                session_data["title"] = (first_line[:37] + '...') if len(first_line) > 40 else first_line
-                                                break
-                                            elif isinstance(content, list) and len(content) > 0:
-                                                # Try to extract text from structured content
-                                                for item in content:
-                                                    if isinstance(item, dict) and item.get("type") == "text":
-                                                        text = item.get("text", "")
-                                                        first_line = text.split('\n', 1)[0]
-                                                        session_data["title"] = (first_line[:37] + '...') if len(first_line) > 40 else first_line
-                                                        break
-                                                break
-                            except json.JSONDecodeError:
-                                pass
-                except Exception as e:
-                    logger.debug(f"Error extracting title for session {session_id}: {e}")
-                
-                # Fallback if we couldn't extract a title
-                if not session_data.get("title"):
-                    session_data["title"] = f"Session {session_id[-8:]}"
+                if "first_prompt" not in metadata:
+                    # Entry written before first prompts were cached
+                    metadata["first_prompt"] = self._read_first_prompt(session_id)
+                    session_data["first_prompt"] = metadata["first_prompt"]
+                    index_dirty = True
+                session_data["title"] = (
+                    metadata["first_prompt"] or f"Session {session_id[-8:]}"
+                )
                     
             result.append(session_data)
         
+        if index_dirty:
+            self._save_index(self.session_index)
         return result
+
+    def _read_first_prompt(self, session_id: str) -> str:
+        """First user message of a session from the cache or its file."""
+        try:
+            if session_id in self.sessions:
+                return first_prompt_from_messages(self.sessions[session_id][0].messages)
+            session_path = self.base_path / f"{session_id}.{self.format}"
+            if not session_path.exists():
+                return ""
+            with _safe_open(session_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return first_prompt_from_messages(data.get("messages", []))
+        except Exception as e:
+            logger.debug(f"Error extracting title for session {session_id}: {e}")
+            return ""
     
     def delete_session(self, session_id: str) -> bool:
         """
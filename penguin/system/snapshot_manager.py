@@ -5,34 +5,87 @@ Stores complete serialisations of `ConversationSystem` state (usually a single
 state, *restore* any previous state, and *branch* off a historical snapshot to
 create an alternate timeline.
 
-The contract purposefully remains minimal – a single table with the following
-columns:
-
-    id         TEXT – primary‑key UUIDv4 string
-    parent_id  TEXT – optional UUIDv4 pointing at the snapshot this one was
-                         branched from (NULL for root snapshots)
-    timestamp  TEXT – ISO‑8601 UTC timestamp
-    payload    BLOB – raw JSON string of the serialised conversation state
-    meta       TEXT – optional JSON string for extra metadata (UI notes, etc.)
-
-All operations are synchronous because snapshots are small (<10 kB) and happen
-infrequently compared to token streaming.  If you need async, wrap calls in
-`asyncio.to_thread` from the caller.
+Two tables back the store:
+
+    snapshots        id, parent_id, timestamp, meta (JSON) and a manifest –
+                     the ordered list of chunk hashes that make up the payload
+    snapshot_chunks  hash, data, codec, size and a reference count
+
+Payloads are split into content-defined chunks (boundaries are chosen by the
+bytes around them, so an edit only disturbs nearby chunks), each stored once
+under its SHA-256 and optionally zlib-compressed. A branch therefore shares
+its whole history with its parent and later snapshots of either side only add
+the chunks that actually changed. ``delete_snapshot`` releases references and
+``collect_garbage`` drops chunks nobody references. Databases written by the
+old single-``payload``-column layout are migrated in place on open.
+
+All operations are synchronous because snapshots happen infrequently compared
+to token streaming.  If you need async, wrap calls in `asyncio.to_thread` from
+the caller.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
+import threading
 import uuid
+import zlib
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+Payload = Union[str, bytes]
+
+SCHEMA_VERSION = 2
+
+# Chunk boundaries are considered where a new JSON object or line starts
+_BOUNDARY_MARKERS = (b"}, {", b"},{", b"\n", b"\\n")
+# Bytes before a candidate boundary that decide whether it is taken
+_BOUNDARY_WINDOW = 64
+# A candidate is taken when its window hashes to 0 mod this (~1 in 4)
+_BOUNDARY_DIVISOR = 4
+MAX_CHUNK_BYTES = 256 * 1024
+
+
+def split_chunks(data: bytes, max_chunk: int = MAX_CHUNK_BYTES) -> List[bytes]:
+    """Split *data* at content-defined boundaries.
+
+    Whether a candidate position becomes a boundary depends only on the bytes
+    just before it, so a shared prefix always yields the same chunks and an
+    insertion re-synchronises at the next boundary after it.
+    """
+    if not data:
+        return [b""]
+    candidates = set()
+    for marker in _BOUNDARY_MARKERS:
+        pos = data.find(marker)
+        while pos != -1:
+            candidates.add(pos + len(marker) - 1)
+            pos = data.find(marker, pos + 1)
+
+    chunks: List[bytes] = []
+    start = 0
+    for pos in sorted(candidates):
+        if pos - start < _BOUNDARY_WINDOW:
+            continue
+        if zlib.crc32(data[pos - _BOUNDARY_WINDOW : pos]) % _BOUNDARY_DIVISOR == 0:
+            chunks.extend(_split_fixed(data[start:pos], max_chunk))
+            start = pos
+    chunks.extend(_split_fixed(data[start:], max_chunk))
+    return chunks
+
+
+def _split_fixed(piece: bytes, max_chunk: int) -> List[bytes]:
+    if len(piece) <= max_chunk:
+        return [piece]
+    return [piece[i : i + max_chunk] for i in range(0, len(piece), max_chunk)]
+
 
 class SnapshotManager:
     """Thin wrapper around an on‑disk SQLite DB for snapshot CRUD."""
@@ -42,63 +95,148 @@ class SnapshotManager:
         "id TEXT PRIMARY KEY,"
         "parent_id TEXT,"
         "timestamp TEXT NOT NULL,"
-        "payload BLOB NOT NULL,"
-        "meta TEXT"
-        ")"
+        "payload BLOB NOT NULL DEFAULT '',"
+        "meta TEXT,"
+        "manifest TEXT"
+        ");"
+        "CREATE TABLE IF NOT EXISTS snapshot_chunks ("
+        "hash TEXT PRIMARY KEY,"
+        "data BLOB NOT NULL,"
+        "codec TEXT NOT NULL,"
+        "size INTEGER NOT NULL,"
+        "refcount INTEGER NOT NULL DEFAULT 0"
+        ");"
+        "CREATE INDEX IF NOT EXISTS idx_snapshot_chunks_refcount ON snapshot_chunks (refcount)"
     )
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, *, compress: bool = True):
         self.db_path = db_path
+        self.compress = compress
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         # Use check_same_thread False so callers from different threads work.
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.RLock()
         self._ensure_schema()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def snapshot(self, payload: str, *, parent_id: Optional[str] = None, meta: Optional[Dict[str, Any]] = None) -> str:
+    def snapshot(self, payload: Payload, *, parent_id: Optional[str] = None, meta: Optional[Dict[str, Any]] = None) -> str:
         """Persist *payload* and return the newly generated snapshot_id."""
         snap_id = uuid.uuid4().hex  # shorter than full UUID string
         timestamp = datetime.utcnow().isoformat()
         meta_json = json.dumps(meta or {})
-        with self.conn:  # implicit transaction
+        with self._lock, self.conn:  # implicit transaction
+            manifest = self._store_payload(payload)
             self.conn.execute(
-                "INSERT INTO snapshots (id, parent_id, timestamp, payload, meta) VALUES (?, ?, ?, ?, ?)",
-                (snap_id, parent_id, timestamp, payload, meta_json),
+                "INSERT INTO snapshots (id, parent_id, timestamp, payload, meta, manifest) VALUES (?, ?, ?, '', ?, ?)",
+                (snap_id, parent_id, timestamp, meta_json, json.dumps(manifest)),
             )
-        logger.debug("Created snapshot %s (parent=%s, %d bytes)", snap_id, parent_id, len(payload))
+        logger.debug(
+            "Created snapshot %s (parent=%s, %d bytes, %d chunks)",
+            snap_id, parent_id, len(payload), len(manifest["chunks"]),
+        )
         return snap_id
 
-    def restore(self, snapshot_id: str) -> Optional[str]:
-        """Return *payload* string for *snapshot_id* or ``None`` if not found."""
-        cur = self.conn.execute("SELECT payload FROM snapshots WHERE id = ?", (snapshot_id,))
-        row = cur.fetchone()
-        if row is None:
-            logger.warning("Snapshot %s not found", snapshot_id)
-            return None
-        return row[0]
+    def restore(self, snapshot_id: str) -> Optional[Payload]:
+        """Return *payload* for *snapshot_id* or ``None`` if not found."""
+        with self._lock:
+            manifest = self._manifest(snapshot_id)
+            if manifest is None:
+                logger.warning("Snapshot %s not found", snapshot_id)
+                return None
+            data = self._load_chunks(manifest["chunks"])
+        return data.decode("utf-8") if manifest.get("type") == "str" else data
 
-    def branch_from(self, snapshot_id: str, *, meta: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
-        """Create **child** snapshot duplicating *snapshot_id*'s payload.
+    def branch_from(self, snapshot_id: str, *, meta: Optional[Dict[str, Any]] = None) -> Tuple[str, Payload]:
+        """Create **child** snapshot sharing *snapshot_id*'s payload.
 
-        Returns ``(new_snapshot_id, payload)`` so caller can immediately hydrate
-        a new conversation instance.
+        The child reuses the parent's chunks, so branching costs one row no
+        matter how long the conversation is. Returns ``(new_snapshot_id,
+        payload)`` so caller can immediately hydrate a new conversation
+        instance.
         """
         payload = self.restore(snapshot_id)
         if payload is None:
             raise ValueError(f"Cannot branch – snapshot {snapshot_id} not found")
-        new_id = self.snapshot(payload, parent_id=snapshot_id, meta=meta)
+        new_id = uuid.uuid4().hex
+        with self._lock, self.conn:
+            manifest = self._manifest(snapshot_id)
+            if manifest is None:
+                raise ValueError(f"Cannot branch – snapshot {snapshot_id} not found")
+            self._adjust_refcounts(manifest["chunks"], 1)
+            self.conn.execute(
+                "INSERT INTO snapshots (id, parent_id, timestamp, payload, meta, manifest) VALUES (?, ?, ?, '', ?, ?)",
+                (new_id, snapshot_id, datetime.utcnow().isoformat(), json.dumps(meta or {}), json.dumps(manifest)),
+            )
         return new_id, payload
 
+    def delete_snapshot(self, snapshot_id: str, *, collect: bool = True) -> bool:
+        """Remove *snapshot_id*, releasing its chunks; returns False if unknown."""
+        with self._lock, self.conn:
+            manifest = self._manifest(snapshot_id)
+            if manifest is None:
+                return False
+            self._adjust_refcounts(manifest["chunks"], -1)
+            self.conn.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+        if collect:
+            self.collect_garbage()
+        return True
+
+    def collect_garbage(self, *, recount: bool = False) -> int:
+        """Delete chunks no snapshot references; returns how many were removed.
+
+        With *recount* the reference counts are first rebuilt from every
+        manifest, repairing counts left wrong by an interrupted process.
+        """
+        with self._lock, self.conn:
+            if recount:
+                counts: Dict[str, int] = {}
+                for (manifest_json,) in self.conn.execute(
+                    "SELECT manifest FROM snapshots WHERE manifest IS NOT NULL"
+                ):
+                    for digest in json.loads(manifest_json)["chunks"]:
+                        counts[digest] = counts.get(digest, 0) + 1
+                self.conn.execute("UPDATE snapshot_chunks SET refcount = 0")
+                self.conn.executemany(
+                    "UPDATE snapshot_chunks SET refcount = ? WHERE hash = ?",
+                    [(count, digest) for digest, count in counts.items()],
+                )
+            removed = self.conn.execute(
+                "DELETE FROM snapshot_chunks WHERE refcount <= 0"
+            ).rowcount
+        if removed:
+            logger.debug("Collected %d unreferenced snapshot chunks", removed)
+        return removed
+
+    def storage_stats(self) -> Dict[str, int]:
+        """Logical payload bytes versus bytes actually stored."""
+        with self._lock:
+            snapshots = self.conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+            chunks, raw_bytes, stored_bytes = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM snapshot_chunks"
+            ).fetchone()
+            logical = self.conn.execute(
+                "SELECT COALESCE(SUM(c.size), 0) FROM snapshots s, json_each(s.manifest, '$.chunks') j "
+                "JOIN snapshot_chunks c ON c.hash = j.value"
+            ).fetchone()[0]
+        return {
+            "snapshots": snapshots,
+            "chunks": chunks,
+            "logical_bytes": logical,
+            "unique_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+        }
+
     def list_snapshots(self, *, limit: int = 50, offset: int = 0) -> list[dict[str, Any]]:
-        cur = self.conn.execute(
-            "SELECT id, parent_id, timestamp, json_extract(meta, '$.name') as name FROM snapshots ORDER BY timestamp DESC LIMIT ? OFFSET ?",
-            (limit, offset),
-        )
-        rows = cur.fetchall()
+        with self._lock:
+            cur = self.conn.execute(
+                "SELECT id, parent_id, timestamp, json_extract(meta, '$.name') as name FROM snapshots ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            )
+            rows = cur.fetchall()
         return [
             {"id": r[0], "parent_id": r[1], "timestamp": r[2], "name": r[3]} for r in rows
         ]
@@ -108,5 +246,92 @@ class SnapshotManager:
     # ------------------------------------------------------------------
 
     def _ensure_schema(self):
-        with self.conn:
-            self.conn.execute(self._SCHEMA_SQL) 
\ No newline at end of file
+        with self._lock, self.conn:
+            columns = {
+                row[1] for row in self.conn.execute("PRAGMA table_info(snapshots)")
+            }
+            if columns and "manifest" not in columns:
+                self.conn.execute("ALTER TABLE snapshots ADD COLUMN manifest TEXT")
+            self.conn.executescript(self._SCHEMA_SQL)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            self._migrate_inline_payloads()
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _migrate_inline_payloads(self) -> None:
+        """Move payloads stored whole in ``snapshots.payload`` into chunks."""
+        migrated = 0
+        with self._lock:
+            ids = [
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT id FROM snapshots WHERE manifest IS NULL"
+                )
+            ]
+            for snap_id in ids:
+                with self.conn:
+                    (payload,) = self.conn.execute(
+                        "SELECT payload FROM snapshots WHERE id = ?", (snap_id,)
+                    ).fetchone()
+                    manifest = self._store_payload(payload if payload is not None else "")
+                    self.conn.execute(
+                        "UPDATE snapshots SET payload = '', manifest = ? WHERE id = ?",
+                        (json.dumps(manifest), snap_id),
+                    )
+                migrated += 1
+        if migrated:
+            logger.info("Migrated %d snapshots to chunked storage", migrated)
+
+    def _manifest(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT manifest FROM snapshots WHERE id = ?", (snapshot_id,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def _store_payload(self, payload: Payload) -> Dict[str, Any]:
+        """Store *payload*'s chunks (caller holds the transaction); return its manifest."""
+        is_str = isinstance(payload, str)
+        data = payload.encode("utf-8") if is_str else bytes(payload)
+        digests: List[str] = []
+        for chunk in split_chunks(data):
+            digest = hashlib.sha256(chunk).hexdigest()
+            digests.append(digest)
+            if self.compress and len(chunk) > 64:
+                stored, codec = zlib.compress(chunk, 6), "zlib"
+                if len(stored) >= len(chunk):
+                    stored, codec = chunk, "raw"
+            else:
+                stored, codec = chunk, "raw"
+            self.conn.execute(
+                "INSERT OR IGNORE INTO snapshot_chunks (hash, data, codec, size, refcount) VALUES (?, ?, ?, ?, 0)",
+                (digest, stored, codec, len(chunk)),
+            )
+        self._adjust_refcounts(digests, 1)
+        return {"type": "str" if is_str else "bytes", "chunks": digests}
+
+    def _adjust_refcounts(self, digests: Iterable[str], delta: int) -> None:
+        counts: Dict[str, int] = {}
+        for digest in digests:
+            counts[digest] = counts.get(digest, 0) + delta
+        self.conn.executemany(
+            "UPDATE snapshot_chunks SET refcount = refcount + ? WHERE hash = ?",
+            [(count, digest) for digest, count in counts.items()],
+        )
+
+    def _load_chunks(self, digests: List[str]) -> bytes:
+        found: Dict[str, bytes] = {}
+        unique = list(dict.fromkeys(digests))
+        for i in range(0, len(unique), 500):
+            batch = unique[i : i + 500]
+            placeholders = ",".join("?" * len(batch))
+            for digest, data, codec in self.conn.execute(
+                f"SELECT hash, data, codec FROM snapshot_chunks WHERE hash IN ({placeholders})",
+                batch,
+            ):
+                found[digest] = zlib.decompress(data) if codec == "zlib" else bytes(data)
+        missing = [digest for digest in unique if digest not in found]
+        if missing:
+            raise ValueError(f"Snapshot payload is missing {len(missing)} chunk(s)")
+        return b"".join(found[digest] for digest in digests)
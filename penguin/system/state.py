@@ -8,6 +8,7 @@ manage conversation state, including messages, sessions, and categories.
 import json
 import logging
 import uuid
+import weakref
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -103,6 +104,19 @@ class Message:
     recipient_id: Optional[str] = None
     message_type: str = "message"  # message|action|status
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in _USAGE_FIELDS:
+            # Keep the running totals of every session holding this message current
+            for usage in tuple(self.__dict__.get("_usage_ledgers") or ()):
+                usage.update(self)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Ledgers belong to the live sessions; copies are recounted where added
+        state = dict(self.__dict__)
+        state.pop("_usage_ledgers", None)
+        return state
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to a dictionary for serialization."""
         result = asdict(self)
@@ -169,6 +183,208 @@ class Message:
             return len(str(self.content)) // 4 + 1
 
 
+# Message fields that feed SessionUsage totals
+_USAGE_FIELDS = frozenset({"tokens", "category", "agent_id"})
+
+
+def _usage_tokens(value: Any) -> int:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return max(parsed, 0)
+
+
+def _usage_category(category: Any) -> str:
+    if hasattr(category, "name"):
+        return category.name
+    if isinstance(category, str):
+        return category
+    return "UNKNOWN"
+
+
+def _usage_agent(agent_id: Any) -> Optional[str]:
+    if isinstance(agent_id, str) and agent_id.strip():
+        return agent_id
+    return None
+
+
+class SessionUsage:
+    """
+    Running token totals for a session, overall, per category and per agent.
+
+    ``MessageList`` updates it as messages are added or trimmed and ``Message``
+    updates it when a tracked message's tokens, category or agent change, so
+    reading usage is O(1) however long the conversation is.
+    """
+
+    def __init__(self) -> None:
+        self.total_tokens = 0
+        self.message_count = 0
+        self.categories: Dict[str, int] = {}
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        # id(message) -> [message, agent_id, category, tokens, occurrences]
+        self._entries: Dict[int, List[Any]] = {}
+
+    def _apply(self, agent_id: Optional[str], category: str, tokens: int, sign: int) -> None:
+        self.total_tokens += sign * tokens
+        self.message_count += sign
+        self.categories[category] = self.categories.get(category, 0) + sign * tokens
+        if agent_id is None:
+            return
+        bucket = self.agents.setdefault(
+            agent_id, {"total_tokens": 0, "message_count": 0, "categories": {}}
+        )
+        bucket["total_tokens"] += sign * tokens
+        bucket["message_count"] += sign
+        bucket["categories"][category] = bucket["categories"].get(category, 0) + sign * tokens
+        if bucket["message_count"] <= 0:
+            del self.agents[agent_id]
+
+    def add(self, message: Any) -> None:
+        """Count one more occurrence of ``message``."""
+        entry = self._entries.get(id(message))
+        if entry is None:
+            entry = [
+                message,
+                _usage_agent(getattr(message, "agent_id", None)),
+                _usage_category(getattr(message, "category", None)),
+                _usage_tokens(getattr(message, "tokens", 0)),
+                0,
+            ]
+            self._entries[id(message)] = entry
+            attrs = getattr(message, "__dict__", None)
+            if isinstance(message, Message) and attrs is not None:
+                attrs.setdefault("_usage_ledgers", weakref.WeakSet()).add(self)
+        entry[4] += 1
+        self._apply(entry[1], entry[2], entry[3], 1)
+
+    def remove(self, message: Any) -> None:
+        """Stop counting one occurrence of ``message``."""
+        entry = self._entries.get(id(message))
+        if entry is None or entry[0] is not message:
+            return
+        entry[4] -= 1
+        self._apply(entry[1], entry[2], entry[3], -1)
+        if entry[4] <= 0:
+            del self._entries[id(message)]
+            self._forget(message)
+
+    def update(self, message: Any) -> None:
+        """Re-read a counted message whose tokens, category or agent changed."""
+        entry = self._entries.get(id(message))
+        if entry is None or entry[0] is not message:
+            return
+        occurrences = entry[4]
+        for _ in range(occurrences):
+            self._apply(entry[1], entry[2], entry[3], -1)
+        entry[1] = _usage_agent(getattr(message, "agent_id", None))
+        entry[2] = _usage_category(getattr(message, "category", None))
+        entry[3] = _usage_tokens(getattr(message, "tokens", 0))
+        for _ in range(occurrences):
+            self._apply(entry[1], entry[2], entry[3], 1)
+
+    def rebuild(self, messages: List[Any]) -> None:
+        """Recount from scratch, e.g. after the message list was replaced."""
+        for entry in self._entries.values():
+            self._forget(entry[0])
+        self.__init__()
+        for message in messages:
+            self.add(message)
+
+    def _forget(self, message: Any) -> None:
+        ledgers = getattr(message, "__dict__", {}).get("_usage_ledgers")
+        if ledgers:
+            ledgers.discard(self)
+
+    def totals(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Total tokens and per-category tokens, for the session or one agent."""
+        if agent_id is None:
+            total, counted = self.total_tokens, self.categories
+        else:
+            bucket = self.agents.get(agent_id) or {}
+            total, counted = bucket.get("total_tokens", 0), bucket.get("categories", {})
+        categories = {category.name: 0 for category in MessageCategory}
+        categories.update(counted)
+        return {"current_total_tokens": total, "categories": categories}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_tokens": self.total_tokens,
+            "message_count": self.message_count,
+            "categories": dict(self.categories),
+            "agents": {
+                agent_id: {**bucket, "categories": dict(bucket["categories"])}
+                for agent_id, bucket in self.agents.items()
+            },
+        }
+
+
+class MessageList(list):
+    """A session's message list that keeps its ``SessionUsage`` current."""
+
+    def __init__(self, messages: Any = ()) -> None:
+        super().__init__(messages)
+        self.usage = SessionUsage()
+        self.usage.rebuild(self)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # Copies and pickles recount rather than sharing the ledger
+        return (MessageList, (list(self),))
+
+    def append(self, message: Any) -> None:
+        super().append(message)
+        self.usage.add(message)
+
+    def extend(self, messages: Any) -> None:
+        messages = list(messages)
+        super().extend(messages)
+        for message in messages:
+            self.usage.add(message)
+
+    def __iadd__(self, messages: Any) -> "MessageList":
+        self.extend(messages)
+        return self
+
+    def insert(self, index: Any, message: Any) -> None:
+        super().insert(index, message)
+        self.usage.add(message)
+
+    def pop(self, index: Any = -1) -> Any:
+        message = super().pop(index)
+        self.usage.remove(message)
+        return message
+
+    def remove(self, message: Any) -> None:
+        # list.remove matches by equality; drop whichever object was removed
+        self.pop(self.index(message))
+
+    def clear(self) -> None:
+        super().clear()
+        self.usage.rebuild(self)
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self.usage.rebuild(self)
+            return
+        old = self[index]
+        super().__setitem__(index, value)
+        self.usage.remove(old)
+        self.usage.add(value)
+
+    def __delitem__(self, index: Any) -> None:
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for message in removed:
+            self.usage.remove(message)
+
+    def __imul__(self, factor: Any) -> "MessageList":
+        super().__imul__(factor)
+        self.usage.rebuild(self)
+        return self
+
+
 @dataclass
 class Session:
     """
@@ -187,6 +403,16 @@ class Session:
     tool_call_records: List[Dict[str, Any]] = field(default_factory=list)
     tool_result_records: List[Dict[str, Any]] = field(default_factory=list)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "messages" and not isinstance(value, MessageList):
+            value = MessageList(value or ())
+        object.__setattr__(self, name, value)
+
+    @property
+    def usage(self) -> SessionUsage:
+        """Running token totals for this session's messages."""
+        return self.messages.usage
+
     @property
     def message_count(self) -> int:
         """Get the number of messages in this session."""
@@ -195,7 +421,7 @@ class Session:
     @property
     def total_tokens(self) -> int:
         """Get total token count for all messages in this session."""
-        return sum(msg.tokens for msg in self.messages)
+        return self.usage.total_tokens
 
     def get_messages_by_category(self, category: MessageCategory) -> List[Message]:
         """Get all messages of a specific category."""
@@ -0,0 +1,313 @@
+"""
+Incremental Codebase Index
+
+Keeps per-file AST summaries of a Python tree so ``analyze_codebase`` does
+not re-parse every file on each call. Summaries are keyed by content hash and
+persisted under ``PENGUIN_CACHE_DIR``; a refresh only reads files whose size
+or mtime changed, only parses content it has not seen, and only recomputes
+import-graph edges for files that changed. Import cycles are found with a
+single-pass Tarjan strongly-connected-components walk.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from penguin.utils.discovery_cache import WORKSPACE_IGNORED_DIRS, file_signature
+
+logger = logging.getLogger(__name__)
+
+_CACHE_VERSION = 1
+
+
+def default_index_path(root: Path) -> Optional[Path]:
+    """Cache file for a root, or None when ``PENGUIN_CODEBASE_CACHE=0``."""
+    if os.getenv("PENGUIN_CODEBASE_CACHE", "1").strip().lower() in {"0", "false", "no"}:
+        return None
+    cache_root = Path(os.getenv("PENGUIN_CACHE_DIR", "~/.cache/penguin")).expanduser()
+    digest = hashlib.sha1(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return cache_root / "codebase" / f"{digest}.json"
+
+
+def summarize_source(content: str) -> Dict[str, Any]:
+    """Extract the functions, classes and imports ``analyze_codebase`` reports."""
+    tree = ast.parse(content)
+    functions: List[Dict[str, Any]] = []
+    classes: List[Dict[str, Any]] = []
+    imports: List[Dict[str, str]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append({
+                "name": node.name,
+                "line": node.lineno,
+                "args": len(node.args.args),
+                "is_async": isinstance(node, ast.AsyncFunctionDef),
+                "docstring": ast.get_docstring(node) is not None,
+            })
+        elif isinstance(node, ast.ClassDef):
+            methods = [
+                n.name
+                for n in node.body
+                if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ]
+            classes.append({
+                "name": node.name,
+                "line": node.lineno,
+                "methods": methods,
+                "method_count": len(methods),
+                "docstring": ast.get_docstring(node) is not None,
+            })
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append({"name": alias.name, "module": alias.name, "level": 0})
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            for alias in node.names:
+                imports.append({
+                    "name": f"{node.module}.{alias.name}",
+                    "module": node.module,
+                    "level": node.level,
+                })
+    return {
+        "lines": len(content.splitlines()),
+        "functions": functions,
+        "classes": classes,
+        "imports": imports,
+    }
+
+
+def strongly_connected_components(graph: Mapping[str, Iterable[str]]) -> List[List[str]]:
+    """Tarjan's algorithm, iterative so deep graphs cannot hit the recursion limit."""
+    index_of: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for start in graph:
+        if start in index_of:
+            continue
+        work: List[Tuple[str, Iterable[str]]] = [(start, iter(graph.get(start, ())))]
+        index_of[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for succ in successors:
+                if succ not in index_of:
+                    index_of[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(graph.get(succ, ()))))
+                    advanced = True
+                    break
+                if succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[succ])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def _module_name(relative_path: str) -> str:
+    module = relative_path[:-3] if relative_path.endswith(".py") else relative_path
+    module = module.replace(os.sep, ".").replace("/", ".")
+    return module[: -len(".__init__")] if module.endswith(".__init__") else module
+
+
+def absolute_module(relative_path: str, module: str, level: int) -> str:
+    """Resolve a (possibly relative) import made by the file at ``relative_path``."""
+    if not level:
+        return module
+    package = _module_name(relative_path).split(".")
+    if not relative_path.endswith("__init__.py"):
+        package = package[:-1]
+    if level > 1:
+        package = package[: -(level - 1)]
+    return ".".join([part for part in package if part] + [module])
+
+
+def circular_dependency_pairs(dependency_graph: Mapping[str, Iterable[str]]) -> List[Dict[str, str]]:
+    """Import edges that lie on a cycle, as ``{"file1", "file2"}`` pairs.
+
+    Graph keys are file paths and values are imported module names; modules
+    are resolved to the files that define them before looking for cycles.
+    """
+    module_files = {_module_name(path): path for path in dependency_graph}
+
+    def resolve(dep: str) -> Optional[str]:
+        return dep if dep in dependency_graph else module_files.get(dep)
+
+    resolved = {
+        path: [target for target in map(resolve, deps) if target is not None]
+        for path, deps in dependency_graph.items()
+    }
+    component_of: Dict[str, int] = {}
+    for number, component in enumerate(strongly_connected_components(resolved)):
+        for member in component:
+            component_of[member] = number
+    sizes: Dict[int, int] = {}
+    for number in component_of.values():
+        sizes[number] = sizes.get(number, 0) + 1
+
+    circular = []
+    for path, deps in dependency_graph.items():
+        for dep in deps:
+            target = resolve(dep)
+            if target is None or component_of[target] != component_of[path]:
+                continue
+            if target == path or sizes[component_of[path]] > 1:
+                circular.append({"file1": path, "file2": dep})
+    return circular
+
+
+class CodebaseIndex:
+    """Cached AST summaries and import graph for one directory tree."""
+
+    def __init__(self, root: Path, cache_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_path = cache_path
+        # relative path -> {"sig": [mtime_ns, size], "hash": content sha256}
+        self._files: Dict[str, Dict[str, Any]] = {}
+        # content hash -> summary, or {"error": message}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        # include_external -> relative path -> imported modules
+        self._edges: Dict[bool, Dict[str, List[str]]] = {False: {}, True: {}}
+        self._loaded = False
+        self._dirty = False
+        self.stats = {"files": 0, "read": 0, "parsed": 0, "edges_rebuilt": 0}
+
+    def _load(self) -> None:
+        self._loaded = True
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable codebase cache {self.cache_path}: {e}")
+            return
+        if data.get("version") != _CACHE_VERSION or data.get("root") != str(self.root.resolve()):
+            return
+        self._files = data.get("files", {})
+        self._summaries = data.get("summaries", {})
+
+    def save(self) -> None:
+        """Persist summaries for the files currently in the tree."""
+        if not self._dirty or self.cache_path is None:
+            return
+        live = {entry["hash"] for entry in self._files.values()}
+        payload = {
+            "version": _CACHE_VERSION,
+            "root": str(self.root.resolve()),
+            "files": self._files,
+            "summaries": {h: s for h, s in self._summaries.items() if h in live},
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+            os.replace(tmp, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Could not write codebase cache {self.cache_path}: {e}")
+
+    def _python_files(self) -> List[str]:
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if d not in WORKSPACE_IGNORED_DIRS)
+            rel_dir = os.path.relpath(dirpath, self.root)
+            for name in sorted(filenames):
+                if name.endswith(".py"):
+                    found.append(name if rel_dir == "." else os.path.join(rel_dir, name))
+        return found
+
+    def refresh(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Bring the index up to date and return ``(path, summary)`` per file."""
+        if not self._loaded:
+            self._load()
+        current = self._python_files()
+        changed: Set[str] = set()
+
+        for rel in current:
+            signature = file_signature(self.root / rel)
+            entry = self._files.get(rel)
+            if entry and entry.get("sig") == signature and entry.get("hash") in self._summaries:
+                continue
+            try:
+                raw = (self.root / rel).read_bytes()
+            except OSError as e:
+                raw = None
+                digest = f"unreadable:{rel}"
+                self._summaries[digest] = {"error": str(e)}
+            self.stats["read"] += 1
+            if raw is not None:
+                digest = hashlib.sha256(raw).hexdigest()
+                if digest not in self._summaries:
+                    self._summaries[digest] = self._summarize(raw)
+                    self.stats["parsed"] += 1
+            if not entry or entry.get("hash") != digest:
+                changed.add(rel)
+            self._files[rel] = {"sig": signature, "hash": digest}
+            self._dirty = True
+
+        removed = set(self._files) - set(current)
+        for rel in removed:
+            del self._files[rel]
+        if removed:
+            self._dirty = True
+        for edges in self._edges.values():
+            for rel in changed | removed:
+                edges.pop(rel, None)
+
+        self.stats["files"] = len(current)
+        return [(rel, self._summaries[self._files[rel]["hash"]]) for rel in current]
+
+    @staticmethod
+    def _summarize(raw: bytes) -> Dict[str, Any]:
+        try:
+            return summarize_source(raw.decode("utf-8"))
+        except Exception as e:
+            return {"error": str(e)}
+
+    def dependency_graph(
+        self,
+        include_external: bool,
+        is_external: Callable[[str], bool],
+    ) -> Dict[str, List[str]]:
+        """Imported modules per file, recomputed only for files that changed."""
+        edges = self._edges[include_external]
+        for rel, entry in self._files.items():
+            if rel in edges:
+                continue
+            summary = self._summaries.get(entry["hash"], {})
+            modules = {
+                absolute_module(rel, imported["module"], imported.get("level", 0))
+                for imported in summary.get("imports", [])
+            }
+            edges[rel] = sorted(
+                module for module in modules
+                if include_external or not is_external(module)
+            )
+            self.stats["edges_rebuilt"] += 1
+        return {rel: edges[rel] for rel in sorted(edges) if edges[rel]}
@@ -2,7 +2,6 @@ import base64
 import logging
 import math
 import os
-import subprocess
 import asyncio
 from typing import Any, Callable, Dict, List, Optional, Union
 import datetime
@@ -25,6 +24,11 @@ from penguin.utils.profiling import profile_operation, profile_startup_phase, pr
 # from .old2_memory_search import MemorySearch
 from penguin.utils.notebook import NotebookExecutor
 
+from penguin.tools.core.codebase_index import (
+    CodebaseIndex,
+    circular_dependency_pairs,
+    default_index_path,
+)
 from penguin.tools.core.declarative_memory_tool import DeclarativeMemoryTool
 from penguin.tools.core.grep_search import GrepSearch
 from penguin.tools.core.lint_python import lint_python
@@ -296,6 +300,7 @@ class ToolManager:
             self._memory_provider = None
             self._indexing_task = None
             self._indexing_completed = False
+            self._codebase_indexes: Dict[str, CodebaseIndex] = {}
 
             # Dynamic external tool providers
             self._mcp_provider = MCPToolProvider(self.config)
@@ -332,6 +337,7 @@ class ToolManager:
             self._agent_executor = None
             self._async_tool_dispatcher = AsyncToolDispatcher(self)
             self._code_execution_lock = threading.Lock()
+            self._kernel_pool = None
 
             # Permission enforcer (lazy initialized)
             self._permission_enforcer = None
@@ -2215,6 +2221,15 @@ class ToolManager:
                 self._lazy_initialized["summary_notes_tool"] = True
         return self._summary_notes_tool
 
+    @property
+    def kernel_pool(self):
+        """Per-session out-of-process kernels used by ``execute_code``."""
+        if self._kernel_pool is None:
+            from penguin.utils.kernel_pool import KernelPool
+
+            self._kernel_pool = KernelPool()
+        return self._kernel_pool
+
     @property
     def notebook_executor(self):
         if not self._lazy_initialized["notebook_executor"]:
@@ -4770,6 +4785,10 @@ class ToolManager:
         except Exception:
             default_timeout = 300
 
+        # Isolated per-session kernels unless explicitly running in-process
+        if os.environ.get("PENGUIN_CODE_EXECUTION", "kernel").lower() != "inprocess":
+            return self._execute_code_in_kernel(code, effective_cwd, default_timeout)
+
         result_container = {"done": False, "result": None, "error": None}
 
         def _runner():
@@ -4809,7 +4828,66 @@ class ToolManager:
             )
         return result_container["result"] or ""
 
-    def execute_command(self, command: str, cwd: Optional[str] = None) -> str:
+    def _execute_code_in_kernel(
+        self, code: str, cwd: Optional[str], timeout_seconds: int
+    ) -> str:
+        from penguin.utils.change_tracker import get_change_tracker
+        from penguin.utils.kernel_pool import KernelDied, KernelTimeout
+
+        context = get_current_execution_context_dict()
+        key = ":".join(
+            str(part)
+            for part in (context.get("session_id"), context.get("agent_id"))
+            if part
+        ) or "default"
+
+        # Report files the cell touches (event-driven, not a tree walk)
+        tracker = get_change_tracker(self._file_root)
+        token = tracker.begin() if tracker else None
+        error: Optional[Dict[str, Any]] = None
+        try:
+            output = self.kernel_pool.execute(
+                key, code, cwd=cwd, timeout=timeout_seconds
+            )
+        except KernelTimeout:
+            error = {
+                "error": "timeout",
+                "tool": "code_execution",
+                "timeout_seconds": timeout_seconds,
+                "detail": "Kernel was killed; the next cell starts with fresh state.",
+            }
+        except (KernelDied, RuntimeError) as e:
+            error = {
+                "error": f"Error executing code: {e}; kernel state was reset",
+                "tool": "code_execution",
+            }
+        finally:
+            # Always close the window, or the tracker keeps recording for it
+            changes = tracker.end(token) if tracker is not None else None
+
+        if error is not None:
+            if changes:
+                error["files_changed"] = {
+                    "created": changes.created,
+                    "modified": changes.modified,
+                    "deleted": changes.deleted,
+                }
+            return json.dumps(error)
+        if changes:
+            output = f"{output}\n\n{changes.summary()}"
+        return output
+
+    def execute_command(
+        self,
+        command: str,
+        cwd: Optional[str] = None,
+        on_output: Optional[Callable[[str, str], None]] = None,
+    ) -> str:
+        """Run a shell command; output chunks go to ``on_output`` as they arrive.
+
+        Without ``on_output`` the callback installed with
+        ``shell_runner.stream_output_to`` (e.g. by ``ActionExecutor``) is used.
+        """
         try:
             # Determine the OS
             import platform
@@ -4838,29 +4916,33 @@ class ToolManager:
                 # TODO: make this configurable
                 # NOTE: You need to consider a case where it may be installing packages, etc.
 
-            result = None
-            try:
-                effective_cwd = cwd or self._file_root
-                result = subprocess.run(
-                    command,
-                    shell=shell,
-                    capture_output=True,
-                    text=True,
-                    cwd=effective_cwd,
-                    env=env,  # Use environment with Rich suppression
-                    timeout=default_timeout,
-                )
-            except subprocess.TimeoutExpired:
+            from penguin.utils.shell_runner import run_shell
+
+            effective_cwd = cwd or self._file_root
+            # Streams into a bounded head/tail buffer; kills the process group on timeout
+            result = run_shell(
+                command,
+                shell=shell,
+                cwd=effective_cwd,
+                env=env,  # Use environment with Rich suppression
+                # As with subprocess.run, a zero timeout expires immediately
+                timeout=default_timeout if default_timeout > 0 else 1e-3,
+                on_output=on_output,
+            )
+            if result.timed_out:
                 return json.dumps(
                     {
-                        "error": "timeout",
+                        "error": result.timed_out,
                         "tool": "execute_command",
                         "timeout_seconds": default_timeout,
+                        "partial_output": result.stdout.strip(),
                     }
                 )
 
             if result.returncode == 0:
-                return result.stdout.strip()
+                note = result.limit_note()
+                output = result.stdout.strip()
+                return f"{output}\n[{note}]" if note else output
             else:
                 return json.dumps(
                     {
@@ -5419,7 +5501,6 @@ class ToolManager:
             )
 
         try:
-            import ast
             from pathlib import Path
             from collections import defaultdict
 
@@ -5444,101 +5525,43 @@ class ToolManager:
             all_functions = []
             all_classes = []
             all_imports = defaultdict(list)
-            dependency_graph = defaultdict(set)
             complexity_metrics = {
                 "total_lines": 0,
                 "total_functions": 0,
                 "total_classes": 0,
             }
 
-            # Find all Python files
-            python_files = list(target_dir.rglob("*.py"))
-
-            for file_path in python_files:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-
-                    # Parse the AST
-                    tree = ast.parse(content)
-                    relative_path = str(file_path.relative_to(target_dir))
-
-                    # Count lines
-                    lines = len(content.splitlines())
-                    complexity_metrics["total_lines"] += lines
-
-                    # Extract functions
-                    functions = []
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.FunctionDef):
-                            func_info = {
-                                "name": node.name,
-                                "line": node.lineno,
-                                "args": len(node.args.args),
-                                "is_async": isinstance(node, ast.AsyncFunctionDef),
-                                "docstring": ast.get_docstring(node) is not None,
-                            }
-                            functions.append(func_info)
-                            all_functions.append({**func_info, "file": relative_path})
-
-                    complexity_metrics["total_functions"] += len(functions)
-
-                    # Extract classes
-                    classes = []
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.ClassDef):
-                            methods = [
-                                n.name
-                                for n in node.body
-                                if isinstance(
-                                    n, (ast.FunctionDef, ast.AsyncFunctionDef)
-                                )
-                            ]
-                            class_info = {
-                                "name": node.name,
-                                "line": node.lineno,
-                                "methods": methods,
-                                "method_count": len(methods),
-                                "docstring": ast.get_docstring(node) is not None,
-                            }
-                            classes.append(class_info)
-                            all_classes.append({**class_info, "file": relative_path})
-
-                    complexity_metrics["total_classes"] += len(classes)
-
-                    # Extract imports
-                    imports = []
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.Import):
-                            for alias in node.names:
-                                import_name = alias.name
-                                imports.append(import_name)
-                                all_imports[relative_path].append(import_name)
-
-                                # Track dependencies (only local imports if not include_external)
-                                if include_external or not self._is_external_import(
-                                    import_name
-                                ):
-                                    dependency_graph[relative_path].add(import_name)
-
-                        elif isinstance(node, ast.ImportFrom):
-                            if node.module:
-                                for alias in node.names:
-                                    import_name = f"{node.module}.{alias.name}"
-                                    imports.append(import_name)
-                                    all_imports[relative_path].append(import_name)
-
-                                    if include_external or not self._is_external_import(
-                                        node.module
-                                    ):
-                                        dependency_graph[relative_path].add(node.module)
-
-                    analysis_results["files_analyzed"] += 1
-
-                except Exception as e:
+            # Per-file summaries come from the incremental index; only files
+            # changed since the last call are re-read and re-parsed
+            index = self._get_codebase_index(target_dir)
+            for relative_path, summary in index.refresh():
+                if "error" in summary:
                     analysis_results["errors"].append(
-                        f"Failed to analyze {file_path}: {str(e)}"
+                        f"Failed to analyze {target_dir / relative_path}: {summary['error']}"
                     )
+                    continue
+
+                complexity_metrics["total_lines"] += summary["lines"]
+                complexity_metrics["total_functions"] += len(summary["functions"])
+                complexity_metrics["total_classes"] += len(summary["classes"])
+                all_functions.extend(
+                    {**func_info, "file": relative_path}
+                    for func_info in summary["functions"]
+                )
+                all_classes.extend(
+                    {**class_info, "file": relative_path}
+                    for class_info in summary["classes"]
+                )
+                if summary["imports"]:
+                    all_imports[relative_path] = [
+                        imported["name"] for imported in summary["imports"]
+                    ]
+                analysis_results["files_analyzed"] += 1
+
+            dependency_graph = index.dependency_graph(
+                include_external, self._is_external_import
+            )
+            index.save()
 
             # Build summary based on analysis_type
             if analysis_type in ["all", "dependencies"]:
@@ -5546,9 +5569,7 @@ class ToolManager:
                     "import_count": sum(
                         len(imports) for imports in all_imports.values()
                     ),
-                    "dependency_graph": {
-                        k: list(v) for k, v in dependency_graph.items()
-                    },
+                    "dependency_graph": dependency_graph,
                     "most_imported": self._get_most_common_imports(all_imports),
                     "circular_dependencies": self._detect_circular_dependencies(
                         dependency_graph
@@ -5649,29 +5670,18 @@ class ToolManager:
             for module, count in counter.most_common(10)
         ]
 
+    def _get_codebase_index(self, target_dir: Path) -> CodebaseIndex:
+        """Return the incremental codebase index for a directory."""
+        key = str(target_dir.resolve())
+        index = self._codebase_indexes.get(key)
+        if index is None:
+            index = CodebaseIndex(target_dir, default_index_path(target_dir))
+            self._codebase_indexes[key] = index
+        return index
+
     def _detect_circular_dependencies(self, dependency_graph: dict) -> list:
         """Detect circular dependencies in the codebase."""
-        circular = []
-
-        def has_path(start, end, visited=None):
-            if visited is None:
-                visited = set()
-            if start == end:
-                return True
-            if start in visited:
-                return False
-            visited.add(start)
-            for dep in dependency_graph.get(start, set()):
-                if has_path(dep, end, visited.copy()):
-                    return True
-            return False
-
-        for file1 in dependency_graph:
-            for dep in dependency_graph[file1]:
-                if dep in dependency_graph and has_path(dep, file1):
-                    circular.append({"file1": file1, "file2": dep})
-
-        return circular
+        return circular_dependency_pairs(dependency_graph)
 
     def _analyze_function_complexity(self, all_functions: list) -> dict:
         """Analyze function complexity patterns."""
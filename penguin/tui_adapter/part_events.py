@@ -14,6 +14,9 @@ from typing import Any, Awaitable, Callable, Dict, Literal, Optional, Tuple
 
 from penguin.system.runtime_events import wrap_opencode_event
 
+# Characters of live tool output kept in a running part's metadata
+TOOL_OUTPUT_PREVIEW_CHARS = 30_000
+
 
 class PartType(Enum):
     """OpenCode-compatible part types."""
@@ -635,6 +638,30 @@ class PartEventAdapter:
         )
         return part_id
 
+    async def on_tool_output(self, part_id: str, chunk: str):
+        """Called with output a running tool has produced so far."""
+        part = self._active_parts.get(part_id)
+        if not part or not chunk:
+            return
+        state = part.content.get("state")
+        if not isinstance(state, dict) or state.get("status") != "running":
+            return
+
+        metadata = state.get("metadata")
+        if not isinstance(metadata, dict):
+            metadata = {}
+            state["metadata"] = metadata
+        output = metadata.get("output")
+        output = (output if isinstance(output, str) else "") + chunk
+        metadata["output"] = output[-TOOL_OUTPUT_PREVIEW_CHARS:]
+
+        # Live output is superseded by the final state; it is not persisted
+        await self._emit(
+            "message.part.updated",
+            {"part": self._part_to_dict(part)},
+            persist=False,
+        )
+
     async def on_tool_end(
         self,
         part_id: str,
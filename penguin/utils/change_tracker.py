@@ -0,0 +1,416 @@
+"""Cheap detection of files created, modified or deleted during code execution.
+
+``WorkspaceChangeTracker`` brackets a unit of work::
+
+    token = tracker.begin()
+    ...run a cell...
+    changes = tracker.end(token)
+
+When watchdog can watch the root, changes are collected from OS file events,
+so ``end`` costs time proportional to the number of events, not the size of
+the workspace. Ignored directories that hold subdirectories of their own (a
+venv, ``node_modules``, ``.git``) are kept out of the watches so they do not
+use up inotify watches. Otherwise it falls back to a snapshot that prunes
+ignored directories and only re-lists and re-stats directories whose mtime
+changed; a file rewritten in place without its directory changing is not
+seen in that mode.
+"""
+
+import fnmatch
+import itertools
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directory names never descended into
+IGNORED_DIRS = {
+    "__pycache__",
+    ".git",
+    "node_modules",
+    "penguin_venv",
+    ".venv",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".idea",
+    ".vscode",
+}
+# "#*" covers unnamed O_TMPFILE inodes and editor autosaves
+IGNORED_FILE_PATTERNS = ["*.pyc", "*.pyo", "*.log", "*.lock", "*.swp", "*~", "#*"]
+
+# Quiet period used to let in-flight OS events arrive before reporting
+_SETTLE_SECONDS = 0.02
+_SETTLE_MAX_SECONDS = 0.25
+# Each watch is an observer thread; workspaces needing more are polled
+_MAX_WATCHES = 64
+
+
+@dataclass
+class FileChanges:
+    """Workspace-relative paths touched between ``begin`` and ``end``."""
+
+    created: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.modified or self.deleted)
+
+    def summary(self, limit: int = 20) -> str:
+        """Short human-readable report, empty when nothing changed."""
+        lines = []
+        for label, paths in (
+            ("created", self.created),
+            ("modified", self.modified),
+            ("deleted", self.deleted),
+        ):
+            if not paths:
+                continue
+            shown = ", ".join(paths[:limit])
+            if len(paths) > limit:
+                shown += f", ... (+{len(paths) - limit} more)"
+            lines.append(f"  {label}: {shown}")
+        return "Workspace changes:\n" + "\n".join(lines) if lines else ""
+
+
+def _has_subdirs(path: str) -> bool:
+    try:
+        with os.scandir(path) as it:
+            return any(entry.is_dir(follow_symlinks=False) for entry in it)
+    except OSError:
+        return False
+
+
+def _walk_files(top: str):
+    """Files under ``top``, skipping ignored directories."""
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+        for name in filenames:
+            yield os.path.join(dirpath, name)
+
+
+def _watch_plan(top: str) -> List[Tuple[str, bool]]:
+    """``(directory, recursive)`` watches covering ``top`` minus ignored trees.
+
+    A subtree is watched recursively unless it contains an ignored directory
+    with subdirectories of its own; each directory above such a one gets a
+    non-recursive watch instead. Ignored leaf directories like ``__pycache__``
+    cost one watch each and are left inside recursive watches.
+    """
+    children: Dict[str, List[str]] = {}
+    blocked: Set[str] = set()
+    order = [top]
+    for directory in order:  # grows while iterating: breadth-first walk
+        subdirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name not in IGNORED_DIRS:
+                        subdirs.append(entry.path)
+                    elif _has_subdirs(entry.path):
+                        blocked.add(directory)
+        except OSError:
+            pass
+        children[directory] = subdirs
+        order.extend(subdirs)
+    for directory in reversed(order):
+        if any(child in blocked for child in children[directory]):
+            blocked.add(directory)
+
+    plan: List[Tuple[str, bool]] = []
+    stack = [top]
+    while stack:
+        directory = stack.pop()
+        plan.append((directory, directory not in blocked))
+        if directory in blocked:
+            stack.extend(children[directory])
+    return plan
+
+
+def _is_ignored(rel_path: str) -> bool:
+    parts = rel_path.split(os.sep)
+    if any(part in IGNORED_DIRS for part in parts[:-1]):
+        return True
+    name = parts[-1]
+    return name in IGNORED_DIRS or any(
+        fnmatch.fnmatch(name, pattern) for pattern in IGNORED_FILE_PATTERNS
+    )
+
+
+class WorkspaceChangeTracker:
+    """Tracks file changes under ``root`` for overlapping begin/end windows."""
+
+    def __init__(self, root: str, use_events: bool = True):
+        self.root = os.path.realpath(root)
+        self._lock = threading.Lock()
+        self._observer = None
+        self._seq = itertools.count(1)
+        self._events: List[Tuple[int, float, str, str]] = []  # (seq, time, kind, rel)
+        self._open: Set[int] = set()
+        # Scheduled watches by absolute directory; only touched before the
+        # observer starts and from its event thread afterwards
+        self._watches: Dict[str, Any] = {}
+        self._handler = None
+        # Polling fallback cache: dir -> (mtime_ns, subdirs, {file: (mtime_ns, size)})
+        self._listings: Dict[str, Tuple[int, List[str], Dict[str, Tuple[int, int]]]] = {}
+        if use_events:
+            self._start_observer()
+
+    @property
+    def event_driven(self) -> bool:
+        return self._observer is not None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def begin(self) -> Any:
+        """Start a window; returns a token for ``end``."""
+        if self._observer is None:
+            return self._snapshot()
+        if self._open:
+            # Let in-flight events land in the windows already open, not this one
+            self._settle()
+        with self._lock:
+            token = next(self._seq)
+            self._open.add(token)
+            return token
+
+    def end(self, token: Any) -> FileChanges:
+        """Close the window opened by ``begin`` and return what changed in it."""
+        if self._observer is None:
+            return self._diff(token, self._snapshot())
+
+        self._settle()
+        with self._lock:
+            self._open.discard(token)
+            events = [(kind, path) for seq, _, kind, path in self._events if seq > token]
+            # Drop events no open window can still need
+            floor = min(self._open) if self._open else next(self._seq)
+            self._events = [e for e in self._events if e[0] > floor]
+        return self._classify(events)
+
+    def close(self) -> None:
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=2)
+            except Exception:
+                pass
+            self._observer = None
+
+    # ------------------------------------------------------------------
+    # Event-driven mode
+    # ------------------------------------------------------------------
+
+    def _start_observer(self) -> None:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return
+
+        tracker = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):  # type: ignore[no-untyped-def]
+                if event.is_directory:
+                    if event.event_type in ("created", "deleted", "moved"):
+                        tracker._directory_event(
+                            event.event_type, event.src_path, getattr(event, "dest_path", "")
+                        )
+                    return
+                if event.event_type == "moved":
+                    tracker._record("deleted", event.src_path)
+                    tracker._record("created", event.dest_path)
+                elif event.event_type in ("created", "modified", "deleted"):
+                    tracker._record(event.event_type, event.src_path)
+                elif event.event_type == "closed":
+                    tracker._record("modified", event.src_path)
+
+        plan = _watch_plan(self.root)
+        if len(plan) > _MAX_WATCHES:
+            logger.info(
+                f"{self.root} needs {len(plan)} watches to skip ignored directories, polling instead"
+            )
+            return
+        observer = Observer()
+        observer.daemon = True
+        self._observer = observer
+        self._handler = _Handler()
+        try:
+            for directory, recursive in plan:
+                self._watches[directory] = observer.schedule(
+                    self._handler, directory, recursive=recursive
+                )
+            observer.start()
+        except Exception as e:  # inotify watch limits, unsupported FS, ...
+            logger.info(f"File events unavailable for {self.root}, polling instead: {e}")
+            self.close()
+            self._watches.clear()
+
+    def _covered(self, path: str) -> bool:
+        """Whether a recursive watch already reports events under ``path``."""
+        directory = os.path.dirname(path)
+        while len(directory) >= len(self.root):
+            watch = self._watches.get(directory)
+            if watch is not None and watch.is_recursive:
+                return True
+            directory = os.path.dirname(directory)
+        return False
+
+    def _unwatch(self, path: str) -> None:
+        prefix = path + os.sep
+        for directory in [d for d in self._watches if d == path or d.startswith(prefix)]:
+            watch = self._watches.pop(directory)
+            try:
+                self._observer.unschedule(watch)
+            except Exception:  # Already gone with its directory
+                pass
+
+    def _directory_event(self, kind: str, src: Any, dest: Any) -> None:
+        """Follow directories that appear or move outside the recursive watches."""
+        src, dest = os.fsdecode(src), os.fsdecode(dest) if dest else ""
+        if kind in ("deleted", "moved"):
+            self._unwatch(src)
+        target = dest if kind == "moved" else src
+        if kind == "deleted" or not target or self._covered(target):
+            return
+        if os.path.relpath(target, self.root).startswith(os.pardir):
+            return
+        if not _is_ignored(os.path.relpath(target, self.root)) and self._observer is not None:
+            for directory, recursive in _watch_plan(target):
+                try:
+                    self._watches[directory] = self._observer.schedule(
+                        self._handler, directory, recursive=recursive
+                    )
+                except Exception as e:
+                    logger.debug(f"Could not watch {directory}: {e}")
+        # Files already inside were not reported by any watch
+        for path in _walk_files(target):
+            if kind == "moved":
+                self._record("deleted", os.path.join(src, os.path.relpath(path, target)))
+            self._record("created", path)
+
+    def _record(self, kind: str, path: Any) -> None:
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        rel = os.path.relpath(path, self.root)
+        if rel.startswith(os.pardir) or _is_ignored(rel):
+            return
+        with self._lock:
+            if self._open:
+                self._events.append((next(self._seq), time.monotonic(), kind, rel))
+
+    def _settle(self) -> None:
+        """Wait briefly until no new events arrive (bounded)."""
+        deadline = time.monotonic() + _SETTLE_MAX_SECONDS
+        while True:
+            time.sleep(_SETTLE_SECONDS)
+            with self._lock:
+                last = self._events[-1][1] if self._events else 0.0
+            now = time.monotonic()
+            if now - last >= _SETTLE_SECONDS or now >= deadline:
+                return
+
+    def _classify(self, events: List[Tuple[str, str]]) -> FileChanges:
+        state: Dict[str, str] = {}
+        for kind, path in events:
+            previous = state.get(path)
+            if previous is None:
+                state[path] = kind
+            elif previous == "created":
+                if kind == "deleted":
+                    state[path] = "transient"  # Created and removed within the window
+            elif previous == "deleted":
+                if kind == "created":
+                    state[path] = "modified"
+            elif previous == "transient":
+                if kind == "created":
+                    state[path] = "created"
+            elif kind == "deleted":
+                state[path] = "deleted"
+
+        changes = FileChanges()
+        for path, kind in sorted(state.items()):
+            if kind == "created":
+                changes.created.append(path)
+            elif kind == "modified":
+                changes.modified.append(path)
+            elif kind == "deleted":
+                changes.deleted.append(path)
+        return changes
+
+    # ------------------------------------------------------------------
+    # Polling fallback
+    # ------------------------------------------------------------------
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        files: Dict[str, Tuple[int, int]] = {}
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            try:
+                dir_mtime = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+            cached = self._listings.get(rel_dir)
+            if cached is None or cached[0] != dir_mtime:
+                # Entries changed: re-list and re-stat this directory only
+                subdirs: List[str] = []
+                stats: Dict[str, Tuple[int, int]] = {}
+                try:
+                    with os.scandir(abs_dir) as it:
+                        for entry in it:
+                            rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                            if _is_ignored(rel):
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(rel)
+                                continue
+                            try:
+                                st = entry.stat(follow_symlinks=False)
+                            except OSError:
+                                continue
+                            stats[rel] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+                cached = (dir_mtime, subdirs, stats)
+                self._listings[rel_dir] = cached
+            stack.extend(cached[1])
+            files.update(cached[2])
+        return files
+
+    @staticmethod
+    def _diff(
+        before: Dict[str, Tuple[int, int]], after: Dict[str, Tuple[int, int]]
+    ) -> FileChanges:
+        return FileChanges(
+            created=sorted(set(after) - set(before)),
+            modified=sorted(p for p in after if p in before and after[p] != before[p]),
+            deleted=sorted(set(before) - set(after)),
+        )
+
+
+_trackers: Dict[str, WorkspaceChangeTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_change_tracker(root: str) -> Optional[WorkspaceChangeTracker]:
+    """Shared tracker for ``root`` (None when the directory does not exist)."""
+    if not root or not os.path.isdir(root):
+        return None
+    key = os.path.realpath(root)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = WorkspaceChangeTracker(key)
+            _trackers[key] = tracker
+        return tracker
@@ -0,0 +1,255 @@
+"""Pruned directory scans and a persistent cache for startup discovery.
+
+Skill and plugin discovery walk user and project directories on every start,
+which can dominate startup in a monorepo or home directory. ``scan_tree``
+never descends past the depth limit, skips ignored directories and records
+the mtime of every directory it read. ``DiscoveryCache`` persists those scans
+(and whatever the caller derives from them) so the next start only has to
+``stat`` the recorded directories to prove nothing changed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# VCS, virtualenv/dependency and cache directories; never skill or plugin homes
+DEFAULT_IGNORED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".cache",
+        ".mypy_cache",
+        ".nox",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".venv",
+        "__pycache__",
+        "node_modules",
+        "site-packages",
+        "venv",
+    }
+)
+
+# Workspace scans (code and memory indexing) also skip build output
+WORKSPACE_IGNORED_DIRS = DEFAULT_IGNORED_DIRS | {"build", "dist"}
+
+_CACHE_VERSION = 1
+
+
+def default_cache_path(name: str) -> Path:
+    """Location of a named discovery cache under ``PENGUIN_CACHE_DIR``."""
+    root = os.getenv("PENGUIN_CACHE_DIR", "~/.cache/penguin")
+    return Path(root).expanduser() / "discovery" / f"{name}.json"
+
+
+def file_signature(path: Union[str, Path]) -> Optional[List[int]]:
+    """``[mtime_ns, size]`` for a file, or None if it cannot be stat'ed."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+@dataclass
+class TreeScan:
+    """Result of a pruned walk looking for directories holding ``target``."""
+
+    root: str
+    # Relative paths ("." for the root) of directories containing the target,
+    # in pre-order walk order
+    matches: List[str] = field(default_factory=list)
+    # Directories one level past the depth limit that contain the target
+    too_deep: List[str] = field(default_factory=list)
+    # Relative directory path -> mtime_ns for every directory inspected
+    dirs: Dict[str, int] = field(default_factory=dict)
+    complete: bool = True
+
+    def is_fresh(self) -> bool:
+        """True while no inspected directory has gained or lost entries."""
+        root = Path(self.root)
+        for rel, mtime_ns in self.dirs.items():
+            try:
+                if os.stat(root / rel).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "root": self.root,
+            "matches": self.matches,
+            "too_deep": self.too_deep,
+            "dirs": self.dirs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TreeScan":
+        return cls(
+            root=data["root"],
+            matches=list(data.get("matches", [])),
+            too_deep=list(data.get("too_deep", [])),
+            dirs=dict(data.get("dirs", {})),
+        )
+
+
+def scan_tree(
+    root: Union[str, Path],
+    target: str,
+    *,
+    max_depth: int,
+    ignored: Collection[str] = DEFAULT_IGNORED_DIRS,
+    limit: Optional[int] = None,
+) -> TreeScan:
+    """Find directories under ``root`` that contain a file named ``target``.
+
+    Directories deeper than ``max_depth`` are not read; the ones exactly one
+    level past the limit are only checked for ``target`` so callers can
+    report them. Symlinked directories are followed once. The walk stops
+    after ``limit`` matches, in which case the scan is marked incomplete.
+    """
+    root_path = Path(root)
+    scan = TreeScan(root=str(root_path))
+    visited: set = set()
+    # Reversed pushes keep the walk pre-order with sorted siblings
+    stack: List[tuple] = [(".", 0)]
+    while stack:
+        rel, depth = stack.pop()
+        directory = root_path / rel
+        try:
+            stat = os.stat(directory)
+            identity = (stat.st_dev, stat.st_ino)
+            if identity in visited:
+                continue
+            visited.add(identity)
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError as exc:
+            logger.debug(f"Skipping unreadable directory {directory}: {exc}")
+            continue
+        scan.dirs[rel] = stat.st_mtime_ns
+
+        children = []
+        for entry in entries:
+            try:
+                if entry.name == target and entry.is_file():
+                    scan.matches.append(rel)
+                elif entry.name not in ignored and entry.is_dir():
+                    children.append(entry.name if rel == "." else f"{rel}/{entry.name}")
+            except OSError:
+                continue
+        if limit is not None and len(scan.matches) >= limit:
+            scan.complete = False
+            break
+
+        if depth + 1 > max_depth:
+            for child in children:
+                child_path = root_path / child
+                try:
+                    scan.dirs[child] = os.stat(child_path).st_mtime_ns
+                except OSError:
+                    continue
+                if (child_path / target).is_file():
+                    scan.too_deep.append(child)
+            continue
+        for child in reversed(children):
+            stack.append((child, depth + 1))
+    return scan
+
+
+class DiscoveryCache:
+    """JSON-backed cache of discovery results, written atomically.
+
+    The cache is a set of named sections (plain dicts). Callers mutate a
+    section and call ``mark_dirty``; ``save`` writes only when something
+    changed. With ``path=None`` the cache lives in memory only.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]]):
+        self.path = Path(path).expanduser() if path else None
+        self._data: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is not None:
+            return self._data
+        data: Dict[str, Any] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                loaded = json.loads(self.path.read_text(encoding="utf-8"))
+                if isinstance(loaded, dict) and loaded.get("version") == _CACHE_VERSION:
+                    data = loaded
+            except (OSError, ValueError) as exc:
+                logger.debug(f"Ignoring unreadable discovery cache {self.path}: {exc}")
+        data["version"] = _CACHE_VERSION
+        self._data = data
+        return data
+
+    def section(self, name: str) -> Dict[str, Any]:
+        data = self._load()
+        section = data.get(name)
+        if not isinstance(section, dict):
+            section = data[name] = {}
+        return section
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def get_scan(self, key: str) -> Optional[TreeScan]:
+        """A cached scan that is still fresh, or None."""
+        entry = self.section("scans").get(key)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            scan = TreeScan.from_dict(entry)
+        except (KeyError, TypeError):
+            return None
+        if not scan.is_fresh():
+            return None
+        entry["used_at"] = time.time()
+        return scan
+
+    def put_scan(self, key: str, scan: TreeScan, max_scans: int = 64) -> None:
+        """Remember a complete scan, evicting the least recently used."""
+        if not scan.complete:
+            return
+        scans = self.section("scans")
+        scans[key] = {**scan.to_dict(), "used_at": time.time()}
+        if len(scans) > max_scans:
+            oldest = sorted(scans, key=lambda k: scans[k].get("used_at", 0))
+            for stale in oldest[: len(scans) - max_scans]:
+                del scans[stale]
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty or self.path is None or self._data is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        except OSError as exc:
+            logger.debug(f"Could not write discovery cache {self.path}: {exc}")
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(self._data, handle)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except (OSError, TypeError, ValueError) as exc:
+            logger.debug(f"Could not write discovery cache {self.path}: {exc}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
@@ -0,0 +1,309 @@
+"""Pool of isolated, per-session Python kernels for code execution.
+
+Each session (or agent) gets its own ``kernel_worker`` subprocess, so cells
+from concurrent agents run in parallel and cannot clobber each other's
+globals, working directory, environment or ``sys.stdout``. A spare kernel is
+kept warm so a new session does not pay interpreter + IPython start-up.
+
+A cell that exceeds its timeout has its whole process group killed; the
+session's next cell starts in a fresh kernel. Kernels idle longer than
+``idle_ttl`` are recycled, and the least recently used idle kernel is evicted
+when ``max_kernels`` is reached.
+
+Environment overrides:
+    PENGUIN_KERNEL_MAX            maximum live kernels (default 8)
+    PENGUIN_KERNEL_WARM           warm spare kernels (default 1)
+    PENGUIN_KERNEL_IDLE_TTL       idle seconds before recycling (default 900)
+    PENGUIN_KERNEL_MEMORY_MB      address-space limit per kernel (default off)
+    PENGUIN_KERNEL_CPU_SECONDS    CPU-time limit per kernel (default off)
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STARTUP_TIMEOUT = 60.0
+
+
+class KernelTimeout(Exception):
+    """The cell did not finish in time; the kernel has been killed."""
+
+
+class KernelDied(Exception):
+    """The kernel process exited while running a cell."""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class KernelLimits:
+    """Resource limits applied inside each kernel process (0 disables)."""
+
+    memory_mb: int = 0
+    cpu_seconds: int = 0
+
+    @classmethod
+    def from_env(cls) -> "KernelLimits":
+        return cls(
+            memory_mb=_env_int("PENGUIN_KERNEL_MEMORY_MB", 0),
+            cpu_seconds=_env_int("PENGUIN_KERNEL_CPU_SECONDS", 0),
+        )
+
+
+class KernelWorker:
+    """Handle to one ``kernel_worker`` subprocess."""
+
+    def __init__(self, limits: KernelLimits):
+        env = os.environ.copy()
+        # Suppress Rich/ANSI formatting in cell output
+        env["TERM"] = "dumb"
+        env["NO_COLOR"] = "1"
+        env["RICH_NO_MARKUP"] = "1"
+        env["PYTHONUNBUFFERED"] = "1"
+
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "penguin.utils.kernel_worker",
+                "--memory-mb",
+                str(limits.memory_mb),
+                "--cpu-seconds",
+                str(limits.cpu_seconds),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            env=env,
+            # Own process group so a timeout kills anything the cell spawned
+            start_new_session=(os.name == "posix"),
+        )
+        self.pid = self.process.pid
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.cells = 0
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._replies: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._ready = threading.Event()
+        self._reader = threading.Thread(
+            target=self._read_replies, name=f"kernel-reader-{self.pid}", daemon=True
+        )
+        self._reader.start()
+
+    def _read_replies(self) -> None:
+        assert self.process.stdout is not None
+        for line in self.process.stdout:
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if reply.get("ready"):
+                self._ready.set()
+            else:
+                self._replies.put(reply)
+        # EOF: the process is gone
+        self._ready.set()
+        self._replies.put(None)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked()
+
+    def wait_ready(self, timeout: float = _STARTUP_TIMEOUT) -> bool:
+        return self._ready.wait(timeout) and self.alive
+
+    def execute(self, code: str, cwd: Optional[str], timeout: Optional[float]) -> str:
+        """Run one cell; the caller must hold ``self.lock``."""
+        if not self.wait_ready():
+            raise KernelDied("kernel failed to start")
+        request_id = next(self._ids)
+        request = {"id": request_id, "code": code, "cwd": cwd}
+        try:
+            assert self.process.stdin is not None
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise KernelDied(f"kernel not accepting input: {e}") from e
+
+        self.cells += 1
+        deadline = None if timeout is None else time.monotonic() + max(timeout, 0)
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                reply = self._replies.get(timeout=remaining)
+            except queue.Empty:
+                self.kill()
+                raise KernelTimeout()
+            if reply is None:
+                raise KernelDied(f"kernel exited with code {self.process.wait()}")
+            if reply.get("id") == request_id:
+                self.last_used = time.monotonic()
+                return str(reply.get("output", ""))
+
+    def kill(self) -> None:
+        if not self.alive:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(self.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError):
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Kernel {self.pid} did not exit after SIGKILL")
+
+
+class KernelPool:
+    """Session-keyed pool of ``KernelWorker`` processes."""
+
+    def __init__(
+        self,
+        max_kernels: Optional[int] = None,
+        warm_spares: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        limits: Optional[KernelLimits] = None,
+    ):
+        self.max_kernels = max(1, max_kernels or _env_int("PENGUIN_KERNEL_MAX", 8))
+        self.warm_spares = (
+            warm_spares if warm_spares is not None else _env_int("PENGUIN_KERNEL_WARM", 1)
+        )
+        self.idle_ttl = (
+            idle_ttl if idle_ttl is not None else _env_int("PENGUIN_KERNEL_IDLE_TTL", 900)
+        )
+        self.limits = limits or KernelLimits.from_env()
+        self._kernels: Dict[str, KernelWorker] = {}
+        self._spares: List[KernelWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats_counters = {"spawned": 0, "timeouts": 0, "crashes": 0, "evicted": 0}
+        atexit.register(self.shutdown)
+
+    def execute(
+        self,
+        key: str,
+        code: str,
+        cwd: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Run ``code`` in the kernel for ``key``.
+
+        Raises ``KernelTimeout`` or ``KernelDied``; either way the kernel is
+        discarded and the next call for ``key`` starts with fresh state.
+        """
+        worker = self._acquire(key)
+        with worker.lock:
+            try:
+                return worker.execute(code, cwd, timeout)
+            except KernelTimeout:
+                self.stats_counters["timeouts"] += 1
+                self._discard(key, worker)
+                raise
+            except KernelDied:
+                self.stats_counters["crashes"] += 1
+                self._discard(key, worker)
+                raise
+
+    def restart(self, key: str) -> None:
+        """Drop the kernel for ``key`` so its next cell starts clean."""
+        with self._lock:
+            worker = self._kernels.pop(key, None)
+        if worker is not None:
+            worker.kill()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers = list(self._kernels.values()) + self._spares
+            self._kernels.clear()
+            self._spares.clear()
+        for worker in workers:
+            worker.kill()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            kernels = {
+                key: {
+                    "pid": w.pid,
+                    "alive": w.alive,
+                    "busy": w.busy,
+                    "cells": w.cells,
+                    "idle_seconds": round(time.monotonic() - w.last_used, 1),
+                }
+                for key, w in self._kernels.items()
+            }
+            spares = len(self._spares)
+        return {"kernels": kernels, "warm_spares": spares, **self.stats_counters}
+
+    # ------------------------------------------------------------------
+
+    def _spawn(self) -> KernelWorker:
+        self.stats_counters["spawned"] += 1
+        return KernelWorker(self.limits)
+
+    def _acquire(self, key: str) -> KernelWorker:
+        to_kill: List[KernelWorker] = []
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("kernel pool is shut down")
+            now = time.monotonic()
+            for other_key, other in list(self._kernels.items()):
+                expired = self.idle_ttl > 0 and now - other.last_used > self.idle_ttl
+                if other_key != key and not other.busy and (expired or not other.alive):
+                    to_kill.append(self._kernels.pop(other_key))
+                    self.stats_counters["evicted"] += int(expired)
+
+            worker = self._kernels.get(key)
+            if worker is None or not worker.alive:
+                while len(self._kernels) >= self.max_kernels:
+                    idle = [(w.last_used, k) for k, w in self._kernels.items() if not w.busy]
+                    if not idle:
+                        break  # Everything busy: allow a temporary overflow
+                    _, victim = min(idle)
+                    to_kill.append(self._kernels.pop(victim))
+                    self.stats_counters["evicted"] += 1
+                self._spares = [s for s in self._spares if s.alive]
+                worker = self._spares.pop(0) if self._spares else self._spawn()
+                self._kernels[key] = worker
+            # Mark as most recently used so concurrent acquires don't evict it
+            worker.last_used = now
+            missing = self.warm_spares - len(self._spares)
+            for _ in range(max(missing, 0)):
+                self._spares.append(self._spawn())
+
+        for stale in to_kill:
+            stale.kill()
+        return worker
+
+    def _discard(self, key: str, worker: KernelWorker) -> None:
+        worker.kill()
+        with self._lock:
+            if self._kernels.get(key) is worker:
+                del self._kernels[key]
@@ -0,0 +1,100 @@
+"""Out-of-process Python kernel used by ``KernelPool``.
+
+Run as ``python -m penguin.utils.kernel_worker``. Requests arrive as JSON lines
+on stdin (``{"id", "code", "cwd"}``) and each reply is one JSON line
+(``{"id", "output"}``) on a private copy of the original stdout. During a cell,
+file descriptors 1 and 2 point at temp files, so output from C extensions and
+child processes is captured too and can never corrupt the protocol stream.
+
+Optional limits are applied to this process before the shell is created:
+``--memory-mb`` (RLIMIT_AS) and ``--cpu-seconds`` (RLIMIT_CPU).
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+
+
+def _apply_limits(memory_mb: int, cpu_seconds: int) -> None:
+    try:
+        import resource
+    except ImportError:  # Windows: no rlimits
+        return
+    if memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_seconds > 0:
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, hard))
+
+
+def _read_fd_capture(handle) -> str:
+    handle.flush()
+    handle.seek(0)
+    return handle.read().decode("utf-8", errors="replace")
+
+
+def _run_cell(shell, code: str, cwd: str | None) -> str:
+    from penguin.utils.notebook import format_cell_result
+
+    if cwd:
+        os.chdir(cwd)
+
+    out = io.StringIO()
+    err = io.StringIO()
+    saved_fds = (os.dup(1), os.dup(2))
+    with tempfile.TemporaryFile() as fd_out, tempfile.TemporaryFile() as fd_err:
+        os.dup2(fd_out.fileno(), 1)
+        os.dup2(fd_err.fileno(), 2)
+        sys.stdout, sys.stderr = out, err
+        try:
+            result = shell.run_cell(code)
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            os.close(saved_fds[0])
+            os.close(saved_fds[1])
+        output = out.getvalue() + _read_fd_capture(fd_out)
+        error_output = err.getvalue() + _read_fd_capture(fd_err)
+    return format_cell_result(result, output, error_output)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--memory-mb", type=int, default=0)
+    parser.add_argument("--cpu-seconds", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Keep a private handle for replies, then point fd 1/2 away from the pipe.
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    os.close(devnull)
+
+    _apply_limits(args.memory_mb, args.cpu_seconds)
+
+    from IPython.core.interactiveshell import InteractiveShell  # type: ignore
+
+    shell = InteractiveShell.instance()
+    replies.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        try:
+            output = _run_cell(shell, request.get("code", ""), request.get("cwd"))
+        except BaseException as e:  # Keep serving after SystemExit/KeyboardInterrupt in a cell
+            output = f"Error executing code: {e!r}"
+        replies.write(json.dumps({"id": request.get("id"), "output": output}) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
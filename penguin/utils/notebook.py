@@ -1,13 +1,49 @@
 import io
 import os
 import sys
+from typing import Optional
 
 from IPython.core.interactiveshell import InteractiveShell # type: ignore
 
+from penguin.utils.change_tracker import get_change_tracker
 from penguin.utils.process_manager import ProcessManager
+from penguin.utils.shell_runner import OutputCallback, run_shell
 from penguin.utils import FileMap
 
 
+def format_cell_result(result, output: str, error_output: str) -> str:
+    """Render an IPython ``ExecutionResult`` plus captured streams as tool output."""
+    # Combine outputs based on what's available
+    if result.success:
+        combined_output = []
+        if output.strip():
+            combined_output.append(output.strip())
+        if result.result is not None:
+            combined_output.append(str(result.result))
+        if error_output.strip():  # Include stderr even on success
+            combined_output.append(f"Warnings:\n{error_output.strip()}")
+        return (
+            "\n".join(combined_output)
+            if combined_output
+            else "Code executed successfully"
+        )
+    else:
+        # Attempt to capture richer error information
+        error_parts = []
+        if result.error_in_exec:
+            # Some exceptions (e.g. MemoryError) have an empty message
+            error_parts.append(
+                str(result.error_in_exec) or type(result.error_in_exec).__name__
+            )
+        if hasattr(result, "error_before_exec") and result.error_before_exec:
+            error_parts.append(str(result.error_before_exec))
+        if error_output.strip():
+            error_parts.append(error_output.strip())
+
+        error_msg = "\n".join(error_parts) if error_parts else "Unknown error occurred"
+        return f"Error: {error_msg}"
+
+
 class NotebookExecutor:
     def __init__(self):
         from penguin.config import WORKSPACE_PATH
@@ -17,23 +53,33 @@ class NotebookExecutor:
         os.chdir(WORKSPACE_PATH)  # Set the working directory to the workspace
         self.process_manager = ProcessManager()
         self.current_process = None
-        self.file_map = FileMap(WORKSPACE_PATH)
+        self._workspace_path = WORKSPACE_PATH
+        self._file_map = None
         self.active_directory = WORKSPACE_PATH  # Explicit workspace tracking
+        self.output_callback: Optional[OutputCallback] = None  # Streams shell output
+
+    @property
+    def file_map(self) -> FileMap:
+        # Built on demand: a FileMap walks the whole tree
+        if self._file_map is None:
+            self._file_map = FileMap(self._workspace_path)
+        return self._file_map
 
     def execute_code(self, code: str) -> str:
         try:
             # Store pre-execution state
             pre_dir = os.getcwd()
             os.chdir(self.active_directory)  # Ensure workspace context
-            
-            pre_state = self.file_map.get_file_map()
-            
+
             # Suppress Rich/ANSI formatting during code execution to prevent contamination
             # Save original environment
             orig_term = os.environ.get('TERM')
             orig_no_color = os.environ.get('NO_COLOR')
             orig_rich_no_markup = os.environ.get('RICH_NO_MARKUP')
-            
+
+            # Track files the cell touches (event-driven, not a tree walk)
+            tracker = get_change_tracker(self.active_directory)
+            token = tracker.begin() if tracker else None
             try:
                 # Disable Rich formatting
                 os.environ['TERM'] = 'dumb'
@@ -49,6 +95,9 @@ class NotebookExecutor:
                 # Execute the code
                 result = self.shell.run_cell(code)
             finally:
+                # Close the change window even if the cell raised
+                changes = tracker.end(token) if tracker is not None else None
+
                 # Restore environment
                 if orig_term is not None:
                     os.environ['TERM'] = orig_term
@@ -65,49 +114,38 @@ class NotebookExecutor:
                 elif 'RICH_NO_MARKUP' in os.environ:
                     del os.environ['RICH_NO_MARKUP']
 
-            # Restore stdout and stderr
-            sys.stdout = sys.__stdout__
-            sys.stderr = sys.__stderr__
-            
-            # Return to original directory after execution
-            os.chdir(pre_dir)
+                # Restore stdout and stderr
+                sys.stdout = sys.__stdout__
+                sys.stderr = sys.__stderr__
+
+                # Return to original directory after execution
+                os.chdir(pre_dir)
 
             # Get the captured outputs
             output = out.getvalue()
             error_output = err.getvalue()
 
-            # Combine outputs based on what's available
-            if result.success:
-                combined_output = []
-                if output.strip():
-                    combined_output.append(output.strip())
-                if result.result is not None:
-                    combined_output.append(str(result.result))
-                if error_output.strip():  # Include stderr even on success
-                    combined_output.append(f"Warnings:\n{error_output.strip()}")
-                return (
-                    "\n".join(combined_output)
-                    if combined_output
-                    else "Code executed successfully"
-                )
-            else:
-                # Attempt to capture richer error information
-                error_parts = []
-                if result.error_in_exec:
-                    error_parts.append(str(result.error_in_exec))
-                if hasattr(result, "error_before_exec") and result.error_before_exec:
-                    error_parts.append(str(result.error_before_exec))
-                if error_output.strip():
-                    error_parts.append(error_output.strip())
-
-                error_msg = "\n".join(error_parts) if error_parts else "Unknown error occurred"
-                return f"Error: {error_msg}"
+            formatted = format_cell_result(result, output, error_output)
+            summary = changes.summary() if changes is not None else ""
+            if summary:
+                formatted = f"{formatted}\n\n{summary}"
+            return formatted
         except Exception as e:
             return f"Error executing code: {str(e)}"
 
-    def execute_shell(self, command: str) -> str:
+    def execute_shell(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        on_output: Optional[OutputCallback] = None,
+    ) -> str:
+        """Run a shell command in the workspace with bounded, streamed output.
+
+        ``on_output(stream, text)`` (or ``self.output_callback``) receives
+        chunks as they arrive. Limits default to ``PENGUIN_SHELL_*`` settings.
+        """
         import platform
-        import subprocess
 
         try:
             # Determine OS and adjust command
@@ -125,21 +163,25 @@ class NotebookExecutor:
             env['RICH_NO_MARKUP'] = '1'
 
             # Execute command in explicit workspace directory
-            result = subprocess.run(
-                command, 
-                shell=shell, 
-                capture_output=True, 
-                text=True, 
+            result = run_shell(
+                command,
+                shell=shell,
                 cwd=self.active_directory,  # Force workspace context
-                env=env  # Use environment with Rich suppression
+                env=env,  # Use environment with Rich suppression
+                timeout=timeout,
+                idle_timeout=idle_timeout,
+                on_output=on_output or self.output_callback,
             )
 
             # Combine stdout and stderr if present
             output = []
-            if result.stdout:
+            if result.stdout.strip():
                 output.append(result.stdout.strip())
-            if result.stderr:
+            if result.stderr.strip():
                 output.append(f"Stderr:\n{result.stderr.strip()}")
+            note = result.limit_note()
+            if note:
+                output.append(f"[{note}]")
 
             return "\n".join(output) if output else "Command executed successfully"
         except Exception as e:
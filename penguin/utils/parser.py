@@ -15,7 +15,7 @@ from datetime import datetime
 from enum import Enum
 from html import unescape
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable, Awaitable
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
 import base64
 from penguin.local_task.manager import ProjectManager
 from penguin.multi.policy import (
@@ -25,6 +25,7 @@ from penguin.multi.policy import (
 )
 from penguin.tools import ToolManager
 from penguin.utils.process_manager import ProcessManager
+from penguin.utils.shell_runner import OutputEventStream, stream_output_to
 from penguin.system.conversation import MessageCategory
 from penguin.system.execution_context import get_current_execution_context
 from penguin.tools.image_tools import ReadImageTool
@@ -953,6 +954,50 @@ def parse_patch_files_payload(params: Any) -> Dict[str, Any]:
     }
 
 
+# Compiled once at import: the alternation over every ActionType value is large
+# and these helpers run repeatedly on streamed buffers.
+_ACTION_TAG_NAMES = tuple(action_type.value for action_type in ActionType)
+_ACTION_TAG_ALTERNATION = "|".join(_ACTION_TAG_NAMES)
+_ACTION_BLOCK_RE = re.compile(
+    f"<({_ACTION_TAG_ALTERNATION})>(.*?)</\\1>", re.DOTALL
+)
+_ACTION_BLOCK_ANYCASE_RE = re.compile(
+    f"<({_ACTION_TAG_ALTERNATION})>.*?</\\1>", re.DOTALL | re.IGNORECASE
+)
+_INCOMPLETE_ACTION_RE = re.compile(
+    f"<({_ACTION_TAG_ALTERNATION})>(?:(?!</\\1>).)*$", re.DOTALL | re.IGNORECASE
+)
+_PARTIAL_ACTION_TAG_RE = re.compile(
+    f"<(?:{_ACTION_TAG_ALTERNATION})?[^>]*$", re.IGNORECASE
+)
+_ORPHAN_ACTION_CLOSE_RE = re.compile(
+    f"^\\s*</({_ACTION_TAG_ALTERNATION})>", re.IGNORECASE
+)
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+_STREAM_TAG_RE = re.compile(f"<(/?)({_ACTION_TAG_ALTERNATION})>", re.IGNORECASE)
+_ACTION_TAG_PREFIXES = frozenset(
+    name[:i] for name in _ACTION_TAG_NAMES for i in range(len(name) + 1)
+)
+_MAX_ACTION_TAG_LEN = max(len(name) for name in _ACTION_TAG_NAMES) + 3
+
+
+def _is_partial_action_tag(fragment: str) -> bool:
+    """Return True if ``fragment`` (starting at ``<``) could still grow into an action tag."""
+    if len(fragment) > _MAX_ACTION_TAG_LEN:
+        return False
+    name = fragment[1:]
+    if name.startswith("/"):
+        name = name[1:]
+    return name.lower() in _ACTION_TAG_PREFIXES
+
+
+def contains_action_tags(content: str) -> bool:
+    """Return True when ``content`` holds at least one complete action tag pair."""
+    if not content:
+        return False
+    return _ACTION_BLOCK_ANYCASE_RE.search(content) is not None
+
+
 def parse_action(content: str) -> List[CodeActAction]:
     """Parse actions from content using regex pattern matching.
 
@@ -967,12 +1012,7 @@ def parse_action(content: str) -> List[CodeActAction]:
         return []
 
     # Check for common action tag patterns - using the enum values directly to ensure only valid actions are detected
-    action_tag_pattern = "|".join([action_type.value for action_type in ActionType])
-    action_tag_regex = (
-        f"<({action_tag_pattern})>.*?</\\1>"  # Match complete tag pairs only
-    )
-
-    if not re.search(action_tag_regex, content, re.DOTALL | re.IGNORECASE):
+    if not contains_action_tags(content):
         # No properly formed action tags found
         logger.debug("No properly formed action tags found in content")
         return []
@@ -980,8 +1020,7 @@ def parse_action(content: str) -> List[CodeActAction]:
     # Extract only the AI's response part
     try:
         # Use more specific pattern matching to only extract valid action types
-        pattern = f"<({action_tag_pattern})>(.*?)</\\1>"
-        matches = re.finditer(pattern, content, re.DOTALL)
+        matches = _ACTION_BLOCK_RE.finditer(content)
 
         actions = []  # Initialize the actions list
 
@@ -1031,17 +1070,12 @@ def strip_action_tags(content: str) -> str:
     if not content:
         return content
 
-    # Build pattern for all valid action types
-    action_tag_pattern = "|".join([action_type.value for action_type in ActionType])
-    # Match complete tag pairs: <action_type>...</action_type>
-    pattern = f"<({action_tag_pattern})>.*?</\\1>"
-
-    # Remove all action tags
-    cleaned = re.sub(pattern, "", content, flags=re.DOTALL | re.IGNORECASE)
+    # Remove all complete <action_type>...</action_type> pairs
+    cleaned = _ACTION_BLOCK_ANYCASE_RE.sub("", content)
 
     # Clean up excessive whitespace left behind
     # Replace multiple newlines with at most two
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    cleaned = _EXCESS_NEWLINES_RE.sub("\n\n", cleaned)
     # Strip leading/trailing whitespace
     cleaned = cleaned.strip()
 
@@ -1064,28 +1098,163 @@ def strip_incomplete_action_tags(content: str) -> str:
     if not content:
         return content
 
-    # Build pattern for valid action types
-    action_tag_pattern = "|".join([action_type.value for action_type in ActionType])
-
     # Match incomplete opening tags at the end: <action_type> without </action_type>
     # This pattern finds <tag> or <tag>content... at the end without closing tag
-    incomplete_pattern = f"<({action_tag_pattern})>(?:(?!</\\1>).)*$"
-
-    # Remove trailing incomplete tags
-    cleaned = re.sub(incomplete_pattern, "", content, flags=re.DOTALL | re.IGNORECASE)
+    cleaned = _INCOMPLETE_ACTION_RE.sub("", content)
 
     # Also remove partially-started opening tags at the end (e.g., <finish_ or <execute)
     # This handles cases where streaming was interrupted mid-tag
-    partial_tag_pattern = f"<(?:{action_tag_pattern})?[^>]*$"
-    cleaned = re.sub(partial_tag_pattern, "", cleaned, flags=re.IGNORECASE)
+    cleaned = _PARTIAL_ACTION_TAG_RE.sub("", cleaned)
 
     # Also remove orphaned closing tags at the start (from previous incomplete)
-    orphan_close_pattern = f"^\\s*</({action_tag_pattern})>"
-    cleaned = re.sub(orphan_close_pattern, "", cleaned, flags=re.IGNORECASE)
+    cleaned = _ORPHAN_ACTION_CLOSE_RE.sub("", cleaned)
 
     return cleaned.strip()
 
 
+class ActionStreamParser:
+    """Incremental ActionXML tokenizer for streamed model output.
+
+    Feed chunks as they arrive; each call returns the text that is now safe to
+    display plus any actions whose closing tag landed in that chunk. Every
+    character is scanned a bounded number of times, so total work is linear in
+    the response length regardless of how many chunks it arrives in.
+
+    Tag names match case-insensitively (like ``contains_action_tags``). Text
+    inside an action, orphan action closing tags and a trailing fragment that
+    could still become an action tag are withheld from the display text.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        # Chunks of an action body not yet joined into ``_buffer``, and the
+        # end of the body a closing tag split across chunks could start in
+        self._pending: List[str] = []
+        self._tail = ""
+        self._scan_from = 0
+        self._active_tag: Optional[str] = None
+        self._close_re: Optional["re.Pattern[str]"] = None
+        self.actions: List[CodeActAction] = []
+
+    @property
+    def in_action(self) -> bool:
+        """True while an opening action tag is waiting for its closing tag."""
+        return self._active_tag is not None
+
+    def feed(self, chunk: str) -> Tuple[str, List[CodeActAction]]:
+        """Consume ``chunk``; return (display text, newly completed actions)."""
+        if chunk:
+            self._pending.append(chunk)
+            if self._active_tag is not None:
+                # Only the closing tag matters inside an action; look for it in
+                # the new text and hold the body until it may have arrived.
+                window = self._tail + chunk
+                self._tail = window[-(len(self._active_tag) + 2) :]
+                if self._close_re.search(window) is None:
+                    return "", []
+        self._join_pending()
+        text, actions = self._drain(final=False)
+        self.actions.extend(actions)
+        return text, actions
+
+    def _join_pending(self) -> None:
+        if self._pending:
+            self._buffer += "".join(self._pending)
+            self._pending.clear()
+
+    def finish(self) -> Tuple[str, List[CodeActAction]]:
+        """Flush the stream end.
+
+        An unclosed action and everything after it is dropped from the display
+        text (as ``strip_incomplete_action_tags`` does), but complete actions
+        nested inside it are still returned, matching ``parse_action``.
+        """
+        self._join_pending()
+        text, actions = self._drain(final=True)
+        if self._active_tag is not None:
+            body = self._buffer
+            self._reset_outside(body)
+            _, nested = self._drain(final=True)
+            actions.extend(nested)
+        self._buffer = ""
+        self._scan_from = 0
+        self.actions.extend(actions)
+        return text, actions
+
+    def _reset_outside(self, remaining: str) -> None:
+        self._buffer = remaining
+        self._scan_from = 0
+        self._active_tag = None
+        self._close_re = None
+
+    def _drain(self, final: bool) -> Tuple[str, List[CodeActAction]]:
+        text_parts: List[str] = []
+        actions: List[CodeActAction] = []
+        buffer = self._buffer
+        pos = 0
+
+        while True:
+            if self._active_tag is not None:
+                match = self._close_re.search(buffer, self._scan_from)
+                if match is None:
+                    # Keep the unterminated body; only rescan a possible partial close tag.
+                    self._scan_from = max(
+                        pos, len(buffer) - len(self._active_tag) - 2
+                    )
+                    break
+                raw_tag = self._active_tag
+                params = unescape(buffer[pos : match.start()].strip())
+                try:
+                    actions.append(
+                        CodeActAction(
+                            resolve_action_type(raw_tag),
+                            params,
+                            raw_action_type=raw_tag,
+                        )
+                    )
+                except KeyError:
+                    logger.warning(f"Unrecognized action type: {raw_tag}")
+                pos = match.end()
+                self._active_tag = None
+                self._close_re = None
+                continue
+
+            lt = buffer.find("<", pos)
+            if lt == -1:
+                text_parts.append(buffer[pos:])
+                pos = len(buffer)
+                break
+            text_parts.append(buffer[pos:lt])
+            pos = lt
+
+            tag = _STREAM_TAG_RE.match(buffer, lt)
+            if tag is not None:
+                name = tag.group(2).lower()
+                pos = tag.end()
+                if not tag.group(1):
+                    self._active_tag = name
+                    self._close_re = re.compile(
+                        f"</{re.escape(name)}>", re.IGNORECASE
+                    )
+                    self._scan_from = pos
+                continue
+
+            if _is_partial_action_tag(buffer[lt : lt + _MAX_ACTION_TAG_LEN + 1]):
+                # Could still become an action tag once more bytes arrive; at
+                # stream end it is dropped like strip_incomplete_action_tags does.
+                if final:
+                    pos = len(buffer)
+                break
+            text_parts.append("<")
+            pos = lt + 1
+
+        self._buffer = buffer[pos:]
+        if self._active_tag is not None:
+            self._scan_from -= pos
+            self._tail = self._buffer[-(len(self._active_tag) + 2) :]
+        return "".join(text_parts), actions
+
+
 class ActionExecutor:
     def __init__(
         self,
@@ -1824,19 +1993,40 @@ class ActionExecutor:
             handler = action_map[action.action_type]
             logger.debug(f"Handler for action {action.action_type.value}: {handler}")
 
-            if asyncio.iscoroutinefunction(handler):
-                logger.debug(f"Executing async handler for {action.action_type.value}")
-                result = await handler(handler_params)
-            else:
-                logger.debug(
-                    f"Executing sync handler for {action.action_type.value} in thread pool"
+            # Shell output produced by the action is streamed to the UI
+            output_stream = (
+                OutputEventStream(
+                    lambda stream, text: self._ui_event_cb(
+                        "action_output",
+                        {
+                            "id": action_id,
+                            "action": action.action_type.value,
+                            "stream": stream,
+                            "chunk": text,
+                        },
+                    )
                 )
-                # Offload synchronous tools to thread pool to avoid blocking the event loop.
-                # asyncio.to_thread preserves contextvars for per-request execution context.
-                result = await asyncio.to_thread(handler, handler_params)
-
-                if asyncio.iscoroutine(result):
-                    result = await result
+                if self._ui_event_cb
+                else None
+            )
+            try:
+                with stream_output_to(output_stream.write if output_stream else None):
+                    if asyncio.iscoroutinefunction(handler):
+                        logger.debug(f"Executing async handler for {action.action_type.value}")
+                        result = await handler(handler_params)
+                    else:
+                        logger.debug(
+                            f"Executing sync handler for {action.action_type.value} in thread pool"
+                        )
+                        # Offload synchronous tools to thread pool to avoid blocking the event loop.
+                        # asyncio.to_thread preserves contextvars for per-request execution context.
+                        result = await asyncio.to_thread(handler, handler_params)
+
+                        if asyncio.iscoroutine(result):
+                            result = await result
+            finally:
+                if output_stream:
+                    await output_stream.close()
 
             logger.info(f"Action {action.action_type.value} executed successfully")
             # --------------------------------------------------
@@ -0,0 +1,318 @@
+"""Bounded, streaming execution of shell commands.
+
+``run_shell`` reads stdout/stderr incrementally instead of buffering them
+with ``capture_output``. Each stream keeps at most ``max_output_bytes``: the
+first half and the most recent half are retained and the middle is dropped,
+so ``cat`` of a huge log cannot exhaust memory while the start and the end
+(usually the error) of the output survive.
+
+The command runs in its own process group. A wall-clock ``timeout`` or an
+``idle_timeout`` (no output for that long) kills the whole group, including
+anything the command spawned. ``on_output(stream, text)`` is called for every
+chunk as it arrives so callers can show progress. Callers that cannot pass
+``on_output`` down to the ``run_shell`` call (a tool several layers below
+them) can install one for the current context with ``stream_output_to``;
+it also reaches work started with ``asyncio.to_thread``. ``OutputEventStream``
+turns those calls, made on a worker thread, into ordered async events.
+
+Environment overrides:
+    PENGUIN_SHELL_TIMEOUT           wall-clock seconds (default 600)
+    PENGUIN_SHELL_IDLE_TIMEOUT      seconds without output (default 300)
+    PENGUIN_SHELL_MAX_OUTPUT_BYTES  bytes kept per stream (default 256 KiB)
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from codecs import getincrementaldecoder
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+OutputCallback = Callable[[str, str], None]
+
+# ``on_output`` used by run_shell calls that do not pass one
+_context_output: contextvars.ContextVar[Optional[OutputCallback]] = contextvars.ContextVar(
+    "penguin_shell_output", default=None
+)
+
+_READ_SIZE = 65536
+_KILL_GRACE_SECONDS = 2.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def default_limits() -> Dict[str, float]:
+    """Timeout and output-cap defaults, honouring ``PENGUIN_SHELL_*``."""
+    return {
+        "timeout": _env_float("PENGUIN_SHELL_TIMEOUT", 600),
+        "idle_timeout": _env_float("PENGUIN_SHELL_IDLE_TIMEOUT", 300),
+        "max_output_bytes": int(_env_float("PENGUIN_SHELL_MAX_OUTPUT_BYTES", 256 * 1024)),
+    }
+
+
+class HeadTailBuffer:
+    """Keeps the first and last ``max_bytes // 2`` bytes written to it."""
+
+    def __init__(self, max_bytes: int):
+        self.head_limit = max(max_bytes // 2, 0)
+        self.tail_limit = max(max_bytes - self.head_limit, 0)
+        self._head = bytearray()
+        self._tail: Deque[bytes] = deque()
+        self._tail_size = 0
+        self.total = 0
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.head_limit - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if not data or self.tail_limit == 0:
+            return
+        self._tail.append(data)
+        self._tail_size += len(data)
+        while self._tail_size - len(self._tail[0]) >= self.tail_limit:
+            self._tail_size -= len(self._tail.popleft())
+
+    @property
+    def dropped(self) -> int:
+        kept = len(self._head) + min(self._tail_size, self.tail_limit)
+        return self.total - kept
+
+    def text(self) -> str:
+        tail = b"".join(self._tail)[-self.tail_limit :] if self.tail_limit else b""
+        head = self._head.decode("utf-8", errors="replace")
+        tail_text = tail.decode("utf-8", errors="replace")
+        if self.dropped:
+            return f"{head}\n... [{self.dropped} bytes truncated] ...\n{tail_text}"
+        return head + tail_text
+
+
+@dataclass
+class ShellResult:
+    stdout: str
+    stderr: str
+    returncode: Optional[int]
+    timed_out: Optional[str] = None  # "timeout" or "idle_timeout"
+    timeout_seconds: float = 0.0  # The limit that fired, when timed_out is set
+    truncated_bytes: int = 0
+    duration: float = 0.0
+
+    def limit_note(self) -> str:
+        """One-line note about a timeout or truncation, empty when neither happened."""
+        notes = []
+        if self.timed_out == "timeout":
+            notes.append(f"Command killed after {self.timeout_seconds:g}s wall-clock timeout")
+        elif self.timed_out == "idle_timeout":
+            notes.append(f"Command killed after {self.timeout_seconds:g}s without output")
+        if self.truncated_bytes:
+            notes.append(f"{self.truncated_bytes} bytes of output truncated")
+        return "; ".join(notes)
+
+
+class OutputEventStream:
+    """Passes output chunks from any thread to an async ``emit(stream, text)``.
+
+    Chunks are emitted in order by one task on the event loop that created
+    the stream; ``close`` waits until everything written so far is emitted.
+    """
+
+    def __init__(self, emit: Callable[[str, str], Awaitable[None]]):
+        self._emit = emit
+        self._loop = asyncio.get_running_loop()
+        self._chunks: asyncio.Queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run())
+
+    def write(self, stream: str, text: str) -> None:
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._chunks.put_nowait, (stream, text))
+
+    async def close(self) -> None:
+        self._chunks.put_nowait(None)
+        await self._task
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._chunks.get()
+            if item is None:
+                return
+            try:
+                await self._emit(*item)
+            except Exception as e:
+                logger.debug(f"Shell output event failed: {e}")
+
+
+@contextmanager
+def stream_output_to(callback: Optional[OutputCallback]) -> Iterator[None]:
+    """Send output of ``run_shell`` calls made in this context to ``callback``."""
+    token = _context_output.set(callback)
+    try:
+        yield
+    finally:
+        _context_output.reset(token)
+
+
+def _pump(pipe, name: str, chunks: "queue.Queue") -> None:
+    try:
+        while True:
+            data = os.read(pipe.fileno(), _READ_SIZE)
+            if not data:
+                break
+            chunks.put((name, data))
+    except (OSError, ValueError):
+        pass
+    finally:
+        chunks.put((name, None))
+
+
+def _kill_group(process: subprocess.Popen) -> None:
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+
+def run_shell(
+    command: Union[str, Sequence[str]],
+    *,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    shell: bool = False,
+    timeout: Optional[float] = None,
+    idle_timeout: Optional[float] = None,
+    max_output_bytes: Optional[int] = None,
+    on_output: Optional[OutputCallback] = None,
+) -> ShellResult:
+    """Run ``command`` with bounded output and timeouts; see the module docstring.
+
+    ``None`` limits fall back to ``default_limits()``; ``0`` disables a timeout.
+    Without ``on_output`` the callback installed by ``stream_output_to`` is used.
+    """
+    if on_output is None:
+        on_output = _context_output.get()
+    defaults = default_limits()
+    timeout = defaults["timeout"] if timeout is None else timeout
+    idle_timeout = defaults["idle_timeout"] if idle_timeout is None else idle_timeout
+    max_output_bytes = int(
+        defaults["max_output_bytes"] if max_output_bytes is None else max_output_bytes
+    )
+
+    started = time.monotonic()
+    process = subprocess.Popen(
+        command,
+        shell=shell,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=(os.name == "posix"),
+    )
+
+    chunks: "queue.Queue" = queue.Queue()
+    buffers = {"stdout": HeadTailBuffer(max_output_bytes), "stderr": HeadTailBuffer(max_output_bytes)}
+    decoders = {name: getincrementaldecoder("utf-8")("replace") for name in buffers}
+    readers: List[threading.Thread] = [
+        threading.Thread(target=_pump, args=(getattr(process, name), name, chunks), daemon=True)
+        for name in buffers
+    ]
+    for reader in readers:
+        reader.start()
+
+    open_streams = len(readers)
+    last_output = started
+    timed_out: Optional[str] = None
+    try:
+        while open_streams:
+            now = time.monotonic()
+            waits = [0.5]
+            if timeout:
+                waits.append(started + timeout - now)
+            if idle_timeout:
+                waits.append(last_output + idle_timeout - now)
+            try:
+                name, data = chunks.get(timeout=max(min(waits), 0))
+            except queue.Empty:
+                now = time.monotonic()
+                if timeout and now - started >= timeout:
+                    timed_out = "timeout"
+                elif idle_timeout and now - last_output >= idle_timeout:
+                    timed_out = "idle_timeout"
+                if timed_out:
+                    _kill_group(process)
+                    break
+                if process.poll() is not None and now - last_output >= _KILL_GRACE_SECONDS:
+                    # The command exited but a background child still holds the
+                    # pipes open; stop reading rather than wait for it
+                    break
+                continue
+            if data is None:
+                open_streams -= 1
+                continue
+            last_output = time.monotonic()
+            buffers[name].write(data)
+            if on_output is not None:
+                text = decoders[name].decode(data)
+                if text:
+                    try:
+                        on_output(name, text)
+                    except Exception as e:
+                        logger.debug(f"Shell output callback failed: {e}")
+    finally:
+        if timed_out is None and process.poll() is None and open_streams:
+            # Interrupted by an exception: don't leave the group running
+            _kill_group(process)
+
+    try:
+        returncode = process.wait(timeout=_KILL_GRACE_SECONDS if timed_out else None)
+    except subprocess.TimeoutExpired:
+        logger.warning(f"Shell command {process.pid} did not exit after SIGKILL")
+        returncode = None
+    if timed_out:
+        # Collect whatever the readers still had in flight
+        for reader in readers:
+            reader.join(timeout=_KILL_GRACE_SECONDS)
+        while True:
+            try:
+                name, data = chunks.get_nowait()
+            except queue.Empty:
+                break
+            if data:
+                buffers[name].write(data)
+    for name, reader in zip(buffers, readers):
+        pipe = getattr(process, name)
+        # A reader still blocked on a background child's pipe owns it until EOF
+        if pipe is not None and not reader.is_alive():
+            pipe.close()
+
+    return ShellResult(
+        stdout=buffers["stdout"].text(),
+        stderr=buffers["stderr"].text(),
+        returncode=returncode,
+        timed_out=timed_out,
+        timeout_seconds=(timeout if timed_out == "timeout" else idle_timeout) if timed_out else 0.0,
+        truncated_bytes=buffers["stdout"].dropped + buffers["stderr"].dropped,
+        duration=time.monotonic() - started,
+    )
+
@@ -23,6 +23,7 @@ from penguin.system_prompt import SYSTEM_PROMPT
 from penguin.tools import ToolManager
 from penguin.utils.log_error import log_error
 from penguin.web.services.system_status import start_vcs_watcher, stop_vcs_watcher
+from penguin.web.health import get_health_monitor
 from penguin.web.services.provider_credentials import (
     apply_credentials_to_environment,
     apply_credentials_to_runtime,
@@ -173,8 +174,13 @@ def create_app() -> "FastAPI":
         from fastapi.staticfiles import StaticFiles
         from fastapi.middleware.cors import CORSMiddleware
         from .routes import router, get_capabilities
-        from .integrations.github_webhook import router as github_webhook_router
+        from .integrations.github_webhook import (
+            router as github_webhook_router,
+            start_github_webhook_jobs,
+        )
+        from .integrations.github_jobs import stop_webhook_job_queue
         from .middleware.auth import AuthenticationMiddleware, AuthConfig
+        from .middleware.metrics import MetricsMiddleware
         from .sse_events import router as sse_router, set_core_instance
     except ImportError:
         raise ImportError(
@@ -194,9 +200,19 @@ def create_app() -> "FastAPI":
             start_vcs_watcher(core)
         except Exception:
             logger.debug("Unable to start VCS watcher", exc_info=True)
+        get_health_monitor().start_loop_lag_monitor()
+        try:
+            start_github_webhook_jobs(core)
+        except Exception:
+            logger.warning("Unable to resume GitHub webhook jobs", exc_info=True)
         yield
         # Shutdown: close connection pools
         logger.info("Penguin web application shutting down...")
+        await get_health_monitor().stop_loop_lag_monitor()
+        try:
+            await stop_webhook_job_queue()
+        except Exception:
+            logger.debug("Unable to stop GitHub webhook jobs", exc_info=True)
         try:
             await stop_vcs_watcher()
         except Exception:
@@ -211,6 +227,18 @@ def create_app() -> "FastAPI":
                 await shutdown_agents()
         except Exception:
             logger.warning("Unable to stop background agents", exc_info=True)
+        try:
+            from penguin.orchestration import shutdown_backend
+
+            await shutdown_backend()
+        except Exception:
+            logger.warning("Unable to flush workflow state", exc_info=True)
+        try:
+            from penguin.agent.sandbox_pool import close_sandbox_pools
+
+            await close_sandbox_pools()
+        except Exception:
+            logger.warning("Unable to stop sandbox workers", exc_info=True)
         try:
             pool = ConnectionPoolManager.get_instance()
             await pool.close_all()
@@ -267,6 +295,9 @@ def create_app() -> "FastAPI":
     auth_config = AuthConfig()
     app.add_middleware(AuthenticationMiddleware, config=auth_config)
 
+    # Outermost: per-route latency and saturation metrics, including auth rejections
+    app.add_middleware(MetricsMiddleware)
+
     # Initialize core and attach to router
     core = get_or_create_core()
     _rehydrate_provider_credentials(core)
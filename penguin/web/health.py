@@ -1,19 +1,93 @@
 """Health monitoring and metrics collection for Penguin API.
 
 Provides comprehensive health checks and performance metrics for Link integration.
+
+Latencies are kept in fixed-bucket histograms (constant memory, mergeable)
+overall and per ``(method, route template, status class, kind)``, where kind
+is ``unary``, ``stream`` or ``websocket``. Saturation is tracked through an
+in-flight request gauge, open SSE/WebSocket connection gauges and periodic
+event-loop lag samples. ``render_prometheus`` exposes the same data in the
+Prometheus text format.
 """
 
 import asyncio
+import bisect
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import psutil
 
 logger = logging.getLogger(__name__)
 
+# Histogram upper bounds in milliseconds: 1-1.5-2-3-5-7.5 steps from 0.1ms to 750s
+LATENCY_BUCKETS_MS: Tuple[float, ...] = tuple(
+    round(m * 10.0**e, 4) for e in range(-1, 6) for m in (1, 1.5, 2, 3, 5, 7.5)
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are interpolated within a bucket."""
+
+    __slots__ = ("counts", "count", "sum_ms", "min_ms", "max_ms")
+
+    def __init__(self):
+        # One extra bucket for values above the last bound (+Inf)
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.min_ms = min(self.min_ms, value_ms)
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = LATENCY_BUCKETS_MS[i - 1] if i > 0 else 0.0
+                upper = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+                estimate = lower + (upper - lower) * (rank - seen) / n
+                return min(max(estimate, self.min_ms), self.max_ms)
+            seen += n
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_ms / self.count if self.count else 0.0
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.mean_ms, 2),
+            "p50_ms": round(self.quantile(0.5), 2),
+            "p95_ms": round(self.quantile(0.95), 2),
+            "p99_ms": round(self.quantile(0.99), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
 
 @dataclass
 class PerformanceMetrics:
@@ -24,7 +98,7 @@ class PerformanceMetrics:
     total_latency_ms: float = 0.0
     min_latency_ms: float = float('inf')
     max_latency_ms: float = 0.0
-    latencies_ms: List[float] = field(default_factory=list)
+    latency_histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
 
     # Success/failure tracking
     success_count: int = 0
@@ -44,10 +118,7 @@ class PerformanceMetrics:
         self.min_latency_ms = min(self.min_latency_ms, latency_ms)
         self.max_latency_ms = max(self.max_latency_ms, latency_ms)
 
-        # Keep last 1000 latencies for percentile calculation
-        self.latencies_ms.append(latency_ms)
-        if len(self.latencies_ms) > 1000:
-            self.latencies_ms.pop(0)
+        self.latency_histogram.record(latency_ms)
 
         if success:
             self.success_count += 1
@@ -69,20 +140,12 @@ class PerformanceMetrics:
     @property
     def p95_latency_ms(self) -> float:
         """95th percentile latency."""
-        if not self.latencies_ms:
-            return 0.0
-        sorted_latencies = sorted(self.latencies_ms)
-        index = int(len(sorted_latencies) * 0.95)
-        return sorted_latencies[min(index, len(sorted_latencies) - 1)]
+        return self.latency_histogram.quantile(0.95)
 
     @property
     def p99_latency_ms(self) -> float:
         """99th percentile latency."""
-        if not self.latencies_ms:
-            return 0.0
-        sorted_latencies = sorted(self.latencies_ms)
-        index = int(len(sorted_latencies) * 0.99)
-        return sorted_latencies[min(index, len(sorted_latencies) - 1)]
+        return self.latency_histogram.quantile(0.99)
 
     @property
     def success_rate(self) -> float:
@@ -105,7 +168,7 @@ class PerformanceMetrics:
         self.total_latency_ms = 0.0
         self.min_latency_ms = float('inf')
         self.max_latency_ms = 0.0
-        self.latencies_ms.clear()
+        self.latency_histogram.reset()
         self.success_count = 0
         self.error_count = 0
         self.total_task_duration_sec = 0.0
@@ -129,15 +192,74 @@ class PerformanceMetrics:
         }
 
 
+def status_class(status_code: int) -> str:
+    """``200`` -> ``"2xx"``."""
+    return f"{status_code // 100}xx" if 100 <= status_code < 600 else "5xx"
+
+
+RouteKey = Tuple[str, str, str, str]  # (method, route template, status class, kind)
+
+
+class RouteMetrics:
+    """Latency histograms per route template, status class and request kind.
+
+    Routes are templates (``/api/v1/sessions/{session_id}``), so the number of
+    series is bounded by the API surface rather than by traffic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[RouteKey, LatencyHistogram] = {}
+
+    def record(self, method: str, route: str, status_code: int, kind: str, latency_ms: float) -> None:
+        key = (method, route, status_class(status_code), kind)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.record(latency_ms)
+
+    def snapshot(self) -> Dict[RouteKey, LatencyHistogram]:
+        """Copies of the current histograms, safe to read without the lock."""
+        with self._lock:
+            copies = {}
+            for key, histogram in self._histograms.items():
+                copy = LatencyHistogram()
+                copy.merge(histogram)
+                copies[key] = copy
+            return copies
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [
+            {"method": method, "route": route, "status": status, "kind": kind, **h.to_dict()}
+            for (method, route, status, kind), h in sorted(self.snapshot().items())
+        ]
+
+
 class HealthMonitor:
     """Health monitoring system for Penguin."""
 
+    # Event-loop lag above this marks the service as degraded
+    LOOP_LAG_DEGRADED_MS = 1000.0
+
     def __init__(self):
         self.metrics = PerformanceMetrics()
+        self.routes = RouteMetrics()
         self.start_time = datetime.utcnow()
         self.active_tasks = 0
         self.max_concurrent_tasks = int(os.getenv("PENGUIN_MAX_CONCURRENT_TASKS", "10"))
 
+        # Saturation gauges
+        self.in_flight_requests = 0
+        self.open_connections: Dict[str, int] = {"sse": 0, "websocket": 0}
+        self.loop_lag = LatencyHistogram()
+        self.last_loop_lag_ms = 0.0
+        self._loop_lag_task: Optional[asyncio.Task] = None
+
         # Process info
         try:
             self.process = psutil.Process()
@@ -189,6 +311,48 @@ class HealthMonitor:
             "utilization": round(utilization, 2)
         }
 
+    def get_saturation(self) -> Dict[str, Any]:
+        """In-flight work, open streaming connections and event-loop lag."""
+        return {
+            "in_flight_requests": self.in_flight_requests,
+            "sse_connections": self.open_connections.get("sse", 0),
+            "websocket_connections": self.open_connections.get("websocket", 0),
+            "event_loop_lag_ms": {
+                "last": round(self.last_loop_lag_ms, 2),
+                **self.loop_lag.to_dict(),
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Event-loop lag sampling
+    # ------------------------------------------------------------------
+
+    def start_loop_lag_monitor(self, interval: float = 0.5) -> None:
+        """Sample event-loop lag every ``interval`` seconds on the running loop."""
+        if self._loop_lag_task is not None and not self._loop_lag_task.done():
+            return
+        self._loop_lag_task = asyncio.get_running_loop().create_task(
+            self._sample_loop_lag(interval)
+        )
+
+    async def stop_loop_lag_monitor(self) -> None:
+        task, self._loop_lag_task = self._loop_lag_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _sample_loop_lag(self, interval: float) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            # How late the loop woke us up: time spent blocked by other callbacks
+            lag_ms = max((time.perf_counter() - started - interval) * 1000, 0.0)
+            self.last_loop_lag_ms = lag_ms
+            self.loop_lag.record(lag_ms)
+
     def get_uptime(self) -> Dict[str, Any]:
         """Get uptime information."""
         uptime = datetime.utcnow() - self.start_time
@@ -198,6 +362,21 @@ class HealthMonitor:
             "uptime_human": str(uptime)
         }
 
+    def get_http_pool_stats(self) -> Dict[str, Any]:
+        """Get shared outbound HTTP client pool statistics."""
+        try:
+            from penguin.llm.api_client import ConnectionPoolManager
+
+            pools = ConnectionPoolManager.get_instance().get_stats()
+        except Exception as e:
+            logger.debug(f"Error collecting HTTP pool stats: {e}")
+            return {"pool_count": 0, "pools": {}}
+        return {
+            "pool_count": len(pools),
+            "total_requests": sum(p.get("requests", 0) for p in pools.values()),
+            "pools": pools,
+        }
+
     async def get_comprehensive_health(self, core=None) -> Dict[str, Any]:
         """Get comprehensive health status.
 
@@ -217,6 +396,10 @@ class HealthMonitor:
         if resource_usage["cpu_percent"] > 90:
             status = "degraded"
 
+        saturation = self.get_saturation()
+        if self.last_loop_lag_ms > self.LOOP_LAG_DEGRADED_MS:
+            status = "degraded"
+
         # Check capacity
         capacity = self.get_agent_capacity()
         if capacity["available"] == 0:
@@ -229,7 +412,10 @@ class HealthMonitor:
             "uptime": self.get_uptime(),
             "resource_usage": resource_usage,
             "agent_capacity": capacity,
-            "performance_metrics": self.metrics.to_dict()
+            "performance_metrics": self.metrics.to_dict(),
+            "routes": self.routes.to_list(),
+            "saturation": saturation,
+            "http_pools": self.get_http_pool_stats(),
         }
 
         # Add core-specific health if available
@@ -263,6 +449,26 @@ class HealthMonitor:
         """Record a request."""
         self.metrics.record_request(latency_ms, success)
 
+    def record_http_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        latency_ms: float,
+        kind: str = "unary",
+    ) -> None:
+        """Record a served HTTP request or WebSocket session under its route."""
+        self.routes.record(method, route, status_code, kind, latency_ms)
+        # Stream and WebSocket durations are connection lifetimes, not latencies
+        if kind == "unary":
+            self.metrics.record_request(latency_ms, success=status_code < 500)
+
+    def connection_opened(self, kind: str) -> None:
+        self.open_connections[kind] = self.open_connections.get(kind, 0) + 1
+
+    def connection_closed(self, kind: str) -> None:
+        self.open_connections[kind] = max(0, self.open_connections.get(kind, 0) - 1)
+
     def record_task(self, duration_sec: float):
         """Record a task completion."""
         self.metrics.record_task(duration_sec)
@@ -278,6 +484,54 @@ class HealthMonitor:
     def reset_metrics(self):
         """Reset performance metrics."""
         self.metrics.reset()
+        self.routes.reset()
+        self.loop_lag.reset()
+
+    def render_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, labels: str, h: LatencyHistogram) -> None:
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS_MS, h.counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{{labels}le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {h.count}')
+            series = f"{{{labels.rstrip(',')}}}" if labels else ""
+            lines.append(f"{name}_sum{series} {h.sum_ms / 1000:.6f}")
+            lines.append(f"{name}_count{series} {h.count}")
+
+        name = "penguin_http_request_duration_seconds"
+        metric(name, "histogram", "HTTP request and WebSocket session duration.")
+        for (method, route, status, kind), h in sorted(self.routes.snapshot().items()):
+            labels = (
+                f'method="{_escape_label(method)}",route="{_escape_label(route)}",'
+                f'status="{status}",kind="{kind}",'
+            )
+            histogram(name, labels, h)
+
+        metric("penguin_http_requests_in_flight", "gauge", "HTTP requests being served.")
+        lines.append(f"penguin_http_requests_in_flight {self.in_flight_requests}")
+        metric("penguin_open_connections", "gauge", "Open streaming connections.")
+        for kind, count in sorted(self.open_connections.items()):
+            lines.append(f'penguin_open_connections{{kind="{kind}"}} {count}')
+        metric("penguin_event_loop_lag_seconds", "histogram", "Event-loop scheduling lag.")
+        histogram("penguin_event_loop_lag_seconds", "", self.loop_lag)
+        metric("penguin_active_tasks", "gauge", "Agent tasks currently running.")
+        lines.append(f"penguin_active_tasks {self.active_tasks}")
+        metric("penguin_uptime_seconds", "gauge", "Seconds since the server started.")
+        lines.append(
+            f"penguin_uptime_seconds {int((datetime.utcnow() - self.start_time).total_seconds())}"
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
 
 
 # Global health monitor instance
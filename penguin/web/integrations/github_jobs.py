@@ -0,0 +1,506 @@
+"""Durable, rate-limited job queue for GitHub webhook processing.
+
+Webhook deliveries are recorded in a local SQLite database before the
+request is acknowledged:
+
+- Every ``X-GitHub-Delivery`` id is stored once, so replays are rejected
+  across restarts (rows are pruned after ``retention_days``).
+- Events with a handler become jobs. A worker task claims queued jobs while
+  staying under a per-repository and a global concurrency cap, so a burst of
+  PR events cannot start an unbounded number of agent runs.
+- A handler that raises is retried with exponential backoff. After
+  ``max_attempts`` the job is dead-lettered and kept for inspection or a
+  manual retry; the event's dead-letter handler (if any) is called once
+  with the last error, e.g. to tell the user the request failed.
+- Jobs that were running when the process stopped are re-queued on start-up;
+  jobs cancelled by a clean shutdown get their attempt back.
+- Handlers can call ``current_job_attempt()`` to skip side effects, such as
+  an acknowledgement comment, that already happened on an earlier attempt.
+
+Environment overrides:
+    PENGUIN_GITHUB_WEBHOOK_QUEUE_PATH      database path
+    PENGUIN_GITHUB_JOBS_PER_REPO           concurrent jobs per repository (default 1)
+    PENGUIN_GITHUB_JOBS_MAX_CONCURRENT     concurrent jobs overall (default 4)
+    PENGUIN_GITHUB_JOBS_MAX_ATTEMPTS       attempts before dead-lettering (default 5)
+    PENGUIN_GITHUB_JOBS_BACKOFF_SECONDS    first retry delay, doubled per attempt (default 30)
+    PENGUIN_GITHUB_WEBHOOK_RETENTION_DAYS  how long deliveries are remembered (default 7)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from penguin.config import WORKSPACE_PATH
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any], Any], Awaitable[None]]
+DeadLetterHandler = Callable[[Dict[str, Any], Any, BaseException], Awaitable[None]]
+
+JOB_STATUSES = ("queued", "running", "succeeded", "dead", "ignored")
+
+# Longest single retry delay
+_BACKOFF_MAX_SECONDS = 30 * 60
+# Upper bound on how long the worker sleeps when nothing is due
+_IDLE_POLL_SECONDS = 30.0
+_PRUNE_INTERVAL_SECONDS = 60 * 60
+
+# Attempt number of the job the current task is running (0 outside the queue)
+_current_attempt: ContextVar[int] = ContextVar("github_job_attempt", default=0)
+
+
+def current_job_attempt() -> int:
+    """Attempt number (1-based) of the webhook job being handled, or 0."""
+    return _current_attempt.get()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    delivery_id TEXT NOT NULL UNIQUE,
+    event TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_run_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_webhook_jobs_ready ON webhook_jobs (status, next_run_at);
+CREATE INDEX IF NOT EXISTS idx_webhook_jobs_repo ON webhook_jobs (repo, status);
+"""
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def default_queue_path() -> Path:
+    """Database path from ``PENGUIN_GITHUB_WEBHOOK_QUEUE_PATH`` or under the workspace."""
+    override = os.getenv("PENGUIN_GITHUB_WEBHOOK_QUEUE_PATH")
+    if override:
+        return Path(override).expanduser()
+    return Path(WORKSPACE_PATH).expanduser() / "integrations" / "github_webhook_jobs.db"
+
+
+class WebhookJobQueue:
+    """SQLite-backed webhook job queue with an in-process async worker."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        per_repo_concurrency: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        retention_days: Optional[float] = None,
+    ):
+        self.path = Path(path) if path else default_queue_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.per_repo_concurrency = max(
+            1, int(per_repo_concurrency or _env_number("PENGUIN_GITHUB_JOBS_PER_REPO", 1))
+        )
+        self.max_concurrency = max(
+            1, int(max_concurrency or _env_number("PENGUIN_GITHUB_JOBS_MAX_CONCURRENT", 4))
+        )
+        self.max_attempts = max(
+            1, int(max_attempts or _env_number("PENGUIN_GITHUB_JOBS_MAX_ATTEMPTS", 5))
+        )
+        self.backoff_seconds = (
+            backoff_seconds
+            if backoff_seconds is not None
+            else _env_number("PENGUIN_GITHUB_JOBS_BACKOFF_SECONDS", 30)
+        )
+        self.retention_seconds = 86400 * (
+            retention_days
+            if retention_days is not None
+            else _env_number("PENGUIN_GITHUB_WEBHOOK_RETENTION_DAYS", 7)
+        )
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._requeue_interrupted()
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._dead_letter_handlers: Dict[str, DeadLetterHandler] = {}
+        self._context: Any = None
+        self._worker: Optional[asyncio.Task] = None
+        self._worker_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._running: Dict[int, asyncio.Task] = {}
+        self._last_prune = 0.0
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        delivery_id: str,
+        event: str,
+        repo: Optional[str],
+        payload: Dict[str, Any],
+        runnable: bool = True,
+    ) -> Optional[int]:
+        """Record a delivery; returns the job id, or None for a replayed delivery.
+
+        Deliveries without a handler are stored as ``ignored`` so they still
+        count for replay protection.
+        """
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO webhook_jobs "
+                "(delivery_id, event, repo, payload, status, next_run_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    delivery_id,
+                    event,
+                    repo or "",
+                    json.dumps(payload) if runnable else "{}",
+                    "queued" if runnable else "ignored",
+                    now,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+        if cursor.rowcount == 0:
+            return None
+        if runnable:
+            self._notify()
+        return cursor.lastrowid
+
+    def retry(self, job_id: int) -> bool:
+        """Put a dead-lettered job back in the queue with a fresh attempt budget."""
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE webhook_jobs SET status = 'queued', attempts = 0, next_run_at = ?, "
+                "updated_at = ? WHERE id = ? AND status = 'dead'",
+                (now, now, job_id),
+            ).rowcount
+            self._conn.commit()
+        if updated:
+            self._notify()
+        return bool(updated)
+
+    def _requeue_interrupted(self) -> None:
+        """Jobs left ``running`` by a dead worker or process run again.
+
+        The attempt stays charged, so a job that keeps crashing the process is
+        still dead-lettered eventually.
+        """
+        with self._lock:
+            recovered = self._conn.execute(
+                "UPDATE webhook_jobs SET status = 'queued', updated_at = ? WHERE status = 'running'",
+                (time.time(),),
+            ).rowcount
+            self._conn.commit()
+        if recovered:
+            logger.info(f"Re-queued {recovered} interrupted GitHub webhook job(s)")
+
+    def _prune(self, now: float) -> None:
+        if now - self._last_prune < _PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+        self._conn.execute(
+            "DELETE FROM webhook_jobs WHERE status IN ('succeeded', 'ignored') AND updated_at < ?",
+            (now - self.retention_seconds,),
+        )
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM webhook_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._job_dict(row) if row else None
+
+    def status(self, status: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """Counts per status, running jobs per repository and the newest jobs."""
+        with self._lock:
+            counts = {name: 0 for name in JOB_STATUSES}
+            for row in self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM webhook_jobs GROUP BY status"
+            ):
+                counts[row["status"]] = row["n"]
+            running = {
+                row["repo"]: row["n"]
+                for row in self._conn.execute(
+                    "SELECT repo, COUNT(*) AS n FROM webhook_jobs "
+                    "WHERE status = 'running' GROUP BY repo"
+                )
+            }
+            sql = "SELECT * FROM webhook_jobs"
+            params: List[Any] = []
+            if status:
+                sql += " WHERE status = ?"
+                params.append(status)
+            sql += " ORDER BY id DESC LIMIT ?"
+            params.append(int(limit))
+            jobs = [self._job_dict(row) for row in self._conn.execute(sql, params)]
+        return {
+            "counts": counts,
+            "running_by_repo": running,
+            "limits": {
+                "per_repo": self.per_repo_concurrency,
+                "max_concurrent": self.max_concurrency,
+                "max_attempts": self.max_attempts,
+            },
+            "worker_running": self._worker is not None and not self._worker.done(),
+            "jobs": jobs,
+        }
+
+    @staticmethod
+    def _job_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job.pop("payload", None)
+        return job
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def ensure_worker(
+        self,
+        handlers: Dict[str, JobHandler],
+        context: Any,
+        dead_letter_handlers: Optional[Dict[str, DeadLetterHandler]] = None,
+    ) -> None:
+        """Start (or restart) the worker on the running event loop.
+
+        ``context`` is passed to every handler alongside the payload.
+        ``dead_letter_handlers`` are called with the payload, the context and
+        the last error when a job of their event runs out of attempts.
+        """
+        self._handlers = dict(handlers)
+        self._dead_letter_handlers = dict(dead_letter_handlers or {})
+        self._context = context
+        loop = asyncio.get_running_loop()
+        if (
+            self._worker is not None
+            and not self._worker.done()
+            and self._worker_loop is loop
+        ):
+            return
+        # Any previous worker died with its loop; its claimed jobs are orphaned
+        self._requeue_interrupted()
+        self._worker_loop = loop
+        self._wake = asyncio.Event()
+        self._running = {}
+        self._worker = loop.create_task(self._work(), name="github-webhook-jobs")
+
+    async def stop(self) -> None:
+        """Stop the worker; running jobs are cancelled and re-queued."""
+        worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _notify(self) -> None:
+        loop, wake = self._worker_loop, self._wake
+        if loop is None or wake is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wake.set()
+        else:
+            loop.call_soon_threadsafe(wake.set)
+
+    async def _work(self) -> None:
+        assert self._wake is not None
+        try:
+            while True:
+                self._wake.clear()
+                for job in self._claim_ready():
+                    task = asyncio.create_task(self._run(job))
+                    self._running[job["id"]] = task
+                delay = self._seconds_until_due()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            tasks = list(self._running.values())
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _claim_ready(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        claimed: List[Dict[str, Any]] = []
+        with self._lock:
+            running_total = self._conn.execute(
+                "SELECT COUNT(*) FROM webhook_jobs WHERE status = 'running'"
+            ).fetchone()[0]
+            if running_total >= self.max_concurrency:
+                return claimed
+            per_repo = {
+                row["repo"]: row["n"]
+                for row in self._conn.execute(
+                    "SELECT repo, COUNT(*) AS n FROM webhook_jobs "
+                    "WHERE status = 'running' GROUP BY repo"
+                )
+            }
+            rows = self._conn.execute(
+                "SELECT * FROM webhook_jobs WHERE status = 'queued' AND next_run_at <= ? "
+                "ORDER BY next_run_at, id",
+                (now,),
+            ).fetchall()
+            for row in rows:
+                if running_total >= self.max_concurrency:
+                    break
+                if per_repo.get(row["repo"], 0) >= self.per_repo_concurrency:
+                    continue
+                self._conn.execute(
+                    "UPDATE webhook_jobs SET status = 'running', attempts = attempts + 1, "
+                    "updated_at = ? WHERE id = ?",
+                    (now, row["id"]),
+                )
+                job = dict(row)
+                job["attempts"] += 1
+                claimed.append(job)
+                per_repo[row["repo"]] = per_repo.get(row["repo"], 0) + 1
+                running_total += 1
+            self._conn.commit()
+        return claimed
+
+    def _seconds_until_due(self) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_run_at) FROM webhook_jobs WHERE status = 'queued'"
+            ).fetchone()
+        if row[0] is None:
+            return _IDLE_POLL_SECONDS
+        # Jobs that are due but blocked by a cap are picked up when a slot frees
+        return min(max(row[0] - time.time(), 0.05), _IDLE_POLL_SECONDS)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        payload: Dict[str, Any] = {}
+        try:
+            handler = self._handlers.get(job["event"])
+            if handler is None:
+                raise RuntimeError(f"No handler registered for event {job['event']!r}")
+            payload = json.loads(job["payload"])
+            _current_attempt.set(job["attempts"])
+            await handler(payload, self._context)
+        except asyncio.CancelledError:
+            self._finish(job_id, "queued", attempts_delta=-1)
+            raise
+        except Exception as e:
+            logger.warning(
+                f"GitHub webhook job {job_id} ({job['event']}, {job['repo']}) "
+                f"failed on attempt {job['attempts']}: {e}"
+            )
+            if job["attempts"] >= self.max_attempts:
+                logger.error(f"GitHub webhook job {job_id} dead-lettered after {job['attempts']} attempts")
+                self._finish(job_id, "dead", error=str(e))
+                await self._dead_lettered(job, payload, e)
+            else:
+                delay = min(self.backoff_seconds * 2 ** (job["attempts"] - 1), _BACKOFF_MAX_SECONDS)
+                self._finish(job_id, "queued", error=str(e), delay=delay)
+        else:
+            self._finish(job_id, "succeeded")
+        finally:
+            self._running.pop(job_id, None)
+            if self._wake is not None:
+                self._wake.set()  # A slot is free
+
+    async def _dead_lettered(
+        self, job: Dict[str, Any], payload: Dict[str, Any], error: BaseException
+    ) -> None:
+        handler = self._dead_letter_handlers.get(job["event"])
+        if handler is None:
+            return
+        try:
+            await handler(payload, self._context, error)
+        except Exception as e:
+            logger.warning(f"Dead-letter handler for GitHub webhook job {job['id']} failed: {e}")
+
+    def _finish(
+        self,
+        job_id: int,
+        status: str,
+        *,
+        error: Optional[str] = None,
+        delay: float = 0.0,
+        attempts_delta: int = 0,
+    ) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE webhook_jobs SET status = ?, last_error = COALESCE(?, last_error), "
+                    "next_run_at = ?, attempts = attempts + ?, updated_at = ? WHERE id = ?",
+                    (status, error, now + delay, attempts_delta, now, job_id),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:  # Queue closed underneath us; recovered on next start
+            logger.warning(f"Could not update GitHub webhook job {job_id}: {e}")
+
+
+_QUEUE: Optional[WebhookJobQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_webhook_job_queue() -> WebhookJobQueue:
+    """Process-wide webhook job queue."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = WebhookJobQueue()
+        return _QUEUE
+
+
+def reset_webhook_job_queue() -> None:
+    """Drop the process-wide queue so the next call reopens it. Intended for tests."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        queue, _QUEUE = _QUEUE, None
+    if queue is not None:
+        queue.close()
+
+
+async def stop_webhook_job_queue() -> None:
+    """Stop the worker of the process-wide queue, if one was opened."""
+    queue = _QUEUE
+    if queue is not None:
+        await queue.stop()
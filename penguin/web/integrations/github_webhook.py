@@ -1,6 +1,11 @@
 """GitHub webhook handler for Penguin Agent.
 
 Handles GitHub webhook events for @Penguin mentions, PR events, and issue events.
+Verified deliveries are recorded in the durable job queue (``github_jobs``),
+which provides replay protection across restarts, per-repository concurrency
+caps and retries; the handlers below run from its worker. Handlers let
+errors propagate so the queue can retry them; the user is told about a
+failure only once the job is dead-lettered.
 """
 
 from __future__ import annotations
@@ -11,74 +16,29 @@ import hmac
 import logging
 import os
 import re
-import time
-from threading import RLock
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Request, HTTPException
 from pydantic import BaseModel
 
 from penguin.project.git_manager import _get_github_app_client
 from penguin.config import GITHUB_APP_ID, GITHUB_APP_PRIVATE_KEY_PATH, GITHUB_APP_INSTALLATION_ID
 from penguin.constants import DEFAULT_PATCH_TRUNCATION_LIMIT
+from penguin.web.integrations.github_jobs import (
+    current_job_attempt,
+    default_queue_path,
+    get_webhook_job_queue,
+    reset_webhook_job_queue,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/integrations/github", tags=["integrations"])
 
 
-_DEFAULT_DELIVERY_CACHE_TTL_SECONDS = 10 * 60
-_DELIVERY_CACHE_TTL_ENV = "PENGUIN_GITHUB_WEBHOOK_DELIVERY_TTL_SECONDS"
-_DELIVERY_CACHE_LOCK = RLock()
-_SEEN_DELIVERY_IDS: dict[str, float] = {}
-
-
-def _delivery_cache_ttl_seconds() -> float:
-    raw = os.getenv(
-        _DELIVERY_CACHE_TTL_ENV,
-        str(_DEFAULT_DELIVERY_CACHE_TTL_SECONDS),
-    ).strip()
-    try:
-        ttl = float(raw)
-    except ValueError:
-        logger.warning(
-            "Invalid %s=%r; using default %s seconds",
-            _DELIVERY_CACHE_TTL_ENV,
-            raw,
-            _DEFAULT_DELIVERY_CACHE_TTL_SECONDS,
-        )
-        return float(_DEFAULT_DELIVERY_CACHE_TTL_SECONDS)
-    return max(ttl, 0.0)
-
-
-def remember_github_delivery(delivery_id: str, *, now: float | None = None) -> bool:
-    """Return True when delivery is new, False when it is blank or a replay."""
-    normalized = delivery_id.strip()
-    if not normalized:
-        return False
-
-    current_time = now if isinstance(now, (int, float)) else time.monotonic()
-    ttl_seconds = _delivery_cache_ttl_seconds()
-    with _DELIVERY_CACHE_LOCK:
-        expired = [
-            seen_id
-            for seen_id, seen_at in _SEEN_DELIVERY_IDS.items()
-            if current_time - seen_at > ttl_seconds
-        ]
-        for seen_id in expired:
-            _SEEN_DELIVERY_IDS.pop(seen_id, None)
-
-        if normalized in _SEEN_DELIVERY_IDS:
-            return False
-
-        _SEEN_DELIVERY_IDS[normalized] = current_time
-        return True
-
-
 def reset_github_delivery_cache() -> None:
-    """Reset the in-memory replay cache. Intended for tests."""
-    with _DELIVERY_CACHE_LOCK:
-        _SEEN_DELIVERY_IDS.clear()
+    """Reopen the job queue, which also holds the seen delivery ids. Intended for tests."""
+    reset_webhook_job_queue()
 
 
 async def post_github_comment(repo_name: str, issue_number: int, comment_body: str) -> bool:
@@ -372,98 +332,86 @@ async def handle_review_command(
 
     logger.info(f"Starting review for PR #{issue_number} in {repo_name} (conversation: {conversation_id})")
 
-    # Post acknowledgment comment
-    await post_github_comment(
-        repo_name,
-        issue_number,
-        f"🐧 **Penguin is reviewing PR #{issue_number}**\n\nI'm analyzing the changes now. This may take a moment..."
+    # Post acknowledgment comment (once, not again on every retry)
+    if current_job_attempt() <= 1:
+        await post_github_comment(
+            repo_name,
+            issue_number,
+            f"🐧 **Penguin is reviewing PR #{issue_number}**\n\nI'm analyzing the changes now. This may take a moment..."
+        )
+
+    # Fetch PR details and changed files; errors propagate to the job queue,
+    # which retries them and reports the failure once the job is dead-lettered
+    github_client = _get_github_app_client(
+        GITHUB_APP_ID,
+        GITHUB_APP_PRIVATE_KEY_PATH,
+        GITHUB_APP_INSTALLATION_ID
     )
 
-    try:
-        # Fetch PR details and changed files
-        github_client = _get_github_app_client(
-            GITHUB_APP_ID,
-            GITHUB_APP_PRIVATE_KEY_PATH,
-            GITHUB_APP_INSTALLATION_ID
-        )
+    if not github_client:
+        raise RuntimeError("Could not authenticate with GitHub API.")
 
-        if not github_client:
-            await post_github_comment(
-                repo_name,
-                issue_number,
-                "❌ **Review failed:** Could not authenticate with GitHub API."
-            )
-            return
+    repo = github_client.get_repo(repo_name)
+    pr = repo.get_pull(issue_number)
 
-        repo = github_client.get_repo(repo_name)
-        pr = repo.get_pull(issue_number)
-
-        # Get changed files
-        files = list(pr.get_files())
-
-        # Check limits
-        max_files = int(os.getenv("PENGUIN_MAX_FILES_PER_REVIEW", "10"))
-        max_lines = int(os.getenv("PENGUIN_MAX_DIFF_LINES", "1000"))
-
-        total_lines = sum(file.additions + file.deletions for file in files)
-
-        if len(files) > max_files or total_lines > max_lines:
-            await post_github_comment(
-                repo_name,
-                issue_number,
-                f"⚠️ **PR is too large for automatic review**\n\n"
-                f"- Files changed: {len(files)} (limit: {max_files})\n"
-                f"- Lines changed: {total_lines} (limit: {max_lines})\n\n"
-                f"Please break this PR into smaller chunks for review."
-            )
-            return
-
-        # Construct review prompt
-        review_prompt = await _build_review_prompt(pr, files)
-
-        # Load or create conversation for this PR
-        # Try to load existing conversation first
-        loaded = core.conversation_manager.load(conversation_id)
-        if loaded:
-            logger.info(f"Loaded existing conversation: {conversation_id}")
-        else:
-            # Create new session with specific ID
-            logger.info(f"Creating new conversation: {conversation_id}")
-            session = core.conversation_manager.session_manager.create_session()
-            session.id = conversation_id  # Override with our custom ID
-            core.conversation_manager.conversation.session = session
-            core.conversation_manager.conversation.system_prompt_sent = False
-            core.conversation_manager.save()
-            logger.info(f"Created new conversation: {conversation_id}")
-
-        # Feed to Penguin's LLM with persistent conversation
-        logger.info(f"Sending {len(files)} files to Penguin for review (conversation: {conversation_id})")
-        result = await core.process(
-            input_data={"text": review_prompt},
-            conversation_id=conversation_id,  # Enable persistence and follow-up questions
-            max_iterations=None,
-            streaming=False
-        )
+    # Get changed files
+    files = list(pr.get_files())
+
+    # Check limits
+    max_files = int(os.getenv("PENGUIN_MAX_FILES_PER_REVIEW", "10"))
+    max_lines = int(os.getenv("PENGUIN_MAX_DIFF_LINES", "1000"))
 
-        # Extract review response
-        review_response = result.get("assistant_response", "No response generated")
+    total_lines = sum(file.additions + file.deletions for file in files)
 
-        # Post review results
+    if len(files) > max_files or total_lines > max_lines:
         await post_github_comment(
             repo_name,
             issue_number,
-            f"✅ **Review complete!**\n\n{review_response}\n\n---\n*💡 You can ask follow-up questions like: `@Penguin explain the security concern` or `@Penguin how would you fix line 407?`*"
+            f"⚠️ **PR is too large for automatic review**\n\n"
+            f"- Files changed: {len(files)} (limit: {max_files})\n"
+            f"- Lines changed: {total_lines} (limit: {max_lines})\n\n"
+            f"Please break this PR into smaller chunks for review."
         )
+        return
 
-        logger.info(f"Successfully completed review for PR #{issue_number} (saved to conversation: {conversation_id})")
+    # Construct review prompt
+    review_prompt = await _build_review_prompt(pr, files)
 
-    except Exception as e:
-        logger.error(f"Failed to review PR #{issue_number}: {e}", exc_info=True)
-        await post_github_comment(
-            repo_name,
-            issue_number,
-            f"❌ **Review failed:** {str(e)}"
-        )
+    # Load or create conversation for this PR
+    # Try to load existing conversation first
+    loaded = core.conversation_manager.load(conversation_id)
+    if loaded:
+        logger.info(f"Loaded existing conversation: {conversation_id}")
+    else:
+        # Create new session with specific ID
+        logger.info(f"Creating new conversation: {conversation_id}")
+        session = core.conversation_manager.session_manager.create_session()
+        session.id = conversation_id  # Override with our custom ID
+        core.conversation_manager.conversation.session = session
+        core.conversation_manager.conversation.system_prompt_sent = False
+        core.conversation_manager.save()
+        logger.info(f"Created new conversation: {conversation_id}")
+
+    # Feed to Penguin's LLM with persistent conversation
+    logger.info(f"Sending {len(files)} files to Penguin for review (conversation: {conversation_id})")
+    result = await core.process(
+        input_data={"text": review_prompt},
+        conversation_id=conversation_id,  # Enable persistence and follow-up questions
+        max_iterations=None,
+        streaming=False
+    )
+
+    # Extract review response
+    review_response = result.get("assistant_response", "No response generated")
+
+    # Post review results
+    await post_github_comment(
+        repo_name,
+        issue_number,
+        f"✅ **Review complete!**\n\n{review_response}\n\n---\n*💡 You can ask follow-up questions like: `@Penguin explain the security concern` or `@Penguin how would you fix line 407?`*"
+    )
+
+    logger.info(f"Successfully completed review for PR #{issue_number} (saved to conversation: {conversation_id})")
 
 
 async def handle_fix_command(
@@ -558,63 +506,54 @@ async def handle_followup_question(
     """
     logger.info(f"Processing follow-up question on {'PR' if is_pr else 'issue'} #{issue_number} (conversation: {conversation_id})")
 
-    try:
-        # Extract the question (remove @Penguin mention)
-        question = comment_body.replace("@Penguin", "").replace("@penguin", "").strip()
-
-        if not question:
-            await post_github_comment(
-                repo_name,
-                issue_number,
-                "👋 I'm here! What would you like to know? Try asking:\n"
-                "- `@Penguin review` - Review this PR\n"
-                "- `@Penguin explain [something]` - Get detailed explanation\n"
-                "- `@Penguin how would you fix [issue]?` - Get suggestions"
-            )
-            return
-
-        # Ensure conversation exists (should have been created by review command)
-        loaded = core.conversation_manager.load(conversation_id)
-        if loaded:
-            logger.info(f"Loaded existing conversation for follow-up: {conversation_id}")
-        else:
-            # Conversation doesn't exist yet (user asked question before review)
-            logger.warning(f"Conversation {conversation_id} doesn't exist, creating for follow-up")
-            session = core.conversation_manager.session_manager.create_session()
-            session.id = conversation_id
-            core.conversation_manager.conversation.session = session
-            core.conversation_manager.conversation.system_prompt_sent = False
-            core.conversation_manager.save()
-            logger.info(f"Created new conversation for follow-up: {conversation_id}")
-
-        # Process in context of existing conversation
-        result = await core.process(
-            input_data={"text": question},
-            conversation_id=conversation_id,  # Use existing conversation context
-            max_iterations=None,
-            streaming=False
-        )
-
-        logger.info(f"Follow-up question processed, conversation saved to: {conversation_id}")
+    # Extract the question (remove @Penguin mention)
+    question = comment_body.replace("@Penguin", "").replace("@penguin", "").strip()
 
-        response = result.get("assistant_response", "I'm not sure how to answer that.")
-
-        # Post response
+    if not question:
         await post_github_comment(
             repo_name,
             issue_number,
-            f"{response}"
+            "👋 I'm here! What would you like to know? Try asking:\n"
+            "- `@Penguin review` - Review this PR\n"
+            "- `@Penguin explain [something]` - Get detailed explanation\n"
+            "- `@Penguin how would you fix [issue]?` - Get suggestions"
         )
+        return
 
-        logger.info(f"Successfully answered follow-up question on {'PR' if is_pr else 'issue'} #{issue_number}")
+    # Ensure conversation exists (should have been created by review command)
+    loaded = core.conversation_manager.load(conversation_id)
+    if loaded:
+        logger.info(f"Loaded existing conversation for follow-up: {conversation_id}")
+    else:
+        # Conversation doesn't exist yet (user asked question before review)
+        logger.warning(f"Conversation {conversation_id} doesn't exist, creating for follow-up")
+        session = core.conversation_manager.session_manager.create_session()
+        session.id = conversation_id
+        core.conversation_manager.conversation.session = session
+        core.conversation_manager.conversation.system_prompt_sent = False
+        core.conversation_manager.save()
+        logger.info(f"Created new conversation for follow-up: {conversation_id}")
+
+    # Process in context of existing conversation
+    result = await core.process(
+        input_data={"text": question},
+        conversation_id=conversation_id,  # Use existing conversation context
+        max_iterations=None,
+        streaming=False
+    )
 
-    except Exception as e:
-        logger.error(f"Failed to answer follow-up question: {e}", exc_info=True)
-        await post_github_comment(
-            repo_name,
-            issue_number,
-            f"❌ Sorry, I encountered an error: {str(e)}"
-        )
+    logger.info(f"Follow-up question processed, conversation saved to: {conversation_id}")
+
+    response = result.get("assistant_response", "I'm not sure how to answer that.")
+
+    # Post response
+    await post_github_comment(
+        repo_name,
+        issue_number,
+        f"{response}"
+    )
+
+    logger.info(f"Successfully answered follow-up question on {'PR' if is_pr else 'issue'} #{issue_number}")
 
 
 async def handle_pull_request(payload: Dict[str, Any], core: Any) -> None:
@@ -644,11 +583,47 @@ async def handle_pull_request(payload: Dict[str, Any], core: Any) -> None:
         # TODO: Cleanup if needed
 
 
+async def handle_issue_comment_failure(payload: Dict[str, Any], core: Any, error: BaseException) -> None:
+    """Tell the commenter that their @Penguin request failed for good.
+
+    Called by the job queue once an ``issue_comment`` job is dead-lettered.
+    """
+    mention = extract_mention_command(payload.get("comment", {}).get("body", ""))
+    if payload.get("action") != "created" or not mention:
+        return
+    repo_name = payload.get("repository", {}).get("full_name")
+    issue_number = payload.get("issue", {}).get("number")
+    if mention["command"] == "review":
+        body = f"❌ **Review failed:** {error}"
+    else:
+        body = f"❌ Sorry, I encountered an error: {error}"
+    await post_github_comment(repo_name, issue_number, body)
+
+
+# Events processed by the job queue worker; anything else is only recorded
+_JOB_HANDLERS = {
+    "issue_comment": handle_issue_comment,
+    "pull_request": handle_pull_request,
+}
+
+# Called once a job of the event has used up its attempts
+_DEAD_LETTER_HANDLERS = {
+    "issue_comment": handle_issue_comment_failure,
+}
+
+
+def start_github_webhook_jobs(core: Any) -> None:
+    """Resume queued webhook jobs on start-up (no-op if the queue was never used)."""
+    if default_queue_path().exists():
+        get_webhook_job_queue().ensure_worker(_JOB_HANDLERS, core, _DEAD_LETTER_HANDLERS)
+
+
 @router.post("/webhook")
-async def github_webhook(request: Request, background_tasks: BackgroundTasks):
+async def github_webhook(request: Request):
     """GitHub webhook endpoint.
 
-    Receives and processes GitHub webhook events.
+    Verifies and records the delivery, then acknowledges it; handled events
+    are processed by the job queue worker.
     """
     # Get webhook secret from environment
     webhook_secret = os.getenv("GITHUB_WEBHOOK_SECRET")
@@ -702,16 +677,23 @@ async def github_webhook(request: Request, background_tasks: BackgroundTasks):
         logger.warning(f"Webhook from unauthorized repo: {repo_name} (allowed: {allowed_repo})")
         raise HTTPException(status_code=403, detail="Unauthorized repository")
 
-    if not remember_github_delivery(delivery_id):
+    queue = get_webhook_job_queue()
+    job_id = queue.enqueue(
+        delivery_id,
+        event_type,
+        repo_name,
+        payload,
+        runnable=event_type in _JOB_HANDLERS,
+    )
+    if job_id is None:
         logger.warning("Rejected replayed GitHub delivery: %s", delivery_id)
         raise HTTPException(status_code=409, detail="Duplicate delivery")
 
-    # Route event to appropriate handler
-    # Process in background to avoid timeout
-    if event_type == "issue_comment":
-        background_tasks.add_task(handle_issue_comment, payload, core)
-    elif event_type == "pull_request":
-        background_tasks.add_task(handle_pull_request, payload, core)
+    # Handled events run from the queue worker, bounded per repository
+    if event_type in _JOB_HANDLERS:
+        queue.ensure_worker(_JOB_HANDLERS, core, _DEAD_LETTER_HANDLERS)
+        logger.info(f"Queued GitHub {event_type} job {job_id} for {repo_name}")
+        return {"status": "queued", "event": event_type, "job_id": job_id}
     elif event_type == "pull_request_review":
         logger.info("Received pull_request_review event (not yet handled)")
     elif event_type == "pull_request_review_comment":
@@ -723,3 +705,30 @@ async def github_webhook(request: Request, background_tasks: BackgroundTasks):
 
     # Return success
     return {"status": "ok", "event": event_type}
+
+
+@router.get("/jobs")
+async def github_webhook_jobs(status: Optional[str] = None, limit: int = 50):
+    """Queue depth per status, running jobs per repository and recent jobs."""
+    return get_webhook_job_queue().status(status=status, limit=max(1, min(limit, 500)))
+
+
+@router.get("/jobs/{job_id}")
+async def github_webhook_job(job_id: int):
+    """State of one webhook job."""
+    job = get_webhook_job_queue().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/jobs/{job_id}/retry")
+async def retry_github_webhook_job(job_id: int):
+    """Re-queue a dead-lettered job."""
+    queue = get_webhook_job_queue()
+    if not queue.retry(job_id):
+        raise HTTPException(status_code=409, detail="Only dead-lettered jobs can be retried")
+    core = getattr(router, "core", None)
+    if core is not None:
+        queue.ensure_worker(_JOB_HANDLERS, core, _DEAD_LETTER_HANDLERS)
+    return queue.get_job(job_id)
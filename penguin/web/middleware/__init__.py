@@ -6,10 +6,12 @@ from .auth import (
     AuthenticationError,
     require_auth,
 )
+from .metrics import MetricsMiddleware
 
 __all__ = [
     "AuthenticationMiddleware",
     "AuthConfig",
     "AuthenticationError",
     "require_auth",
+    "MetricsMiddleware",
 ]
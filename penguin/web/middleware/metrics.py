@@ -0,0 +1,108 @@
+"""Request metrics middleware.
+
+Records every HTTP request and WebSocket session into the ``HealthMonitor``
+under its route template, status class and kind. This is a plain ASGI
+middleware rather than a ``BaseHTTPMiddleware`` so streamed responses pass
+through untouched and SSE streams can be told apart from unary requests by
+their ``Content-Type``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, MutableMapping, Optional
+
+from penguin.web.health import HealthMonitor, get_health_monitor
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+# Label for requests that matched no route, so 404 scans can't create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, set by the router on ``scope``."""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Feeds per-route latency histograms and saturation gauges."""
+
+    def __init__(self, app: ASGIApp, monitor: Optional[HealthMonitor] = None):
+        self.app = app
+        self._monitor = monitor
+
+    @property
+    def monitor(self) -> HealthMonitor:
+        return self._monitor or get_health_monitor()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        monitor = self.monitor
+        started = time.perf_counter()
+        state = {"status": 500, "kind": "unary", "sse": False}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = int(message.get("status", 500))
+                for name, value in message.get("headers") or []:
+                    if name.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        state["kind"] = "stream"
+                        state["sse"] = True
+                        monitor.connection_opened("sse")
+            elif message["type"] == "http.response.body" and message.get("more_body"):
+                state["kind"] = "stream"
+            await send(message)
+
+        monitor.in_flight_requests += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            monitor.in_flight_requests -= 1
+            if state["sse"]:
+                monitor.connection_closed("sse")
+            monitor.record_http_request(
+                scope.get("method", "GET"),
+                route_template(scope),
+                state["status"],
+                (time.perf_counter() - started) * 1000,
+                kind=state["kind"],
+            )
+
+    async def _websocket(self, scope: Scope, receive: Receive, send: Send) -> None:
+        monitor = self.monitor
+        started = time.perf_counter()
+        state = {"accepted": False, "status": 403}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "websocket.accept" and not state["accepted"]:
+                state["accepted"] = True
+                state["status"] = 101
+                monitor.connection_opened("websocket")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if state["accepted"]:
+                monitor.connection_closed("websocket")
+            monitor.record_http_request(
+                "WEBSOCKET",
+                route_template(scope),
+                state["status"],
+                (time.perf_counter() - started) * 1000,
+                kind="websocket",
+            )
@@ -38,6 +38,7 @@ from PIL import Image, UnidentifiedImageError
 from penguin.config import WORKSPACE_PATH
 from penguin.core import PenguinCore
 from penguin.core_runtime import process_lifecycle
+from penguin.llm.api_client import ConnectionPoolManager
 from penguin.llm.model_config import normalize_openai_service_tier
 from penguin.llm.runtime import (
     UnsupportedReasoningVariantError,
@@ -93,7 +94,7 @@ from penguin.web.services.session_view import (
     TITLE_SOURCE_AUTO,
     TITLE_SOURCE_MANUAL,
     create_session_info,
-    get_session_diff,
+    get_session_diff_async,
     get_session_info,
     get_session_metadata_title,
     get_session_messages,
@@ -3197,6 +3198,15 @@ async def health(core: PenguinCore = Depends(get_core)):
     return await monitor.get_comprehensive_health(core)
 
 
+@router.get("/api/v1/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request latency histograms and saturation gauges in Prometheus text format."""
+    return PlainTextResponse(
+        get_health_monitor().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @router.get("/api/v1/system-info")
 async def system_info(core: PenguinCore = Depends(get_core)):
     """Return core system information."""
@@ -3939,8 +3949,9 @@ async def discover_models(core: PenguinCore = Depends(get_core)):
 
     url = "https://openrouter.ai/api/v1/models"
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.get(url, headers=headers)
+        pool = ConnectionPoolManager.get_instance()
+        async with pool.client_context("https://openrouter.ai/api/v1") as client:
+            resp = await client.get(url, headers=headers, timeout=20.0)
             resp.raise_for_status()
             payload = resp.json()
             data = payload.get("data", []) if isinstance(payload, dict) else []
@@ -6419,7 +6430,7 @@ async def session_diff(
     messageID: Optional[str] = Query(None),
 ):
     """OpenCode-compatible session.diff endpoint."""
-    diffs = get_session_diff(core, session_id, message_id=messageID)
+    diffs = await get_session_diff_async(core, session_id, message_id=messageID)
     if diffs is None:
         raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
     return diffs
@@ -8167,6 +8178,10 @@ async def get_audit_log(
     ),
     category: Optional[str] = Query(default=None, description="Filter by category"),
     agent_id: Optional[str] = Query(default=None, description="Filter by agent ID"),
+    session_id: Optional[str] = Query(default=None, description="Filter by session ID"),
+    tool_name: Optional[str] = Query(default=None, description="Filter by tool name"),
+    since: Optional[str] = Query(default=None, description="ISO timestamp lower bound"),
+    until: Optional[str] = Query(default=None, description="ISO timestamp upper bound"),
 ):
     """Get recent permission audit log entries.
 
@@ -8179,17 +8194,35 @@ async def get_audit_log(
     - result: Filter by result ("allow", "ask", "deny")
     - category: Filter by category ("filesystem", "process", "network", etc.)
     - agent_id: Filter by agent ID
+    - session_id, tool_name, since, until: Query by session, tool and time
+      range (served from the audit database when one is configured)
     """
     try:
         from penguin.security.audit import get_audit_logger
 
         audit_logger = get_audit_logger()
-        entries = audit_logger.get_recent_entries(
-            limit=limit,
-            result_filter=result,
-            category_filter=category,
-            agent_filter=agent_id,
-        )
+        if session_id or tool_name or since or until:
+            try:
+                entries = audit_logger.query_entries(
+                    session_id=session_id,
+                    tool_name=tool_name,
+                    since=since,
+                    until=until,
+                    result=result,
+                    agent_id=agent_id,
+                    limit=limit,
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid time range: {e}")
+            if category:
+                entries = [e for e in entries if e.operation.split(".")[0] == category]
+        else:
+            entries = audit_logger.get_recent_entries(
+                limit=limit,
+                result_filter=result,
+                category_filter=category,
+                agent_filter=agent_id,
+            )
 
         return {
             "entries": [e.to_dict() for e in entries],
@@ -8199,9 +8232,15 @@ async def get_audit_log(
                 "result": result,
                 "category": category,
                 "agent_id": agent_id,
+                "session_id": session_id,
+                "tool_name": tool_name,
+                "since": since,
+                "until": until,
             },
         }
 
+    except HTTPException:
+        raise
     except ImportError as e:
         raise HTTPException(
             status_code=503, detail=f"Audit module not available: {str(e)}"
@@ -222,6 +222,16 @@ def _response_detail(response: httpx.Response) -> str:
     return "No response body"
 
 
+def _oauth_http_client():
+    """Shared keep-alive client for the OpenAI OAuth issuer."""
+    # Lazy import keeps this service importable without the LLM stack.
+    from penguin.llm.api_client import ConnectionPoolManager
+
+    return ConnectionPoolManager.get_instance().client_context(
+        _OPENAI_OAUTH_ISSUER, auth_mode="oauth", timeout=20.0
+    )
+
+
 def _is_transient_status(status_code: int) -> bool:
     return status_code in {408, 409, 425, 429, 500, 502, 503, 504}
 
@@ -630,7 +640,7 @@ async def _openai_refresh_oauth_record(
 
     max_attempts = 2
     backoff_seconds = 0.4
-    async with httpx.AsyncClient(timeout=20.0) as client:
+    async with _oauth_http_client() as client:
         for attempt in range(1, max_attempts + 1):
             response = await client.post(
                 f"{_OPENAI_OAUTH_ISSUER}/oauth/token",
@@ -785,7 +795,7 @@ async def _openai_authorize_device_flow(
         client_id_source,
     )
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
+    async with _oauth_http_client() as client:
         response = await client.post(
             f"{_OPENAI_OAUTH_ISSUER}/api/accounts/deviceauth/usercode",
             headers={
@@ -917,7 +927,7 @@ async def _openai_complete_browser_flow(
             method_index=method_index,
         )
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
+    async with _oauth_http_client() as client:
         return await _openai_exchange_authorization_code(
             client=client,
             authorization_code=parsed_code,
@@ -954,7 +964,7 @@ async def _openai_complete_device_flow(
         )
 
     deadline = time.monotonic() + _OPENAI_OAUTH_TIMEOUT_SECONDS
-    async with httpx.AsyncClient(timeout=20.0) as client:
+    async with _oauth_http_client() as client:
         while time.monotonic() < deadline:
             poll = await client.post(
                 f"{_OPENAI_OAUTH_ISSUER}/api/accounts/deviceauth/token",
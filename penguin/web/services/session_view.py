@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import hashlib
 import logging
 import os
 import subprocess
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -44,6 +49,20 @@ _TODO_STATUS_VALUES = {"pending", "in_progress", "completed", "cancelled"}
 _TODO_PRIORITY_VALUES = {"high", "medium", "low"}
 _TITLE_SOURCE_VALUES = {TITLE_SOURCE_AUTO, TITLE_SOURCE_MANUAL}
 
+# Git fallback for session diffs: one `git diff` per tree change, bounded
+# output, and a stat-based fingerprint so polling a quiet tree runs no git.
+_GIT_DIFF_TIMEOUT_SEC = 15
+_GIT_PATCH_MAX_CHARS = 512 * 1024
+_UNTRACKED_MAX_BYTES = 256 * 1024
+_UNTRACKED_MAX_FILES = 500
+_GIT_DIFF_CACHE_MAX_ENTRIES = 16
+# Above this many tracked files, stat-ing them all costs more than git does
+_GIT_DIFF_CACHE_MAX_TRACKED = 20_000
+_git_diff_lock = threading.Lock()
+_git_layouts: dict[str, tuple[str, Path, Path]] = {}
+_git_tracked_files: dict[str, tuple[Any, list[str]]] = {}
+_git_diff_cache: OrderedDict[str, tuple[str, list[str], list[dict[str, Any]]]] = OrderedDict()
+
 logger = logging.getLogger(__name__)
 
 
@@ -1299,21 +1318,23 @@ def _diffs_from_tool_part(part: dict[str, Any]) -> list[dict[str, Any]]:
     return []
 
 
-def _run_git(args: list[str], cwd: str) -> str:
+def _run_git(args: list[str], cwd: str, *, timeout: float = 2, strip: bool = True) -> str:
     try:
         proc = subprocess.run(
             ["git", *args],
             cwd=cwd,
             capture_output=True,
             text=True,
-            timeout=2,
+            encoding="utf-8",
+            errors="replace",
+            timeout=timeout,
             check=False,
         )
     except Exception:
         return ""
     if proc.returncode != 0:
         return ""
-    return proc.stdout.strip()
+    return proc.stdout.strip() if strip else proc.stdout
 
 
 def _normalize_existing_directory(directory: Any) -> Optional[str]:
@@ -1366,61 +1387,245 @@ def _session_directory(core: Any, session: Any) -> str:
     return str(Path.cwd())
 
 
-def _git_fallback_diffs(directory: str) -> list[dict[str, Any]]:
-    worktree = _run_git(["rev-parse", "--show-toplevel"], directory)
-    if not worktree:
-        return []
+def _stat_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _git_layout(directory: str) -> tuple[str, Path, Path] | None:
+    """Worktree root, git dir and common git dir for ``directory`` (cached)."""
+    with _git_diff_lock:
+        layout = _git_layouts.get(directory)
+    if layout is not None and layout[1].is_dir():
+        return layout
+    output = _run_git(
+        ["rev-parse", "--show-toplevel", "--absolute-git-dir", "--git-common-dir"],
+        directory,
+    )
+    lines = output.splitlines()
+    if len(lines) != 3:
+        return None
+    worktree, git_dir = lines[0], Path(lines[1])
+    common_dir = Path(lines[2])
+    if not common_dir.is_absolute():
+        common_dir = (Path(directory) / common_dir).resolve()
+    layout = (worktree, git_dir, common_dir)
+    with _git_diff_lock:
+        _git_layouts[directory] = layout
+    return layout
+
+
+def _git_tracked(worktree: str, index_signature: Any) -> list[str] | None:
+    with _git_diff_lock:
+        cached = _git_tracked_files.get(worktree)
+    if cached is not None and cached[0] == index_signature:
+        return cached[1]
+    output = _run_git(["ls-files", "-z"], worktree, timeout=_GIT_DIFF_TIMEOUT_SEC, strip=False)
+    tracked = [path for path in output.split("\0") if path]
+    if len(tracked) > _GIT_DIFF_CACHE_MAX_TRACKED:
+        return None
+    with _git_diff_lock:
+        _git_tracked_files[worktree] = (index_signature, tracked)
+    return tracked
 
-    changed = _run_git(["diff", "--name-only"], worktree)
-    files = [line.strip() for line in changed.splitlines() if line.strip()]
-    diffs: list[dict[str, Any]] = []
-    for relative_path in files:
-        patch = _run_git(["diff", "--", relative_path], worktree)
-        additions, deletions = _line_counts(patch)
-        diffs.append(
-            _build_file_diff(
-                file_path=relative_path,
-                before="",
-                after=patch,
-                additions=additions,
-                deletions=deletions,
-            )
-        )
 
-    untracked = _run_git(["ls-files", "--others", "--exclude-standard"], worktree)
-    for relative_path in (
-        line.strip() for line in untracked.splitlines() if line.strip()
-    ):
-        file_path = Path(worktree) / relative_path
-        if not file_path.is_file():
-            continue
+def _git_tree_fingerprint(
+    worktree: str, git_dir: Path, common_dir: Path, untracked: list[str]
+) -> str | None:
+    """Digest of HEAD, the index and the stat data of every relevant path.
+
+    Any edit, checkout, stage or new file changes at least one of the
+    recorded mtimes, so an unchanged digest means ``git diff`` would print
+    the same thing. Returns None when the tree is too large to fingerprint.
+    """
+    index_signature = _stat_signature(git_dir / "index")
+    tracked = _git_tracked(worktree, index_signature)
+    if tracked is None:
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        head = (git_dir / "HEAD").read_bytes()
+    except OSError:
+        head = b""
+    digest.update(head)
+    meta_paths = [common_dir / "packed-refs", common_dir / "info" / "exclude"]
+    if head.startswith(b"ref: "):
+        meta_paths.append(common_dir / head[5:].strip().decode("utf-8", "replace"))
+    for path in meta_paths:
+        digest.update(repr(_stat_signature(path)).encode())
+    digest.update(repr(index_signature).encode())
+
+    root = Path(worktree)
+    directories = {"."}
+    for relative_path in (*tracked, *untracked):
+        digest.update(relative_path.encode("utf-8", "surrogateescape"))
+        digest.update(repr(_stat_signature(root / relative_path)).encode())
+        parent = os.path.dirname(relative_path)
+        while parent and parent not in directories:
+            directories.add(parent)
+            parent = os.path.dirname(parent)
+    # New untracked files show up as directory mtime changes
+    for relative_dir in sorted(directories):
+        digest.update(repr(_stat_signature(root / relative_dir)).encode())
+    return digest.hexdigest()
+
+
+def _unquote_git_path(path: str) -> str:
+    if len(path) >= 2 and path.startswith('"') and path.endswith('"'):
+        raw = codecs.escape_decode(path[1:-1].encode("utf-8"))[0]
+        return raw.decode("utf-8", "replace")
+    return path
+
+
+def _patch_file_path(patch: str) -> str | None:
+    old_path: str | None = None
+    header = ""
+    for line in patch.splitlines():
+        if line.startswith("diff --git "):
+            header = line[len("diff --git ") :]
+        elif line.startswith("--- "):
+            candidate = _unquote_git_path(line[4:].rstrip("\t"))
+            old_path = candidate[2:] if candidate.startswith("a/") else None
+        elif line.startswith("+++ "):
+            candidate = _unquote_git_path(line[4:].rstrip("\t"))
+            if candidate.startswith("b/"):
+                return candidate[2:]
+            return old_path
+        elif line.startswith("@@"):
+            break
+    # Binary and mode-only changes have no ---/+++ lines: "a/<p> b/<p>"
+    if header.startswith('"'):
+        return _unquote_git_path(header.split('" ', 1)[0] + '"')[2:]
+    if header.startswith("a/") and (len(header) - 5) % 2 == 0:
+        length = (len(header) - 5) // 2
+        return header[2 : 2 + length]
+    return None
+
+
+def _split_git_patch(patch: str) -> list[tuple[str, str]]:
+    """Split a multi-file ``git diff`` into ``(path, patch)`` pairs."""
+    chunks: list[list[str]] = []
+    for line in patch.splitlines(keepends=True):
+        if line.startswith("diff --git ") or not chunks:
+            chunks.append([])
+        chunks[-1].append(line)
+    files: list[tuple[str, str]] = []
+    for chunk in chunks:
+        text = "".join(chunk).rstrip("\n")
+        file_path = _patch_file_path(text)
+        if file_path:
+            files.append((file_path, text))
+    return files
+
+
+def _untracked_file_diff(worktree: str, relative_path: str) -> dict[str, Any] | None:
+    file_path = Path(worktree) / relative_path
+    if not file_path.is_file():
+        return None
+    content = ""
+    signature = _stat_signature(file_path)
+    if signature is not None and signature[1] <= _UNTRACKED_MAX_BYTES:
         try:
             content = file_path.read_text(encoding="utf-8")
         except OSError:
-            continue
+            return None
         except UnicodeDecodeError:
             content = ""
-        additions = len(content.splitlines()) if content else 0
+    return _build_file_diff(
+        file_path=relative_path,
+        before="",
+        after=content,
+        additions=len(content.splitlines()) if content else 0,
+        deletions=0,
+    )
+
+
+def _compute_git_diffs(worktree: str, untracked: list[str]) -> list[dict[str, Any]]:
+    patch = _run_git(
+        [
+            "-c",
+            "core.quotePath=false",
+            "diff",
+            "--no-color",
+            "--no-ext-diff",
+            "--no-renames",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+        ],
+        worktree,
+        timeout=_GIT_DIFF_TIMEOUT_SEC,
+        strip=False,
+    )
+    diffs: list[dict[str, Any]] = []
+    for relative_path, file_patch in _split_git_patch(patch):
+        additions, deletions = _line_counts(file_patch)
+        if len(file_patch) > _GIT_PATCH_MAX_CHARS:
+            file_patch = file_patch[:_GIT_PATCH_MAX_CHARS] + "\n... (diff truncated)"
         diffs.append(
             _build_file_diff(
                 file_path=relative_path,
                 before="",
-                after=content,
+                after=file_patch,
                 additions=additions,
-                deletions=0,
+                deletions=deletions,
             )
         )
-
+    for relative_path in untracked[:_UNTRACKED_MAX_FILES]:
+        diff = _untracked_file_diff(worktree, relative_path)
+        if diff is not None:
+            diffs.append(diff)
     return _merge_file_diffs(diffs)
 
 
-def get_session_diff(
+def _git_fallback_diffs(directory: str) -> list[dict[str, Any]]:
+    """Uncommitted changes in the worktree holding ``directory``.
+
+    Runs one ``git diff`` plus one ``git ls-files`` when the tree changed and
+    no git at all when the cached fingerprint still matches.
+    """
+    layout = _git_layout(directory)
+    if layout is None:
+        return []
+    worktree, git_dir, common_dir = layout
+
+    with _git_diff_lock:
+        cached = _git_diff_cache.get(worktree)
+    if cached is not None:
+        fingerprint, untracked, diffs = cached
+        if _git_tree_fingerprint(worktree, git_dir, common_dir, untracked) == fingerprint:
+            with _git_diff_lock:
+                if worktree in _git_diff_cache:
+                    _git_diff_cache.move_to_end(worktree)
+            return [dict(diff) for diff in diffs]
+
+    output = _run_git(
+        ["ls-files", "--others", "--exclude-standard", "-z"],
+        worktree,
+        timeout=_GIT_DIFF_TIMEOUT_SEC,
+        strip=False,
+    )
+    untracked = [path for path in output.split("\0") if path]
+    # Fingerprint before diffing so edits made meanwhile invalidate the entry
+    fingerprint = _git_tree_fingerprint(worktree, git_dir, common_dir, untracked)
+    diffs = _compute_git_diffs(worktree, untracked)
+    if fingerprint is not None:
+        with _git_diff_lock:
+            _git_diff_cache[worktree] = (fingerprint, untracked, diffs)
+            _git_diff_cache.move_to_end(worktree)
+            while len(_git_diff_cache) > _GIT_DIFF_CACHE_MAX_ENTRIES:
+                _git_diff_cache.popitem(last=False)
+    return [dict(diff) for diff in diffs]
+
+
+def _transcript_session_diff(
     core: Any,
     session_id: str,
-    *,
-    message_id: str | None = None,
-) -> Optional[list[dict[str, Any]]]:
-    """Return OpenCode FileDiff[] derived from persisted message/tool transcript."""
+    message_id: str | None,
+) -> Optional[tuple[Any, list[dict[str, Any]]]]:
     session, _manager = _find_session(core, session_id)
     if session is None:
         return None
@@ -1448,17 +1653,57 @@ def get_session_diff(
                 continue
             diffs.extend(_diffs_from_tool_part(part))
 
-    merged_diffs = _merge_file_diffs(diffs)
-    if merged_diffs:
-        return merged_diffs
+    return session, _merge_file_diffs(diffs)
 
-    fallback_diffs = _git_fallback_diffs(_session_directory(core, session))
+
+def _log_git_fallback(
+    session_id: str, message_id: str | None, fallback_diffs: list[dict[str, Any]]
+) -> None:
     logger.warning(
         "session.view.diff_git_fallback session=%s message_id=%s diff_count=%s",
         session_id,
         message_id or "",
         len(fallback_diffs),
     )
+
+
+def get_session_diff(
+    core: Any,
+    session_id: str,
+    *,
+    message_id: str | None = None,
+) -> Optional[list[dict[str, Any]]]:
+    """Return OpenCode FileDiff[] derived from persisted message/tool transcript."""
+    found = _transcript_session_diff(core, session_id, message_id)
+    if found is None:
+        return None
+    session, merged_diffs = found
+    if merged_diffs:
+        return merged_diffs
+
+    fallback_diffs = _git_fallback_diffs(_session_directory(core, session))
+    _log_git_fallback(session_id, message_id, fallback_diffs)
+    return fallback_diffs
+
+
+async def get_session_diff_async(
+    core: Any,
+    session_id: str,
+    *,
+    message_id: str | None = None,
+) -> Optional[list[dict[str, Any]]]:
+    """``get_session_diff`` with the git fallback run off the event loop."""
+    found = _transcript_session_diff(core, session_id, message_id)
+    if found is None:
+        return None
+    session, merged_diffs = found
+    if merged_diffs:
+        return merged_diffs
+
+    fallback_diffs = await asyncio.to_thread(
+        _git_fallback_diffs, _session_directory(core, session)
+    )
+    _log_git_fallback(session_id, message_id, fallback_diffs)
     return fallback_diffs
 
 
@@ -0,0 +1,168 @@
+"""Tests for the durable GitHub webhook job queue."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from penguin.web.integrations import github_webhook
+from penguin.web.integrations.github_jobs import WebhookJobQueue, reset_webhook_job_queue
+
+
+async def _wait_for(queue: WebhookJobQueue, predicate, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = queue.status(limit=100)
+        if predicate(status["counts"]):
+            return status
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"queue did not settle: {queue.status()['counts']}")
+
+
+def test_queue_caps_concurrency_retries_and_dead_letters(tmp_path):
+    running: dict[str, int] = {}
+    peaks = {"global": 0}
+    peak_per_repo: dict[str, int] = {}
+    calls: list[str] = []
+    dead_lettered: list[str] = []
+
+    async def handler(payload, context):
+        repo = payload["repo"]
+        calls.append(repo)
+        running[repo] = running.get(repo, 0) + 1
+        peak_per_repo[repo] = max(peak_per_repo.get(repo, 0), running[repo])
+        peaks["global"] = max(peaks["global"], sum(running.values()))
+        try:
+            await asyncio.sleep(0.05)
+            if repo == "owner/broken":
+                raise RuntimeError("agent run failed")
+        finally:
+            running[repo] -= 1
+
+    async def on_dead(payload, context, error):
+        dead_lettered.append(f"{payload['repo']}: {error}")
+
+    async def scenario():
+        queue = WebhookJobQueue(
+            tmp_path / "jobs.db",
+            per_repo_concurrency=1,
+            max_concurrency=2,
+            max_attempts=3,
+            backoff_seconds=0.01,
+        )
+        for i, repo in enumerate(["owner/a"] * 4 + ["owner/b"] * 2 + ["owner/broken"]):
+            assert queue.enqueue(f"d-{i}", "pull_request", repo, {"repo": repo}) is not None
+        assert queue.enqueue("d-0", "pull_request", "owner/a", {"repo": "owner/a"}) is None
+
+        queue.ensure_worker({"pull_request": handler}, None, {"pull_request": on_dead})
+        status = await _wait_for(queue, lambda c: c["succeeded"] == 6 and c["dead"] == 1)
+        dead = [job for job in status["jobs"] if job["status"] == "dead"][0]
+        assert dead["attempts"] == 3 and "agent run failed" in dead["last_error"]
+
+        assert queue.retry(dead["id"])
+        await _wait_for(queue, lambda c: c["dead"] == 1 and c["queued"] == 0 and c["running"] == 0)
+        await queue.stop()
+        queue.close()
+
+    asyncio.run(scenario())
+    assert max(peak_per_repo.values()) == 1
+    assert peaks["global"] == 2
+    assert calls.count("owner/broken") == 6  # 3 attempts, then 3 more after the manual retry
+    assert dead_lettered == ["owner/broken: agent run failed"] * 2
+
+
+def test_review_failure_is_retried_and_reported_once(monkeypatch, tmp_path):
+    posted: list[str] = []
+    clients = iter([None, None])
+
+    async def fake_post(repo_name, issue_number, body):
+        posted.append(body)
+        return True
+
+    monkeypatch.setattr(github_webhook, "post_github_comment", fake_post)
+    monkeypatch.setattr(github_webhook, "_get_github_app_client", lambda *args: next(clients))
+    payload = {
+        "action": "created",
+        "comment": {"body": "@Penguin review", "user": {"login": "octocat"}},
+        "issue": {"number": 3, "pull_request": {}},
+        "repository": {"full_name": "owner/repo"},
+    }
+
+    async def scenario():
+        queue = WebhookJobQueue(tmp_path / "jobs.db", max_attempts=2, backoff_seconds=0.01)
+        queue.enqueue("review-1", "issue_comment", "owner/repo", payload)
+        queue.ensure_worker(github_webhook._JOB_HANDLERS, SimpleNamespace(), github_webhook._DEAD_LETTER_HANDLERS)
+        status = await _wait_for(queue, lambda c: c["dead"] == 1)
+        await queue.stop()
+        queue.close()
+        return status["jobs"][0]
+
+    job = asyncio.run(scenario())
+    assert job["attempts"] == 2
+    acks = [body for body in posted if body.startswith("🐧")]
+    assert len(acks) == 1
+    failures = [body for body in posted if body.startswith("❌")]
+    assert failures == ["❌ **Review failed:** Could not authenticate with GitHub API."]
+
+
+def _signed_post(client: TestClient, delivery_id: str, event: str, payload: dict):
+    body = json.dumps(payload).encode("utf-8")
+    digest = hmac.new(b"super-secret", body, hashlib.sha256).hexdigest()
+    return client.post(
+        "/api/v1/integrations/github/webhook",
+        content=body,
+        headers={
+            "X-Hub-Signature-256": f"sha256={digest}",
+            "X-GitHub-Event": event,
+            "X-GitHub-Delivery": delivery_id,
+            "Content-Type": "application/json",
+        },
+    )
+
+
+def test_webhook_enqueues_jobs_and_dedup_survives_restart(monkeypatch, tmp_path):
+    monkeypatch.setenv("PENGUIN_GITHUB_WEBHOOK_QUEUE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "super-secret")
+    monkeypatch.delenv("GITHUB_REPOSITORY", raising=False)
+    handled = []
+
+    async def fake_pull_request(payload, core):
+        handled.append(payload["pull_request"]["number"])
+
+    monkeypatch.setitem(github_webhook._JOB_HANDLERS, "pull_request", fake_pull_request)
+    reset_webhook_job_queue()
+    original_core = getattr(github_webhook.router, "core", None)
+    github_webhook.router.core = SimpleNamespace()
+    app = FastAPI()
+    app.include_router(github_webhook.router)
+    payload = {"action": "opened", "repository": {"full_name": "owner/repo"}, "pull_request": {"number": 7}}
+    try:
+        with TestClient(app) as client:
+            first = _signed_post(client, "delivery-7", "pull_request", payload)
+            assert first.status_code == 200 and first.json()["status"] == "queued"
+            job_id = first.json()["job_id"]
+            for _ in range(200):
+                if client.get(f"/api/v1/integrations/github/jobs/{job_id}").json()["status"] == "succeeded":
+                    break
+                time.sleep(0.02)
+            assert handled == [7]
+            assert _signed_post(client, "ping-1", "ping", {}).json()["status"] == "ok"
+
+        # A restarted process still remembers both deliveries
+        reset_webhook_job_queue()
+        with TestClient(app) as client:
+            assert _signed_post(client, "delivery-7", "pull_request", payload).status_code == 409
+            assert _signed_post(client, "ping-1", "ping", {}).status_code == 409
+            counts = client.get("/api/v1/integrations/github/jobs").json()["counts"]
+            assert counts["succeeded"] == 1 and counts["ignored"] == 1
+            assert client.post(f"/api/v1/integrations/github/jobs/{job_id}/retry").status_code == 409
+    finally:
+        github_webhook.router.core = original_core
+        reset_webhook_job_queue()
@@ -11,17 +11,16 @@ from fastapi.testclient import TestClient
 
 from penguin.web.integrations.github_webhook import (
     github_webhook,
-    remember_github_delivery,
     reset_github_delivery_cache,
     router as github_router,
 )
 
 
 @pytest.fixture(autouse=True)
-def clear_webhook_env(monkeypatch: pytest.MonkeyPatch) -> None:
+def clear_webhook_env(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    monkeypatch.setenv("PENGUIN_GITHUB_WEBHOOK_QUEUE_PATH", str(tmp_path / "jobs.db"))
     monkeypatch.delenv("GITHUB_WEBHOOK_SECRET", raising=False)
     monkeypatch.delenv("GITHUB_REPOSITORY", raising=False)
-    monkeypatch.delenv("PENGUIN_GITHUB_WEBHOOK_DELIVERY_TTL_SECONDS", raising=False)
     reset_github_delivery_cache()
 
 
@@ -53,15 +52,6 @@ def _payload_bytes() -> bytes:
     ).encode("utf-8")
 
 
-def test_remember_github_delivery_rejects_replay(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("PENGUIN_GITHUB_WEBHOOK_DELIVERY_TTL_SECONDS", "60")
-
-    assert remember_github_delivery("", now=100.0) is False
-    assert remember_github_delivery("delivery-1", now=100.0) is True
-    assert remember_github_delivery("delivery-1", now=120.0) is False
-    assert remember_github_delivery("delivery-1", now=161.0) is True
-
-
 def test_github_webhook_rejects_duplicate_delivery(webhook_client: TestClient) -> None:
     payload = _payload_bytes()
     headers = {
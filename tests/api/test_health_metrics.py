@@ -0,0 +1,87 @@
+"""Tests for per-route latency histograms and saturation metrics."""
+
+import random
+
+from fastapi import FastAPI, WebSocket
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from penguin.web.health import HealthMonitor, LatencyHistogram
+from penguin.web.middleware.metrics import UNMATCHED_ROUTE, MetricsMiddleware
+
+
+def test_histogram_quantiles_and_merge():
+    random.seed(7)
+    values = [random.lognormvariate(3, 1) for _ in range(5000)]
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for i, value in enumerate(values):
+        (first if i % 2 else second).record(value)
+    first.merge(second)
+
+    exact = sorted(values)
+    assert first.count == len(values)
+    for q in (0.5, 0.95, 0.99):
+        expected = exact[int(q * len(exact)) - 1]
+        assert abs(first.quantile(q) - expected) / expected < 0.25
+    assert first.quantile(1.0) == max(values)
+
+
+def _app(monitor):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/events")
+    async def events():
+        async def stream():
+            assert monitor.get_saturation()["sse_connections"] == 1
+            yield "data: one\n\n"
+            yield "data: two\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_text("hi")
+        await websocket.close()
+
+    app.add_middleware(MetricsMiddleware, monitor=monitor)
+    return app
+
+
+def test_middleware_records_routes_streams_and_prometheus():
+    monitor = HealthMonitor()
+    client = TestClient(_app(monitor))
+
+    for item_id in (1, 2, 3):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    assert client.get("/items/not-a-number").status_code == 422
+    assert client.get("/nope/123").status_code == 404
+    assert "data: two" in client.get("/events").text
+    with client.websocket_connect("/ws") as websocket:
+        assert websocket.receive_text() == "hi"
+
+    routes = {(r["method"], r["route"], r["status"], r["kind"]): r for r in monitor.routes.to_list()}
+    assert routes[("GET", "/items/{item_id}", "2xx", "unary")]["count"] == 3
+    assert routes[("GET", "/items/{item_id}", "4xx", "unary")]["count"] == 1
+    assert ("GET", UNMATCHED_ROUTE, "4xx", "unary") in routes
+    assert ("GET", "/events", "2xx", "stream") in routes
+    assert ("WEBSOCKET", "/ws", "1xx", "websocket") in routes
+    # Only unary requests feed the aggregate latency percentiles
+    assert monitor.metrics.request_count == 5
+
+    saturation = monitor.get_saturation()
+    assert saturation["in_flight_requests"] == 0
+    assert saturation["sse_connections"] == 0 and saturation["websocket_connections"] == 0
+
+    text = monitor.render_prometheus()
+    assert (
+        'penguin_http_request_duration_seconds_count{method="GET",route="/items/{item_id}",'
+        'status="2xx",kind="unary"} 3'
+    ) in text
+    assert 'le="+Inf"} 3' in text
+    assert "penguin_http_requests_in_flight 0" in text
+    assert "penguin_event_loop_lag_seconds_count 0" in text
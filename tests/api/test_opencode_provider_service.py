@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 
 import pytest
 
+from penguin.llm.api_client import ConnectionPoolManager
 from penguin.web.services import opencode_provider as provider_service
 
 
@@ -46,7 +47,10 @@ def _clear_pending_oauth(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.delenv("OPENAI_ACCOUNT_ID", raising=False)
     provider_service._PENDING_OAUTH.clear()
     provider_service.provider_auth_service._RECENT_OAUTH_COMPLETIONS.clear()
+    # OAuth clients are pooled; drop them so each test builds its own fake.
+    ConnectionPoolManager._instance = None
     yield
+    ConnectionPoolManager._instance = None
     provider_service._PENDING_OAUTH.clear()
     provider_service.provider_auth_service._RECENT_OAUTH_COMPLETIONS.clear()
 
@@ -58,7 +62,7 @@ async def test_provider_oauth_authorize_headless_sets_pending_state(
     calls: list[str] = []
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -232,7 +236,7 @@ async def test_provider_oauth_callback_persists_oauth_record(
     calls: list[str] = []
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -304,7 +308,7 @@ async def test_provider_oauth_respects_client_id_env_override(
     seen: dict[str, str] = {}
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -386,7 +390,7 @@ async def test_provider_oauth_refresh_updates_credentials(
     calls: list[str] = []
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -451,7 +455,7 @@ async def test_provider_oauth_refresh_reuses_fresh_persisted_credentials(
     calls: list[str] = []
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -12,6 +12,7 @@ from typing import Any, cast
 
 import pytest
 
+import penguin.web.services.session_view as session_view_module
 from penguin.system.session_manager import SessionManager
 from penguin.system.state import Message, MessageCategory, Session
 from penguin.web.services.session_summary import summarize_session_title
@@ -29,6 +30,7 @@ from penguin.web.services.session_view import (
     VARIANT_KEY,
     create_session_info,
     get_session_diff,
+    get_session_diff_async,
     get_session_info,
     get_session_messages,
     get_session_title_source,
@@ -2146,3 +2148,101 @@ def test_get_session_diff_git_fallback_skips_unreadable_untracked_files(
     by_file = {diff["file"]: diff for diff in diffs}
     assert "missing.md" not in by_file
     assert by_file["visible.md"]["after"] == "visible\n"
+
+
+def _git_repo_with_history(repo: Path) -> None:
+    repo.mkdir()
+    for args in (
+        ["init"],
+        ["config", "user.email", "penguin@example.com"],
+        ["config", "user.name", "Penguin"],
+    ):
+        subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+    (repo / "src").mkdir()
+    for index in range(30):
+        (repo / "src" / f"module_{index}.py").write_text(
+            f"value = {index}\n", encoding="utf-8"
+        )
+    (repo / "name with spaces.txt").write_text("before\n", encoding="utf-8")
+    (repo / "gone.txt").write_text("a\nb\n", encoding="utf-8")
+    (repo / "logo.bin").write_bytes(b"\x00\x01\x02")
+    subprocess.run(["git", "add", "."], cwd=repo, check=True, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-m", "base"], cwd=repo, check=True, capture_output=True
+    )
+
+
+def _count_git_calls(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    calls: list[list[str]] = []
+    original_run = subprocess.run
+
+    def _run(args: Any, *rest: Any, **kwargs: Any) -> Any:
+        if isinstance(args, list) and args[:1] == ["git"]:
+            calls.append(args[1:])
+        return original_run(args, *rest, **kwargs)
+
+    monkeypatch.setattr(session_view_module.subprocess, "run", _run)
+    return calls
+
+
+def test_get_session_diff_git_fallback_runs_one_diff_and_caches_quiet_trees(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    repo = tmp_path / "repo"
+    _git_repo_with_history(repo)
+    for index in range(30):
+        (repo / "src" / f"module_{index}.py").write_text(
+            f"value = {index + 1}\n", encoding="utf-8"
+        )
+    (repo / "name with spaces.txt").write_text("after\nmore\n", encoding="utf-8")
+    (repo / "gone.txt").unlink()
+    (repo / "logo.bin").write_bytes(b"\x00\x03")
+    (repo / "big.log").write_text("x\n" * 200_000, encoding="utf-8")
+    session = _session("session_git_single", "Git Diff", "2026-02-03T00:00:00")
+    session.metadata["directory"] = str(repo / "src")
+    core = _core([session])
+    calls = _count_git_calls(monkeypatch)
+
+    diffs = get_session_diff(core, session.id)
+
+    assert diffs is not None
+    assert sum(1 for call in calls if "diff" in call) == 1
+    by_file = {diff["file"]: diff for diff in diffs}
+    assert len(by_file) == 34
+    assert (by_file["src/module_7.py"]["additions"], by_file["src/module_7.py"]["deletions"]) == (1, 1)
+    assert "+value = 8" in by_file["src/module_7.py"]["after"]
+    assert "src/module_8.py" not in by_file["src/module_7.py"]["after"]
+    assert by_file["name with spaces.txt"]["additions"] == 2
+    assert by_file["gone.txt"]["deletions"] == 2
+    assert "Binary files" in by_file["logo.bin"]["after"]
+    # Oversized untracked files are listed without their content
+    assert by_file["big.log"]["after"] == ""
+
+    # Polling an unchanged tree does not start git at all
+    calls.clear()
+    assert get_session_diff(core, session.id) == diffs
+    assert calls == []
+
+    (repo / "src" / "module_0.py").write_text("value = 'changed'\n", encoding="utf-8")
+    (repo / "src" / "fresh.py").write_text("new = True\n", encoding="utf-8")
+    updated = get_session_diff(core, session.id)
+    assert updated is not None
+    by_file = {diff["file"]: diff for diff in updated}
+    assert "+value = 'changed'" in by_file["src/module_0.py"]["after"]
+    assert by_file["src/fresh.py"]["after"] == "new = True\n"
+
+
+async def test_get_session_diff_async_matches_sync(tmp_path: Path):
+    repo = tmp_path / "repo"
+    _git_repo_with_history(repo)
+    (repo / "gone.txt").write_text("a\nc\n", encoding="utf-8")
+    session = _session("session_git_async", "Git Diff", "2026-02-03T00:00:00")
+    session.metadata["directory"] = str(repo)
+    core = _core([session])
+
+    diffs = await get_session_diff_async(core, session.id)
+
+    assert diffs == get_session_diff(core, session.id)
+    assert diffs is not None and [diff["file"] for diff in diffs] == ["gone.txt"]
+    assert await get_session_diff_async(core, "missing") is None
@@ -488,3 +488,49 @@ async def test_tool_call_ids_are_scoped_by_session() -> None:
     assert adapters["session_b"].ends == []
     assert owner._opencode_tool_parts == {"session_b:call_shared": "part_session_b"}
     assert set(owner._opencode_tool_info) == {"session_b:call_shared"}
+
+
+@pytest.mark.asyncio
+async def test_handle_tui_action_output_streams_into_running_tool_part() -> None:
+    from penguin.tui_adapter.part_events import PartEventAdapter
+
+    persisted: list[str] = []
+
+    async def _persist(event_type: str, properties: dict[str, Any]) -> None:
+        persisted.append(event_type)
+
+    bus = _EventBus()
+    adapter = PartEventAdapter(bus, persist_callback=_persist)
+    adapter.set_session("session_1")
+    part_id = await adapter.on_tool_start("bash", {"command": "make"}, tool_call_id="call_1")
+    owner = SimpleNamespace(
+        _opencode_tool_parts={"session_1:call_1": part_id},
+        _get_tui_adapter=lambda _session_id: adapter,
+    )
+    persisted.clear()
+    bus.events.clear()
+
+    for chunk in ("building\n", "done\n"):
+        await action_events.handle_tui_action_output(
+            owner,
+            "action_output",
+            {"session_id": "session_1", "id": "call_1", "stream": "stdout", "chunk": chunk},
+        )
+    # Output for an unknown call is ignored
+    await action_events.handle_tui_action_output(
+        owner,
+        "action_output",
+        {"session_id": "session_1", "id": "call_2", "chunk": "stray"},
+    )
+
+    parts = [
+        data["properties"]["part"]
+        for _, data in bus.events
+        if data.get("type") == "message.part.updated"
+    ]
+    assert [part["state"]["metadata"]["output"] for part in parts] == [
+        "building\n",
+        "building\ndone\n",
+    ]
+    assert all(part["state"]["status"] == "running" for part in parts)
+    assert persisted == []
@@ -133,6 +133,7 @@ def test_subscribe_to_stream_events_initializes_tui_bridge_state() -> None:
     )
     owner._on_tui_stream_chunk = object()
     owner._on_tui_action = object()
+    owner._on_tui_action_output = object()
     owner._on_tui_action_result = object()
     owner._on_tui_lsp_updated = object()
     owner._on_tui_lsp_diagnostics = object()
@@ -147,6 +148,7 @@ def test_subscribe_to_stream_events_initializes_tui_bridge_state() -> None:
     assert event_bus.subscriptions == [
         ("stream_chunk", owner._on_tui_stream_chunk),
         ("action", owner._on_tui_action),
+        ("action_output", owner._on_tui_action_output),
         ("action_result", owner._on_tui_action_result),
         ("lsp.updated", owner._on_tui_lsp_updated),
         ("lsp.client.diagnostics", owner._on_tui_lsp_diagnostics),
@@ -154,6 +156,7 @@ def test_subscribe_to_stream_events_initializes_tui_bridge_state() -> None:
     ]
     assert owner._tui_stream_handler is owner._on_tui_stream_chunk
     assert owner._tui_action_handler is owner._on_tui_action
+    assert owner._tui_action_output_handler is owner._on_tui_action_output
     assert owner._tui_action_result_handler is owner._on_tui_action_result
     assert owner._tui_lsp_updated_handler is owner._on_tui_lsp_updated
     assert owner._tui_lsp_diagnostics_handler is owner._on_tui_lsp_diagnostics
@@ -143,7 +143,7 @@ class FakeCodexTransport:
         transport = self
 
         class _FakeAsyncClient:
-            def __init__(self, timeout: Any) -> None:
+            def __init__(self, timeout: Any, **pool_kwargs: Any) -> None:
                 self.timeout = timeout
                 transport.timeouts.append(timeout)
 
@@ -375,5 +375,119 @@ class TestAsyncInstance:
         assert manager_sync is manager_async
 
 
+# =============================================================================
+# LOCAL STUB SERVER TESTS
+# =============================================================================
+
+
+@pytest.fixture
+def stub_server():
+    """Keep-alive HTTP/1.1 server that records the client port of each request."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class SeenPorts(list):
+        cookie_headers: list = []
+
+    seen_ports = SeenPorts()
+    seen_ports.cookie_headers = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            seen_ports.append(self.client_address[1])
+            seen_ports.cookie_headers.append(self.headers.get("Cookie"))
+            body = b'{"ok": true}'
+            self.send_response(200 if self.path != "/missing" else 404)
+            if self.path == "/login":
+                self.send_header("Set-Cookie", "session=user-a; Path=/")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", seen_ports
+    server.shutdown()
+    server.server_close()
+
+
+class TestStubServer:
+    """Exercise real pooled clients against a local server."""
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_one_connection_and_report_stats(self, stub_server):
+        base_url, seen_ports = stub_server
+        manager = ConnectionPoolManager.get_instance()
+
+        for path in ("/a", "/b", "/missing"):
+            async with manager.client_context(base_url) as client:
+                await client.get(f"{base_url}{path}")
+
+        assert len(seen_ports) == 3
+        assert len(set(seen_ports)) == 1
+
+        stats = manager.get_stats()[base_url]
+        assert stats["requests"] == 3
+        assert stats["responses"] == 3
+        assert stats["errors"] == 1
+        assert stats["connections"] == {"open": 1, "idle": 1}
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_auth_modes_get_separate_pools(self, stub_server):
+        base_url, seen_ports = stub_server
+        manager = ConnectionPoolManager.get_instance()
+
+        plain = await manager.get_client(base_url)
+        oauth = await manager.get_client(base_url, auth_mode="oauth", timeout=5.0)
+        await plain.get(f"{base_url}/a")
+        await oauth.get(f"{base_url}/a")
+
+        assert plain is not oauth
+        assert oauth.timeout.connect == 5.0
+        assert set(manager.get_stats()) == {base_url, f"{base_url}#oauth"}
+        assert len(set(seen_ports)) == 2
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_pooled_clients_do_not_carry_cookies_between_callers(self, stub_server):
+        base_url, seen_ports = stub_server
+        manager = ConnectionPoolManager.get_instance()
+
+        async with manager.client_context(base_url) as client:
+            await client.get(f"{base_url}/login")
+        async with manager.client_context(base_url) as client:
+            await client.get(f"{base_url}/a")
+            await client.get(f"{base_url}/a", headers={"Cookie": "explicit=1"})
+
+        assert seen_ports.cookie_headers == [None, None, "explicit=1"]
+        assert len(client.cookies) == 0
+        await manager.close_all()
+
+    def test_client_from_closed_loop_is_replaced(self, stub_server):
+        base_url, _ = stub_server
+        manager = ConnectionPoolManager.get_instance()
+
+        async def fetch():
+            client = await manager.get_client(base_url)
+            await client.get(f"{base_url}/a")
+            return client
+
+        first = asyncio.run(fetch())
+        assert manager.get_stats()[base_url]["active"] is False
+        second = asyncio.run(fetch())
+
+        assert second is not first
+        assert manager.get_stats()[base_url]["requests"] == 1
+        asyncio.run(manager.close_all())
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
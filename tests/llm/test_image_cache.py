@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import base64
+
+import pytest
+from PIL import Image
+
+from penguin.llm.image_cache import (
+    DEFAULT_IMAGE_TOKEN_ESTIMATE,
+    ImagePreprocessCache,
+    estimate_image_tokens,
+)
+from penguin.system.context_window import ContextWindowManager
+
+
+def _write_png(path, size=(2048, 1024)) -> None:
+    Image.new("RGB", size, color=(10, 200, 30)).save(path)
+
+
+@pytest.mark.asyncio
+async def test_image_cache_encodes_once_and_reuses_memory_and_disk(tmp_path) -> None:
+    image_path = tmp_path / "shot.png"
+    _write_png(image_path)
+    cache = ImagePreprocessCache(cache_dir=tmp_path / "cache")
+
+    first = await cache.aencode_path(str(image_path))
+    second = await cache.aencode_path(str(image_path))
+
+    assert first is not None and second is first
+    assert first.data_uri.startswith("data:image/jpeg;base64,")
+    assert base64.b64decode(first.data)[:3] == b"\xff\xd8\xff"
+    assert (first.width, first.height) == (1024, 512)
+    assert (first.source_width, first.source_height) == (2048, 1024)
+    assert cache.stats == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+
+    fresh = ImagePreprocessCache(cache_dir=tmp_path / "cache")
+    from_disk = fresh.encode_path(str(image_path))
+    assert from_disk == first
+    assert fresh.stats["disk_hits"] == 1
+    cache.shutdown()
+
+
+def test_image_cache_keys_on_content_not_path(tmp_path) -> None:
+    cache = ImagePreprocessCache(cache_dir=tmp_path / "cache")
+    original = tmp_path / "a.png"
+    _write_png(original, size=(64, 64))
+    copy = tmp_path / "b.png"
+    copy.write_bytes(original.read_bytes())
+
+    assert cache.encode_path(str(original)) == cache.encode_path(str(copy))
+    assert cache.stats["misses"] == 1
+
+    keep_format = cache.encode_path(str(original), output_format=None)
+    assert keep_format.media_type == "image/png"
+    assert base64.b64decode(keep_format.data)[:4] == b"\x89PNG"
+
+
+def test_context_window_budgets_images_from_dimensions(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("PENGUIN_CACHE_DIR", str(tmp_path / "cache"))
+    small = tmp_path / "small.png"
+    _write_png(small, size=(200, 100))
+    cwm = ContextWindowManager(token_counter=lambda content: len(str(content)) // 4)
+
+    tokens = cwm._count_content_tokens(
+        [{"type": "image_url", "image_path": str(small)}]
+    )
+
+    assert tokens == estimate_image_tokens(200, 100)
+    assert tokens < DEFAULT_IMAGE_TOKEN_ESTIMATE
+    assert (
+        cwm._count_content_tokens(
+            [{"type": "image_url", "image_url": {"url": "https://example.com/x.png"}}]
+        )
+        == DEFAULT_IMAGE_TOKEN_ESTIMATE
+    )
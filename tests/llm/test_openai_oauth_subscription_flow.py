@@ -8,6 +8,7 @@ import httpx
 import pytest
 
 from penguin.llm.adapters.openai import OpenAIAdapter
+from penguin.llm.api_client import ConnectionPoolManager
 from penguin.llm.contracts import (
     ErrorCategory,
     LLMProviderError,
@@ -31,6 +32,14 @@ from .codex_oauth_fixtures import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_connection_pool() -> Any:
+    """Codex clients are pooled, so each test must build its own fake client."""
+    ConnectionPoolManager._instance = None
+    yield
+    ConnectionPoolManager._instance = None
+
+
 @pytest.mark.asyncio
 async def test_oauth_request_uses_stored_record_without_env_access(
     monkeypatch: pytest.MonkeyPatch,
@@ -57,7 +66,7 @@ async def test_oauth_request_uses_stored_record_without_env_access(
     seen: dict[str, Any] = {}
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: Any) -> None:
+        def __init__(self, timeout: Any, **pool_kwargs: Any) -> None:
             self.timeout = timeout
             seen["timeout"] = timeout
 
@@ -130,7 +139,7 @@ async def test_oauth_request_routes_to_codex_with_required_headers(
     seen: dict[str, Any] = {}
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: Any) -> None:
+        def __init__(self, timeout: Any, **pool_kwargs: Any) -> None:
             self.timeout = timeout
             seen["timeout"] = timeout
 
@@ -230,7 +239,7 @@ async def test_oauth_request_preserves_requested_model_id(
     seen: dict[str, Any] = {}
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -293,7 +302,7 @@ async def test_oauth_request_normalizes_responses_function_tools(
     seen: dict[str, Any] = {}
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -376,7 +385,7 @@ async def test_oauth_stream_records_reasoning_debug_snapshot(
     )
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -471,7 +480,7 @@ async def test_oauth_request_includes_reasoning_summary_auto_and_encrypted_conte
     seen: dict[str, Any] = {}
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -536,7 +545,7 @@ async def test_oauth_stream_extracts_reasoning_from_output_item_done_summary(
     )
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -1126,7 +1135,7 @@ async def test_oauth_request_refreshes_before_codex_call(
     seen: dict[str, Any] = {}
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -1247,7 +1256,7 @@ async def test_oauth_codex_status_error_emits_diag_and_trace(
     )
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: float) -> None:
+        def __init__(self, timeout: float, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -1581,7 +1590,7 @@ async def test_oauth_codex_incomplete_stream_does_not_lock_next_turn(
     ]
 
     class _FakeAsyncClient:
-        def __init__(self, timeout: Any) -> None:
+        def __init__(self, timeout: Any, **pool_kwargs: Any) -> None:
             self.timeout = timeout
 
         async def __aenter__(self) -> _FakeAsyncClient:
@@ -0,0 +1,216 @@
+"""Tests for running AgentExecutor agents in worker processes.
+
+The runners below stand in for an LLM: they are imported by the spawned
+workers, stream a few events, and call tools back through the parent.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from penguin.multi.executor import AgentExecutor
+from penguin.multi.worker_pool import (
+    AgentWorkerPool,
+    WorkerError,
+    WorkerJob,
+    route_tools_to_parent,
+    save_session_in_parent,
+)
+from penguin.system.session_manager import SessionManager, set_session_writer
+from penguin.system.state import MessageCategory, create_message
+
+RUNNER = f"{__name__}:mock_llm_runner"
+
+
+async def mock_llm_runner(job: WorkerJob) -> Dict[str, Any]:
+    """Fake LLM turn: stream tokens, optionally call a tool, optionally hang."""
+    job.state["turns"] = job.state.get("turns", 0) + 1
+    for token in job.prompt.split():
+        job.emit({"type": "stream_chunk", "chunk": token})
+    if job.prompt.startswith("hang"):
+        await asyncio.sleep(60)
+    if job.prompt.startswith("fail"):
+        raise ValueError("mock model error")
+    tool_output = None
+    if job.prompt.startswith("tool"):
+        tool_output = await job.call_tool("read_file", {"path": "README.md"})
+    return {
+        "assistant_response": f"done: {job.prompt}",
+        "pid": os.getpid(),
+        "turns": job.state["turns"],
+        "tool_output": tool_output,
+    }
+
+
+class _WorkerTools:
+    """Worker-side tool manager; running a tool here would be a bug."""
+
+    def execute_tool(self, name, arguments, context=None):
+        raise AssertionError("tool ran in the worker")
+
+    async def execute_tool_async(self, name, arguments, context=None):
+        raise AssertionError("tool ran in the worker")
+
+
+async def bridged_runner(job: WorkerJob) -> Dict[str, Any]:
+    """Wires a worker the way run_core_agent does, without an LLM."""
+    set_session_writer(save_session_in_parent)
+    tools = _WorkerTools()
+    route_tools_to_parent(tools)
+    manager = SessionManager(base_path=job.metadata["sessions"], auto_save_interval=0)
+    session = manager.create_session()
+    session.add_message(create_message(
+        role="user", content=job.prompt, category=MessageCategory.DIALOG
+    ))
+    outputs = [
+        tools.execute_tool("read_file", {"path": "sync.md"}),
+        await tools.execute_tool_async("read_file", {"path": "async.md"}),
+    ]
+    assert manager.save_session(session)
+    return {"session_id": session.id, "outputs": outputs}
+
+
+class _ToolManager:
+    def __init__(self):
+        self.calls: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = []
+
+    async def execute_tool_async(self, name, arguments, context=None):
+        self.calls.append((name, arguments, context))
+        return f"contents of {arguments['path']}"
+
+
+class _Core:
+    def __init__(self):
+        self.tool_manager = _ToolManager()
+
+
+@pytest.fixture
+async def pooled_executor():
+    events: List[Tuple[str, Dict[str, Any]]] = []
+    core = _Core()
+    pool = AgentWorkerPool(2, runner=RUNNER)
+    executor = AgentExecutor(
+        core,
+        max_concurrent=4,
+        worker_pool=pool,
+        on_event=lambda agent_id, event: events.append((agent_id, event)),
+    )
+    await pool.start()
+    executor.events = events
+    executor.core = core
+    yield executor
+    await executor.shutdown()
+
+
+async def test_pooled_agents_stream_events_and_call_tools(pooled_executor):
+    executor = pooled_executor
+    await executor.spawn_agents([
+        ("writer", "write a poem"),
+        ("reader", "tool read please"),
+    ])
+    await executor.wait_for_all()
+
+    assert executor.get_status("writer")["state"] == "completed"
+    assert "done: write a poem" in executor.get_status("writer")["result"]
+    chunks = [e["chunk"] for aid, e in executor.events if aid == "writer"]
+    assert chunks == ["write", "a", "poem"]
+
+    assert "contents of README.md" in executor.get_status("reader")["result"]
+    assert executor.core.tool_manager.calls == [
+        ("read_file", {"path": "README.md"}, {"agent_id": "reader"})
+    ]
+    assert {w["pid"] for w in executor.get_stats()["workers"]} != {os.getpid()}
+
+
+async def test_agents_stick_to_their_worker(pooled_executor):
+    pool = pooled_executor.worker_pool
+    first = [await pool.run(f"agent-{i}", "hello") for i in range(4)]
+    second = [await pool.run(f"agent-{i}", "again") for i in range(4)]
+
+    assert [r["pid"] for r in first] == [r["pid"] for r in second]
+    assert len({r["pid"] for r in first}) == 2
+    # Per-agent state lives on in the worker between runs
+    assert [r["turns"] for r in second] == [2, 2, 2, 2]
+
+
+async def test_cancellation_and_failures_cross_the_process_boundary(pooled_executor):
+    executor = pooled_executor
+    await executor.spawn_agent("slow", "hang forever")
+    await executor.spawn_agent("broken", "fail now")
+    while not any(aid == "slow" for aid, _ in executor.events):
+        await asyncio.sleep(0.01)
+
+    assert await executor.cancel("slow")
+    await executor.wait_for("broken")
+    assert executor.get_status("slow")["state"] == "cancelled"
+    assert executor.get_status("broken")["state"] == "failed"
+    assert "mock model error" in executor.get_status("broken")["error"]
+
+    # The worker that ran the cancelled job is still healthy
+    result = await executor.worker_pool.run("slow", "after cancel")
+    assert result["assistant_response"] == "done: after cancel"
+
+
+async def test_dead_worker_fails_its_jobs_and_respawns():
+    pool = AgentWorkerPool(1, runner=RUNNER)
+    try:
+        job = asyncio.create_task(pool.run("victim", "hang"))
+        while not pool.status()[0]["active_jobs"]:
+            await asyncio.sleep(0.01)
+        old_pid = pool.status()[0]["pid"]
+        pool._workers[0].process.kill()
+        with pytest.raises(WorkerError):
+            await job
+
+        result = await pool.run("victim", "back again")
+        assert result["pid"] != old_pid
+    finally:
+        await pool.close()
+
+
+async def test_state_counts_are_maintained_without_scanning():
+    gate = asyncio.Event()
+
+    class _SlowCore:
+        async def process(self, input_data, agent_id=None):
+            await gate.wait()
+            return {"assistant_response": agent_id}
+
+    executor = AgentExecutor(_SlowCore(), max_concurrent=2)
+    await executor.spawn_agents([(f"a{i}", "go") for i in range(5)])
+    await asyncio.sleep(0.01)
+    assert (executor.running_count, executor.pending_count) == (2, 3)
+
+    assert await executor.cancel("a4")
+    gate.set()
+    await executor.wait_for_all()
+    counts = executor.get_stats()["state_counts"]
+    assert counts["completed"] == 4 and counts["cancelled"] == 1
+    assert executor.running_count == executor.pending_count == 0
+
+    assert executor.cleanup_all() == 5
+    assert set(executor.get_stats()["state_counts"].values()) == {0}
+
+
+async def test_worker_tools_and_session_writes_run_in_the_parent(tmp_path):
+    core = _Core()
+    pool = AgentWorkerPool(1, runner=f"{__name__}:bridged_runner")
+    executor = AgentExecutor(core, worker_pool=pool)
+    try:
+        result = await pool.run("scribe", "remember this", {"sessions": str(tmp_path)})
+    finally:
+        await executor.shutdown()
+
+    assert result["outputs"] == ["contents of sync.md", "contents of async.md"]
+    assert [call[:2] for call in core.tool_manager.calls] == [
+        ("read_file", {"path": "sync.md"}),
+        ("read_file", {"path": "async.md"}),
+    ]
+    # The worker never writes; both files come from the parent's SessionManager
+    saved = json.loads((tmp_path / f"{result['session_id']}.json").read_text())
+    assert saved["messages"][0]["content"] == "remember this"
+    index = json.loads((tmp_path / "session_index.json").read_text())
+    assert index[result["session_id"]]["first_prompt"] == "remember this"
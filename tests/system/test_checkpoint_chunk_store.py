@@ -0,0 +1,172 @@
+"""
+Tests for delta-encoded, content-addressed checkpoints.
+
+These tests verify that:
+1. Checkpoint manifests only list messages added since their parent
+2. Message blobs are stored once and shared across checkpoints
+3. Restores, restarts and retention cleanup keep every checkpoint loadable
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from penguin.system.checkpoint_manager import (
+    CheckpointManager,
+    CheckpointMetadata,
+    CheckpointType,
+)
+from penguin.system.checkpoint_store import read_gzip_json
+from penguin.system.state import Message, MessageCategory, Session
+
+
+def _manager(tmp_path):
+    session_manager = SimpleNamespace(
+        session_index={}, load_session=lambda session_id: None, current_session=None
+    )
+    return CheckpointManager(tmp_path, session_manager)
+
+
+async def _checkpoint(manager, session, cp_type=CheckpointType.AUTO):
+    metadata = CheckpointMetadata(
+        id=f"cp_{len(manager.checkpoint_index):04d}",
+        type=cp_type,
+        created_at=f"2026-01-01T00:00:{len(manager.checkpoint_index):02d}",
+        session_id=session.id,
+        message_id=session.messages[-1].id,
+        message_count=len(session.messages),
+    )
+    await manager._create_checkpoint_file(session, metadata)
+    return metadata.id
+
+
+def _blob_count(manager):
+    return sum(1 for _ in manager.chunk_store.root.glob("*/*.json.gz"))
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_store_only_new_messages(tmp_path):
+    manager = _manager(tmp_path)
+    session = Session()
+    ids = []
+    for i in range(20):
+        session.add_message(Message("user", f"message {i}", MessageCategory.DIALOG))
+        ids.append(await _checkpoint(manager, session))
+
+    last = read_gzip_json(manager._checkpoint_file(ids[-1]))
+    assert last["parent"] == ids[-2]
+    assert last["messages"] == [manager._store_message(session.messages[-1])]
+    assert _blob_count(manager) == 20
+
+    restored = await manager._load_checkpoint_session(ids[4])
+    assert [m.content for m in restored.messages] == [f"message {i}" for i in range(5)]
+    assert restored.id == session.id
+
+
+@pytest.mark.asyncio
+async def test_restart_replays_journal_and_continues_chain(tmp_path):
+    manager = _manager(tmp_path)
+    session = Session()
+    for i in range(3):
+        session.add_message(Message("user", f"m{i}", MessageCategory.DIALOG))
+        last_id = await _checkpoint(manager, session)
+
+    reopened = _manager(tmp_path)
+    assert set(reopened.checkpoint_index) == set(manager.checkpoint_index)
+
+    session.add_message(Message("assistant", "after restart", MessageCategory.DIALOG))
+    new_id = await _checkpoint(reopened, session)
+    manifest = read_gzip_json(reopened._checkpoint_file(new_id))
+    assert manifest["parent"] == last_id
+    assert len(manifest["messages"]) == 1
+
+    restored = await reopened._load_checkpoint_session(new_id)
+    assert [m.content for m in restored.messages] == ["m0", "m1", "m2", "after restart"]
+
+
+@pytest.mark.asyncio
+async def test_deleting_parents_rebases_children_and_sweeps_blobs(tmp_path):
+    manager = _manager(tmp_path)
+    session = Session()
+    session.add_message(Message("user", "keep", MessageCategory.DIALOG))
+    first = await _checkpoint(manager, session)
+    session.add_message(Message("assistant", "discarded", MessageCategory.DIALOG))
+    middle = await _checkpoint(manager, session)
+
+    # Diverge: drop the last message and continue differently
+    session.messages.pop()
+    session.add_message(Message("assistant", "replacement", MessageCategory.DIALOG))
+    last = await _checkpoint(manager, session)
+    assert _blob_count(manager) == 3
+
+    await manager._delete_checkpoint(middle)
+    assert manager.checkpoint_index[last].parent_checkpoint == first
+    assert manager._collect_garbage() == 1
+
+    await manager._delete_checkpoint(first)
+    manager._resolved.clear()
+    restored = await manager._load_checkpoint_session(last)
+    assert [m.content for m in restored.messages] == ["keep", "replacement"]
+    assert manager._collect_garbage() == 0
+
+
+@pytest.mark.asyncio
+async def test_in_place_message_edits_reach_the_next_checkpoint(tmp_path):
+    manager = _manager(tmp_path)
+    session = Session()
+    session.add_message(Message("assistant", "calling a tool", MessageCategory.DIALOG))
+    await _checkpoint(manager, session)
+
+    # Same id, content length, tokens and timestamp; only metadata changes
+    session.messages[0].metadata["tool_calls"] = [{"id": "call_1", "name": "read_file"}]
+    edited = await _checkpoint(manager, session)
+
+    manager._resolved.clear()
+    restored = await manager._load_checkpoint_session(edited)
+    assert restored.messages[0].metadata["tool_calls"] == [
+        {"id": "call_1", "name": "read_file"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_history_is_not_serialized_again(tmp_path, monkeypatch):
+    manager = _manager(tmp_path)
+    put = manager.chunk_store.put
+    stored = []
+    monkeypatch.setattr(
+        manager.chunk_store, "put", lambda data: stored.append(data["id"]) or put(data)
+    )
+    session = Session()
+    for i in range(30):
+        session.add_message(Message("user", f"message {i}", MessageCategory.DIALOG))
+        await _checkpoint(manager, session)
+    assert stored == [m.id for m in session.messages]
+
+    session.messages[3].metadata["edited"] = True
+    session.messages[5].content = "rewritten"
+    await _checkpoint(manager, session)
+    assert stored[30:] == [session.messages[3].id, session.messages[5].id]
+
+
+@pytest.mark.asyncio
+async def test_failed_rebase_keeps_the_parent_checkpoint(tmp_path, monkeypatch):
+    manager = _manager(tmp_path)
+    session = Session()
+    session.add_message(Message("user", "one", MessageCategory.DIALOG))
+    first = await _checkpoint(manager, session)
+    session.add_message(Message("user", "two", MessageCategory.DIALOG))
+    second = await _checkpoint(manager, session)
+
+    def _broken_write(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(
+        "penguin.system.checkpoint_manager.write_gzip_json_atomic", _broken_write
+    )
+    assert await manager._delete_checkpoint(first) is False
+    assert first in manager.checkpoint_index
+    assert manager._checkpoint_file(first).exists()
+
+    manager._resolved.clear()
+    restored = await manager._load_checkpoint_session(second)
+    assert [m.content for m in restored.messages] == ["one", "two"]
@@ -0,0 +1,81 @@
+"""Tests for the SQLite journal index behind JournalManager."""
+
+from penguin.system.journal_index import INDEX_FILENAME
+from penguin.system.journal_manager import JournalEntry, JournalManager
+
+
+def _write_day(journal_dir, date, entries):
+    text = "".join(
+        JournalEntry(
+            timestamp=f"{date}T10:00:{i:02d}",
+            entry_type=entry_type,
+            session_id=session_id,
+            agent_id=agent_id,
+            tokens=0,
+            content=content,
+        ).to_yaml_frontmatter()
+        for i, (content, entry_type, session_id, agent_id) in enumerate(entries)
+    )
+    (journal_dir / f"{date}.md").write_text(text, encoding="utf-8")
+
+
+def test_search_is_ranked_filtered_and_follows_files(tmp_path):
+    manager = JournalManager(tmp_path)
+    journal_dir = manager.journal_dir
+    _write_day(
+        journal_dir,
+        "2026-01-05",
+        [
+            ("Fixed the authentication bug in login", "note", "s1", "penguin"),
+            ("Lunch", "note", "s1", "penguin"),
+        ],
+    )
+    _write_day(
+        journal_dir,
+        "2026-02-10",
+        [("authentication authentication refactor", "decision", "s2", "reviewer")],
+    )
+
+    results = manager.search("authentic")
+    assert [r["date"] for r in results] == ["2026-02-10", "2026-01-05"]
+    assert manager.search("authentication", agent_id="penguin")[0]["session_id"] == "s1"
+    assert [r["date"] for r in manager.search("auth", date_from="2026-02-01")] == ["2026-02-10"]
+    assert manager.search('quote " and (parens)') == []
+
+    # Rewritten and deleted files are picked up on the next search
+    _write_day(journal_dir, "2026-01-05", [("Rewrote everything", "note", "s1", "penguin")])
+    (journal_dir / "2026-02-10.md").unlink()
+    assert manager.search("authentication") == []
+    assert [r["content"] for r in manager.search("rewrote")] == ["Rewrote everything"]
+
+
+def test_appends_update_index_incrementally_and_rebuild(tmp_path):
+    manager = JournalManager(tmp_path)
+    for i in range(5):
+        assert manager.write_entry(f"entry number {i}", session_id="cli")
+
+    tail = manager.read_last_entries(2)
+    assert [e.content for e in tail] == ["entry number 3", "entry number 4"]
+    assert manager.index.entry_count() == 5
+
+    # The index is a disposable cache: deleting it loses nothing
+    manager.index.close()
+    (manager.journal_dir / INDEX_FILENAME).unlink()
+    fresh = JournalManager(tmp_path)
+    assert [r["content"] for r in fresh.search("number 2")] == ["entry number 2"]
+    assert fresh.rebuild_index() == 5
+    assert len(fresh.read_last_entries(50)) == 5
+
+
+def test_index_files_are_gitignored_once(tmp_path):
+    journal_dir = tmp_path / "context" / "journal"
+    journal_dir.mkdir(parents=True)
+    (journal_dir / ".gitignore").write_text("drafts/", encoding="utf-8")
+
+    for _ in range(2):
+        manager = JournalManager(tmp_path)
+        assert manager.index is not None
+        manager.index.close()
+
+    lines = (journal_dir / ".gitignore").read_text(encoding="utf-8").splitlines()
+    assert lines == ["drafts/", f"{INDEX_FILENAME}*"]
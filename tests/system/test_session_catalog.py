@@ -0,0 +1,89 @@
+"""Tests for the last_active-ordered session catalog behind list_sessions."""
+
+import json
+import random
+
+from penguin.system.session_catalog import SessionCatalog
+from penguin.system.session_manager import SessionManager
+from penguin.system.state import MessageCategory, create_message
+
+
+def _entry(last_active: str, **extra):
+    return {"last_active": last_active, "title": "t", **extra}
+
+
+def test_catalog_stays_ordered_under_writes_and_deletes():
+    rng = random.Random(3)
+    catalog = SessionCatalog()
+    expected = {}
+    for step in range(2000):
+        session_id = f"s{rng.randrange(300)}"
+        if rng.random() < 0.2 and session_id in catalog:
+            del catalog[session_id]
+            expected.pop(session_id)
+        else:
+            stamp = f"2026-01-01T00:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+            catalog[session_id] = _entry(stamp)
+            expected[session_id] = stamp
+    newest_first = sorted(expected, key=lambda sid: (expected[sid], sid), reverse=True)
+
+    assert list(catalog.newest()) == newest_first
+    assert [sid for sid, _ in catalog.page(25, 10)] == newest_first[10:35]
+    assert catalog.page(10, len(expected)) == []
+
+
+def test_catalog_filters_by_directory_agent_and_parent():
+    catalog = SessionCatalog({
+        "a": _entry("2026-01-04", directory="/work/repo", agent_id="default"),
+        "b": _entry("2026-01-03", directory="/work/repo/", agent_id="reviewer", parentID="a"),
+        "c": _entry("2026-01-02", directory="/work/other", agent_id="default", parent_id="a"),
+        "d": _entry("2026-01-01"),
+    })
+
+    assert [sid for sid, _ in catalog.page(directory="/work/repo")] == ["a", "b"]
+    assert [sid for sid, _ in catalog.page(agent_id="default")] == ["a", "c"]
+    assert [sid for sid, _ in catalog.page(parent_id="a")] == ["b", "c"]
+    assert [sid for sid, _ in catalog.page(1, 1, parent_id="a")] == ["c"]
+
+
+def test_list_sessions_uses_cached_first_prompt(tmp_path):
+    manager = SessionManager(base_path=str(tmp_path), auto_save_interval=0)
+    sessions = []
+    for index in range(5):
+        session = manager.create_session()
+        session.metadata["title"] = ""
+        session.add_message(create_message(
+            role="user",
+            content=f"Question number {index}\nwith details",
+            category=MessageCategory.DIALOG,
+        ))
+        assert manager.save_session(session)
+        sessions.append(session)
+
+    listed = manager.list_sessions(limit=2)
+    assert [item["id"] for item in listed] == [sessions[4].id, sessions[3].id]
+    assert listed[0]["title"] == "Question number 4"
+
+    # A fresh manager lists from the persisted index without opening sessions
+    reloaded = SessionManager(base_path=str(tmp_path), auto_save_interval=0)
+    session_file = tmp_path / f"{sessions[0].id}.json"
+    data = json.loads(session_file.read_text())
+    data["messages"] = []
+    session_file.write_text(json.dumps(data))
+    assert reloaded.list_sessions(limit=1, offset=4)[0]["title"] == "Question number 0"
+
+
+def test_list_sessions_backfills_first_prompt_for_old_index_entries(tmp_path):
+    manager = SessionManager(base_path=str(tmp_path), auto_save_interval=0)
+    session = manager.create_session()
+    session.metadata["title"] = ""
+    session.add_message(create_message(
+        role="user", content="Legacy prompt", category=MessageCategory.DIALOG
+    ))
+    manager.save_session(session)
+    del manager.session_index[session.id]["first_prompt"]
+    manager.sessions.clear()
+
+    assert manager.list_sessions()[0]["title"] == "Legacy prompt"
+    saved = json.loads((tmp_path / "session_index.json").read_text())
+    assert saved[session.id]["first_prompt"] == "Legacy prompt"
@@ -0,0 +1,102 @@
+"""Tests for the incrementally maintained per-session token totals."""
+
+import copy
+import gc
+import pickle
+
+from hypothesis import given, settings, strategies as st
+
+from penguin.core_runtime.token_usage_runtime import usage_from_session_messages
+from penguin.system.state import Message, MessageCategory, Session
+
+CATEGORIES = [MessageCategory.DIALOG, MessageCategory.SYSTEM, MessageCategory.SYSTEM_OUTPUT]
+AGENTS = ["agent-a", "agent-b", None]
+
+
+def _recount(session, agent_id=None):
+    categories = {}
+    total = 0
+    for message in session.messages:
+        if agent_id is not None and message.agent_id != agent_id:
+            continue
+        total += message.tokens
+        categories[message.category.name] = categories.get(message.category.name, 0) + message.tokens
+    return total, categories
+
+
+operations = st.lists(
+    st.tuples(
+        st.sampled_from(["add", "pop", "del_slice", "retoken", "move_agent", "replace", "trim_reassign"]),
+        st.integers(min_value=0, max_value=400),
+        st.sampled_from(CATEGORIES),
+        st.sampled_from(AGENTS),
+    ),
+    max_size=40,
+)
+
+
+@settings(max_examples=75)
+@given(ops=operations)
+def test_totals_match_a_full_recount_after_any_edit(ops):
+    session = Session()
+    for op, tokens, category, agent_id in ops:
+        messages = session.messages
+        if op == "add" or not messages:
+            session.add_message(Message("user", "x", category, tokens=tokens, agent_id=agent_id))
+        elif op == "pop":
+            messages.pop(tokens % len(messages))
+        elif op == "del_slice":
+            del messages[: tokens % 3]
+        elif op == "retoken":
+            messages[tokens % len(messages)].tokens = tokens
+        elif op == "move_agent":
+            messages[-1].agent_id = agent_id
+            messages[-1].category = category
+        elif op == "replace":
+            messages[tokens % len(messages)] = Message("assistant", "y", category, tokens=tokens)
+        else:
+            session.messages = [m for m in messages if m.category != category]
+
+        for agent_id in (None, "agent-a", "agent-b"):
+            total, categories = _recount(session, agent_id)
+            totals = session.usage.totals(agent_id)
+            assert totals["current_total_tokens"] == total
+            assert {k: v for k, v in totals["categories"].items() if v} == {
+                k: v for k, v in categories.items() if v
+            }
+        assert session.usage.message_count == len(session.messages)
+
+
+def test_usage_is_recounted_on_load_and_copies_count_independently():
+    session = Session()
+    session.add_message(Message("user", "hi", MessageCategory.DIALOG, tokens=7, agent_id="agent-a"))
+    session.add_message(Message("system", "rules", MessageCategory.SYSTEM, tokens=5))
+
+    restored = Session.from_dict(session.to_dict())
+    assert restored.total_tokens == 12
+    assert restored.usage.totals("agent-a")["current_total_tokens"] == 7
+
+    clone = copy.deepcopy(session)
+    clone.messages[0].tokens = 100
+    assert (session.total_tokens, clone.total_tokens) == (12, 105)
+
+    usage = usage_from_session_messages(object(), session, agent_id="agent-a")
+    assert usage["current_total_tokens"] == 7
+    assert usage["categories"]["DIALOG"] == 7 and usage["categories"]["SYSTEM"] == 0
+
+
+def test_clones_do_not_accumulate_ledgers_and_messages_pickle():
+    session = Session()
+    message = Message("user", "hi", MessageCategory.DIALOG, tokens=3)
+    session.add_message(message)
+    for _ in range(1000):
+        clone = Session()
+        clone.messages = list(session.messages)
+    del clone
+    gc.collect()
+    assert len(message._usage_ledgers) == 1
+
+    restored = pickle.loads(pickle.dumps(session))
+    restored.messages[0].tokens = 10
+    assert (session.total_tokens, restored.total_tokens) == (3, 10)
+    assert pickle.loads(pickle.dumps(message)).tokens == 3
@@ -0,0 +1,81 @@
+"""Tests for chunked, deduplicated SnapshotManager payloads."""
+
+import json
+import sqlite3
+
+from penguin.system.snapshot_manager import SnapshotManager
+from penguin.system.state import Message, MessageCategory, Session
+
+
+def _payload(session):
+    return json.dumps(session.to_dict(), ensure_ascii=False)
+
+
+def _long_session(count=300):
+    session = Session()
+    for i in range(count):
+        session.add_message(
+            Message(
+                "user" if i % 2 else "assistant",
+                f"turn {i}: " + "some fairly long conversation text\n" * 20,
+                MessageCategory.DIALOG,
+                tokens=50,
+            )
+        )
+    return session
+
+
+def test_branches_share_chunks_and_gc_reclaims_them(tmp_path):
+    manager = SnapshotManager(tmp_path / "snapshots.db")
+    session = _long_session()
+    root_id = manager.snapshot(_payload(session), meta={"name": "root"})
+    after_root = manager.storage_stats()
+    assert after_root["stored_bytes"] < after_root["logical_bytes"] / 3  # compressed
+
+    branch_id, payload = manager.branch_from(root_id)
+    assert payload == manager.restore(root_id) == _payload(session)
+    after_branch = manager.storage_stats()
+    assert after_branch["chunks"] == after_root["chunks"]
+    assert after_branch["logical_bytes"] == 2 * after_root["logical_bytes"]
+
+    # Continuing the branch only stores what changed
+    branched = Session.from_dict(json.loads(payload))
+    branched.metadata["snapshot_parent"] = root_id
+    branched.add_message(Message("user", "a new question", MessageCategory.DIALOG, tokens=4))
+    child_id = manager.snapshot(_payload(branched), parent_id=branch_id)
+    after_child = manager.storage_stats()
+    assert after_child["unique_bytes"] - after_branch["unique_bytes"] < after_root["unique_bytes"] / 10
+    assert manager.restore(child_id) == _payload(branched)
+
+    assert manager.delete_snapshot(root_id)
+    assert manager.restore(branch_id) == _payload(session)
+    for snap_id in (branch_id, child_id):
+        manager.delete_snapshot(snap_id)
+    assert manager.storage_stats()["chunks"] == 0
+    assert not manager.delete_snapshot(root_id)
+
+
+def test_legacy_databases_are_migrated(tmp_path):
+    db_path = tmp_path / "snapshots.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE snapshots (id TEXT PRIMARY KEY, parent_id TEXT, "
+        "timestamp TEXT NOT NULL, payload BLOB NOT NULL, meta TEXT)"
+    )
+    legacy = _payload(_long_session(20))
+    conn.execute(
+        "INSERT INTO snapshots VALUES ('old', NULL, '2025-01-01T00:00:00', ?, '{\"name\": \"legacy\"}')",
+        (legacy,),
+    )
+    conn.commit()
+    conn.close()
+
+    manager = SnapshotManager(db_path)
+    assert manager.restore("old") == legacy
+    assert manager.list_snapshots()[0]["name"] == "legacy"
+    assert manager.conn.execute("SELECT payload FROM snapshots").fetchone()[0] == ""
+
+    # Refcounts survive a recount and the migrated payload stays readable
+    new_id, _ = manager.branch_from("old")
+    assert manager.collect_garbage(recount=True) == 0
+    assert manager.restore(new_id) == legacy
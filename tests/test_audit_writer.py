@@ -0,0 +1,106 @@
+"""Tests for the buffered permission audit writer and its sinks."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from penguin.security.audit import (
+    AuditEntry,
+    BufferedAuditWriter,
+    JsonlAuditSink,
+    PermissionAuditLogger,
+)
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_entries_are_batched_and_deny_is_flushed_immediately(tmp_path):
+    audit = PermissionAuditLogger(
+        log_file=str(tmp_path / "audit.log"),
+        categories={"filesystem": "all"},
+        flush_interval=60,
+    )
+    for i in range(20):
+        audit.log("filesystem.read", f"/ws/{i}.py", "allow", "inside workspace")
+
+    # A DENY waits for everything queued before it to reach disk
+    audit.log("filesystem.write", "/etc/passwd", "deny", "outside workspace")
+    lines = _read_lines(tmp_path / "audit.log")
+    assert [line["result"] for line in lines] == ["allow"] * 20 + ["deny"]
+
+    writer = audit.get_stats()["writer"]
+    assert writer["written"] == 21 and writer["batches"] == 1
+    assert writer["dropped"] == 0
+
+    audit.log("filesystem.read", "/ws/late.py", "allow", "inside workspace")
+    audit.close()
+    assert len(_read_lines(tmp_path / "audit.log")) == 22
+
+
+def test_jsonl_sink_rotates_by_size(tmp_path):
+    path = tmp_path / "audit.log"
+    writer = BufferedAuditWriter(
+        [JsonlAuditSink(str(path), max_bytes=2000, backup_count=2)],
+        flush_interval=0.01,
+        batch_size=5,
+    )
+    entry = AuditEntry(
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        operation="process.execute",
+        resource="x" * 100,
+        result="allow",
+        reason="ok",
+    )
+    for _ in range(200):
+        writer.submit(entry)
+    writer.close()
+
+    assert (tmp_path / "audit.log.1").exists() and (tmp_path / "audit.log.2").exists()
+    assert not (tmp_path / "audit.log.3").exists()
+    for name in ("audit.log", "audit.log.1", "audit.log.2"):
+        assert (tmp_path / name).stat().st_size < 2000 + 500
+
+
+def test_sqlite_store_queries_by_session_tool_and_time(tmp_path):
+    audit = PermissionAuditLogger(
+        log_file=str(tmp_path / "audit.log"),
+        sqlite_file=str(tmp_path / "audit.db"),
+        categories={"filesystem": "all", "process": "all"},
+        include_context=True,
+    )
+    start = datetime.now(timezone.utc) - timedelta(seconds=1)
+    for i in range(6):
+        audit.log(
+            "process.execute" if i % 2 else "filesystem.write",
+            f"res-{i}",
+            "deny" if i == 5 else "allow",
+            "test",
+            tool_name="execute_command" if i % 2 else "write_to_file",
+            session_id="s1" if i < 4 else "s2",
+            context={"i": i},
+        )
+
+    entries = audit.query_entries(session_id="s1", tool_name="execute_command")
+    assert [e.resource for e in entries] == ["res-3", "res-1"]
+    assert entries[0].context == {"i": 3}
+
+    assert [e.resource for e in audit.query_entries(result="deny")] == ["res-5"]
+    assert len(audit.query_entries(since=start, until=datetime.now(timezone.utc))) == 6
+    assert audit.query_entries(until=start) == []
+    audit.close()
+
+
+def test_submit_after_close_is_dropped(tmp_path):
+    audit = PermissionAuditLogger(
+        log_file=str(tmp_path / "audit.log"),
+        sqlite_file=str(tmp_path / "audit.db"),
+        categories={"filesystem": "all"},
+    )
+    audit.log("filesystem.write", "/ws/a.py", "allow", "inside workspace")
+    audit.close()
+
+    audit.log("filesystem.write", "/ws/b.py", "deny", "too late")
+    assert len(_read_lines(tmp_path / "audit.log")) == 1
+    assert audit.get_stats()["writer"]["dropped"] == 1
+    assert audit.get_stats()["writer"]["errors"] == 0
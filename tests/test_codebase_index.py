@@ -0,0 +1,91 @@
+"""Tests for the incremental codebase index behind analyze_codebase."""
+
+import json
+import random
+from pathlib import Path
+
+from penguin.tools.core.codebase_index import (
+    circular_dependency_pairs,
+    strongly_connected_components,
+)
+from penguin.tools.tool_manager import ToolManager
+
+
+def _tool_manager() -> ToolManager:
+    return ToolManager(
+        config={"tools": {"allow_memory_tools": True}},
+        log_error_func=lambda *args, **kwargs: None,
+        fast_startup=True,
+    )
+
+
+def _brute_force_pairs(graph):
+    def reaches(start, end):
+        seen, todo = set(), [start]
+        while todo:
+            node = todo.pop()
+            if node == end:
+                return True
+            if node not in seen:
+                seen.add(node)
+                todo.extend(graph.get(node, ()))
+        return False
+
+    return [
+        {"file1": node, "file2": dep}
+        for node, deps in graph.items()
+        for dep in deps
+        if dep in graph and reaches(dep, node)
+    ]
+
+
+def test_tarjan_matches_pairwise_reachability():
+    rng = random.Random(7)
+    for _ in range(50):
+        nodes = [f"n{i}" for i in range(rng.randint(1, 25))]
+        graph = {
+            node: rng.sample(nodes, k=rng.randint(0, min(3, len(nodes))))
+            for node in nodes
+        }
+        assert circular_dependency_pairs(graph) == _brute_force_pairs(graph)
+        components = strongly_connected_components(graph)
+        assert sorted(n for c in components for n in c) == sorted(nodes)
+
+    # Deep chains do not hit the recursion limit
+    chain = {f"m{i}": [f"m{i + 1}"] for i in range(5000)}
+    chain["m5000"] = ["m0"]
+    assert len(strongly_connected_components(chain)) == 1
+
+
+def test_repeat_analysis_only_reparses_changed_files(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("PENGUIN_CACHE_DIR", str(tmp_path / "cache"))
+    root = tmp_path / "proj"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "pkg" / "a.py").write_text("from pkg.b import helper\n\ndef run():\n    return helper()\n")
+    (root / "pkg" / "b.py").write_text("from .a import run\n\ndef helper():\n    return 1\n")
+    for i in range(20):
+        (root / "pkg" / f"leaf{i}.py").write_text(f"async def leaf{i}(x):\n    return x\n")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "vendored.py").write_text("import os\n")
+
+    manager = _tool_manager()
+    first = json.loads(manager.analyze_codebase(directory=str(root)))
+    assert first["files_analyzed"] == 23
+    assert first["patterns"]["async_functions"] == 20
+    cycles = first["dependencies"]["circular_dependencies"]
+    assert {"file1": "pkg/a.py", "file2": "pkg.b"} in cycles
+    assert {"file1": "pkg/b.py", "file2": "pkg.a"} in cycles
+
+    index = manager._get_codebase_index(root)
+    (root / "pkg" / "b.py").write_text("def helper():\n    return 2\n")
+    index.stats.update(read=0, parsed=0, edges_rebuilt=0)
+    second = json.loads(manager.analyze_codebase(directory=str(root)))
+    assert (index.stats["read"], index.stats["parsed"], index.stats["edges_rebuilt"]) == (1, 1, 1)
+    assert second["dependencies"]["circular_dependencies"] == []
+
+    # A new process picks the summaries up from disk without parsing
+    fresh = _tool_manager()
+    third = json.loads(fresh.analyze_codebase(directory=str(root)))
+    assert fresh._get_codebase_index(root).stats["parsed"] == 0
+    assert third == second
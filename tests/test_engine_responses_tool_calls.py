@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from types import SimpleNamespace
 from typing import Optional
 from unittest.mock import AsyncMock
@@ -9,6 +10,7 @@ import pytest
 from penguin.engine import Engine, LoopState
 from penguin.llm.runtime import execute_pending_tool_call, execute_pending_tool_calls
 from penguin.tools.runtime import ORDERED_TOOL_BATCH_NAME, ToolExecutionPolicy
+from penguin.utils.shell_runner import run_shell
 
 
 def test_prepare_responses_tools_enables_openai_native_tools() -> None:
@@ -385,6 +387,48 @@ async def test_multiple_pending_responses_tool_calls_execute_serially() -> None:
     ] == ["call_pwd", "call_ls"]
 
 
+@pytest.mark.asyncio
+async def test_pending_tool_call_streams_shell_output_before_result() -> None:
+    class _Handler:
+        def __init__(self) -> None:
+            self._tool_calls = [
+                {
+                    "name": "execute_command",
+                    "arguments": '{"command":"echo hi"}',
+                    "call_id": "call_echo",
+                }
+            ]
+
+        def get_and_clear_pending_tool_calls(self) -> list[dict[str, str]]:
+            result = self._tool_calls
+            self._tool_calls = []
+            return result
+
+    events: list[tuple[str, dict[str, object]]] = []
+
+    async def _execute_tool_async(tool_name: str, tool_args: dict[str, object]) -> str:
+        result = await asyncio.to_thread(run_shell, ["bash", "-c", tool_args["command"]])
+        return result.stdout
+
+    async def _emit(event_type: str, payload: dict[str, object]) -> None:
+        events.append((event_type, payload))
+
+    await execute_pending_tool_calls(
+        api_client=SimpleNamespace(
+            client_handler=_Handler(),
+            model_config=SimpleNamespace(provider="openai", model="gpt-5.5"),
+        ),
+        tool_manager=SimpleNamespace(execute_tool_async=_execute_tool_async),
+        persist_action_result=lambda *_args: None,
+        emit_action_result=lambda payload: _emit("action_result", payload),
+        emit_action_output=lambda payload: _emit("action_output", payload),
+    )
+
+    assert [event_type for event_type, _ in events] == ["action_output", "action_result"]
+    output = events[0][1]
+    assert (output["id"], output["stream"], output["chunk"]) == ("call_echo", "stdout", "hi\n")
+
+
 @pytest.mark.asyncio
 async def test_ordered_tool_batch_executes_children_serially_as_parent_result() -> None:
     class _Handler:
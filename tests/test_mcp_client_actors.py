@@ -0,0 +1,216 @@
+"""Tests for per-server MCP connection actors, circuit breaking and metrics.
+
+Most tests replace the transport with an in-memory echo session that mirrors
+``penguin/integrations/mcp/echo.py``; the last one talks to the real echo
+server over stdio when the MCP SDK is installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from contextlib import AsyncExitStack
+from types import SimpleNamespace
+
+import pytest
+
+import penguin.integrations.mcp.manager as manager_module
+from penguin.integrations.mcp.config import MCPServerConfig
+from penguin.integrations.mcp.manager import MCPClientManager, MCPServerStatus
+
+
+class FakeEchoSession:
+    def __init__(self, behaviour: dict) -> None:
+        self.behaviour = behaviour
+
+    async def list_tools(self):
+        await asyncio.sleep(self.behaviour.get("list_delay", 0))
+        return SimpleNamespace(
+            tools=[
+                SimpleNamespace(
+                    name="echo_tool",
+                    description="Echo a message as a tool.",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {"message": {"type": "string"}},
+                    },
+                )
+            ]
+        )
+
+    async def call_tool(self, name, arguments):
+        await asyncio.sleep(self.behaviour.get("call_delay", 0))
+        return {"content": [{"type": "text", "text": f"Tool echo: {arguments['message']}"}]}
+
+
+class FakeEchoManager(MCPClientManager):
+    def __init__(self, servers, behaviours) -> None:
+        super().__init__(servers)
+        self.behaviours = behaviours
+        self.opened: list[str] = []
+        self.closed: list[str] = []
+
+    async def _open_session(self, state):
+        behaviour = self.behaviours[state.config.name]
+        if behaviour.get("down"):
+            raise ConnectionError(f"{state.config.name} refused connection")
+        self.opened.append(state.config.name)
+        stack = AsyncExitStack()
+        stack.callback(self.closed.append, state.config.name)
+        return stack, FakeEchoSession(behaviour)
+
+
+def _server(name: str, **overrides) -> MCPServerConfig:
+    return MCPServerConfig(name=name, command="echo-server", **overrides)
+
+
+@pytest.fixture(autouse=True)
+def sdk_available(monkeypatch):
+    monkeypatch.setattr(manager_module, "HAS_MCP_SDK", True)
+
+
+async def test_discovery_is_concurrent_and_isolates_slow_servers() -> None:
+    manager = FakeEchoManager(
+        [
+            _server("alpha"),
+            _server("stuck", startup_timeout_sec=0.2),
+            _server("beta"),
+        ],
+        {"alpha": {"list_delay": 0.1}, "stuck": {"list_delay": 5}, "beta": {"list_delay": 0.1}},
+    )
+    started = time.perf_counter()
+    tools = await manager.discover()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    assert [tool.public_name for tool in tools] == [
+        "mcp__alpha__echo_tool",
+        "mcp__beta__echo_tool",
+    ]
+    status = manager.status()["servers"]
+    assert status["stuck"]["status"] == "failed"
+    assert "timed out" in status["stuck"]["error"]
+    assert status["stuck"]["metrics"]["connect_failures"] == 1
+    assert status["alpha"]["metrics"]["last_connect_ms"] >= 100
+    # The failed session was torn down on its own actor
+    assert manager.closed == ["stuck"]
+    await manager.close()
+
+
+async def test_hung_tool_call_does_not_block_other_servers_and_reconnects_lazily() -> None:
+    behaviours = {"fast": {}, "hung": {"call_delay": 5}}
+    manager = FakeEchoManager(
+        [_server("fast"), _server("hung", tool_timeout_sec=0.2)],
+        behaviours,
+    )
+    await manager.discover()
+
+    hung = asyncio.create_task(
+        manager.call_tool("mcp__hung__echo_tool", {"message": "hello"})
+    )
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    result = await manager.call_tool("mcp__fast__echo_tool", {"message": "hi"})
+    assert time.perf_counter() - started < 0.1
+    assert result["content"][0]["text"] == "Tool echo: hi"
+
+    with pytest.raises(TimeoutError):
+        await hung
+    assert manager.status()["servers"]["hung"]["metrics"]["call_timeouts"] == 1
+    assert manager.status()["servers"]["hung"]["status"] == "failed"
+
+    behaviours["hung"]["call_delay"] = 0
+    result = await manager.call_tool("mcp__hung__echo_tool", {"message": "again"})
+    assert result["content"][0]["text"] == "Tool echo: again"
+    assert manager.opened.count("hung") == 2
+    metrics = manager.status()["servers"]["hung"]["metrics"]
+    assert metrics["calls"] == 2 and metrics["call_errors"] == 1
+    await manager.close()
+
+
+async def test_circuit_breaker_opens_and_recovers_after_reset() -> None:
+    behaviours = {"flaky": {"down": True}}
+    manager = FakeEchoManager(
+        [_server("flaky", circuit_failure_threshold=2, circuit_reset_sec=0.2)],
+        behaviours,
+    )
+    await manager.discover()
+    with pytest.raises(ValueError):
+        await manager.call_tool("mcp__flaky__echo_tool", {"message": "x"})
+
+    status = manager.status()["servers"]["flaky"]
+    assert status["circuit"]["state"] == "open"
+    assert status["metrics"]["connect_attempts"] == 2
+
+    # While open, calls fail fast without touching the server
+    with pytest.raises(ValueError):
+        await manager.call_tool("mcp__flaky__echo_tool", {"message": "x"})
+    assert manager.status()["servers"]["flaky"]["metrics"]["connect_attempts"] == 2
+
+    behaviours["flaky"]["down"] = False
+    await asyncio.sleep(0.25)
+    assert manager.status()["servers"]["flaky"]["circuit"]["state"] == "half_open"
+    result = await manager.call_tool("mcp__flaky__echo_tool", {"message": "back"})
+    assert result["content"][0]["text"] == "Tool echo: back"
+    status = manager.status()["servers"]["flaky"]
+    assert status["circuit"] == {"state": "closed", "consecutive_failures": 0, "retry_in_sec": None}
+    assert status["metrics"]["circuit_opens"] == 1
+    await manager.close()
+
+
+async def test_failed_reconnect_keeps_tools_for_the_circuit_breaker() -> None:
+    behaviours = {"flaky": {"call_delay": 5}}
+    manager = FakeEchoManager(
+        [_server("flaky", tool_timeout_sec=0.1, circuit_failure_threshold=2, circuit_reset_sec=60)],
+        behaviours,
+    )
+    await manager.discover()
+    with pytest.raises(TimeoutError):
+        await manager.call_tool("mcp__flaky__echo_tool", {"message": "x"})
+
+    behaviours["flaky"]["down"] = True
+    with pytest.raises(RuntimeError, match="could not reconnect: flaky refused connection"):
+        await manager.call_tool("mcp__flaky__echo_tool", {"message": "x"})
+    with pytest.raises(RuntimeError, match="2 consecutive failures"):
+        await manager.call_tool("mcp__flaky__echo_tool", {"message": "x"})
+
+    status = manager.status()["servers"]["flaky"]
+    assert status["circuit"]["state"] == "open"
+    assert status["tools"] == ["mcp__flaky__echo_tool"]
+    assert status["metrics"]["rejected_calls"] == 1
+    await manager.close()
+
+
+def test_sync_facade_runs_on_the_manager_loop() -> None:
+    manager = FakeEchoManager([_server("one"), _server("two")], {"one": {}, "two": {}})
+    assert len(manager.list_tools_sync()) == 2
+    assert manager.call_tool_sync("mcp__two__echo_tool", {"message": "sync"}) == {
+        "content": [{"type": "text", "text": "Tool echo: sync"}]
+    }
+    status = manager.close_sync()
+    assert {s["status"] for s in status["servers"].values()} == {"disconnected"}
+    assert sorted(manager.closed) == ["one", "two"]
+    assert manager._loop is None
+
+
+def test_bundled_echo_server_over_stdio() -> None:
+    pytest.importorskip("mcp")
+    manager = MCPClientManager(
+        [
+            MCPServerConfig(
+                name="echo",
+                command=sys.executable,
+                args=["-m", "penguin.integrations.mcp.run_echo_server", "--transport", "stdio"],
+                startup_timeout_sec=30,
+            )
+        ]
+    )
+    try:
+        tools = manager.list_tools_sync()
+        assert "mcp__echo__echo_tool" in {tool.public_name for tool in tools}
+        result = manager.call_tool_sync("mcp__echo__echo_tool", {"message": "ping"})
+        assert "Tool echo: ping" in str(result)
+        assert manager.status()["servers"]["echo"]["status"] == MCPServerStatus.CONNECTED.value
+    finally:
+        manager.close_sync()
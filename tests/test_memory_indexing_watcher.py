@@ -0,0 +1,225 @@
+"""Tests for the debounced watcher pipeline in front of IncrementalIndexer."""
+
+import asyncio
+import itertools
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from penguin.memory.indexing.incremental import IncrementalIndexer
+from penguin.memory.indexing.watcher import ChangeCoalescer, FileSystemWatcher
+
+
+class _Provider:
+    """In-memory provider recording how often content was embedded."""
+
+    embedding_model = "test-model"
+
+    def __init__(self):
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.embeds = 0
+        self._ids = itertools.count()
+
+    async def add_memory(self, content, metadata=None, categories=None):
+        self.embeds += 1
+        memory_id = f"m{next(self._ids)}"
+        self.records[memory_id] = {"content": content, "metadata": dict(metadata or {})}
+        return memory_id
+
+    async def get_memory(self, memory_id):
+        return self.records.get(memory_id)
+
+    async def update_memory(self, memory_id, content=None, metadata=None):
+        self.records[memory_id]["metadata"] = metadata
+        return True
+
+    async def delete_memory(self, memory_id):
+        return self.records.pop(memory_id, None) is not None
+
+    def paths(self):
+        return sorted(Path(r["metadata"]["path"]).name for r in self.records.values())
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+async def indexer(tmp_path: Path):
+    indexer = IncrementalIndexer(_Provider(), {"workspace_path": str(tmp_path)})
+    await indexer.start_workers(num_workers=2)
+    yield indexer
+    await indexer.stop_workers()
+
+
+def _coalescer(indexer, tmp_path, clock, **kwargs):
+    return ChangeCoalescer(indexer, [tmp_path], debounce_sec=1.0, clock=clock, **kwargs)
+
+
+async def _settle(coalescer, clock, indexer):
+    clock.now += 10
+    await coalescer.flush()
+    await indexer._queue.join()
+
+
+async def test_reindex_replaces_memories_and_delete_reaches_provider(indexer, tmp_path):
+    notes = tmp_path / "notes.md"
+    notes.write_text("# v1")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "config").write_text("[core]")
+    assert await indexer.sync_directory(str(tmp_path)) == 1
+    await indexer._queue.join()
+
+    notes.write_text("# version two")
+    await indexer.sync_directory(str(tmp_path))
+    await indexer._queue.join()
+    assert [r["content"] for r in indexer.provider.records.values()] == ["# version two"]
+
+    notes.unlink()
+    indexer.remove_from_index(str(notes))
+    await indexer._queue.join()
+    assert indexer.provider.records == {}
+    assert indexer.metadata.data == {}
+
+
+async def test_event_bursts_are_coalesced_per_path(indexer, tmp_path):
+    clock = _Clock()
+    coalescer = _coalescer(indexer, tmp_path, clock)
+    doc = tmp_path / "doc.txt"
+    doc.write_text("hello")
+    for _ in range(20):
+        coalescer.record("modified", str(doc))
+        clock.now += 0.1
+    # Nothing happens while the path is still busy
+    assert await coalescer.flush() == 0
+
+    scratch = tmp_path / "scratch.txt"
+    scratch.write_text("temp")
+    coalescer.record("created", str(scratch))
+    scratch.unlink()
+    coalescer.record("deleted", str(scratch))
+    coalescer.record("modified", str(tmp_path / "__pycache__" / "x.pyc"))
+    coalescer.record("modified", str(indexer.metadata.metadata_path))
+    await _settle(coalescer, clock, indexer)
+
+    assert indexer.provider.embeds == 1
+    assert indexer.provider.paths() == ["doc.txt"]
+    assert coalescer.stats["ignored"] == 2
+
+    # An editor-style atomic save with unchanged content does not re-embed
+    tmp = tmp_path / ".doc.txt.swp"
+    tmp.write_text("hello")
+    coalescer.record("created", str(tmp))
+    tmp.replace(doc)
+    coalescer.record("moved", str(tmp), str(doc))
+    await _settle(coalescer, clock, indexer)
+    assert indexer.provider.embeds == 1
+    assert indexer.stats["unchanged"] == 1
+
+
+async def test_touched_files_are_hashed_once_and_fetch_does_not_reconcile(indexer, tmp_path, monkeypatch):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("same")
+    await indexer.sync_directory(str(tmp_path))
+    await indexer._queue.join()
+
+    stat = doc.stat()
+    os.utime(doc, (stat.st_atime, stat.st_mtime + 10))
+    hashed = []
+    calculate = indexer.metadata._calculate_hash
+    monkeypatch.setattr(indexer.metadata, "_calculate_hash", lambda path: hashed.append(path) or calculate(path))
+    assert await indexer.reconcile([str(tmp_path)]) == (0, 0)
+    assert await indexer.reconcile([str(tmp_path)]) == (0, 0)
+    assert hashed == [str(doc)]
+
+    clock = _Clock()
+    coalescer = _coalescer(indexer, tmp_path, clock)
+    coalescer.record("modified", str(tmp_path / ".git" / "FETCH_HEAD"))
+    await _settle(coalescer, clock, indexer)
+    assert coalescer.stats["reconciles"] == 0
+
+
+async def test_continuously_modified_path_is_flushed_after_max_delay(indexer, tmp_path):
+    clock = _Clock()
+    coalescer = _coalescer(indexer, tmp_path, clock, max_delay_sec=3.0)
+    log = tmp_path / "app.log"
+    log.write_text("line")
+    for _ in range(4):
+        coalescer.record("modified", str(log))
+        clock.now += 0.9
+    assert await coalescer.flush() == 1
+
+
+async def test_rename_moves_memories_without_reembedding(indexer, tmp_path):
+    clock = _Clock()
+    coalescer = _coalescer(indexer, tmp_path, clock)
+    old = tmp_path / "old.py"
+    old.write_text("def f():\n    return 1\n")
+    await indexer.sync_directory(str(tmp_path))
+    await indexer._queue.join()
+
+    new = tmp_path / "pkg" / "new.py"
+    new.parent.mkdir()
+    old.replace(new)
+    coalescer.record("moved", str(old), str(new))
+    await _settle(coalescer, clock, indexer)
+
+    assert indexer.provider.embeds == 1
+    assert indexer.provider.paths() == ["new.py"]
+    assert list(indexer.metadata.data) == [str(new)]
+    assert coalescer.stats["renamed"] == 1
+
+
+async def test_checkout_switches_to_a_reconcile_scan(indexer, tmp_path):
+    clock = _Clock()
+    coalescer = _coalescer(indexer, tmp_path, clock, bulk_threshold=5)
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(name)
+    await indexer.sync_directory(str(tmp_path))
+    await indexer._queue.join()
+
+    # A checkout rewrites HEAD and many files at once
+    (tmp_path / "a.txt").unlink()
+    (tmp_path / "c.txt").write_text("c")
+    coalescer.record("modified", str(tmp_path / ".git" / "HEAD"))
+    for i in range(50):
+        coalescer.record("modified", str(tmp_path / f"file{i}.txt"))
+    assert coalescer.pending_count == 0
+    await _settle(coalescer, clock, indexer)
+
+    assert coalescer.stats["reconciles"] == 1
+    assert indexer.provider.paths() == ["b.txt", "c.txt"]
+
+    # Too many distinct paths in one window also triggers a reconcile
+    for i in range(5):
+        coalescer.record("created", str(tmp_path / f"new{i}.txt"))
+    await _settle(coalescer, clock, indexer)
+    assert coalescer.stats["reconciles"] == 2
+
+
+async def test_watcher_end_to_end(indexer, tmp_path):
+    watcher = FileSystemWatcher([str(tmp_path)], indexer, debounce_sec=0.05)
+    await watcher.start()
+    try:
+        target = tmp_path / "live.md"
+        target.write_text("# live")
+        for _ in range(200):
+            if indexer.provider.records:
+                break
+            await asyncio.sleep(0.02)
+        assert indexer.provider.paths() == ["live.md"]
+
+        target.unlink()
+        for _ in range(200):
+            if not indexer.provider.records:
+                break
+            await asyncio.sleep(0.02)
+        assert indexer.provider.records == {}
+    finally:
+        await watcher.stop()
@@ -242,6 +242,66 @@ class TestNativeBackend:
         workflows = await backend.list_workflows()
         assert len(workflows) == 3
 
+    @staticmethod
+    def _instant_phases(backend):
+        """Make every ITUV phase succeed immediately."""
+        from penguin.orchestration.backend import PhaseResult
+
+        async def execute_phase(workflow_id, phase, state):
+            await asyncio.sleep(0)
+            now = datetime.utcnow()
+            return PhaseResult(phase=phase, success=True, started_at=now, completed_at=now)
+
+        backend._execute_phase = execute_phase
+
+    @pytest.mark.asyncio
+    async def test_resume_wakes_paused_workflow_immediately(self, backend):
+        """Resume is delivered by signal rather than noticed by polling."""
+        from penguin.orchestration.backend import WorkflowStatus
+
+        self._instant_phases(backend)
+        workflow_id = await backend.start_workflow(task_id="task-wake")
+        await backend.pause_workflow(workflow_id)
+        await asyncio.sleep(0.05)
+        assert (await backend.get_workflow_status(workflow_id)).status == WorkflowStatus.PAUSED
+
+        loop = asyncio.get_running_loop()
+        resumed_at = loop.time()
+        await backend.resume_workflow(workflow_id)
+        await asyncio.wait_for(backend._active_workflows[workflow_id], timeout=1)
+        assert loop.time() - resumed_at < 0.2
+
+        info = await backend.get_workflow_status(workflow_id)
+        assert info.status == WorkflowStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workflows_share_state_writes(self, backend):
+        """Phase-completion writes from concurrent workflows are group-committed."""
+        from penguin.orchestration.backend import WorkflowStatus
+
+        self._instant_phases(backend)
+        workflow_ids = [await backend.start_workflow(task_id=f"task-{i}") for i in range(200)]
+        await asyncio.gather(*list(backend._active_workflows.values()))
+        await backend.shutdown()
+
+        # 3 durable phase checkpoints per workflow, batched across workflows
+        assert backend.persist_stats["states_written"] >= 600
+        assert backend.persist_stats["flushes"] <= 20
+
+        # Cancelling a paused workflow wakes it too
+        paused_id = await backend.start_workflow(task_id="task-paused")
+        await backend.pause_workflow(paused_id)
+        task = backend._active_workflows[paused_id]
+        await backend.cancel_workflow(paused_id)
+        await asyncio.wait([task], timeout=1)
+        assert task.done()
+
+        states = {s.workflow_id: s for s in backend.storage.list_states(limit=500)}
+        assert states[paused_id].status == WorkflowStatus.CANCELLED
+        for workflow_id in workflow_ids:
+            assert states[workflow_id].status == WorkflowStatus.COMPLETED
+            assert len(states[workflow_id].phase_results) == 4
+
 
 class TestBackendFactory:
     """Test backend factory function."""
@@ -286,6 +346,27 @@ class TestBackendFactory:
             
             reset_backend()
 
+    @pytest.mark.asyncio
+    async def test_shutdown_backend_writes_pending_states(self):
+        """Coalesced state updates are written when the backend is shut down."""
+        from penguin.orchestration import get_backend, shutdown_backend
+        from penguin.orchestration.config import OrchestrationConfig, reset_backend, set_config
+        from penguin.orchestration.state import WorkflowState
+
+        reset_backend()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            set_config(OrchestrationConfig(backend="native"))
+            backend = get_backend(workspace_path=Path(tmpdir))
+            backend._mark_dirty(WorkflowState(workflow_id="wf-dirty", task_id="task-1"))
+            assert backend.storage.get_state("wf-dirty") is None
+
+            await shutdown_backend()
+
+            assert backend.storage.get_state("wf-dirty") is not None
+            assert get_backend(workspace_path=Path(tmpdir)) is not backend
+            reset_backend()
+
 
 class TestWorkflowInfo:
     """Test WorkflowInfo data class."""
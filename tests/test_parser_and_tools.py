@@ -5,7 +5,7 @@ import os
 from penguin.llm.model_config import ModelConfig
 from penguin.llm.openrouter_gateway import OpenRouterGateway
 from penguin.tools.tool_manager import ToolManager
-from penguin.utils.parser import ActionType, parse_action
+from penguin.utils.parser import ActionStreamParser, ActionType, parse_action
 
 
 def _dummy_log_error(exc: Exception, context: str = ""):
@@ -56,6 +56,71 @@ def test_parse_action_detects_question():
     assert actions[0].action_type == ActionType.QUESTION
 
 
+def _feed_in_chunks(content: str, size: int):
+    parser = ActionStreamParser()
+    text_parts = []
+    actions = []
+    for start in range(0, len(content), size):
+        text, completed = parser.feed(content[start : start + size])
+        text_parts.append(text)
+        actions.extend(completed)
+    text, completed = parser.finish()
+    text_parts.append(text)
+    actions.extend(completed)
+    return "".join(text_parts), actions
+
+
+def test_action_stream_parser_matches_parse_action_for_any_chunking():
+    content = (
+        "Plan: a < b and <b>bold</b>.\n"
+        "<execute>print('<hi>')</execute> between "
+        "<search>needle</search> tail <finish_response>unterminated"
+    )
+    expected = [(a.action_type, a.params) for a in parse_action(content)]
+
+    for size in (1, 2, 3, 7, 64, len(content)):
+        text, actions = _feed_in_chunks(content, size)
+        assert [(a.action_type, a.params) for a in actions] == expected
+        assert text == "Plan: a < b and <b>bold</b>.\n between  tail "
+
+
+def test_action_stream_parser_yields_action_when_closing_tag_lands():
+    parser = ActionStreamParser()
+
+    assert parser.feed("Running <exec") == ("Running ", [])
+    assert parser.feed("ute>ls -la</exe") == ("", [])
+    assert parser.in_action
+
+    text, actions = parser.feed("cute> done")
+    assert text == " done"
+    assert [a.action_type for a in actions] == [ActionType.EXECUTE]
+    assert actions[0].params == "ls -la"
+    assert not parser.in_action
+
+
+def test_action_stream_parser_holds_long_action_bodies_without_rejoining():
+    parser = ActionStreamParser()
+    parser.feed("<execute>")
+    for _ in range(5000):
+        assert parser.feed("x = 1  # </execut\n") == ("", [])
+    # The body is only joined once the closing tag can have arrived
+    assert parser._buffer == ""
+
+    text, actions = parser.feed("</EXECUTE> done")
+    assert text == " done"
+    assert actions[0].params == ("x = 1  # </execut\n" * 5000).strip()
+
+
+def test_action_stream_parser_finish_recovers_nested_actions():
+    parser = ActionStreamParser()
+    parser.feed("<execute>x <search>q</search>")
+
+    text, actions = parser.finish()
+
+    assert text == ""
+    assert [a.action_type for a in actions] == [ActionType.SEARCH]
+
+
 def test_tool_manager_get_responses_tools_curated():
     # Minimal ToolManager instantiation
     tm = ToolManager(config={}, log_error_func=_dummy_log_error, fast_startup=True)
@@ -399,6 +399,81 @@ class TestPermissionEnforcer:
         assert allowed == PermissionResult.ALLOW
 
 
+class TestDecisionCache:
+    """Test memoized permission decisions and their invalidation."""
+
+    @pytest.fixture
+    def enforcer(self, tmp_path):
+        workspace, project = tmp_path / "workspace", tmp_path / "project"
+        workspace.mkdir()
+        project.mkdir()
+        enforcer = PermissionEnforcer(mode=PermissionMode.WORKSPACE)
+        policy = WorkspaceBoundaryPolicy(
+            workspace_root=str(workspace),
+            project_root=str(project),
+            mode=PermissionMode.WORKSPACE,
+        )
+        enforcer.add_policy(policy)
+        enforcer.add_policy(AgentModePolicy())
+        return enforcer, policy, project
+
+    def test_repeated_checks_are_served_from_cache(self, enforcer):
+        from penguin.security.audit import get_audit_logger
+
+        enforcer, policy, project = enforcer
+        target = str(project / "src" / "main.py")
+        before = get_audit_logger().get_stats()["decision_cache"]
+
+        with patch.object(policy, "_normalize_path", wraps=policy._normalize_path) as normalize:
+            for _ in range(50):
+                assert enforcer.check(Operation.FILESYSTEM_WRITE, target) == PermissionResult.ALLOW
+            assert normalize.call_count == 1
+
+            # Context the policies read is part of the key
+            assert (
+                enforcer.check(Operation.FILESYSTEM_WRITE, target, {"agent_mode": "plan"})
+                == PermissionResult.DENY
+            )
+
+        assert enforcer.get_cache_stats()["hits"] == 49
+        after = get_audit_logger().get_stats()["decision_cache"]
+        assert after["hits"] - before["hits"] == 49
+        assert 0 < after["hit_rate"] <= 1
+
+    def test_policy_allowlist_and_mode_changes_invalidate(self, enforcer):
+        enforcer, policy, project = enforcer
+        target = str(project / "notes.txt")
+        assert enforcer.check(Operation.FILESYSTEM_WRITE, target) == PermissionResult.ALLOW
+
+        policy.add_denied_path("notes.*")
+        assert enforcer.check(Operation.FILESYSTEM_WRITE, target) == PermissionResult.DENY
+
+        enforcer.add_session_allowlist("filesystem.write:*notes.txt")
+        assert enforcer.check(Operation.FILESYSTEM_WRITE, target) == PermissionResult.ALLOW
+        enforcer.clear_session_allowlist()
+
+        policy.mode = PermissionMode.FULL
+        assert enforcer.check(Operation.FILESYSTEM_WRITE, target) == PermissionResult.ALLOW
+        policy.mode = PermissionMode.READ_ONLY
+        assert enforcer.check(Operation.FILESYSTEM_WRITE, target) == PermissionResult.DENY
+
+    def test_uncacheable_policies_are_always_evaluated(self, enforcer):
+        enforcer, _policy, project = enforcer
+        calls = []
+
+        class CountingPolicy(PolicyEngine):
+            name = "counting"
+
+            def check_operation(self, operation, resource, context=None):
+                calls.append(resource)
+                return PermissionResult.ALLOW, "ok"
+
+        enforcer.add_policy(CountingPolicy())
+        for _ in range(3):
+            enforcer.check(Operation.FILESYSTEM_READ, str(project / "a.py"))
+        assert len(calls) == 3
+
+
 class TestPermissionDeniedError:
     """Test permission denied error formatting."""
 
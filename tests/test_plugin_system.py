@@ -207,6 +207,44 @@ def test_function():
             # For now, just check that the file is scanned
             assert len(plugins) >= 0  # May not find tools due to import issues
 
+    def test_discovery_cache_avoids_reimporting_and_reparsing(self, tmp_path):
+        plugins_dir = tmp_path / "plugins"
+        plugins_dir.mkdir()
+        imports_log = tmp_path / "imports.log"
+        helper = plugins_dir / "helper.py"
+        helper.write_text(
+            f"open({str(imports_log)!r}, 'a').write('x')\n", encoding="utf-8"
+        )
+        plugin_dir = plugins_dir / "cached_plugin"
+        plugin_dir.mkdir()
+        (plugin_dir / "plugin.json").write_text(
+            json.dumps({"name": "cached_plugin", "entry_point": "main:Plugin"}),
+            encoding="utf-8",
+        )
+        (plugin_dir / "main.py").write_text("class Plugin: pass\n", encoding="utf-8")
+        (plugins_dir / "__pycache__").mkdir()
+        cache_path = tmp_path / "cache.json"
+
+        first = PluginDiscovery([plugins_dir], cache_path=cache_path).discover_all()
+        assert list(first) == ["cached_plugin"]
+        assert imports_log.read_text() == "x"
+
+        # A fresh process: the helper is known not to be a plugin and the
+        # manifest is served from the cache
+        discovery = PluginDiscovery([plugins_dir], cache_path=cache_path)
+        with patch.object(discovery, "_parse_manifest", side_effect=AssertionError):
+            second = discovery.discover_all()
+        assert second == first
+        assert imports_log.read_text() == "x"
+
+        helper.write_text(
+            f"open({str(imports_log)!r}, 'a').write('y')\n", encoding="utf-8"
+        )
+        discovery.discover_all()
+        assert imports_log.read_text() == "xy"
+        discovery.discover_all(refresh=True)
+        assert imports_log.read_text() == "xyy"
+
 
 class TestPluginManager:
     """Test plugin manager functionality"""
@@ -0,0 +1,138 @@
+import random
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from penguin.project.manager import ProjectManager
+from penguin.project.models import Task, TaskStatus
+from penguin.project.ready_queue import ReadyQueue
+from penguin.project.storage import ProjectStorage
+
+
+def _task(task_id, project_id, dependencies=(), priority=0, offset=0):
+    created = (datetime(2026, 1, 1) + timedelta(seconds=offset)).isoformat()
+    return Task(
+        id=task_id,
+        title=f"Task {task_id}",
+        description=task_id,
+        status=TaskStatus.ACTIVE,
+        created_at=created,
+        updated_at=created,
+        priority=priority,
+        project_id=project_id,
+        dependencies=list(dependencies),
+    )
+
+
+def _brute_force_ready(manager, project_id):
+    tasks = manager.list_tasks(project_id)
+    task_map = {task.id: task for task in tasks}
+    return [
+        task.id
+        for task in manager._sort_by_tie_breakers(tasks)
+        if task.status == TaskStatus.ACTIVE
+        and not manager.get_unsatisfied_dependencies(task, task_map)
+        and all(dep in task_map for dep in task.dependencies)
+    ]
+
+
+def test_ready_queue_tracks_status_changes_incrementally(tmp_path):
+    random.seed(3)
+    manager = ProjectManager(tmp_path)
+    project = manager.create_project("Ready", "Ready queue")
+    for i in range(40):
+        deps = random.sample([f"t{j}" for j in range(i)], k=min(i, random.randint(0, 3)))
+        manager.storage.create_task(_task(f"t{i}", project.id, deps, random.randint(0, 3), i))
+
+    assert [t.id for t in manager.get_ready_tasks(project.id)] == _brute_force_ready(manager, project.id)
+    dag = manager.build_dag(project.id)
+
+    with patch.object(manager.storage, "list_tasks", wraps=manager.storage.list_tasks) as list_tasks:
+        for _ in range(30):
+            task = manager.get_next_task_dag(project.id)
+            if task is None:
+                break
+            task.status = random.choice([TaskStatus.COMPLETED, TaskStatus.FAILED])
+            manager.storage.update_task(task)
+        assert list_tasks.call_count == 0
+        ready_ids = [t.id for t in manager.get_ready_tasks(project.id)]
+
+    # Status-only changes update the cached DAG in place
+    assert manager.build_dag(project.id) is dag
+    assert ready_ids == _brute_force_ready(manager, project.id)
+
+    # New tasks and deletions are structural: the DAG follows them exactly
+    manager.storage.create_task(_task("late", project.id, ["t39"], offset=100))
+    manager.storage.delete_task("t0")
+    assert set(manager.build_dag(project.id).nodes) == {t.id for t in manager.list_tasks(project.id)}
+    assert manager.build_dag(project.id).has_edge("t39", "late")
+    assert [t.id for t in manager.get_ready_tasks(project.id)] == _brute_force_ready(manager, project.id)
+
+
+def test_writes_through_another_storage_reload_the_queue(tmp_path):
+    manager = ProjectManager(tmp_path)
+    project = manager.create_project("Shared", "Shared database")
+    manager.storage.create_task(_task("a", project.id))
+    manager.storage.create_task(_task("b", project.id, ["a"], offset=1))
+    assert [t.id for t in manager.get_ready_tasks(project.id)] == ["a"]
+
+    other = ProjectStorage(tmp_path / "projects.db")
+    done = other.get_task("a")
+    done.status = TaskStatus.COMPLETED
+    other.update_task(done)
+    assert other.get_dependent_task_ids("a") == ["b"]
+    assert [t.id for t in other.get_task_dependencies("b")] == ["a"]
+    other.close()
+
+    assert [t.id for t in manager.get_ready_tasks(project.id)] == ["b"]
+    assert manager.get_next_task_dag(project.id).id == "b"
+
+
+def test_deleting_a_project_drops_its_dependency_edges(tmp_path):
+    manager = ProjectManager(tmp_path)
+    doomed = manager.create_project("Doomed", "Deleted below")
+    kept = manager.create_project("Kept", "Survives")
+    manager.storage.create_task(_task("a", doomed.id))
+    manager.storage.create_task(_task("b", doomed.id, ["a"], offset=1))
+    manager.storage.create_task(_task("c", kept.id))
+    manager.storage.create_task(_task("d", kept.id, ["c"], offset=1))
+
+    manager.storage.delete_project(doomed.id)
+
+    with manager.storage._get_connection() as conn:
+        rows = conn.execute("SELECT task_id, depends_on_id FROM task_dependencies").fetchall()
+    assert [tuple(row) for row in rows] == [("d", "c")]
+
+
+def test_task_moved_to_another_project_leaves_the_old_queue(tmp_path):
+    manager = ProjectManager(tmp_path)
+    source = manager.create_project("Source", "Moved from")
+    target = manager.create_project("Target", "Moved to")
+    manager.storage.create_task(_task("a", source.id))
+    manager.storage.create_task(_task("b", target.id))
+    assert [t.id for t in manager.get_ready_tasks(source.id)] == ["a"]
+    assert [t.id for t in manager.get_ready_tasks(target.id)] == ["b"]
+    manager.build_dag(source.id)
+
+    moved = manager.storage.get_task("a")
+    moved.project_id = target.id
+    manager.storage.update_task(moved)
+
+    assert manager.get_ready_tasks(source.id) == []
+    assert set(manager.build_dag(source.id).nodes) == set()
+    assert {t.id for t in manager.get_ready_tasks(target.id)} == {"a", "b"}
+
+
+def test_peek_only_scheduling_keeps_the_heap_bounded():
+    queue = ReadyQueue(
+        [_task(f"t{i}", "p", offset=i) for i in range(100)],
+        is_satisfied=lambda dependency, task: True,
+        sort_key=lambda task: (-task.priority, task.created_at, task.id),
+    )
+    for step in range(20_000):
+        queue.upsert(_task(f"t{step % 100}", "p", priority=step % 7, offset=step))
+        assert queue.peek() is not None
+
+    assert len(queue._heap) <= 2 * len(queue.ready) + 65
+    assert [t.id for t in queue.ready_tasks()] == [
+        t.id for t in sorted(queue.tasks.values(), key=lambda t: (-t.priority, t.created_at, t.id))
+    ]
@@ -0,0 +1,107 @@
+"""Tests for the warm sandbox worker pool behind ContainerExecutor."""
+
+import asyncio
+from types import SimpleNamespace
+
+from penguin.agent import container_executor
+from penguin.agent.container_executor import ContainerExecutor
+from penguin.agent.sandbox_pool import SandboxPool, SubprocessBackend
+
+
+def test_subprocess_pool_reuses_recycles_and_replaces_workers(tmp_path):
+    async def scenario():
+        pool = SandboxPool(
+            SubprocessBackend(cwd=str(tmp_path)),
+            size=1,
+            max_jobs_per_worker=2,
+            health_check_interval=0,
+        )
+        executor = ContainerExecutor(backend="subprocess", pool=pool)
+        pids = []
+        try:
+            result = await executor.execute_agent({"name": "sandboxed"}, "hello")
+            assert result["status"] == "completed"
+            assert result["assistant_response"] == "Fallback response to: hello"
+
+            for i in range(3):
+                async with pool.acquire() as worker:
+                    pids.append(worker.process.pid)
+                    result = await worker.call("run_agent", {"prompt": f"job {i}"})
+                    assert result["assistant_response"] == f"Fallback response to: job {i}"
+
+            # Two jobs per worker: the executor's run and job 0 shared a process
+            assert pids[0] != pids[1] == pids[2]
+
+            # A worker that died while idle fails its health check and is replaced
+            async with pool.acquire() as worker:
+                dead = worker
+            dead.process.kill()
+            await dead.process.wait()
+            assert (await pool.call("ping"))["pid"] != dead.process.pid
+            assert pool.status()["failed_health_checks"] == 1
+        finally:
+            await pool.close()
+        return pool.status()
+
+    status = asyncio.run(scenario())
+    assert status["workers"] == 0 and status["jobs"] >= 6
+
+
+def test_close_waits_for_workers_being_replaced(tmp_path):
+    async def scenario():
+        pool = SandboxPool(SubprocessBackend(cwd=str(tmp_path)), size=1, max_jobs_per_worker=1)
+        async with pool.acquire() as worker:
+            await worker.call("ping")
+        # The used worker is being retired and replaced in the background
+        assert len(pool._retiring) == 1
+        await pool.close()
+        assert not pool._retiring
+        assert worker.process.returncode is not None
+        assert pool.status()["workers"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_docker_unavailable_is_rechecked_after_ttl(monkeypatch):
+    calls = []
+    now = [1000.0]
+
+    async def no_docker(*args, **kwargs):
+        calls.append(args)
+        raise FileNotFoundError("docker")
+
+    monkeypatch.setattr(container_executor, "_docker_available", None)
+    monkeypatch.setattr(container_executor.asyncio, "create_subprocess_exec", no_docker)
+    monkeypatch.setattr(container_executor, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    executor = ContainerExecutor(backend="auto")
+
+    async def scenario():
+        assert await executor._check_docker_available() is False
+        assert await executor._check_docker_available() is False
+        assert len(calls) == 1
+        now[0] += container_executor._DOCKER_UNAVAILABLE_TTL + 1
+        assert await executor._check_docker_available() is False
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_close_sandbox_pools_stops_shared_workers():
+    from penguin.agent import sandbox_pool
+
+    async def scenario():
+        executors = [
+            ContainerExecutor(backend="subprocess", workspace_mount=mount)
+            for mount in ("/tmp/one", "/tmp/two")
+        ]
+        pools = [await executor._get_pool() for executor in executors]
+        # The subprocess backend ignores the mount, so both share one pool
+        assert pools[0] is pools[1]
+        async with pools[0].acquire() as worker:
+            await worker.call("ping")
+        await sandbox_pool.close_sandbox_pools()
+        assert sandbox_pool._pools == {}
+        assert pools[0].status()["workers"] == 0
+        assert worker.process.returncode is not None
+
+    asyncio.run(scenario())
@@ -0,0 +1,109 @@
+"""Tests for the incremental server log index behind the dashboard."""
+
+import os
+
+import pytest
+
+import penguin.dashboard.queries.log_index as log_index
+from penguin.dashboard.queries.log_index import ServerLogIndex
+
+
+def _line(second: int, level: str, logger: str, message: str) -> str:
+    return f"2026-07-29 02:28:{second:02d},000 - {logger} - {level} - {message}\n"
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ServerLogIndex(tmp_path / "index.db")
+    yield index
+    index.close()
+
+
+def _messages(index, **filters):
+    return [entry["message"] for entry in index.query(**filters)]
+
+
+def test_refresh_reads_only_appended_complete_lines(index, tmp_path):
+    log = tmp_path / "server.txt"
+    log.write_text(_line(1, "INFO", "penguin.engine", "first"))
+    assert index.refresh([str(log)]) == 1
+
+    with log.open("a") as handle:
+        handle.write(_line(2, "INFO", "penguin.engine", "second"))
+        handle.write("2026-07-29 02:28:03,000 - penguin.engine - INFO - par")
+    assert index.refresh([str(log)]) == 1
+    assert index.refresh([str(log)]) == 0
+
+    with log.open("a") as handle:
+        handle.write("tial\n")
+    assert index.refresh([str(log)]) == 1
+    assert _messages(index) == ["first", "second", "partial"]
+    assert index.refresh([str(log)], min_interval=60) == 0
+
+
+def test_rotation_keeps_entries_and_drops_deleted_backups(index, tmp_path):
+    log = tmp_path / "server.txt"
+    backup = tmp_path / "server.txt.1"
+    log.write_text(_line(1, "INFO", "penguin.engine", "old"))
+    index.refresh([str(log)])
+
+    # RotatingFileHandler renames the live file and starts a new one
+    os.replace(log, backup)
+    log.write_text(_line(2, "INFO", "penguin.engine", "new"))
+    assert index.refresh([str(log), str(backup)]) == 1
+    assert _messages(index) == ["old", "new"]
+    assert _messages(index, paths=[str(backup)]) == ["old"]
+
+    # The oldest backup is deleted on the next rotation
+    backup.unlink()
+    index.refresh([str(log)])
+    assert _messages(index) == ["new"]
+    assert [f["path"] for f in index.status()["files"]] == [str(log)]
+
+    # A truncated file is re-read from the start
+    log.write_text(_line(3, "INFO", "penguin.engine", "restart"))
+    index.refresh([str(log)])
+    assert _messages(index) == ["restart"]
+
+
+def test_line_longer_than_a_read_does_not_stall_the_file(index, tmp_path, monkeypatch):
+    monkeypatch.setattr(log_index, "_READ_CHUNK_BYTES", 256)
+    monkeypatch.setattr(log_index, "_MAX_LINE_BYTES", 80)
+    log = tmp_path / "server.txt"
+    log.write_text(
+        _line(1, "ERROR", "penguin.engine", "huge " + "x" * 1000)
+        + _line(2, "INFO", "penguin.engine", "after")
+    )
+
+    for _ in range(10):
+        index.refresh([str(log)])
+    entries = index.query()
+    assert [entry["message"] for entry in entries][-1] == "after"
+    assert entries[0]["message"].startswith("huge x")
+    assert len(entries[0]["message"]) < 80
+    assert len(entries) == 2
+
+
+def test_query_filters(index, tmp_path):
+    log = tmp_path / "server.txt"
+    log.write_text(
+        _line(1, "INFO", "penguin.llm.adapters.openai", "llm.call request=r1 session=s1")
+        + _line(2, "ERROR", "penguin.llm", "llm.error request=r2 session=s1 boom")
+        + _line(3, "WARNING", "penguin.tools", "tool.slow session=s2")
+        + _line(4, "ERROR", "penguin.llmx", "llm.error unrelated")
+    )
+    index.refresh([str(log)])
+
+    assert _messages(index, logger="penguin.llm", level="ERROR") == [
+        "llm.error request=r2 session=s1 boom"
+    ]
+    assert len(index.query(logger="penguin.llm")) == 2
+    assert len(index.query(level=["ERROR", "WARNING"])) == 3
+    assert _messages(index, event="tool.slow") == ["tool.slow session=s2"]
+    assert len(index.query(session_id="s1")) == 2
+    assert _messages(index, request_id="r1") == ["llm.call request=r1 session=s1"]
+    assert len(index.query(since="2026-07-29 02:28:02,000", until="2026-07-29 02:28:03,000")) == 2
+    assert _messages(index, contains="boom") == ["llm.error request=r2 session=s1 boom"]
+    assert [e["message"] for e in index.query(limit=1, newest_first=True)] == [
+        "llm.error unrelated"
+    ]
@@ -1,6 +1,8 @@
 from pathlib import Path
+from unittest.mock import patch
 
 from penguin.skills.discovery import discover_skills
+from penguin.skills.parser import parse_skill_file
 
 
 def make_skill(path: Path, name: str, description: str = "Desc") -> None:
@@ -115,3 +117,59 @@ def test_project_skills_loaded_when_trusted(tmp_path: Path) -> None:
     skills, _ = discover_skills(config, project_root=tmp_path)
 
     assert [skill.name for skill in skills] == ["project-skill"]
+
+
+def test_discover_prunes_ignored_and_deep_directories(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    make_skill(root / "ok", "shallow-skill")
+    make_skill(root / "node_modules" / "pkg", "vendored-skill")
+    make_skill(root / "build", "build-skill")
+    make_skill(root / "a" / "b", "boundary-skill")
+    make_skill(root / "a" / "b" / "c" / "d", "buried-skill")
+    config = {
+        "skills": {
+            "include_bundled": False,
+            "scan_paths": {"user": [str(root)]},
+            "max_scan_depth": 1,
+            "cache": False,
+        }
+    }
+
+    skills, diagnostics = discover_skills(config)
+
+    # Build-output names are valid skill directories; only vendored trees are pruned
+    assert sorted(skill.name for skill in skills) == ["build-skill", "shallow-skill"]
+    # Only the level just past the limit is reported; deeper trees are not walked
+    assert [(d.code, Path(d.path).parent.name) for d in diagnostics] == [
+        ("max_depth_exceeded", "b")
+    ]
+
+
+def test_discovery_cache_skips_walk_and_parse_until_something_changes(tmp_path: Path) -> None:
+    make_skill(tmp_path / "user" / "alpha", "alpha")
+    config = {
+        "skills": {
+            "include_bundled": False,
+            "scan_paths": {"user": [str(tmp_path / "user")]},
+            "cache_path": str(tmp_path / "cache.json"),
+        }
+    }
+    assert [skill.name for skill in discover_skills(config)[0]] == ["alpha"]
+
+    with patch("penguin.skills.discovery.scan_tree", side_effect=AssertionError), patch(
+        "penguin.skills.discovery.parse_skill_file", side_effect=AssertionError
+    ):
+        assert [skill.name for skill in discover_skills(config)[0]] == ["alpha"]
+
+    # A new skill directory changes the root's mtime; the edited file its signature
+    make_skill(tmp_path / "user" / "beta", "beta")
+    make_skill(tmp_path / "user" / "alpha", "alpha", "A longer description")
+    with patch(
+        "penguin.skills.discovery.parse_skill_file", wraps=parse_skill_file
+    ) as parse:
+        skills, _ = discover_skills(config)
+    assert [(s.name, s.description) for s in skills] == [
+        ("alpha", "A longer description"),
+        ("beta", "Desc"),
+    ]
+    assert parse.call_count == 2
@@ -0,0 +1,147 @@
+"""Tests for the workspace change tracker used around code execution."""
+
+import os
+
+import pytest
+
+from penguin.utils.change_tracker import WorkspaceChangeTracker
+
+
+def _populate(root):
+    (root / "src").mkdir()
+    (root / "src" / "keep.py").write_text("a = 1\n")
+    (root / "src" / "edit.py").write_text("b = 1\n")
+    (root / "old.txt").write_text("bye\n")
+    (root / "node_modules").mkdir()
+
+
+def _mutate(root):
+    (root / "src" / "edit.py").write_text("b = 2  # longer\n")
+    (root / "old.txt").unlink()
+    (root / "src" / "new.csv").write_text("x,y\n")
+    (root / "scratch.tmp").write_text("temp")
+    (root / "scratch.tmp").unlink()
+    (root / "node_modules" / "ignored.js").write_text("ignored")
+
+
+@pytest.mark.parametrize("use_events", [True, False])
+def test_reports_created_modified_deleted(tmp_path, use_events):
+    _populate(tmp_path)
+    tracker = WorkspaceChangeTracker(str(tmp_path), use_events=use_events)
+    try:
+        assert tracker.event_driven is use_events
+        token = tracker.begin()
+        _mutate(tmp_path)
+        changes = tracker.end(token)
+    finally:
+        tracker.close()
+
+    assert changes.created == [os.path.join("src", "new.csv")]
+    assert changes.modified == [os.path.join("src", "edit.py")]
+    assert changes.deleted == ["old.txt"]
+    assert "created: src/new.csv" in changes.summary().replace(os.sep, "/")
+
+
+def test_overlapping_windows_and_quiet_cells(tmp_path):
+    tracker = WorkspaceChangeTracker(str(tmp_path))
+    try:
+        outer = tracker.begin()
+        (tmp_path / "first.txt").write_text("1")
+        inner = tracker.begin()
+        (tmp_path / "second.txt").write_text("2")
+
+        assert tracker.end(inner).created == ["second.txt"]
+        assert tracker.end(outer).created == ["first.txt", "second.txt"]
+        assert not tracker.end(tracker.begin())
+    finally:
+        tracker.close()
+
+
+def test_window_is_closed_when_execution_raises(tmp_path, monkeypatch):
+    from penguin.tools.tool_manager import ToolManager
+    from penguin.utils import notebook
+    from penguin.utils.notebook import NotebookExecutor
+
+    tracker = WorkspaceChangeTracker(str(tmp_path))
+    monkeypatch.setattr(notebook, "get_change_tracker", lambda root: tracker)
+    monkeypatch.setattr(
+        "penguin.utils.change_tracker.get_change_tracker", lambda root: tracker
+    )
+
+    class _Explodes:
+        def run_cell(self, code):
+            (tmp_path / "partial.txt").write_text("half")
+            raise KeyboardInterrupt("stop")
+
+        def execute(self, key, code, cwd=None, timeout=None):
+            raise ValueError("kernel pool broke")
+
+    executor = NotebookExecutor.__new__(NotebookExecutor)
+    executor.shell = _Explodes()
+    executor.active_directory = str(tmp_path)
+    cwd = os.getcwd()
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            executor.execute_code("boom()")
+        assert os.getcwd() == cwd
+
+        manager = ToolManager.__new__(ToolManager)
+        manager._file_root = str(tmp_path)
+        manager._kernel_pool = _Explodes()
+        with pytest.raises(ValueError):
+            manager._execute_code_in_kernel("boom()", str(tmp_path), 5)
+
+        assert tracker._open == set()
+        (tmp_path / "later.txt").write_text("after")
+        tracker._settle()
+        assert tracker._events == []
+    finally:
+        tracker.close()
+
+
+def test_ignored_trees_get_no_watches_and_new_dirs_are_followed(tmp_path):
+    _populate(tmp_path)
+    (tmp_path / "node_modules" / "pkg" / "lib").mkdir(parents=True)
+    (tmp_path / "src" / "__pycache__").mkdir()
+    tracker = WorkspaceChangeTracker(str(tmp_path))
+    try:
+        assert tracker.event_driven
+        watched = {os.path.relpath(d, tmp_path): w.is_recursive for d, w in tracker._watches.items()}
+        assert watched == {".": False, "src": True}
+
+        token = tracker.begin()
+        (tmp_path / "pkg" / "deep").mkdir(parents=True)
+        (tmp_path / "pkg" / "deep" / "mod.py").write_text("x = 1\n")
+        (tmp_path / "node_modules" / "pkg" / "lib" / "index.js").write_text("ignored")
+        first = tracker.end(token)
+
+        token = tracker.begin()
+        (tmp_path / "pkg" / "deep" / "mod.py").write_text("x = 22\n")
+        second = tracker.end(token)
+    finally:
+        tracker.close()
+
+    assert first.created == [os.path.join("pkg", "deep", "mod.py")]
+    assert second.modified == [os.path.join("pkg", "deep", "mod.py")]
+
+
+def test_polling_only_restats_changed_directories(tmp_path, monkeypatch):
+    _populate(tmp_path)
+    tracker = WorkspaceChangeTracker(str(tmp_path), use_events=False)
+    token = tracker.begin()
+    (tmp_path / "src" / "new.csv").write_text("x,y\n")
+
+    scanned = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scanned.append(path) or real_scandir(path))
+    stat_calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(
+        os, "stat", lambda path, *a, **kw: stat_calls.append(str(path)) or real_stat(path, *a, **kw)
+    )
+    changes = tracker.end(token)
+
+    assert changes.created == [os.path.join("src", "new.csv")]
+    # Files are only re-stat'd while re-listing a directory whose mtime moved
+    assert [os.path.relpath(path, tmp_path) for path in scanned] == ["src"]
+    assert not any(path.endswith("old.txt") for path in stat_calls)
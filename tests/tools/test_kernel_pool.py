@@ -0,0 +1,62 @@
+"""Tests for the out-of-process per-session kernel pool."""
+
+import threading
+import time
+
+import pytest
+
+from penguin.utils.kernel_pool import KernelPool, KernelTimeout
+
+
+@pytest.fixture
+def pool():
+    kernel_pool = KernelPool(max_kernels=2, warm_spares=1, idle_ttl=0)
+    yield kernel_pool
+    kernel_pool.shutdown()
+
+
+def test_sessions_have_isolated_state_and_cwd(pool, tmp_path):
+    (tmp_path / "a").mkdir()
+    assert pool.execute("s1", "value = 'one'") == "Code executed successfully"
+    pool.execute("s2", "value = 'two'")
+
+    assert pool.execute("s1", "print(value)") == "one"
+    assert pool.execute("s2", "print(value)") == "two"
+    assert pool.execute("s1", "import os; print(os.getcwd())", cwd=str(tmp_path / "a")) == str(
+        tmp_path / "a"
+    )
+    # fd-level output from child processes is captured as well
+    assert pool.execute("s1", "import os; _ = os.system('echo from-child')") == "from-child"
+
+
+def test_timeout_kills_kernel_and_next_cell_gets_fresh_state(pool):
+    pool.execute("s1", "marker = 1")
+    pid = pool.stats()["kernels"]["s1"]["pid"]
+
+    with pytest.raises(KernelTimeout):
+        pool.execute("s1", "import time; time.sleep(30)", timeout=0.5)
+
+    assert "s1" not in pool.stats()["kernels"]
+    assert pool.execute("s1", "print('marker' in globals())") == "False"
+    assert pool.stats()["kernels"]["s1"]["pid"] != pid
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_sessions_execute_in_parallel_and_lru_is_evicted(pool):
+    for key in ("s1", "s2"):
+        pool.execute(key, "pass")
+
+    def run(key):
+        pool.execute(key, "import time; time.sleep(1)")
+
+    threads = [threading.Thread(target=run, args=(key,)) for key in ("s1", "s2")]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started < 1.9
+
+    pool.execute("s2", "pass")  # s1 is now least recently used
+    pool.execute("s3", "pass")
+    assert set(pool.stats()["kernels"]) == {"s2", "s3"}
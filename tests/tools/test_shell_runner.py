@@ -0,0 +1,116 @@
+"""Tests for bounded, streaming shell execution."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from penguin.utils.shell_runner import HeadTailBuffer, run_shell
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="uses bash and process groups")
+
+
+def test_head_tail_buffer_keeps_both_ends():
+    buffer = HeadTailBuffer(10)
+    for chunk in (b"abc", b"defgh", b"0123456789", b"XYZ"):
+        buffer.write(chunk)
+
+    assert buffer.total == 21
+    assert buffer.dropped == 11
+    assert buffer.text() == "abcde\n... [11 bytes truncated] ...\n89XYZ"
+
+
+def test_large_output_is_capped_and_streamed():
+    chunks = []
+    code = "import sys; sys.stdout.write('START' + 'x' * 2_000_000 + 'END')"
+    result = run_shell(
+        [sys.executable, "-c", code],
+        max_output_bytes=1000,
+        on_output=lambda stream, text: chunks.append((stream, len(text))),
+    )
+
+    assert result.returncode == 0
+    assert result.stdout.startswith("START") and result.stdout.endswith("END")
+    assert len(result.stdout) < 1100
+    assert result.truncated_bytes == 2_000_008 - 1000
+    assert sum(size for stream, size in chunks if stream == "stdout") == 2_000_008
+    assert "truncated" in result.limit_note()
+
+
+@pytest.mark.parametrize(
+    "limits, reason",
+    [({"timeout": 1, "idle_timeout": 0}, "timeout"), ({"idle_timeout": 0.5}, "idle_timeout")],
+)
+def test_timeouts_kill_whole_process_group(tmp_path, limits, reason):
+    pid_file = tmp_path / "child.pid"
+    # The child keeps printing during the wall-clock case, and is silent in the idle case
+    noise = "while true; do echo tick; sleep 0.1; done" if reason == "timeout" else "sleep 60"
+    command = f"bash -c '{noise}' & echo $! > {pid_file}; wait"
+
+    started = time.monotonic()
+    result = run_shell(["bash", "-c", command], **limits)
+
+    assert result.timed_out == reason
+    assert time.monotonic() - started < 5
+    child = int(pid_file.read_text())
+    for _ in range(50):
+        try:
+            os.kill(child, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("background child survived the timeout")
+
+
+class _CommandToolManager:
+    """Routes ``execute_command`` to the real ToolManager implementation."""
+
+    def __init__(self, file_root):
+        from penguin.tools.tool_manager import ToolManager
+
+        self._manager = ToolManager.__new__(ToolManager)
+        self._manager._file_root = str(file_root)
+
+    def execute_tool(self, tool_name, tool_input):
+        assert tool_name == "execute_command"
+        return self._manager.execute_command(tool_input["command"])
+
+
+async def test_command_output_reaches_ui_events_while_running(tmp_path):
+    from penguin.utils.parser import ActionExecutor, ActionType, CodeActAction
+
+    loop = asyncio.get_running_loop()
+    events = []
+
+    async def ui_event(event_type, data):
+        events.append((loop.time(), event_type, data))
+
+    executor = ActionExecutor(_CommandToolManager(tmp_path), None, ui_event_callback=ui_event)
+    result = await executor.execute_action(
+        CodeActAction(ActionType.EXECUTE_COMMAND, "echo one; sleep 1; echo two")
+    )
+
+    assert result == "one\ntwo"
+    assert [event_type for _, event_type, _ in events] == [
+        "action", "action_output", "action_output", "action_result",
+    ]
+    started, first, second, finished = events
+    assert [data["chunk"] for _, _, data in (first, second)] == ["one\n", "two\n"]
+    assert {data["id"] for _, _, data in events} == {started[2]["id"]}
+    # The first line was emitted while the command was still sleeping
+    assert finished[0] - first[0] >= 0.5
+
+
+def test_execute_command_passes_chunks_to_on_output(tmp_path):
+    from penguin.tools.tool_manager import ToolManager
+
+    manager = ToolManager.__new__(ToolManager)
+    manager._file_root = str(tmp_path)
+    chunks = []
+    result = manager.execute_command("echo a; echo b >&2", on_output=lambda s, t: chunks.append((s, t)))
+
+    assert result == "a"
+    assert sorted(chunks) == [("stderr", "b\n"), ("stdout", "a\n")]